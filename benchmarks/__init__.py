@@ -0,0 +1,16 @@
+"""
+End-to-end benchmarks for the chat hot path.
+
+Scripted conversations run against the mock provider (and a scripted
+LangChain provider for the agent/tool path) with a local Postgres behind
+``ConversationDB``.  See ``docs/development/benchmarks.md``; run
+``python -m benchmarks --help`` from the repository root.
+"""
+
+import sys
+from pathlib import Path
+
+
+_SRC = str(Path(__file__).resolve().parent.parent / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
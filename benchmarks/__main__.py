@@ -0,0 +1,97 @@
+"""Command-line entry point: ``python -m benchmarks``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from . import scenarios as _scenarios
+from .compare import compare, format_deltas
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    names = sorted(_scenarios.SCENARIOS)
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the chat hot path against the mock provider and a local Postgres.",
+    )
+    parser.add_argument(
+        "scenarios", nargs="*", metavar="SCENARIO", help=f"scenarios to run (default: all): {', '.join(names)}"
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="concurrent conversations (default: 8)")
+    parser.add_argument("-t", "--turns", type=int, default=3, help="turns per conversation (default: 3)")
+    parser.add_argument(
+        "--word-delay", type=float, default=0.0, help="seconds per streamed word in the mock providers (default: 0)"
+    )
+    parser.add_argument("--dsn", help="Postgres connection string (default: KNIK_DB_* settings)")
+    parser.add_argument("-o", "--output", type=Path, help="write the JSON results to this file")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE", help="compare against an earlier results file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="relative change reported as a regression (default: 0.10)"
+    )
+    parser.add_argument("--no-allocations", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--keep-data", action="store_true", help="keep the conversations the run creates")
+    parser.add_argument("-v", "--verbose", action="store_true", help="keep the application's info logging")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in _scenarios.SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}; choose from {', '.join(names)}")
+    return args
+
+
+def _print_summary(results: dict) -> None:
+    print(f"{'scenario':<18} {'ttft p50/p99 ms':>18} {'latency p50/p99 ms':>20} {'tok/s p50':>10} {'db/turn':>8}")
+    for name, result in results["scenarios"].items():
+        if result["status"] != "ok":
+            print(f"{name:<18} skipped: {result['reason']}")
+            continue
+        ttft, latency = result["ttft_ms"], result["latency_ms"]
+        print(
+            f"{name:<18} {ttft.get('p50', '-'):>8}/{ttft.get('p99', '-'):<9} "
+            f"{latency.get('p50', '-'):>9}/{latency.get('p99', '-'):<10} "
+            f"{result['tokens_per_s'].get('p50', '-'):>10} {result['db_calls_per_turn'].get('mean', '-'):>8}"
+            + (f"  ({result['errors']} errors)" if result["errors"] else "")
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if not args.verbose:
+        from lib.utils.printer import printer
+
+        printer.set_log_level("WARNING")
+
+    from .runner import run_benchmarks
+
+    selected = [_scenarios.SCENARIOS[name] for name in (args.scenarios or _scenarios.SCENARIOS)]
+    results = asyncio.run(
+        run_benchmarks(
+            selected,
+            concurrency=args.concurrency,
+            turns=args.turns,
+            word_delay=args.word_delay,
+            dsn=args.dsn,
+            allocations=not args.no_allocations,
+            keep_data=args.keep_data,
+        )
+    )
+
+    _print_summary(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        deltas = compare(json.loads(args.compare.read_text()), results)
+        print()
+        print(format_deltas(deltas, args.threshold))
+        if any(d.is_regression(args.threshold) for d in deltas):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Compare two result files metric by metric."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+# (path into a scenario result, True if a larger value is better)
+COMPARED_METRICS: tuple[tuple[tuple[str, ...], bool], ...] = (
+    (("ttft_ms", "p50"), False),
+    (("ttft_ms", "p99"), False),
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p99"), False),
+    (("tokens_per_s", "p50"), True),
+    (("turns_per_s",), True),
+    (("db_calls_per_turn", "mean"), False),
+    (("allocations", "peak_bytes_per_turn", "p50"), False),
+    (("allocations", "retained_bytes"), False),
+)
+
+
+@dataclass(frozen=True)
+class Delta:
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+    higher_is_better: bool
+
+    @property
+    def change(self) -> float | None:
+        """Relative change from the baseline (``0.1`` = 10% larger)."""
+        if self.baseline == 0:
+            return None if self.current == 0 else float("inf")
+        return (self.current - self.baseline) / abs(self.baseline)
+
+    def is_regression(self, threshold: float) -> bool:
+        change = self.change
+        if change is None:
+            return False
+        return change < -threshold if self.higher_is_better else change > threshold
+
+
+def _lookup(result: dict[str, Any], path: tuple[str, ...]) -> float | None:
+    value: Any = result
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value if isinstance(value, int | float) else None
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[Delta]:
+    """Deltas for every metric both runs measured, in scenario then metric order."""
+    deltas = []
+    for name, result in current.get("scenarios", {}).items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before or before.get("status") != "ok" or result.get("status") != "ok":
+            continue
+        for path, higher_is_better in COMPARED_METRICS:
+            old, new = _lookup(before, path), _lookup(result, path)
+            if old is not None and new is not None:
+                deltas.append(Delta(name, ".".join(path), old, new, higher_is_better))
+    return deltas
+
+
+def format_deltas(deltas: list[Delta], threshold: float) -> str:
+    lines = [f"{'scenario':<18} {'metric':<40} {'baseline':>12} {'current':>12} {'change':>9}"]
+    for d in deltas:
+        change = d.change
+        shown = "n/a" if change is None else f"{change:+.1%}"
+        flag = "  REGRESSION" if d.is_regression(threshold) else ""
+        lines.append(f"{d.scenario:<18} {d.metric:<40} {d.baseline:>12g} {d.current:>12g} {shown:>9}{flag}")
+    return "\n".join(lines)
@@ -0,0 +1,151 @@
+"""Per-turn samples, database call attribution, and percentile summaries."""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import math
+import statistics
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from lib.services.postgres.db import PostgresDB
+
+
+@dataclass
+class TurnSample:
+    """One chat turn as seen by the caller."""
+
+    conversation: int
+    turn: int
+    started: float
+    first_token: float | None = None
+    finished: float | None = None
+    output_tokens: int = 0
+    chunks: int = 0
+    tool_calls: int = 0
+    db_calls: int = 0
+    peak_alloc_bytes: int | None = None
+    error: str | None = None
+
+    @property
+    def ttft(self) -> float | None:
+        return None if self.first_token is None else self.first_token - self.started
+
+    @property
+    def latency(self) -> float | None:
+        return None if self.finished is None else self.finished - self.started
+
+    @property
+    def tokens_per_second(self) -> float | None:
+        if self.first_token is None or self.finished is None or self.output_tokens <= 0:
+            return None
+        streaming = self.finished - self.first_token
+        return self.output_tokens / streaming if streaming > 0 else None
+
+    def mark_chunk(self, now: float) -> None:
+        if self.first_token is None:
+            self.first_token = now
+        self.chunks += 1
+
+
+_current_sample: contextvars.ContextVar[TurnSample | None] = contextvars.ContextVar("bench_turn", default=None)
+
+
+@contextlib.contextmanager
+def attribute_db_calls(sample: TurnSample) -> Iterator[None]:
+    """Charge connection checkouts in this context (and tasks it spawns) to *sample*."""
+    token = _current_sample.set(sample)
+    try:
+        yield
+    finally:
+        _current_sample.reset(token)
+
+
+@contextlib.contextmanager
+def count_db_calls() -> Iterator[list[int]]:
+    """Count every ``PostgresDB`` connection checkout while active.
+
+    Yields a one-element list holding the total; per-turn counts go to the
+    ``TurnSample`` set by ``attribute_db_calls``.  Every query helper and
+    every direct ``get_connection`` user goes through ``get_connection``, so
+    one checkout is one database round trip from the caller's point of view.
+    """
+    total = [0]
+    original = PostgresDB.__dict__["get_connection"]
+
+    @contextlib.asynccontextmanager
+    async def _counted(cls):
+        total[0] += 1
+        sample = _current_sample.get()
+        if sample is not None:
+            sample.db_calls += 1
+        async with original.__func__(cls) as conn:
+            yield conn
+
+    PostgresDB.get_connection = classmethod(_counted)
+    try:
+        yield total
+    finally:
+        PostgresDB.get_connection = original
+
+
+def percentile(values: Iterable[float], pct: float) -> float | None:
+    """Nearest-rank percentile (``pct`` in 0-100); ``None`` for no values."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def distribution(values: Iterable[float | None], scale: float = 1.0, digits: int = 3) -> dict[str, Any]:
+    """``count``/``mean``/``p50``/``p90``/``p99``/``max`` of the non-``None`` values, times *scale*."""
+    present = [v * scale for v in values if v is not None]
+    if not present:
+        return {"count": 0}
+    return {
+        "count": len(present),
+        "mean": round(statistics.fmean(present), digits),
+        "p50": round(percentile(present, 50), digits),
+        "p90": round(percentile(present, 90), digits),
+        "p99": round(percentile(present, 99), digits),
+        "max": round(max(present), digits),
+    }
+
+
+@dataclass
+class RunResult:
+    samples: list[TurnSample] = field(default_factory=list)
+    wall_time: float = 0.0
+    total_db_calls: int = 0
+    retained_alloc_bytes: int | None = None
+
+    def summary(self) -> dict[str, Any]:
+        ok = [s for s in self.samples if s.error is None]
+        errors = [s.error for s in self.samples if s.error is not None]
+        summary = {
+            "turns": len(self.samples),
+            "errors": len(errors),
+            "wall_time_s": round(self.wall_time, 3),
+            "turns_per_s": round(len(ok) / self.wall_time, 3) if self.wall_time > 0 else None,
+            "ttft_ms": distribution((s.ttft for s in ok), scale=1000),
+            "latency_ms": distribution((s.latency for s in ok), scale=1000),
+            "tokens_per_s": distribution(s.tokens_per_second for s in ok),
+            "output_tokens_per_turn": distribution(s.output_tokens for s in ok),
+            "tool_calls_per_turn": distribution(s.tool_calls for s in ok),
+            "db_calls_per_turn": distribution(s.db_calls for s in ok),
+            "db_calls_total": self.total_db_calls,
+        }
+        if errors:
+            summary["first_errors"] = errors[:5]
+        return summary
+
+    def allocation_summary(self) -> dict[str, Any]:
+        """Summary of a tracemalloc pass: peak bytes above the turn's start, and bytes still held after."""
+        return {
+            "turns": len(self.samples),
+            "peak_bytes_per_turn": distribution((s.peak_alloc_bytes for s in self.samples), digits=0),
+            "retained_bytes": self.retained_alloc_bytes,
+        }
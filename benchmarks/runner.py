@@ -0,0 +1,326 @@
+"""Runs scenarios: N concurrent conversations, each a sequence of streamed turns."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from lib.services.ai_client import AIClient
+from lib.services.ai_client.registry import MCPServerRegistry
+from lib.services.conversation import ConversationDB
+from lib.services.postgres.db import PostgresDB
+
+from .measure import RunResult, TurnSample, attribute_db_calls, count_db_calls
+from .scenarios import Scenario
+from .scripted_provider import PROVIDER_NAME, ScriptedProvider
+
+
+RESULTS_SCHEMA = 1
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class TransportUnavailableError(RuntimeError):
+    """The scenario's entry point cannot be imported in this environment."""
+
+
+@dataclass
+class Conversation:
+    index: int
+    conversation_id: str | None = None
+    client: AIClient | None = None
+    created_ids: set[str] = field(default_factory=set)
+
+
+def _build_client(scenario: Scenario) -> AIClient:
+    """Build a client the way the web backend does: full tool catalog, no fallback."""
+    from lib.mcp.index import register_all_tools
+
+    registry = MCPServerRegistry()
+    register_all_tools(registry)
+    kwargs: dict[str, Any] = {}
+    if scenario.provider == PROVIDER_NAME:
+        kwargs["script"] = scenario.script
+    return AIClient(provider=scenario.provider, auto_fallback_to_mock=False, mcp_registry=registry, **kwargs)
+
+
+class ClientTransport:
+    """``AIClient.achat_stream`` with a conversation id, as the bot and console apps use it."""
+
+    def __init__(self, scenario: Scenario):
+        self.scenario = scenario
+
+    def __enter__(self) -> ClientTransport:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    async def open(self, index: int) -> Conversation:
+        return Conversation(index, client=await asyncio.to_thread(_build_client, self.scenario))
+
+    async def turn(self, conversation: Conversation, prompt: str, sample: TurnSample) -> None:
+        async for chunk in conversation.client.achat_stream(prompt, conversation_id=conversation.conversation_id):
+            if isinstance(chunk, str):
+                sample.mark_chunk(time.perf_counter())
+            elif "__conversation_id__" in chunk:
+                conversation.conversation_id = chunk["__conversation_id__"]
+                conversation.created_ids.add(conversation.conversation_id)
+            elif chunk.get("__tool_call_start__"):
+                sample.tool_calls += 1
+            elif chunk.get("__done__"):
+                usage = chunk.get("usage") or {}
+                sample.output_tokens = usage.get("output_tokens") or sample.chunks
+
+
+class _SilentVoice:
+    """TTS stand-in so SSE numbers measure the text path, not speech synthesis."""
+
+    sample_rate = 24000
+
+    def generate_stream(self, text: str):
+        return iter(())
+
+
+class SSETransport:
+    """The web backend's SSE generator (``stream_chat_response``), minus HTTP framing."""
+
+    def __init__(self, scenario: Scenario):
+        self.scenario = scenario
+        try:
+            from apps.web.backend import state
+            from apps.web.backend.routes import chat_stream
+            from lib.services.ai_client.client_cache import AIClientCache
+        except ImportError as e:
+            raise TransportUnavailableError(f"web backend cannot be imported: {e}") from e
+        self._state = state
+        self._route = chat_stream
+        self._cache_class = AIClientCache
+        self._saved: tuple | None = None
+
+    def __enter__(self) -> SSETransport:
+        state = self._state
+        self._saved = (
+            state._factory_config,
+            state.tts_processor,
+            state.conversation_clients,
+            ScriptedProvider.default_script,
+        )
+        state._factory_config = state._FactoryConfig(
+            provider=self.scenario.provider,
+            model="benchmark",
+            project_id=None,
+            location=None,
+            system_instruction=None,
+        )
+        state.tts_processor = _SilentVoice()
+        state.conversation_clients = self._cache_class()
+        ScriptedProvider.default_script = self.scenario.script
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        state = self._state
+        (
+            state._factory_config,
+            state.tts_processor,
+            state.conversation_clients,
+            ScriptedProvider.default_script,
+        ) = self._saved
+
+    async def open(self, index: int) -> Conversation:
+        return Conversation(index)
+
+    async def turn(self, conversation: Conversation, prompt: str, sample: TurnSample) -> None:
+        async for frame in self._route.stream_chat_response(prompt, conversation_id=conversation.conversation_id):
+            event, _, data = frame.partition("\ndata: ")
+            event = event.removeprefix("event: ")
+            if event == "text":
+                sample.mark_chunk(time.perf_counter())
+            elif event == "conversation_id":
+                conversation.conversation_id = json.loads(data)["conversation_id"]
+                conversation.created_ids.add(conversation.conversation_id)
+            elif event == "tool_start":
+                sample.tool_calls += 1
+            elif event == "usage":
+                sample.output_tokens = json.loads(data)["usage"].get("output_tokens", 0)
+            elif event == "error":
+                sample.error = json.loads(data).get("error", "stream error")
+        if not sample.output_tokens:
+            sample.output_tokens = sample.chunks
+
+
+def make_transport(scenario: Scenario) -> ClientTransport | SSETransport:
+    if scenario.transport == "sse":
+        return SSETransport(scenario)
+    return ClientTransport(scenario)
+
+
+async def _drain_background_tasks() -> None:
+    """Wait for title generation and other fire-and-forget work started by the turns."""
+    while AIClient._background_tasks:
+        await asyncio.gather(*list(AIClient._background_tasks), return_exceptions=True)
+
+
+async def _run_conversation(
+    transport,
+    scenario: Scenario,
+    index: int,
+    turns: int,
+    result: RunResult,
+    trace_allocations: bool = False,
+) -> Conversation:
+    conversation = await transport.open(index)
+    for turn in range(turns):
+        sample = TurnSample(index, turn, started=time.perf_counter())
+        if trace_allocations:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        with attribute_db_calls(sample):
+            try:
+                await transport.turn(conversation, scenario.prompt(turn), sample)
+            except Exception as e:
+                sample.error = f"{type(e).__name__}: {e}"
+        sample.finished = time.perf_counter()
+        if trace_allocations:
+            sample.peak_alloc_bytes = tracemalloc.get_traced_memory()[1] - baseline
+        result.samples.append(sample)
+    return conversation
+
+
+async def _cleanup(conversations: list[Conversation]) -> None:
+    for conversation in conversations:
+        for conversation_id in conversation.created_ids:
+            await ConversationDB.delete_conversation(conversation_id)
+
+
+async def run_scenario(
+    scenario: Scenario,
+    *,
+    concurrency: int,
+    turns: int,
+    allocations: bool = True,
+    keep_data: bool = False,
+) -> dict[str, Any]:
+    """Run *concurrency* conversations of *turns* turns each and summarize them.
+
+    A one-turn warm-up runs first so imports, tool catalogs and pool
+    connections are not charged to the measured turns.  Allocations are
+    measured in a separate single-conversation pass, since tracemalloc slows
+    everything down and is process-wide.
+    """
+    info = {
+        "description": scenario.description,
+        "provider": scenario.provider,
+        "transport": scenario.transport,
+        "concurrency": concurrency,
+        "turns_per_conversation": turns,
+    }
+    try:
+        transport = make_transport(scenario)
+    except TransportUnavailableError as e:
+        return {**info, "status": "skipped", "reason": str(e)}
+
+    conversations: list[Conversation] = []
+    with transport, count_db_calls() as db_calls:
+        try:
+            conversations.append(await _run_conversation(transport, scenario, -1, 1, RunResult()))
+            await _drain_background_tasks()
+
+            result = RunResult()
+            calls_before = db_calls[0]
+            started = time.perf_counter()
+            conversations += await asyncio.gather(
+                *(_run_conversation(transport, scenario, i, turns, result) for i in range(concurrency))
+            )
+            result.wall_time = time.perf_counter() - started
+            await _drain_background_tasks()
+            result.total_db_calls = db_calls[0] - calls_before
+
+            summary = result.summary()
+
+            if allocations:
+                traced = RunResult()
+                gc.collect()
+                tracemalloc.start()
+                try:
+                    start_bytes = tracemalloc.get_traced_memory()[0]
+                    conversations.append(
+                        await _run_conversation(transport, scenario, concurrency, turns, traced, trace_allocations=True)
+                    )
+                    await _drain_background_tasks()
+                    gc.collect()
+                    traced.retained_alloc_bytes = tracemalloc.get_traced_memory()[0] - start_bytes
+                finally:
+                    tracemalloc.stop()
+                summary["allocations"] = traced.allocation_summary()
+        finally:
+            if not keep_data:
+                await _cleanup(conversations)
+
+    return {**info, "status": "ok", **summary}
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+async def _connect(dsn: str | None) -> None:
+    await PostgresDB.initialize(dsn)
+    await ConversationDB.initialize()
+    if await PostgresDB.fetch_val("SELECT to_regclass('public.conversation_messages')") is None:
+        raise RuntimeError("conversation tables are missing; apply db/migrations to the benchmark database first")
+
+
+async def run_benchmarks(
+    scenarios: list[Scenario],
+    *,
+    concurrency: int,
+    turns: int,
+    word_delay: float,
+    dsn: str | None = None,
+    allocations: bool = True,
+    keep_data: bool = False,
+) -> dict[str, Any]:
+    """Run *scenarios* in order against the database at *dsn* (``KNIK_DB_*`` when omitted)."""
+    # Read by the mock and scripted providers when each client is built.
+    os.environ["KNIK_MOCK_WORD_DELAY"] = str(word_delay)
+    await _connect(dsn)
+    results: dict[str, Any] = {}
+    try:
+        for scenario in scenarios:
+            results[scenario.name] = await run_scenario(
+                scenario, concurrency=concurrency, turns=turns, allocations=allocations, keep_data=keep_data
+            )
+    finally:
+        await PostgresDB.close()
+
+    return {
+        "schema": RESULTS_SCHEMA,
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            "concurrency": concurrency,
+            "turns": turns,
+            "word_delay_s": word_delay,
+            "allocations": allocations,
+        },
+        "scenarios": results,
+    }
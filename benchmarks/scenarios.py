@@ -0,0 +1,81 @@
+"""Scripted conversations the harness can run."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from .scripted_provider import PROVIDER_NAME, Script, ToolCall
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    One benchmark workload.
+
+    Attributes:
+        name: Key used on the command line and in result files.
+        description: One-line summary printed with the results.
+        provider: ``mock`` or the scripted LangChain provider.
+        transport: ``client`` drives ``AIClient.achat_stream`` directly;
+            ``sse`` drives the web backend's SSE generator
+            (``stream_chat_response``), TTS replaced by a silent voice.
+        script: What the scripted provider does each turn.
+        prompts: User messages, cycled over the turns of a conversation.
+    """
+
+    name: str
+    description: str
+    provider: str
+    transport: str
+    script: Script = Script()
+    prompts: tuple[str, ...] = field(
+        default=(
+            "What's on my calendar today?",
+            "Summarize that in one sentence.",
+            "And what about tomorrow?",
+        )
+    )
+
+    def prompt(self, turn: int) -> str:
+        return self.prompts[turn % len(self.prompts)]
+
+
+_TOOL_SCRIPT = Script(
+    tool_calls=(
+        ToolCall("calculate", {"expression": "sqrt(1764) * 3", "precision": 2}),
+        ToolCall("word_count", {"text": "the quick brown fox jumps over the lazy dog"}),
+    ),
+    reply_words=40,
+)
+
+SCENARIOS: dict[str, Scenario] = {
+    s.name: s
+    for s in (
+        Scenario(
+            "chat",
+            "Mock provider through AIClient.achat_stream with ConversationDB persistence",
+            provider="mock",
+            transport="client",
+        ),
+        Scenario(
+            "agent-tools",
+            "Scripted LangChain agent: two tool calls via MCPServerRegistry, then a 40-word reply",
+            provider=PROVIDER_NAME,
+            transport="client",
+            script=_TOOL_SCRIPT,
+        ),
+        Scenario(
+            "sse-chat",
+            "Mock provider through the SSE chat route",
+            provider="mock",
+            transport="sse",
+        ),
+        Scenario(
+            "sse-agent-tools",
+            "Scripted LangChain agent with tool calls through the SSE chat route",
+            provider=PROVIDER_NAME,
+            transport="sse",
+            script=_TOOL_SCRIPT,
+        ),
+    )
+}
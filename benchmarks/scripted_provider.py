@@ -0,0 +1,172 @@
+"""
+A LangChain provider driven by a fixed script instead of a model API.
+
+``MockAIProvider`` streams canned text straight from ``chat_stream``, so it
+never touches ``LangChainProvider`` or tool dispatch.  This provider runs the
+real ``LangChainProvider`` streaming loop over a ``create_agent`` agent whose
+chat model follows a ``Script``: request each scripted tool call in turn
+(executed through ``MCPServerRegistry.execute_tool``), then stream a reply
+word by word with the same per-word delay as the mock.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain.agents import create_agent
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from lib.core.config import Config
+from lib.services.ai_client.providers.base_provider import LangChainProvider
+from lib.services.ai_client.registry import ProviderRegistry
+
+
+PROVIDER_NAME = "bench-scripted"
+
+
+@dataclass(frozen=True)
+class ToolCall:
+    name: str
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Script:
+    """What the scripted model does on every turn."""
+
+    tool_calls: tuple[ToolCall, ...] = ()
+    reply_words: int = 40
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that plays a ``Script``; tool binding is accepted and ignored."""
+
+    script: Script = Script()
+    word_delay: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs) -> ScriptedChatModel:
+        return self
+
+    def _next_message(self, messages: list[BaseMessage]) -> AIMessage:
+        # Tool results since the latest user message tell us how far into the script this turn is.
+        step = 0
+        for message in reversed(messages):
+            if isinstance(message, ToolMessage):
+                step += 1
+            elif message.type == "human":
+                break
+        input_tokens = sum(len(str(m.content).split()) for m in messages)
+        if step < len(self.script.tool_calls):
+            call = self.script.tool_calls[step]
+            return AIMessage(
+                content="",
+                tool_calls=[{"name": call.name, "args": call.args, "id": f"call_{len(messages)}_{step}"}],
+                usage_metadata={"input_tokens": input_tokens, "output_tokens": 8, "total_tokens": input_tokens + 8},
+            )
+        words = self.script.reply_words
+        text = " ".join(f"word{i}" for i in range(words))
+        return AIMessage(
+            content=text,
+            usage_metadata={"input_tokens": input_tokens, "output_tokens": words, "total_tokens": input_tokens + words},
+        )
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+    def _chunks(self, messages) -> Iterator[ChatGenerationChunk]:
+        message = self._next_message(messages)
+        if message.tool_calls:
+            chunks = [
+                {"name": tc["name"], "args": json.dumps(tc["args"]), "id": tc["id"], "index": i}
+                for i, tc in enumerate(message.tool_calls)
+            ]
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(content="", tool_call_chunks=chunks, usage_metadata=message.usage_metadata)
+            )
+            return
+        words = message.content.split(" ")
+        for i, word in enumerate(words):
+            last = i == len(words) - 1
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content=word if last else word + " ",
+                    usage_metadata=message.usage_metadata if last else None,
+                )
+            )
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        for chunk in self._chunks(messages):
+            if self.word_delay > 0 and chunk.message.content:
+                time.sleep(self.word_delay)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        for chunk in self._chunks(messages):
+            if self.word_delay > 0 and chunk.message.content:
+                await asyncio.sleep(self.word_delay)
+            yield chunk
+
+
+class ScriptedProvider(LangChainProvider):
+    """``LangChainProvider`` over a ``ScriptedChatModel``.
+
+    ``default_script`` applies when no ``script`` is passed, which is how the
+    web backend's client factory (which only forwards provider/model/registry)
+    picks up the scenario being benchmarked.
+    """
+
+    default_script: Script = Script()
+
+    @classmethod
+    def get_provider_name(cls) -> str:
+        return PROVIDER_NAME
+
+    def __init__(
+        self,
+        mcp_registry=None,
+        system_instruction: str | None = None,
+        script: Script | None = None,
+        word_delay: float | None = None,
+        model: str = "scripted",
+        **kwargs,
+    ):
+        llm = ScriptedChatModel(
+            script=script or self.default_script,
+            word_delay=Config().mock_word_delay if word_delay is None else word_delay,
+        )
+        agent = None
+        if mcp_registry is not None:
+            agent = create_agent(
+                model=llm,
+                tools=mcp_registry.create_langchain_tools(),
+                system_prompt=system_instruction or "You are a helpful AI assistant with access to tools.",
+            )
+        self.model_name = model
+        super().__init__(
+            llm=llm,
+            agent=agent,
+            provider_name=PROVIDER_NAME,
+            mcp_registry=mcp_registry,
+            system_instruction=system_instruction,
+            skip_tool_binding=True,
+        )
+
+    def get_models(self) -> list[dict[str, Any]]:
+        return [{"id": self.model_name, "name": "Scripted", "context_window": 128_000, "provider": PROVIDER_NAME}]
+
+
+ProviderRegistry.register(PROVIDER_NAME, ScriptedProvider)
@@ -0,0 +1,47 @@
+-- Normalized, append-only message storage.
+-- Appending to conversations.messages (JSONB) rewrites the whole array on every
+-- turn, so each append costs O(history).  Messages now live one row per message,
+-- keyed by (conversation_id, seq), and conversations.message_count doubles as the
+-- seq allocator so an append is a single-row update plus a single-row insert.
+-- conversations.messages is left in place (no longer written) for rollback.
+
+ALTER TABLE conversations ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS conversation_messages (
+    conversation_id TEXT NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+    seq             INTEGER NOT NULL,
+    role            TEXT NOT NULL,
+    content         TEXT NOT NULL DEFAULT '',
+    metadata        JSONB NOT NULL DEFAULT '{}'::jsonb,
+    token_count     INTEGER,
+    created_at      TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (conversation_id, seq)
+);
+
+-- Compaction pointers reference messages by metadata.message_id
+CREATE INDEX IF NOT EXISTS idx_conversation_messages_message_id
+    ON conversation_messages (conversation_id, (metadata->>'message_id'))
+    WHERE metadata ? 'message_id';
+
+-- Backfill existing JSONB arrays; seq preserves the original array index
+INSERT INTO conversation_messages (conversation_id, seq, role, content, metadata, created_at)
+SELECT
+    c.id,
+    (m.ordinality - 1)::INTEGER,
+    COALESCE(m.elem->>'role', 'user'),
+    COALESCE(m.elem->>'content', ''),
+    COALESCE(m.elem->'metadata', '{}'::jsonb),
+    COALESCE((m.elem->>'timestamp')::timestamptz, c.created_at)
+FROM conversations c
+CROSS JOIN LATERAL jsonb_array_elements(COALESCE(c.messages, '[]'::jsonb)) WITH ORDINALITY AS m(elem, ordinality)
+ON CONFLICT (conversation_id, seq) DO NOTHING;
+
+UPDATE conversations c
+SET message_count = sub.cnt
+FROM (
+    SELECT conversation_id, MAX(seq) + 1 AS cnt
+    FROM conversation_messages
+    GROUP BY conversation_id
+) sub
+WHERE c.id = sub.conversation_id
+  AND c.message_count < sub.cnt;
@@ -0,0 +1,7 @@
+-- Due-schedule lookup for the cron poller.
+-- CronScheduler claims due rows with
+--   WHERE enabled = true AND next_run_at <= now() ORDER BY next_run_at FOR UPDATE SKIP LOCKED
+-- so each tick costs an index range scan over due work instead of a full scan
+-- of every enabled schedule.
+CREATE INDEX IF NOT EXISTS idx_schedules_enabled_next_run
+ON schedules(enabled, next_run_at);
@@ -0,0 +1,58 @@
+-- Incremental token accounting.
+-- conversation_messages.token_count is now filled in at append time, and the
+-- conversation row carries running totals that append_message bumps in the same
+-- statement that allocates the message seq.  Token-usage reads become a single
+-- row lookup instead of a walk over every message's metadata.
+
+ALTER TABLE conversations ADD COLUMN IF NOT EXISTS message_tokens BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE conversations ADD COLUMN IF NOT EXISTS input_tokens BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE conversations ADD COLUMN IF NOT EXISTS output_tokens BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE conversations ADD COLUMN IF NOT EXISTS context_tokens BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE conversations ADD COLUMN IF NOT EXISTS last_input_tokens INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE conversations ADD COLUMN IF NOT EXISTS assistant_message_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE conversations ADD COLUMN IF NOT EXISTS usage_message_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE conversations ADD COLUMN IF NOT EXISTS has_estimates BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Legacy rows have no token_count; use the same ~4 chars/token estimate
+-- token_utils falls back to without tiktoken.
+UPDATE conversation_messages
+SET token_count = 4 + GREATEST(1, length(content) / 4)
+WHERE token_count IS NULL;
+
+-- Backfill the running totals from what is already stored.
+UPDATE conversations c
+SET message_tokens          = sub.message_tokens,
+    input_tokens            = sub.input_tokens,
+    output_tokens           = sub.output_tokens,
+    context_tokens          = sub.context_tokens,
+    last_input_tokens       = COALESCE(sub.last_input_tokens, 0),
+    assistant_message_count = sub.assistant_message_count,
+    usage_message_count     = sub.usage_message_count,
+    has_estimates           = sub.has_estimates,
+    total_tokens            = sub.total_tokens
+FROM (
+    SELECT
+        conversation_id,
+        SUM(token_count) AS message_tokens,
+        COALESCE(SUM(COALESCE((usage->>'input_tokens')::numeric, 0)
+          + COALESCE((usage->>'tool_input_tokens')::numeric, 0)), 0) AS input_tokens,
+        COALESCE(SUM(COALESCE((usage->>'output_tokens')::numeric, 0)
+          + COALESCE((usage->>'tool_output_tokens')::numeric, 0)), 0) AS output_tokens,
+        COALESCE(SUM((usage->>'context_tokens')::numeric), 0) AS context_tokens,
+        COALESCE(SUM((usage->>'total_tokens')::numeric), 0) AS total_tokens,
+        (ARRAY_AGG(COALESCE((usage->>'input_tokens')::numeric, 0) ORDER BY seq DESC)
+            FILTER (WHERE usage IS NOT NULL))[1] AS last_input_tokens,
+        COUNT(*) FILTER (WHERE role = 'assistant') AS assistant_message_count,
+        COUNT(usage) AS usage_message_count,
+        COALESCE(BOOL_OR((usage->>'estimated')::boolean), FALSE) AS has_estimates
+    FROM (
+        -- Usage is only counted on assistant messages, as get_conversation_token_usage did.
+        SELECT
+            conversation_id, seq, role, token_count,
+            CASE WHEN role = 'assistant' AND jsonb_typeof(metadata->'usage') = 'object'
+                 THEN metadata->'usage' END AS usage
+        FROM conversation_messages
+    ) m
+    GROUP BY conversation_id
+) sub
+WHERE c.id = sub.conversation_id;
@@ -0,0 +1,49 @@
+-- Hourly execution rollups for the analytics endpoints.
+-- One row per (workflow, UTC hour the executions started in).  create_execution
+-- bumps `executions` and complete_execution adds the outcome and duration in the
+-- same statement that writes the executions row, so dashboard counts, success
+-- rates and average durations are sums over a few rollup rows instead of scans
+-- over the whole execution history.
+
+CREATE TABLE IF NOT EXISTS workflow_execution_rollups (
+    workflow_id TEXT NOT NULL,
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,  -- start of the UTC hour
+    executions INTEGER NOT NULL DEFAULT 0,     -- started in this hour, any status
+    successes INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    timed_executions INTEGER NOT NULL DEFAULT 0,  -- completions that reported a duration
+    total_duration_ms BIGINT NOT NULL DEFAULT 0,
+    max_duration_ms INTEGER,                    -- high-water mark; never lowered
+    last_started_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (workflow_id, bucket),
+    FOREIGN KEY (workflow_id) REFERENCES workflows(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_workflow_execution_rollups_bucket
+ON workflow_execution_rollups(bucket);
+
+-- Backfill from existing history.  Re-running recomputes the same values.
+INSERT INTO workflow_execution_rollups (
+    workflow_id, bucket, executions, successes, failures,
+    timed_executions, total_duration_ms, max_duration_ms, last_started_at
+)
+SELECT
+    workflow_id,
+    date_trunc('hour', started_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS bucket,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE status = 'success'),
+    COUNT(*) FILTER (WHERE status = 'failed'),
+    COUNT(duration_ms) FILTER (WHERE status <> 'running'),
+    COALESCE(SUM(duration_ms) FILTER (WHERE status <> 'running'), 0),
+    MAX(duration_ms) FILTER (WHERE status <> 'running'),
+    MAX(started_at)
+FROM executions
+GROUP BY 1, 2
+ON CONFLICT (workflow_id, bucket) DO UPDATE
+SET executions        = EXCLUDED.executions,
+    successes         = EXCLUDED.successes,
+    failures          = EXCLUDED.failures,
+    timed_executions  = EXCLUDED.timed_executions,
+    total_duration_ms = EXCLUDED.total_duration_ms,
+    max_duration_ms   = EXCLUDED.max_duration_ms,
+    last_started_at   = EXCLUDED.last_started_at;
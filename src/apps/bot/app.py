@@ -132,13 +132,20 @@ class BotApp:
             logger.info("Bot service cancelled")
 
     async def _auto_cleaner(self) -> None:
-        """Background task: close idle browser sessions every 5 minutes."""
+        """Background task: close idle browser sessions and log queue stats every 5 minutes."""
         while True:
             await asyncio.sleep(300)
             try:
                 BrowserTool.cleanup_idle(self.config.browser_idle_timeout)
             except Exception as e:
                 logger.warning(f"Auto-cleaner error: {e}")
+            if self._message_handler is not None:
+                m = self._message_handler.get_metrics()
+                logger.info(
+                    f"Message queue: depth={m['queue_depth']} peak={m['peak_queue_depth']} "
+                    f"queued={m['total_queued']} coalesced={m['total_coalesced']} "
+                    f"expired={m['total_expired']} rejected={m['total_rejected']}"
+                )
 
     async def _on_message(self, incoming: IncomingMessage) -> None:
         if self._message_handler is None:
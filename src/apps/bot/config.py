@@ -10,6 +10,9 @@ from lib.core.config import Config
 class BotConfig(Config):
     DEFAULT_BOT_PROVIDERS: ClassVar[list[str]] = ["telegram"]
     DEFAULT_CONCURRENT_LIMIT: ClassVar[int] = 10
+    DEFAULT_QUEUE_MAX_DEPTH: ClassVar[int] = 5
+    DEFAULT_QUEUE_TTL: ClassVar[float] = 300.0
+    DEFAULT_COALESCE_WINDOW: ClassVar[float] = 10.0
 
     bot_enabled: bool = field(default_factory=lambda: Config.from_env("KNIK_BOT_ENABLED", True, bool))
 
@@ -19,7 +22,22 @@ class BotConfig(Config):
         default_factory=lambda: Config.from_env("KNIK_BOT_CONCURRENT_LIMIT", BotConfig.DEFAULT_CONCURRENT_LIMIT, int)
     )
 
-    busy_message: str = "I'm still thinking about your previous message."
+    # Messages that arrive while a chat's reply is generating wait in a per-chat
+    # FIFO. Follow-ups from the same sender sent within the coalesce window of
+    # each other are answered together as one prompt.
+    bot_queue_max_depth: int = field(
+        default_factory=lambda: Config.from_env("KNIK_BOT_QUEUE_MAX_DEPTH", BotConfig.DEFAULT_QUEUE_MAX_DEPTH, int)
+    )
+    bot_queue_ttl: float = field(
+        default_factory=lambda: Config.from_env("KNIK_BOT_QUEUE_TTL", BotConfig.DEFAULT_QUEUE_TTL, float)
+    )
+    bot_coalesce_window: float = field(
+        default_factory=lambda: Config.from_env("KNIK_BOT_COALESCE_WINDOW", BotConfig.DEFAULT_COALESCE_WINDOW, float)
+    )
+
+    busy_message: str = "I'm still thinking about your previous message. I'll answer this one next."
+    queue_full_message: str = "I have too many messages waiting. Please resend this once I've replied."
+    queue_expired_message: str = "This message waited too long and was skipped. Please send it again."
     error_message: str = "Sorry, an error occurred while processing your message."
 
     @classmethod
@@ -1,8 +1,16 @@
-"""BotMessageHandler - Non-blocking message processor with per-chat task isolation."""
+"""BotMessageHandler - Non-blocking message processor with per-chat task isolation.
+
+Each chat has at most one active task.  Messages that arrive while it is busy
+wait in a bounded per-chat FIFO; when the reply finishes, the next run of
+queued follow-ups from the same sender is merged into one prompt.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import dataclasses
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
@@ -41,6 +49,13 @@ class ActiveTaskInfo:
     user_hint: str = ""
 
 
+@dataclass
+class QueuedMessage:
+    incoming: IncomingMessage
+    provider: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
 class BotMessageHandler:
     def __init__(
         self,
@@ -61,11 +76,16 @@ class BotMessageHandler:
         self._user_client_manager = user_client_manager
 
         self._active_tasks: dict[ChatKey, ActiveTaskInfo] = {}
+        self._queues: dict[ChatKey, deque[QueuedMessage]] = {}
         self._lock = asyncio.Lock()
 
         self._total_processed = 0
         self._total_errors = 0
         self._total_queued = 0
+        self._total_coalesced = 0
+        self._total_expired = 0
+        self._total_rejected = 0
+        self._peak_queue_depth = 0
 
     async def handle(self, incoming: IncomingMessage) -> None:
         provider = incoming.provider_name or "unknown"
@@ -125,15 +145,11 @@ class BotMessageHandler:
 
         async with self._lock:
             if chat_key in self._active_tasks:
-                self._total_queued += 1
-                asyncio.create_task(
-                    self._send_busy_hint(incoming, provider),
-                    name=f"busy-hint-{chat_key}",
-                )
+                self._enqueue(chat_key, incoming, provider)
                 return
 
             task = asyncio.create_task(
-                self._process_message(incoming, provider),
+                self._run_chat(chat_key, incoming, provider),
                 name=f"process-{chat_key}-{(incoming.message_id or 'unknown')[:8]}",
             )
 
@@ -147,6 +163,92 @@ class BotMessageHandler:
 
             printer.info(f"Started processing task for {chat_key} (message: {incoming.message_id})")
 
+    def _enqueue(self, chat_key: ChatKey, incoming: IncomingMessage, provider: str) -> None:
+        """Hold a message until the chat's current reply is done. Caller holds the lock."""
+        queue = self._queues.setdefault(chat_key, deque())
+        if len(queue) >= self._config.bot_queue_max_depth:
+            self._total_rejected += 1
+            printer.warning(f"Queue full for {chat_key} ({len(queue)} waiting), rejecting {incoming.message_id}")
+            asyncio.create_task(
+                self._send_notice(incoming, provider, self._config.queue_full_message),
+                name=f"queue-full-{chat_key}",
+            )
+            return
+
+        queue.append(QueuedMessage(incoming=incoming, provider=provider))
+        self._total_queued += 1
+        self._peak_queue_depth = max(self._peak_queue_depth, len(queue))
+        printer.info(f"Queued message {incoming.message_id} for {chat_key} (depth {len(queue)})")
+
+        # One hint per burst is enough; later follow-ups join the same queue.
+        if len(queue) == 1:
+            asyncio.create_task(
+                self._send_notice(incoming, provider, self._config.busy_message),
+                name=f"busy-hint-{chat_key}",
+            )
+
+    async def _run_chat(self, chat_key: ChatKey, incoming: IncomingMessage, provider: str) -> None:
+        """Process a message, then keep draining the chat's queue until it is empty."""
+        next_item: tuple[IncomingMessage, str] | None = (incoming, provider)
+        while next_item is not None:
+            await self._process_message(*next_item)
+            next_item = await self._next_from_queue(chat_key)
+
+    async def _next_from_queue(self, chat_key: ChatKey) -> tuple[IncomingMessage, str] | None:
+        """Pop the next prompt for *chat_key*, coalescing a same-sender burst.
+
+        Returns None (and releases the chat's active slot in the same critical
+        section, so nothing can be queued behind a finished task) when empty.
+        """
+        expired: list[QueuedMessage] = []
+        async with self._lock:
+            queue = self._queues.get(chat_key)
+            now = time.monotonic()
+            while queue and now - queue[0].enqueued_at > self._config.bot_queue_ttl:
+                expired.append(queue.popleft())
+
+            if not queue:
+                self._queues.pop(chat_key, None)
+                self._active_tasks.pop(chat_key, None)
+                batch = None
+            else:
+                batch = [queue.popleft()]
+                sender = batch[0].incoming.sender_id
+                while (
+                    queue
+                    and queue[0].incoming.sender_id == sender
+                    and queue[0].enqueued_at - batch[-1].enqueued_at <= self._config.bot_coalesce_window
+                ):
+                    batch.append(queue.popleft())
+                if not queue:
+                    self._queues.pop(chat_key, None)
+
+                info = self._active_tasks.get(chat_key)
+                if info is not None:
+                    info.message_id = batch[-1].incoming.message_id or ""
+                    info.user_hint = (batch[0].incoming.text or "")[:50]
+                    info.started_at = datetime.now(UTC)
+
+        for item in expired:
+            self._total_expired += 1
+            printer.warning(f"Queued message {item.incoming.message_id} for {chat_key} expired")
+            await self._send_notice(item.incoming, item.provider, self._config.queue_expired_message)
+
+        if batch is None:
+            return None
+        if len(batch) > 1:
+            self._total_coalesced += len(batch) - 1
+            printer.info(f"Coalesced {len(batch)} queued messages for {chat_key}")
+        return self._coalesce(batch), batch[-1].provider
+
+    @staticmethod
+    def _coalesce(batch: list[QueuedMessage]) -> IncomingMessage:
+        """Merge a burst into one message; replies thread to the latest one."""
+        if len(batch) == 1:
+            return batch[0].incoming
+        text = "\n\n".join(item.incoming.text for item in batch if item.incoming.text)
+        return dataclasses.replace(batch[-1].incoming, text=text)
+
     async def cancel_all(self, timeout: float = 5.0) -> None:
         async with self._lock:
             if not self._active_tasks:
@@ -172,6 +274,11 @@ class BotMessageHandler:
 
             self._active_tasks.clear()
 
+            dropped = sum(len(queue) for queue in self._queues.values())
+            if dropped:
+                printer.warning(f"Discarding {dropped} queued messages on shutdown")
+            self._queues.clear()
+
     def get_active_count(self) -> int:
         return len(self._active_tasks)
 
@@ -180,6 +287,12 @@ class BotMessageHandler:
             "total_processed": self._total_processed,
             "total_errors": self._total_errors,
             "total_queued": self._total_queued,
+            "total_coalesced": self._total_coalesced,
+            "total_expired": self._total_expired,
+            "total_rejected": self._total_rejected,
+            "queue_depth": sum(len(queue) for queue in self._queues.values()),
+            "peak_queue_depth": self._peak_queue_depth,
+            "queues": {str(chat_key): len(queue) for chat_key, queue in self._queues.items()},
             "active_count": len(self._active_tasks),
             "active_tasks": [
                 {
@@ -247,22 +360,26 @@ class BotMessageHandler:
         else:
             printer.info(f"Task for {chat_key} completed")
 
+        # A task that finished normally already released its slot while draining
+        # (and a new task may own it by now); cancelled ones are removed here.
         async def _remove():
             async with self._lock:
-                self._active_tasks.pop(chat_key, None)
+                info = self._active_tasks.get(chat_key)
+                if info is not None and info.task is task:
+                    self._active_tasks.pop(chat_key, None)
 
         asyncio.create_task(_remove(), name=f"cleanup-{chat_key}")
 
-    async def _send_busy_hint(self, incoming: IncomingMessage, provider: str) -> None:
+    async def _send_notice(self, incoming: IncomingMessage, provider: str, text: str) -> None:
         try:
             await self._messaging_client.send_message(
                 chat_id=incoming.chat_id,
-                text=self._config.busy_message,
+                text=text,
                 provider=provider,
                 reply_to_message_id=incoming.message_id,
             )
         except Exception as e:
-            printer.warning(f"Failed to send busy hint to {provider}:{incoming.chat_id}: {e}")
+            printer.warning(f"Failed to send notice to {provider}:{incoming.chat_id}: {e}")
 
     async def _send_error_message(
         self,
@@ -11,7 +11,8 @@ from lib.services.messaging_client.client import MessagingClient
 
 
 class UserClientManager:
-    """Each client gets its own MCPServerRegistry so tool state is fully isolated between users."""
+    """Each client gets its own MCPServerRegistry view over the shared tool catalog, so consent
+    approvals and session-scoped tools (e.g. the browser) stay isolated between users."""
 
     def __init__(
         self,
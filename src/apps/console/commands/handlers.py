@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import TYPE_CHECKING
 
 from lib.commands.models import CommandResult
+from lib.utils.async_utils import run_async
 
 
 if TYPE_CHECKING:
@@ -16,12 +16,12 @@ logger = logging.getLogger(__name__)
 
 
 def handle_new(command_service: CommandService, args: str, user_id: str) -> CommandResult:
-    return asyncio.run(command_service.new_session(user_id))
+    return run_async(command_service.new_session(user_id))
 
 
 def handle_resume(command_service: CommandService, args: str, user_id: str) -> CommandResult:
     if not args:
-        sessions = asyncio.run(command_service.list_sessions(limit=5))
+        sessions = run_async(command_service.list_sessions(limit=5))
         if not sessions:
             return CommandResult(success=True, message="No previous conversations found.")
         lines = ["Recent conversations:", ""]
@@ -35,7 +35,7 @@ def handle_resume(command_service: CommandService, args: str, user_id: str) -> C
         lines.append("Usage: /resume <id> or /resume #<number>")
         return CommandResult(success=True, message="\n".join(lines))
 
-    return asyncio.run(command_service.resume_session(user_id, args))
+    return run_async(command_service.resume_session(user_id, args))
 
 
 def handle_sessions(command_service: CommandService, args: str, user_id: str) -> CommandResult:
@@ -49,7 +49,7 @@ def handle_sessions(command_service: CommandService, args: str, user_id: str) ->
             return CommandResult(success=False, message="Usage: /sessions [page]\nExample: /sessions 2")
 
     offset = (page - 1) * page_size
-    sessions = asyncio.run(command_service.list_sessions(limit=page_size, offset=offset))
+    sessions = run_async(command_service.list_sessions(limit=page_size, offset=offset))
 
     if not sessions and page == 1:
         return CommandResult(success=True, message="No conversations found.")
@@ -74,15 +74,15 @@ def handle_sessions(command_service: CommandService, args: str, user_id: str) ->
 
 
 def handle_model(command_service: CommandService, args: str, user_id: str) -> CommandResult:
-    return asyncio.run(command_service.switch_model(args))
+    return run_async(command_service.switch_model(args))
 
 
 def handle_provider(command_service: CommandService, args: str, user_id: str) -> CommandResult:
-    return asyncio.run(command_service.switch_provider(args))
+    return run_async(command_service.switch_provider(args))
 
 
 def handle_status(command_service: CommandService, args: str, user_id: str) -> CommandResult:
-    status = asyncio.run(command_service.get_status(user_id))
+    status = run_async(command_service.get_status(user_id))
     conv_display = status.conversation_id if status.conversation_id else "None (new session)"
     message = f"Status:\n  Provider: {status.provider}\n  Model:    {status.model}\n  Session:  {conv_display}"
 
@@ -9,6 +9,7 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from lib.commands.models import CommandDefinition, CommandResult
+from lib.utils.async_utils import run_async
 
 
 if TYPE_CHECKING:
@@ -79,7 +80,7 @@ class ConsoleCommandDispatcher:
             )
             # handlers may return a coroutine if accidentally defined async
             if asyncio.iscoroutine(result):
-                result = asyncio.run(result)
+                result = run_async(result)
             return result
         except Exception as e:
             logger.error("Command handler error for /%s: %s", command_name, e)
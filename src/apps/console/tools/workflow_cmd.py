@@ -1,11 +1,11 @@
 """Workflow command handler"""
 
-import asyncio
 import json
 
 from imports import printer as logger
 from lib.cron import workflow_service
 from lib.services.scheduler.db_client import SchedulerDB
+from lib.utils.async_utils import run_async
 
 
 def workflow_command(app, args: str) -> str:
@@ -24,7 +24,7 @@ def workflow_command(app, args: str) -> str:
     action = parts[0].lower()
 
     if action == "list":
-        return asyncio.run(_list_workflows())
+        return run_async(_list_workflows())
 
     if action == "run":
         if len(parts) < 2:
@@ -38,7 +38,7 @@ def workflow_command(app, args: str) -> str:
         except json.JSONDecodeError:
             return "Error: Inputs must be valid JSON."
 
-        return asyncio.run(_run_workflow(app, workflow_id, inputs))
+        return run_async(_run_workflow(app, workflow_id, inputs))
 
     return f"Unknown workflow action: {action}. Use 'list' or 'run'."
 
@@ -7,6 +7,7 @@ import signal
 from imports import printer as logger
 from lib.core.config import Config
 from lib.cron.scheduler import Scheduler
+from lib.services.http_client import close_http_clients
 from lib.services.postgres.db import PostgresDB
 
 
@@ -42,7 +43,8 @@ class CronJobApp:
             logger.info("Cron service cancelled")
         finally:
             logger.info("Shutting down Cron Job Service...")
-            self.scheduler.stop()
+            await self.scheduler.stop()
+            await close_http_clients()
             await PostgresDB.close()
             logger.info("Shutdown complete.")
 
@@ -0,0 +1,114 @@
+"""Binary audio transport for the streaming chat endpoint.
+
+Instead of base64 WAV blobs inside SSE events, TTS audio can be sent as raw
+PCM16 over a separate chunked HTTP response.  The SSE stream announces the
+audio stream once (``audio_stream``) and then only references frames by
+sequence number (``audio_ref``), so the text path stays small and the audio
+path carries no base64/JSON overhead.
+
+Every frame is a fixed 20-byte little-endian header followed by the payload::
+
+    magic        2s   b"KA"
+    codec        u8   1 = PCM16LE mono
+    flags        u8   bit 0 = end of stream (empty payload)
+    seq          u32  frame number within the stream, starting at 0
+    sentence     u32  index of the sentence the frame belongs to
+    sample_rate  u32
+    length       u32  payload size in bytes
+"""
+
+import asyncio
+import struct
+import uuid
+from collections.abc import AsyncIterator
+
+import numpy as np
+
+
+FRAME_MAGIC = b"KA"
+FRAME_HEADER = struct.Struct("<2sBBIIII")
+CODEC_PCM16 = 1
+FLAG_END = 0x01
+
+# How long an announced stream waits for its reader before it is dropped.
+_UNCLAIMED_TTL = 30.0
+
+
+def encode_pcm16(audio: np.ndarray) -> bytes:
+    """Convert float audio in [-1, 1] to little-endian 16-bit PCM bytes."""
+    samples = np.clip(np.asarray(audio, dtype=np.float32).reshape(-1), -1.0, 1.0)
+    return (samples * 32767.0).astype("<i2").tobytes()
+
+
+def pack_frame(seq: int, sentence: int, sample_rate: int, payload: bytes = b"", flags: int = 0) -> bytes:
+    return FRAME_HEADER.pack(FRAME_MAGIC, CODEC_PCM16, flags, seq, sentence, sample_rate, len(payload)) + payload
+
+
+def unpack_header(data: bytes) -> tuple[int, int, int, int, int, int]:
+    """Parse a frame header into ``(codec, flags, seq, sentence, sample_rate, length)``."""
+    magic, codec, flags, seq, sentence, sample_rate, length = FRAME_HEADER.unpack_from(data)
+    if magic != FRAME_MAGIC:
+        raise ValueError(f"Bad audio frame magic: {magic!r}")
+    return codec, flags, seq, sentence, sample_rate, length
+
+
+class AudioFrameStream:
+    """Single-producer, single-reader queue of encoded frames for one response."""
+
+    def __init__(self, stream_id: str):
+        self.stream_id = stream_id
+        self.frame_count = 0
+        self.bytes_sent = 0
+        self._frames: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._closed = False
+
+    def push(self, sentence: int, audio: np.ndarray, sample_rate: int) -> dict:
+        """Queue one chunk of audio and return the reference sent over SSE."""
+        payload = encode_pcm16(audio)
+        seq = self.frame_count
+        self.frame_count += 1
+        self.bytes_sent += FRAME_HEADER.size + len(payload)
+        self._frames.put_nowait(pack_frame(seq, sentence, sample_rate, payload))
+        return {
+            "stream_id": self.stream_id,
+            "seq": seq,
+            "sentence": sentence,
+            "sample_rate": sample_rate,
+            "samples": len(payload) // 2,
+        }
+
+    def close(self) -> None:
+        """Queue the end-of-stream frame. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        self._frames.put_nowait(pack_frame(self.frame_count, 0, 0, flags=FLAG_END))
+        self._frames.put_nowait(None)
+
+    async def frames(self) -> AsyncIterator[bytes]:
+        while (frame := await self._frames.get()) is not None:
+            yield frame
+
+
+class AudioStreamRegistry:
+    """Announced audio streams waiting for (or being read by) their client.
+
+    A stream is claimed at most once; streams nobody claims within
+    ``ttl`` seconds are dropped so abandoned responses don't pin audio.
+    """
+
+    def __init__(self, ttl: float = _UNCLAIMED_TTL):
+        self.ttl = ttl
+        self._streams: dict[str, AudioFrameStream] = {}
+
+    def open(self) -> AudioFrameStream:
+        stream = AudioFrameStream(uuid.uuid4().hex)
+        self._streams[stream.stream_id] = stream
+        asyncio.get_running_loop().call_later(self.ttl, self._streams.pop, stream.stream_id, None)
+        return stream
+
+    def claim(self, stream_id: str) -> AudioFrameStream | None:
+        return self._streams.pop(stream_id, None)
+
+    def __len__(self) -> int:
+        return len(self._streams)
@@ -7,8 +7,9 @@ import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 
 src_path = Path(__file__).parent.parent.parent
@@ -24,7 +25,9 @@ from apps.web.backend.routes.cron import router as cron_router
 from apps.web.backend.routes.history import router as history_router
 from apps.web.backend.routes.workflow import router as workflow_router
 from imports import printer
+from lib.services.http_client import close_http_clients
 from lib.services.postgres.db import PostgresDB
+from lib.utils.metrics import metrics
 
 
 config = WebBackendConfig()
@@ -66,6 +69,7 @@ async def lifespan(app: FastAPI):
     printer.info(f"TTS Voice: {config.voice_name}")
     yield
     printer.info("Shutting down Knik backend...")
+    await close_http_clients()
     try:
         await PostgresDB.close()
         printer.info("PostgreSQL connection pool closed")
@@ -88,6 +92,14 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Expose in-process metrics in the Prometheus text format."""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (KNIK_METRICS_ENABLED=false)")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -16,6 +16,8 @@ from apps.web.backend.config import WebBackendConfig
 from imports import KokoroVoiceModel, printer
 from lib.core.config import Config
 from lib.services.ai_client.registry import ProviderRegistry
+from lib.services.tts import get_tts_cache
+from lib.utils.metrics import tracer
 
 
 router = APIRouter()
@@ -69,6 +71,22 @@ async def update_settings(settings: SettingsUpdate):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.get("/tts-cache")
+async def get_tts_cache_stats():
+    return get_tts_cache().stats()
+
+
+@router.get("/ai-client-cache")
+async def get_ai_client_cache_stats():
+    return state.conversation_clients.stats()
+
+
+@router.get("/traces")
+async def get_recent_spans(limit: int = 100, trace_id: str | None = None):
+    """Most recent finished spans (newest first); empty unless KNIK_TRACING_ENABLED is set."""
+    return {"enabled": tracer.enabled, "spans": tracer.recent(limit=limit, trace_id=trace_id)}
+
+
 @router.get("/providers")
 async def list_providers():
     provider_names = {
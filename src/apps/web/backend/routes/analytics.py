@@ -3,6 +3,7 @@ Analytics API endpoints
 Workflow metrics, top performing workflows, and activity feed
 """
 
+import asyncio
 from datetime import UTC, datetime
 
 from fastapi import APIRouter, HTTPException, Query
@@ -53,25 +54,28 @@ async def get_dashboard(
     - Metrics (aggregated counts)
     - Recent workflows (minimal fields only)
     - Recent executions (minimal fields only)
+
+    Counts come from the hourly execution rollups and the queries run
+    concurrently, so latency does not grow with execution history.
     """
     try:
         end_date = datetime.now(UTC)
         start_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        total_workflows = await SchedulerDB.get_total_workflows()
-        executions_today = await SchedulerDB.get_executions_count(start_date, end_date)
-        success_rate = await SchedulerDB.get_success_rate(start_date, end_date)
-
-        recent_workflows = await SchedulerDB.get_recent_workflows_summary(workflows_limit)
-        recent_executions = await SchedulerDB.get_recent_executions_summary(executions_limit)
+        total_workflows, stats, recent_workflows, recent_executions = await asyncio.gather(
+            SchedulerDB.get_total_workflows(),
+            SchedulerDB.get_execution_stats(start_date, end_date),
+            SchedulerDB.get_recent_workflows_summary(workflows_limit),
+            SchedulerDB.get_recent_executions_summary(executions_limit),
+        )
 
         return DashboardResponse(
             success=True,
             data={
                 "metrics": {
                     "totalWorkflows": total_workflows,
-                    "executionsToday": executions_today,
-                    "successRate": success_rate,
+                    "executionsToday": stats["executions"],
+                    "successRate": stats["success_rate"],
                 },
                 "recentWorkflows": recent_workflows,
                 "recentExecutions": recent_executions,
@@ -99,19 +103,19 @@ async def get_metrics(
 
         start_date, end_date = SchedulerDB.get_date_range(time_range)
 
-        total_workflows = await SchedulerDB.get_total_workflows()
-        executions_in_period = await SchedulerDB.get_executions_count(start_date, end_date)
-        success_rate = await SchedulerDB.get_success_rate(start_date, end_date)
-        avg_duration = await SchedulerDB.get_average_duration(start_date, end_date)
-        active_executions = await SchedulerDB.get_active_executions_count()
+        total_workflows, stats, active_executions = await asyncio.gather(
+            SchedulerDB.get_total_workflows(),
+            SchedulerDB.get_execution_stats(start_date, end_date),
+            SchedulerDB.get_active_executions_count(),
+        )
 
         metrics = {
             "totalWorkflows": total_workflows,
-            "executionsToday": executions_in_period,
-            "successRate": success_rate,
-            "avgDurationMs": avg_duration,
+            "executionsToday": stats["executions"],
+            "successRate": stats["success_rate"],
+            "avgDurationMs": stats["avg_duration_ms"],
             "activeExecutions": active_executions,
-            "totalExecutions": executions_in_period,
+            "totalExecutions": stats["executions"],
             "timeRange": time_range,
         }
 
@@ -2,6 +2,11 @@
 
 Text is streamed immediately.  TTS runs in a background task and is
 fully decoupled — a TTS failure never blocks or kills the text stream.
+
+Audio is delivered either inline as base64 WAV ``audio`` events (the
+default) or, with ``audio_transport="binary"``, as raw PCM16 frames on
+``GET /audio/{stream_id}`` that the SSE stream references by sequence
+number (see ``audio_frames``).
 """
 
 import asyncio
@@ -12,10 +17,11 @@ import json
 import sys
 from collections.abc import AsyncGenerator
 from pathlib import Path
+from typing import Literal
 
 import numpy as np
 import soundfile as sf
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
@@ -24,9 +30,9 @@ src_path = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(src_path))
 
 from apps.web.backend import state
+from apps.web.backend.audio_frames import AudioFrameStream
 from apps.web.backend.config import WebBackendConfig
 from imports import printer
-from lib.services.conversation import ConversationDB
 from lib.services.tts.utils import is_speakable
 
 
@@ -43,6 +49,7 @@ _TTS_QUEUE_MAX = 10
 class StreamChatRequest(BaseModel):
     message: str
     conversation_id: str | None = None
+    audio_transport: Literal["sse", "binary"] = "sse"
 
 
 def _encode_audio(audio_data: np.ndarray, sample_rate: int) -> str:
@@ -51,31 +58,56 @@ def _encode_audio(audio_data: np.ndarray, sample_rate: int) -> str:
     return base64.b64encode(buf.getvalue()).decode()
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 async def _tts_worker(
     sentence_queue: asyncio.Queue,
     audio_queue: asyncio.Queue,
+    audio_stream: AudioFrameStream | None = None,
 ) -> None:
+    """Synthesize queued sentences and put ready-to-send SSE audio events on
+    *audio_queue*.  With an *audio_stream* the PCM goes out as binary frames
+    and only an ``audio_ref`` event is queued per chunk."""
+    sentence_index = 0
     while True:
         sentence = await sentence_queue.get()
         if sentence is _TTS_DONE:
+            if audio_stream is not None:
+                audio_stream.close()
             await audio_queue.put(_TTS_DONE)
             break
 
         try:
             printer.info(f"[TTS worker] Generating audio for: '{sentence[:50]}...'")
-            audio_data, sr = await asyncio.to_thread(state.tts_processor.generate, sentence)
-            audio_b64 = _encode_audio(audio_data, sr)
-            await audio_queue.put({"audio": audio_b64, "sample_rate": sr})
-            printer.success("[TTS worker] Audio chunk ready")
+            sr = state.tts_processor.sample_rate
+            # Advance the synthesis generator one pipeline chunk at a time off
+            # the event loop, so a long sentence starts playing after its
+            # first chunk rather than after the whole sentence is rendered.
+            chunks = state.tts_processor.generate_stream(sentence)
+            while (audio_data := await asyncio.to_thread(next, chunks, None)) is not None:
+                if audio_stream is not None:
+                    event = _sse("audio_ref", audio_stream.push(sentence_index, audio_data, sr))
+                else:
+                    event = _sse("audio", {"audio": _encode_audio(audio_data, sr), "sample_rate": sr})
+                await audio_queue.put(event)
+                printer.success("[TTS worker] Audio chunk ready")
         except Exception as e:
             # Log and skip — do NOT propagate.  Text stream is unaffected.
             printer.error(f"[TTS worker] TTS failed for sentence, skipping: {e}")
+        sentence_index += 1
 
 
-async def stream_chat_response(prompt: str, conversation_id: str | None = None) -> AsyncGenerator[str, None]:
+async def stream_chat_response(
+    prompt: str,
+    conversation_id: str | None = None,
+    audio_transport: str = "sse",
+) -> AsyncGenerator[str, None]:
     sentence_queue: asyncio.Queue = asyncio.Queue(maxsize=_TTS_QUEUE_MAX)
     audio_queue: asyncio.Queue = asyncio.Queue()
     tts_task: asyncio.Task | None = None
+    audio_stream: AudioFrameStream | None = None
 
     async def _drain_audio() -> AsyncGenerator[str, None]:
         while True:
@@ -86,23 +118,32 @@ async def stream_chat_response(prompt: str, conversation_id: str | None = None)
             if item is _TTS_DONE:
                 await audio_queue.put(_TTS_DONE)
                 break
-            yield f"event: audio\ndata: {json.dumps(item)}\n\n"
+            yield item
 
     try:
         await state.init(config)
 
         ai_client = await state.get_or_create_ai_client(conversation_id)
 
-        tts_task = asyncio.create_task(_tts_worker(sentence_queue, audio_queue))
+        if audio_transport == "binary":
+            audio_stream = state.audio_streams.open()
+            yield _sse(
+                "audio_stream",
+                {
+                    "stream_id": audio_stream.stream_id,
+                    "url": f"/api/chat/stream/audio/{audio_stream.stream_id}",
+                    "format": "pcm16",
+                    "sample_rate": state.tts_processor.sample_rate,
+                },
+            )
+
+        tts_task = asyncio.create_task(_tts_worker(sentence_queue, audio_queue, audio_stream))
 
         text_buffer = ""
         full_response = ""
         sentence_endings = [".", "!", "?", "\n"]
         audio_count = 0
         active_conversation_id = conversation_id
-        pre_compaction_state, _ = (
-            await ConversationDB.get_compaction_state(conversation_id) if conversation_id else (None, 0)
-        )
 
         async for chunk in ai_client.achat_stream(
             prompt=prompt,
@@ -113,6 +154,10 @@ async def stream_chat_response(prompt: str, conversation_id: str | None = None)
                 conv_id = chunk["__conversation_id__"]
                 active_conversation_id = conv_id
                 yield f"event: conversation_id\ndata: {json.dumps({'conversation_id': conv_id})}\n\n"
+                # Background compaction lands between turns; report the pointer this turn started from.
+                summary_message_id = chunk.get("summary_message_id")
+                if summary_message_id:
+                    yield f"event: compaction\ndata: {json.dumps({'summary_message_id': summary_message_id})}\n\n"
                 continue
 
             if isinstance(chunk, dict) and chunk.get("__done__"):
@@ -144,7 +189,7 @@ async def stream_chat_response(prompt: str, conversation_id: str | None = None)
                         break
                     audio_count += 1
                     printer.success(f"Sent audio chunk {audio_count}")
-                    yield f"event: audio\ndata: {json.dumps(item)}\n\n"
+                    yield item
 
                 if usage:
                     printer.info(
@@ -154,11 +199,8 @@ async def stream_chat_response(prompt: str, conversation_id: str | None = None)
                     )
                     yield f"event: usage\ndata: {json.dumps({'usage': usage})}\n\n"
 
-                if active_conversation_id:
-                    post_compaction_state, _ = await ConversationDB.get_compaction_state(active_conversation_id)
-                    if post_compaction_state and post_compaction_state != pre_compaction_state:
-                        yield f"event: compaction\ndata: {json.dumps({'summary_message_id': post_compaction_state})}\n\n"
-
+                if audio_stream is not None:
+                    printer.info(f"Binary audio: {audio_stream.bytes_sent} bytes in {audio_stream.frame_count} frames")
                 printer.info(f"Stream complete: sent {audio_count} audio chunks")
                 yield f"event: done\ndata: {json.dumps({'audio_count': audio_count})}\n\n"
                 continue
@@ -208,12 +250,18 @@ async def stream_chat_response(prompt: str, conversation_id: str | None = None)
             tts_task.cancel()
             with contextlib.suppress(asyncio.CancelledError, Exception):
                 await tts_task
+        if audio_stream is not None:
+            audio_stream.close()
 
 
 @router.post("/")
 async def stream_chat(request: StreamChatRequest):
     return StreamingResponse(
-        stream_chat_response(request.message, conversation_id=request.conversation_id),
+        stream_chat_response(
+            request.message,
+            conversation_id=request.conversation_id,
+            audio_transport=request.audio_transport,
+        ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -221,3 +269,20 @@ async def stream_chat(request: StreamChatRequest):
             "X-Accel-Buffering": "no",
         },
     )
+
+
+@router.get("/audio/{stream_id}")
+async def stream_chat_audio(stream_id: str):
+    """Binary PCM16 frames for a chat stream opened with ``audio_transport="binary"``."""
+    audio_stream = state.audio_streams.claim(stream_id)
+    if audio_stream is None:
+        raise HTTPException(status_code=404, detail="Audio stream not found or already consumed")
+
+    return StreamingResponse(
+        audio_stream.frames(),
+        media_type="application/octet-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -9,6 +9,7 @@ from __future__ import annotations
 import asyncio
 from dataclasses import dataclass
 
+from apps.web.backend.audio_frames import AudioStreamRegistry
 from imports import AIClient, KokoroVoiceModel, printer
 from lib.mcp.index import register_all_tools
 from lib.services.ai_client.client_cache import AIClientCache
@@ -26,8 +27,20 @@ class _FactoryConfig:
     api_key: str | None = None
 
 
-conversation_clients: AIClientCache = AIClientCache()
+def _release_client(conversation_id: str, client: AIClient) -> None:
+    """Eviction hook: free the per-conversation tool resources (e.g. browser sessions).
+
+    May block on an in-flight tool call; the cache runs it on a worker thread
+    when eviction happens inside a request.
+    """
+    registry = client._mcp_registry
+    if registry is not None:
+        registry.cleanup_tools()
+
+
+conversation_clients: AIClientCache = AIClientCache.from_config(on_evict=_release_client)
 tts_processor: KokoroVoiceModel | None = None
+audio_streams: AudioStreamRegistry = AudioStreamRegistry()
 
 _factory_config: _FactoryConfig | None = None
 _init_lock: asyncio.Lock | None = None
@@ -82,24 +95,21 @@ async def init(cfg_source) -> None:
 async def get_or_create_ai_client(conversation_id: str | None) -> AIClient:
     """A None conversation_id still gets a fresh client (the achat lifecycle
     will create a real conversation_id and the caller should cache-update
-    using set_client() once the id is known.
+    using set_client() once the id is known.  Concurrent first requests for
+    one conversation share a single build.
     """
-    if conversation_id is not None:
-        cached = conversation_clients.get(conversation_id)
-        if cached is not None:
-            return cached
-
     cfg = _factory_config
     if cfg is None:
         raise RuntimeError("state.init() must be called before get_or_create_ai_client()")
 
-    _registry, client = await asyncio.to_thread(_build_client, cfg)
-    printer.success(f"AIClient ready: {cfg.provider}/{cfg.model}")
-
-    if conversation_id is not None:
-        conversation_clients.set(conversation_id, client)
+    async def build() -> AIClient:
+        _registry, client = await asyncio.to_thread(_build_client, cfg)
+        printer.success(f"AIClient ready: {cfg.provider}/{cfg.model}")
+        return client
 
-    return client
+    if conversation_id is None:
+        return await build()
+    return await conversation_clients.get_or_create(conversation_id, build)
 
 
 def set_client(conversation_id: str, client: AIClient) -> None:
@@ -113,8 +123,9 @@ def update_factory_config(
     api_base: str | None = None,
     api_key: str | None = None,
 ) -> None:
-    """Clears the entire client cache so subsequent requests get fresh clients
-    built with the new config.  Existing in-flight requests are unaffected.
+    """Swaps in an empty client cache so subsequent requests get fresh clients
+    built with the new config.  Existing in-flight requests are unaffected
+    (the old clients are not cleaned up under them).
     """
     global _factory_config, conversation_clients
 
@@ -130,7 +141,7 @@ def update_factory_config(
         api_base=api_base if api_base is not None else _factory_config.api_base,
         api_key=api_key if api_key is not None else _factory_config.api_key,
     )
-    conversation_clients = AIClientCache()
+    conversation_clients = AIClientCache.from_config(on_evict=_release_client)
 
 
 def get_factory_provider() -> str | None:
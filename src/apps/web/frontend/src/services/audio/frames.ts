@@ -0,0 +1,100 @@
+/**
+ * Reader for the binary audio stream served at `/api/chat/stream/audio/{id}`.
+ *
+ * Each frame is a 20-byte little-endian header followed by PCM16 mono samples:
+ * magic "KA" (2), codec (u8), flags (u8, bit 0 = end), seq (u32),
+ * sentence (u32), sample rate (u32), payload length (u32).
+ */
+
+const HEADER_SIZE = 20
+const MAGIC_0 = 0x4b // 'K'
+const MAGIC_1 = 0x41 // 'A'
+const FLAG_END = 0x01
+
+export interface AudioFrame {
+  seq: number
+  sentence: number
+  sampleRate: number
+  pcm: Uint8Array
+}
+
+/** Wraps raw PCM16 mono samples in a WAV container playable by HTMLAudioElement. */
+export function pcm16ToWav(pcm: Uint8Array, sampleRate: number): Blob {
+  const header = new ArrayBuffer(44)
+  const view = new DataView(header)
+  const writeTag = (offset: number, tag: string) => {
+    for (let i = 0; i < 4; i++) view.setUint8(offset + i, tag.charCodeAt(i))
+  }
+
+  writeTag(0, 'RIFF')
+  view.setUint32(4, 36 + pcm.byteLength, true)
+  writeTag(8, 'WAVE')
+  writeTag(12, 'fmt ')
+  view.setUint32(16, 16, true)
+  view.setUint16(20, 1, true) // PCM
+  view.setUint16(22, 1, true) // mono
+  view.setUint32(24, sampleRate, true)
+  view.setUint32(28, sampleRate * 2, true)
+  view.setUint16(32, 2, true)
+  view.setUint16(34, 16, true)
+  writeTag(36, 'data')
+  view.setUint32(40, pcm.byteLength, true)
+
+  return new Blob([header, pcm], { type: 'audio/wav' })
+}
+
+/**
+ * Fetches a binary audio stream and calls `onFrame` for every complete frame,
+ * in order, until the end frame arrives or the stream closes.
+ */
+export async function readAudioFrameStream(
+  url: string,
+  onFrame: (frame: AudioFrame) => void,
+  signal?: AbortSignal
+): Promise<void> {
+  const response = await fetch(url, { signal })
+  if (!response.ok) {
+    throw new Error(`Audio stream error! status: ${response.status}`)
+  }
+
+  const reader = response.body?.getReader()
+  if (!reader) {
+    throw new Error('No audio stream body')
+  }
+
+  let buffer = new Uint8Array(0)
+
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) return
+
+    const merged = new Uint8Array(buffer.byteLength + value.byteLength)
+    merged.set(buffer)
+    merged.set(value, buffer.byteLength)
+    buffer = merged
+
+    let offset = 0
+    while (buffer.byteLength - offset >= HEADER_SIZE) {
+      const view = new DataView(buffer.buffer, buffer.byteOffset + offset, HEADER_SIZE)
+      if (view.getUint8(0) !== MAGIC_0 || view.getUint8(1) !== MAGIC_1) {
+        throw new Error('Malformed audio frame')
+      }
+      const length = view.getUint32(16, true)
+      if (buffer.byteLength - offset < HEADER_SIZE + length) break
+
+      if (view.getUint8(3) & FLAG_END) {
+        await reader.cancel()
+        return
+      }
+
+      onFrame({
+        seq: view.getUint32(4, true),
+        sentence: view.getUint32(8, true),
+        sampleRate: view.getUint32(12, true),
+        pcm: buffer.slice(offset + HEADER_SIZE, offset + HEADER_SIZE + length),
+      })
+      offset += HEADER_SIZE + length
+    }
+    buffer = buffer.slice(offset)
+  }
+}
@@ -6,4 +6,5 @@ setMediaSessionUpdater(updateMediaSession)
 
 export * from './playback'
 export * from './queue'
+export * from './frames'
 export * from './mediaSession'
@@ -23,9 +23,9 @@ export function notifyStateChange(isPaused: boolean, isPlaying: boolean): void {
   if (stateCallback) stateCallback(isPaused, isPlaying)
 }
 
-/** Decodes a base64 audio chunk and plays it, resolving when playback ends. */
+/** Plays a base64 WAV string or audio Blob, resolving when playback ends. */
 export function playAudio(
-  base64Audio: string,
+  audioData: string | Blob,
   _sampleRate: number = 24000,
   getQueueSize: () => number = () => 0
 ): Promise<void> {
@@ -38,14 +38,7 @@ export function playAudio(
 
       currentResolve = resolve
 
-      const binaryString = atob(base64Audio)
-
-      const bytes = new Uint8Array(binaryString.length)
-      for (let i = 0; i < binaryString.length; i++) {
-        bytes[i] = binaryString.charCodeAt(i)
-      }
-
-      const blob = new Blob([bytes], { type: 'audio/wav' })
+      const blob = typeof audioData === 'string' ? base64ToBlob(audioData) : audioData
       const audioUrl = URL.createObjectURL(blob)
       const audio = new Audio(audioUrl)
       currentAudio = audio
@@ -89,6 +82,17 @@ export function playAudio(
   })
 }
 
+function base64ToBlob(base64Audio: string): Blob {
+  const binaryString = atob(base64Audio)
+
+  const bytes = new Uint8Array(binaryString.length)
+  for (let i = 0; i < binaryString.length; i++) {
+    bytes[i] = binaryString.charCodeAt(i)
+  }
+
+  return new Blob([bytes], { type: 'audio/wav' })
+}
+
 /** Stops the currently playing audio and resets state. */
 export function stopAudio(): void {
   if (currentAudio) {
@@ -1,6 +1,6 @@
 import { playAudio } from './playback'
 
-let audioQueue: Array<{ audio: string; sampleRate: number }> = []
+let audioQueue: Array<{ audio: string | Blob; sampleRate: number }> = []
 let isPlayingQueue = false
 
 async function playQueue(): Promise<void> {
@@ -22,9 +22,9 @@ async function playQueue(): Promise<void> {
   isPlayingQueue = false
 }
 
-/** Enqueues a base64 audio chunk for sequential playback. */
-export function queueAudio(base64Audio: string, sampleRate: number = 24000): void {
-  audioQueue.push({ audio: base64Audio, sampleRate })
+/** Enqueues a base64 WAV chunk or audio Blob for sequential playback. */
+export function queueAudio(audio: string | Blob, sampleRate: number = 24000): void {
+  audioQueue.push({ audio, sampleRate })
 
   if (!isPlayingQueue) {
     playQueue().catch(err => console.error('[Audio Queue] Error starting playback:', err))
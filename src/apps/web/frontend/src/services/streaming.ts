@@ -1,6 +1,9 @@
+import { readAudioFrameStream, type AudioFrame } from './audio/frames'
+
 interface StreamCallbacks {
   onText?: (chunk: string) => void
   onAudio?: (audioBase64: string) => void
+  onAudioFrame?: (frame: AudioFrame) => void
   onComplete?: (audioChunkCount: number) => void
   onError?: (error: string) => void
   onConversationId?: (conversationId: string) => void
@@ -9,6 +12,11 @@ interface StreamCallbacks {
 
 interface StreamOptions {
   conversationId?: string
+  /**
+   * 'sse' (default) sends base64 WAV inside `audio` events; 'binary' sends raw
+   * PCM16 frames on a separate response, delivered through `onAudioFrame`.
+   */
+  audioTransport?: 'sse' | 'binary'
 }
 
 /**
@@ -17,7 +25,7 @@ interface StreamOptions {
  *
  * @param message - User message to send
  * @param callbacks - Event handlers for text, audio, completion, and errors
- * @param options - Optional stream config (e.g. conversationId for persistence)
+ * @param options - Optional stream config (conversationId for persistence, audioTransport)
  * @returns AbortController (can be aborted to cancel stream)
  *
  * @example
@@ -42,12 +50,16 @@ export async function streamChat(
   const url = `${apiUrl}/api/chat/stream`
 
   const abortController = new AbortController()
+  let audioStream: Promise<void> | null = null
 
   try {
     const body: Record<string, unknown> = { message }
     if (options?.conversationId) {
       body.conversation_id = options.conversationId
     }
+    if (options?.audioTransport) {
+      body.audio_transport = options.audioTransport
+    }
 
     const response = await fetch(url, {
       method: 'POST',
@@ -109,6 +121,12 @@ export async function streamChat(
               callbacks.onText(parsed.text)
             } else if (currentEvent === 'audio' && callbacks.onAudio && parsed.audio) {
               callbacks.onAudio(parsed.audio)
+            } else if (currentEvent === 'audio_stream' && callbacks.onAudioFrame && parsed.url) {
+              audioStream = readAudioFrameStream(
+                `${apiUrl}${parsed.url}`,
+                callbacks.onAudioFrame,
+                abortController.signal
+              )
             } else if (currentEvent === 'done' && callbacks.onComplete) {
               callbacks.onComplete(parsed.audio_count || 0)
             } else if (currentEvent === 'error' && callbacks.onError) {
@@ -122,6 +140,8 @@ export async function streamChat(
         }
       }
     }
+
+    if (audioStream) await audioStream
   } catch (error: unknown) {
     if (error instanceof Error && error.name !== 'AbortError' && callbacks.onError) {
       callbacks.onError(error.message || 'Stream error')
@@ -2,6 +2,7 @@ import type { StateCreator } from 'zustand'
 import {
   streamChat,
   queueAudio,
+  pcm16ToWav,
   clearAudioQueue,
   ConversationAPI,
   ApiClient,
@@ -137,6 +138,9 @@ export const createChatSlice: StateCreator<
           onAudio: (audioBase64: string) => {
             queueAudio(audioBase64, 24000)
           },
+          onAudioFrame: frame => {
+            queueAudio(pcm16ToWav(frame.pcm, frame.sampleRate), frame.sampleRate)
+          },
           onComplete: (_count: number) => {
             set({ loading: false })
             get().success('Response received!')
@@ -148,7 +152,7 @@ export const createChatSlice: StateCreator<
             setAudioPlaying(false)
           },
         },
-        { conversationId: conversationId ?? undefined }
+        { conversationId: conversationId ?? undefined, audioTransport: 'binary' }
       )
 
       setStreamController(controller)
@@ -1,35 +1,71 @@
 """
 Central imports file for the Knik application.
 Import everything you need from here to avoid complex import paths.
+
+Names are loaded on first access, so an entry point only pays for what it
+actually uses (``from imports import printer`` does not load TTS or the AI
+providers).
 """
 
-from lib import (
-    AIClient,
-    AudioConfig,
-    AudioProcessor,
-    BaseProcessor,
-    CommandProcessor,
-    Config,
-    ConsoleProcessor,
-    KokoroVoiceModel,
-    LogLevel,
-    MockAIClient,
-    Printer,
-    PrinterConfig,
-    TTSAsyncProcessor,
-    VoiceModel,
-    create_processor,
-    printer,
-)
-from lib.commands import CommandService
-from lib.cron import schedule_service, workflow_service
-from lib.mcp import (
-    get_all_tools,
-    get_tool_info,
-    register_all_tools,
-)
+from typing import TYPE_CHECKING
+
+from lib.utils.lazy import lazy_exports
+
+
+if TYPE_CHECKING:
+    from lib import (
+        AIClient,
+        AudioConfig,
+        AudioProcessor,
+        BaseProcessor,
+        CommandProcessor,
+        Config,
+        ConsoleProcessor,
+        KokoroVoiceModel,
+        LogLevel,
+        MockAIClient,
+        Printer,
+        PrinterConfig,
+        TTSAsyncProcessor,
+        VoiceModel,
+        create_processor,
+        printer,
+    )
+    from lib.commands import CommandService
+    from lib.cron import schedule_service, workflow_service
+    from lib.mcp import (
+        get_all_tools,
+        get_tool_info,
+        register_all_tools,
+    )
 
 
+# Public name -> module that defines it.
+_LAZY_ATTRS = {
+    "AIClient": "lib.services.ai_client",
+    "MockAIClient": "lib.services.ai_client",
+    "CommandService": "lib.commands",
+    "ConsoleProcessor": "lib.utils",
+    "CommandProcessor": "lib.utils",
+    "BaseProcessor": "lib.utils",
+    "create_processor": "lib.utils",
+    "Printer": "lib.utils",
+    "PrinterConfig": "lib.utils",
+    "LogLevel": "lib.utils",
+    "printer": "lib.utils",
+    "Config": "lib.core",
+    "AudioConfig": "lib.core",
+    "TTSAsyncProcessor": "lib.services.tts",
+    "VoiceModel": "lib.services.tts",
+    "KokoroVoiceModel": "lib.services.tts",
+    "AudioProcessor": "lib.services.tts",
+    "register_all_tools": "lib.mcp",
+    "get_all_tools": "lib.mcp",
+    "get_tool_info": "lib.mcp",
+    "workflow_service": "lib.cron",
+    "schedule_service": "lib.cron",
+}
+
 __all__ = [
     "AIClient",
     "CommandService",
@@ -54,3 +90,6 @@ __all__ = [
     "workflow_service",
     "schedule_service",
 ]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
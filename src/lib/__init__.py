@@ -1,24 +1,54 @@
 """
 Knik Audio Library
 A modular library for text-to-speech, audio processing, and AI interactions.
-4:"""
 
-from lib.commands import CommandService
+Attributes are resolved lazily (PEP 562): ``from lib import printer`` only
+imports the printer, not the TTS stack or every AI provider.
+"""
+
+from typing import TYPE_CHECKING
+
+from .utils.lazy import lazy_exports
+
 
-from .core import AudioConfig, Config
-from .services import AIClient, MockAIClient
-from .services.tts import AudioProcessor, KokoroVoiceModel, TTSAsyncProcessor, VoiceModel
-from .utils import (
-    BaseProcessor,
-    CommandProcessor,
-    ConsoleProcessor,
-    LogLevel,
-    Printer,
-    PrinterConfig,
-    create_processor,
-    printer,
-)
+if TYPE_CHECKING:
+    from lib.commands import CommandService
 
+    from .core import AudioConfig, Config
+    from .services import AIClient, MockAIClient
+    from .services.tts import AudioProcessor, KokoroVoiceModel, TTSAsyncProcessor, VoiceModel
+    from .utils import (
+        BaseProcessor,
+        CommandProcessor,
+        ConsoleProcessor,
+        LogLevel,
+        Printer,
+        PrinterConfig,
+        create_processor,
+        printer,
+    )
+
+
+# Public name -> module that defines it.
+_LAZY_ATTRS = {
+    "AIClient": "lib.services.ai_client",
+    "MockAIClient": "lib.services.ai_client",
+    "CommandService": "lib.commands",
+    "Config": "lib.core",
+    "AudioConfig": "lib.core",
+    "VoiceModel": "lib.services.tts",
+    "KokoroVoiceModel": "lib.services.tts",
+    "AudioProcessor": "lib.services.tts",
+    "TTSAsyncProcessor": "lib.services.tts",
+    "ConsoleProcessor": "lib.utils",
+    "CommandProcessor": "lib.utils",
+    "BaseProcessor": "lib.utils",
+    "create_processor": "lib.utils",
+    "Printer": "lib.utils",
+    "PrinterConfig": "lib.utils",
+    "LogLevel": "lib.utils",
+    "printer": "lib.utils",
+}
 
 __all__ = [
     "AIClient",
@@ -39,3 +69,6 @@ __all__ = [
     "LogLevel",
     "printer",
 ]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
@@ -86,7 +86,7 @@ class CommandService:
                     title=conv.title,
                     created_at=conv.created_at,
                     updated_at=conv.updated_at,
-                    message_count=len(conv.messages),
+                    message_count=conv.message_count,
                 )
             )
         return sessions
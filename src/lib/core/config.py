@@ -78,8 +78,10 @@ Be reliable, efficient, and action focused like Jarvis."""
     }
 
     DEFAULT_MODEL_DISCOVERY_TIMEOUT: ClassVar[int] = 5  # seconds
+    DEFAULT_MODEL_CACHE_TTL: ClassVar[int] = 3600  # seconds
 
-    DEFAULT_COMPACTION_THRESHOLD: ClassVar[float] = 0.95  # trigger at 95% of context window
+    DEFAULT_COMPACTION_WATERMARK: ClassVar[float] = 0.80  # start background compaction at 80% of context window
+    DEFAULT_COMPACTION_THRESHOLD: ClassVar[float] = 0.95  # past 95%, the next turn waits for the running compaction
     DEFAULT_COMPACTION_ENABLED: ClassVar[bool] = True
     DEFAULT_COMPACTION_CIRCUIT_BREAKER: ClassVar[int] = 3  # stop after N consecutive failures
     DEFAULT_COMPACTION_PROMPT_BUFFER: ClassVar[int] = 1024  # tokens reserved for summary output
@@ -145,11 +147,29 @@ Be reliable, efficient, and action focused like Jarvis."""
 
     custom_api_base: str | None = field(default_factory=lambda: Config.from_env("KNIK_CUSTOM_API_BASE", None))
     custom_api_key: str | None = field(default_factory=lambda: Config.from_env("KNIK_CUSTOM_API_KEY", None))
+    mock_word_delay: float = field(default_factory=lambda: Config.from_env("KNIK_MOCK_WORD_DELAY", 0.05, float))
 
     voice_language: str = field(default_factory=lambda: Config.get_language())
     voice_name: str = field(default_factory=lambda: Config.get_voice())
     sample_rate: int = field(default=24000)
     enable_voice_output: bool = field(default_factory=lambda: Config.from_env("KNIK_VOICE_OUTPUT", True, bool))
+    tts_cache_max_bytes: int = field(
+        default_factory=lambda: Config.from_env("KNIK_TTS_CACHE_MAX_BYTES", 64 * 1024 * 1024, int)
+    )
+    tts_cache_dir: str | None = field(default_factory=lambda: Config.from_env("KNIK_TTS_CACHE_DIR", None))
+    tts_cache_disk_max_bytes: int = field(
+        default_factory=lambda: Config.from_env("KNIK_TTS_CACHE_DISK_MAX_BYTES", 512 * 1024 * 1024, int)
+    )
+
+    ai_client_cache_max_size: int = field(
+        default_factory=lambda: Config.from_env("KNIK_AI_CLIENT_CACHE_MAX_SIZE", 200, int)
+    )
+    ai_client_cache_idle_ttl: float = field(
+        default_factory=lambda: Config.from_env("KNIK_AI_CLIENT_CACHE_IDLE_TTL", 1800.0, float)
+    )
+    ai_client_cache_max_bytes: int = field(
+        default_factory=lambda: Config.from_env("KNIK_AI_CLIENT_CACHE_MAX_BYTES", 256 * 1024 * 1024, int)
+    )
 
     db_host: str = field(default_factory=lambda: Config.from_env("KNIK_DB_HOST", "localhost"))
     db_port: int = field(default_factory=lambda: Config.from_env("KNIK_DB_PORT", 5432, int))
@@ -164,6 +184,19 @@ Be reliable, efficient, and action focused like Jarvis."""
     scheduler_max_concurrent: int = field(
         default_factory=lambda: Config.from_env("KNIK_SCHEDULER_MAX_CONCURRENT", 10, int)
     )
+    workflow_log_flush_interval: float = field(
+        default_factory=lambda: Config.from_env("KNIK_WORKFLOW_LOG_FLUSH_INTERVAL", 1.0, float)
+    )
+    workflow_log_batch_size: int = field(
+        default_factory=lambda: Config.from_env("KNIK_WORKFLOW_LOG_BATCH_SIZE", 50, int)
+    )
+
+    http_max_connections: int = field(default_factory=lambda: Config.from_env("KNIK_HTTP_MAX_CONNECTIONS", 100, int))
+    http_max_keepalive: int = field(default_factory=lambda: Config.from_env("KNIK_HTTP_MAX_KEEPALIVE", 20, int))
+    http_max_per_host: int = field(default_factory=lambda: Config.from_env("KNIK_HTTP_MAX_PER_HOST", 10, int))
+    http_retries: int = field(default_factory=lambda: Config.from_env("KNIK_HTTP_RETRIES", 2, int))
+    http_retry_backoff: float = field(default_factory=lambda: Config.from_env("KNIK_HTTP_RETRY_BACKOFF", 0.5, float))
+    http_cache_entries: int = field(default_factory=lambda: Config.from_env("KNIK_HTTP_CACHE_ENTRIES", 128, int))
 
     browser_headless: bool = field(default_factory=lambda: Config.from_env("KNIK_BROWSER_HEADLESS", False, bool))
     browser_profile_dir: str = field(
@@ -173,6 +206,14 @@ Be reliable, efficient, and action focused like Jarvis."""
         )
     )
     browser_idle_timeout: int = field(default_factory=lambda: Config.from_env("KNIK_BROWSER_IDLE_TIMEOUT", 1800, int))
+    browser_max_sessions: int = field(default_factory=lambda: Config.from_env("KNIK_BROWSER_MAX_SESSIONS", 4, int))
+    browser_acquire_timeout: float = field(
+        default_factory=lambda: Config.from_env("KNIK_BROWSER_ACQUIRE_TIMEOUT", 120.0, float)
+    )
+    metrics_enabled: bool = field(default_factory=lambda: Config.from_env("KNIK_METRICS_ENABLED", True, bool))
+    tracing_enabled: bool = field(default_factory=lambda: Config.from_env("KNIK_TRACING_ENABLED", False, bool))
+    tracing_buffer_size: int = field(default_factory=lambda: Config.from_env("KNIK_TRACING_BUFFER_SIZE", 1000, int))
+
     telegram_bot_token: str | None = field(default_factory=lambda: Config.from_env("KNIK_TELEGRAM_BOT_TOKEN", None))
 
     model_discovery_timeout: int = field(
@@ -180,6 +221,9 @@ Be reliable, efficient, and action focused like Jarvis."""
             "KNIK_MODEL_DISCOVERY_TIMEOUT", Config.DEFAULT_MODEL_DISCOVERY_TIMEOUT, int
         )
     )
+    model_cache_ttl: int = field(
+        default_factory=lambda: Config.from_env("KNIK_MODEL_CACHE_TTL", Config.DEFAULT_MODEL_CACHE_TTL, int)
+    )
 
     # Conversation history context size (number of turn-pairs sent to LLM)
     history_context_size: int = field(default_factory=lambda: Config.from_env("KNIK_HISTORY_CONTEXT_SIZE", 5, int))
@@ -187,6 +231,9 @@ Be reliable, efficient, and action focused like Jarvis."""
     compaction_enabled: bool = field(
         default_factory=lambda: Config.from_env("KNIK_COMPACTION_ENABLED", Config.DEFAULT_COMPACTION_ENABLED, bool)
     )
+    compaction_watermark: float = field(
+        default_factory=lambda: Config.from_env("KNIK_COMPACTION_WATERMARK", Config.DEFAULT_COMPACTION_WATERMARK, float)
+    )
     compaction_threshold: float = field(
         default_factory=lambda: Config.from_env("KNIK_COMPACTION_THRESHOLD", Config.DEFAULT_COMPACTION_THRESHOLD, float)
     )
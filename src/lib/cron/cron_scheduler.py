@@ -1,46 +1,84 @@
 """Background CRON scheduler for periodic schedule polling."""
 
 import asyncio
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 
 from imports import printer as logger
 from lib.core.config import Config
 from lib.cron.engine import WorkflowEngine
+from lib.cron.models import Schedule
 from lib.services.scheduler.db_client import SchedulerDB
 
 
 class CronScheduler:
-    """Background service that polls the DB for Schedules and triggers Workflows."""
+    """Background service that polls the DB for Schedules and triggers Workflows.
+
+    Due schedules are claimed in the database (``FOR UPDATE SKIP LOCKED``), so
+    several scheduler processes can share one schedules table without
+    double-firing.  Claimed schedules are handed to ``scheduler_workers``
+    worker tasks; at most ``scheduler_max_concurrent`` schedules are claimed
+    but unfinished at any time, and anything beyond that stays in the table
+    for the next tick (or another instance) to pick up.
+    """
 
     def __init__(self):
         """Initialize scheduler with engine and config."""
         self._running = False
         self._task: asyncio.Task | None = None
+        self._workers: list[asyncio.Task] = []
+        self._queue: asyncio.Queue[Schedule] = asyncio.Queue()
+        self._in_flight = 0
         self.config = Config()
-        self.engine = WorkflowEngine()
+        self.engine = WorkflowEngine(
+            log_flush_interval=self.config.workflow_log_flush_interval,
+            log_batch_size=self.config.workflow_log_batch_size,
+        )
 
         self._last_run_map: dict[int, datetime] = {}
         self._poll_count = 0
 
     def start(self):
-        """Start the background polling loop."""
+        """Start the background polling loop and its workers."""
         if self._running:
             return
         logger.info("Starting CronScheduler background loop...")
         self._running = True
+        self._workers = [
+            asyncio.create_task(self._worker_loop(i)) for i in range(max(1, self.config.scheduler_workers))
+        ]
         self._task = asyncio.create_task(self._poll_loop())
 
-    def stop(self):
-        """Stop the background polling loop."""
+    async def stop(self):
+        """Stop the background polling loop and its workers.
+
+        Schedules still waiting in the queue were claimed (their ``next_run_at``
+        already advanced) but never started, so their claims are released and
+        they fire on the next poll instead of skipping a cron tick.
+        """
         if not self._running:
             return
         logger.info("Stopping CronScheduler background loop...")
         self._running = False
-        if self._task:
-            self._task.cancel()
+        tasks = [*self._workers, *([self._task] if self._task else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._workers = []
+
+        unstarted: list[Schedule] = []
+        while not self._queue.empty():
+            unstarted.append(self._queue.get_nowait())
+            self._queue.task_done()
+        self._in_flight = 0
+        if unstarted:
+            try:
+                await SchedulerDB.release_schedule_claims(unstarted, datetime.now(UTC))
+            except Exception as e:
+                logger.error(f"CronScheduler failed to release {len(unstarted)} queued schedule(s): {e}")
 
     async def _poll_loop(self):
-        """Main polling loop that periodically checks for due schedules."""
+        """Main polling loop that periodically claims due schedules."""
         interval = self.config.scheduler_check_interval
         # Log heartbeat every ~1 minute (or at least every interval)
         heartbeat_frequency = max(1, 60 // interval)
@@ -48,11 +86,10 @@ class CronScheduler:
         while self._running:
             self._poll_count += 1
             try:
-                schedules = await SchedulerDB.list_schedules()
                 if self._poll_count % heartbeat_frequency == 0:
-                    logger.info(f"CronScheduler heartbeat: {len(schedules)} active schedules polling...")
+                    logger.info(f"CronScheduler heartbeat: {self._in_flight} schedule(s) in flight")
 
-                await self._check_schedules(schedules)
+                await self._check_schedules()
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -60,35 +97,38 @@ class CronScheduler:
 
             await asyncio.sleep(interval)
 
-    async def _check_schedules(self, schedules: list | None = None):
-        """Check and trigger schedules that are due."""
-        now = datetime.now(UTC)
+    async def _check_schedules(self) -> int:
+        """Claim schedules that are due and queue them for the workers.
 
-        if schedules is None:
-            schedules = await SchedulerDB.list_schedules()
+        Only as many rows as there are free slots are claimed, so a busy
+        instance leaves due work for its peers.  Returns the number claimed.
+        """
+        slots = max(1, self.config.scheduler_max_concurrent) - self._in_flight
+        if slots <= 0:
+            return 0
 
+        schedules = await SchedulerDB.claim_due_schedules(datetime.now(UTC), slots)
         for schedule in schedules:
+            logger.info(
+                f"Schedule ID {schedule.id} triggered. "
+                f"Executing Target Workflow ID {schedule.target_workflow_id} "
+                f"(next run: {schedule.next_run_at or 'none'})"
+            )
+            self._in_flight += 1
+            self._queue.put_nowait(schedule)
+        return len(schedules)
+
+    async def _worker_loop(self, worker_id: int):
+        """Run queued schedules one at a time until cancelled."""
+        while True:
+            schedule = await self._queue.get()
             try:
-                if not schedule.enabled or not schedule.next_run_at:
-                    continue
-
-                if schedule.next_run_at <= now:
-                    logger.info(
-                        f"Schedule ID {schedule.id} triggered at {schedule.next_run_at}. "
-                        f"Executing Target Workflow ID {schedule.target_workflow_id}"
-                    )
-
-                    asyncio.create_task(self._trigger_workflow(schedule.target_workflow_id))
-
-                    if schedule.recurrence_seconds:
-                        next_run = now + timedelta(seconds=schedule.recurrence_seconds)
-                        await SchedulerDB.update_schedule_next_run(schedule.id, next_run)
-                        logger.info(f"Schedule ID {schedule.id} next run: {next_run}")
-
-                    await SchedulerDB.record_schedule_execution(schedule.id)
-
+                await self._trigger_workflow(schedule.target_workflow_id)
             except Exception as e:
-                logger.error(f"Error processing schedule {schedule.id}: {e}")
+                logger.error(f"CronScheduler worker {worker_id} error on schedule {schedule.id}: {e}")
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
 
     async def _trigger_workflow(self, workflow_id: str):
         """Background trigger wrapper to prevent failing the loop on unhandled DAG faults."""
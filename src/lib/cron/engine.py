@@ -1,12 +1,14 @@
-"""Workflow execution engine with DAG-based parallel processing."""
+"""Workflow execution engine with event-driven DAG scheduling."""
 
 import asyncio
 import copy
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+from datetime import UTC, datetime
 from typing import Any
 
 from imports import printer as logger
+from lib.cron.execution_log import DEFAULT_BATCH_SIZE, DEFAULT_FLUSH_INTERVAL, ExecutionLogWriter
 from lib.cron.models import Workflow
 from lib.cron.nodes import (
     AIExecutionNode,
@@ -17,15 +19,49 @@ from lib.cron.nodes import (
 )
 from lib.cron.validation import VALID_NODE_TYPES, validate_workflow_definition
 from lib.services.scheduler.db_client import SchedulerDB
+from lib.utils.metrics import metrics, span
 
 
-class WorkflowEngine:
-    """Executes a parsed Workflow definition resolving its nodes topologically."""
+_WORKFLOW_SECONDS = metrics.histogram("knik_workflow_duration_seconds", "Workflow execution time", ("status",))
+_NODE_SECONDS = metrics.histogram(
+    "knik_workflow_node_duration_seconds", "Workflow node execution time", ("node_type", "status")
+)
 
-    async def execute_workflow(self, workflow: Workflow, inputs: dict[str, Any] | None = None) -> dict[str, Any]:
+
+class WorkflowEngine:
+    """Executes a parsed Workflow definition resolving its nodes topologically.
+
+    Node outcomes go through an :class:`ExecutionLogWriter`, so they are
+    written in batches off the critical path instead of one INSERT per node.
+    """
+
+    def __init__(self, log_flush_interval: float = DEFAULT_FLUSH_INTERVAL, log_batch_size: int = DEFAULT_BATCH_SIZE):
+        self.log_flush_interval = log_flush_interval
+        self.log_batch_size = log_batch_size
+
+    async def execute_workflow(
+        self,
+        workflow: Workflow,
+        inputs: dict[str, Any] | None = None,
+        max_parallel: int | None = None,
+    ) -> dict[str, Any]:
         """
-        Execute a Workflow's Definition DAG. Resolves node dependencies and executes iteratively.
+        Execute a Workflow's Definition DAG.
+
+        Nodes are started as soon as every predecessor has completed (or been
+        pruned), so a fast branch never waits on an unrelated slow node.
+        ``max_parallel`` (or the definition's ``max_parallel`` key) caps how
+        many nodes run at once; unset means unbounded.
         """
+        with span("workflow", workflow_id=workflow.id):
+            return await self._execute_workflow(workflow, inputs, max_parallel)
+
+    async def _execute_workflow(
+        self,
+        workflow: Workflow,
+        inputs: dict[str, Any] | None,
+        max_parallel: int | None,
+    ) -> dict[str, Any]:
         logger.info(f"Starting execution for Workflow: {workflow.id}")
         inputs = inputs or {}
 
@@ -34,6 +70,8 @@ class WorkflowEngine:
             raise RuntimeError("Failed to create execution record in the database")
 
         workflow_start = time.perf_counter()
+        execution_log = ExecutionLogWriter(execution_id, self.log_flush_interval, self.log_batch_size)
+        execution_log.start()
 
         try:
             validation_result = validate_workflow_definition(workflow.definition)
@@ -41,6 +79,7 @@ class WorkflowEngine:
                 raise ValueError(f"Invalid workflow definition: {validation_result['message']}")
 
             nodes, adj_list, reverse_adj, in_degree = self._parse_dag(workflow.definition)
+            limit = max_parallel or workflow.definition.get("max_parallel") or 0
 
             node_outputs: dict[str, dict[str, Any]] = {}
             context: dict[str, Any] = {"input": inputs}
@@ -49,154 +88,194 @@ class WorkflowEngine:
             # downstream nodes (e.g. FlowMergeNode) can still become ready.
             pruned_edges: set[tuple[str, str]] = set()
 
-            ready = [node_id for node_id in nodes if in_degree[node_id] == 0]
-
-            # Level-based parallel execution: at each iteration, run all
-            # currently-ready (in-degree == 0) nodes concurrently via
-            # asyncio.gather(), then propagate outputs and enqueue the
-            # next wave of unblocked nodes.
-            while ready:
-                logger.info(f"Executing {len(ready)} node(s) in parallel: {ready}")
+            ready: deque[str] = deque(node_id for node_id in nodes if in_degree[node_id] == 0)
+            running: dict[asyncio.Task, str] = {}
+            errors: list[tuple[str, BaseException]] = []
 
-                level_inputs: dict[str, dict[str, Any]] = {}
-                for curr_id in ready:
-                    predecessor_ids = reverse_adj.get(curr_id, [])
-                    level_inputs[curr_id] = copy.deepcopy(
+            def _launch_ready() -> None:
+                # After a failure nothing new starts; in-flight nodes are
+                # allowed to finish so every outcome is logged to the DB.
+                while ready and not errors and (not limit or len(running) < limit):
+                    nid = ready.popleft()
+                    n_inputs = copy.deepcopy(
                         {
                             "input": context.get("input"),
-                            **{nid: context[nid] for nid in predecessor_ids if nid in context},
+                            **{pid: context[pid] for pid in reverse_adj.get(nid, []) if pid in context},
                         }
                     )
-
-                async def _execute_single(
-                    nid: str,
-                    _level_inputs: dict[str, dict[str, Any]] = level_inputs,
-                ) -> tuple[str, dict[str, Any]]:
-                    """Execute one node and return (node_id, output). Logs to DB."""
-                    node = nodes[nid]
-                    n_inputs = _level_inputs[nid]
-                    node_start = time.perf_counter()
-                    try:
-                        logger.debug(f"[{nid}] Executing node")
-                        output = await node.execute(n_inputs)
-                        node_duration_ms = int((time.perf_counter() - node_start) * 1000)
-
-                        await SchedulerDB.log_node_execution(
-                            execution_id=execution_id,
-                            node_id=nid,
-                            node_type=node.__class__.__name__,
-                            status="success",
-                            inputs=n_inputs,
-                            outputs=output,
-                            duration_ms=node_duration_ms,
-                        )
-                        return nid, output
-
-                    except asyncio.CancelledError:
-                        # Never log cancellation as a node failure — re-raise cleanly.
-                        raise
-
-                    except Exception as e:
-                        node_duration_ms = int((time.perf_counter() - node_start) * 1000)
-                        logger.error(f"[{nid}] Node execution failed: {e}")
+                    task = asyncio.create_task(self._execute_node(execution_log, nid, nodes[nid], n_inputs))
+                    running[task] = nid
+                    logger.info(f"[{nid}] Started ({len(running)} node(s) running)")
+
+            try:
+                _launch_ready()
+                while running:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        nid = running.pop(task)
                         try:
-                            await SchedulerDB.log_node_execution(
-                                execution_id=execution_id,
-                                node_id=nid,
-                                node_type=node.__class__.__name__,
-                                status="failed",
-                                inputs=n_inputs,
-                                error_message=str(e),
-                                duration_ms=node_duration_ms,
+                            output = task.result()
+                        except Exception as e:
+                            errors.append((nid, e))
+                            continue
+
+                        node_outputs[nid] = output
+                        context[nid] = output
+                        ready.extend(
+                            self._release_successors(
+                                workflow.definition,
+                                nid,
+                                nodes,
+                                output,
+                                adj_list,
+                                reverse_adj,
+                                in_degree,
+                                pruned_edges,
+                                context,
                             )
-                        except Exception:
-                            logger.error(f"[{nid}] Failed to log node failure to DB")
-                        raise
-
-                # Use return_exceptions=True so all nodes complete and get
-                # logged, even if some fail.  We inspect results afterward.
-                raw_results = await asyncio.gather(
-                    *[_execute_single(nid) for nid in ready],
-                    return_exceptions=True,
-                )
-
-                results: list[tuple[str, dict[str, Any]]] = []
-                errors: list[tuple[str, BaseException]] = []
-                for nid, res in zip(ready, raw_results, strict=False):
-                    if isinstance(res, BaseException):
-                        errors.append((nid, res))
-                    else:
-                        results.append(res)
-
-                # If any node raised, abort the workflow after collecting all
-                # results so every node's outcome is logged to the DB.
-                if errors:
-                    failed_ids = [nid for nid, _ in errors]
-                    first_err = errors[0][1]
-                    raise RuntimeError(f"Node(s) failed: {', '.join(failed_ids)}") from first_err
-
-                next_ready: list[str] = []
-                for nid, output in results:
-                    node = nodes[nid]
-                    node_outputs[nid] = output
-                    context[nid] = output
-
-                    for next_id in adj_list[nid]:
-                        if isinstance(node, ConditionalBranchNode):
-                            edge_con = self._get_edge_condition(workflow.definition, nid, next_id)
-                            res_str = "true" if output.get("result") else "false"
-                            if edge_con and edge_con != res_str:
-                                # This edge is not taken.  Decrement in-degree
-                                # anyway so downstream merge nodes can still
-                                # fire, and propagate the prune transitively.
-                                pruned_edges.add((nid, next_id))
-                                in_degree[next_id] -= 1
-                                if in_degree[next_id] == 0:
-                                    # The node became ready but ALL its live
-                                    # predecessors were pruned — propagate the
-                                    # prune instead of executing it.
-                                    if self._all_predecessors_pruned(next_id, reverse_adj, pruned_edges, context):
-                                        self._propagate_prune(
-                                            next_id,
-                                            nodes,
-                                            adj_list,
-                                            in_degree,
-                                            pruned_edges,
-                                            next_ready,
-                                            reverse_adj,
-                                            context,
-                                        )
-                                    else:
-                                        next_ready.append(next_id)
-                                continue
-
-                        in_degree[next_id] -= 1
-                        if in_degree[next_id] == 0:
-                            next_ready.append(next_id)
-
-                ready = next_ready
+                        )
+                    _launch_ready()
+                    # Wave boundary: write this batch of outcomes in the background.
+                    execution_log.flush_soon()
+            except BaseException:
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                raise
+            finally:
+                # Node rows land before the execution is marked finished, whatever the outcome.
+                await asyncio.shield(execution_log.aclose())
+
+            if errors:
+                failed_ids = [nid for nid, _ in errors]
+                first_err = errors[0][1]
+                raise RuntimeError(f"Node(s) failed: {', '.join(failed_ids)}") from first_err
 
             unvisited = [nid for nid, deg in in_degree.items() if deg > 0]
             if unvisited:
                 logger.warning(f"Nodes never became ready (possibly behind not-taken branches): {unvisited}")
 
+            duration = time.perf_counter() - workflow_start
+            _WORKFLOW_SECONDS.observe(duration, status="success")
             await SchedulerDB.complete_execution(
                 execution_id,
                 status="success",
                 outputs=node_outputs,
-                duration_ms=int((time.perf_counter() - workflow_start) * 1000),
+                duration_ms=int(duration * 1000),
             )
             return node_outputs
 
         except Exception as e:
+            await execution_log.aclose()
+            duration = time.perf_counter() - workflow_start
+            _WORKFLOW_SECONDS.observe(duration, status="failed")
             await SchedulerDB.complete_execution(
                 execution_id,
                 status="failed",
                 error_message=str(e),
-                duration_ms=int((time.perf_counter() - workflow_start) * 1000),
+                duration_ms=int(duration * 1000),
             )
             raise
 
+    @staticmethod
+    async def _execute_node(
+        execution_log: ExecutionLogWriter,
+        nid: str,
+        node: BaseNode,
+        n_inputs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Execute one node, record its outcome, and return its output."""
+        node_type = node.__class__.__name__
+        with span("workflow.node", node_id=nid, node_type=node_type):
+            started_at = datetime.now(UTC)
+            node_start = time.perf_counter()
+            try:
+                logger.debug(f"[{nid}] Executing node")
+                output = await node.execute(n_inputs)
+                duration = time.perf_counter() - node_start
+                _NODE_SECONDS.observe(duration, node_type=node_type, status="success")
+                execution_log.record(
+                    node_id=nid,
+                    node_type=node_type,
+                    status="success",
+                    inputs=n_inputs,
+                    outputs=output,
+                    started_at=started_at,
+                    duration_ms=int(duration * 1000),
+                )
+                return output
+
+            except asyncio.CancelledError:
+                # Never log cancellation as a node failure — re-raise cleanly.
+                raise
+
+            except Exception as e:
+                logger.error(f"[{nid}] Node execution failed: {e}")
+                duration = time.perf_counter() - node_start
+                _NODE_SECONDS.observe(duration, node_type=node_type, status="failed")
+                execution_log.record(
+                    node_id=nid,
+                    node_type=node_type,
+                    status="failed",
+                    inputs=n_inputs,
+                    error_message=str(e),
+                    started_at=started_at,
+                    duration_ms=int(duration * 1000),
+                )
+                raise
+
+    def _release_successors(
+        self,
+        definition: dict[str, Any],
+        nid: str,
+        nodes: dict[str, BaseNode],
+        output: dict[str, Any],
+        adj_list: dict[str, list[str]],
+        reverse_adj: dict[str, list[str]],
+        in_degree: dict[str, int],
+        pruned_edges: set[tuple[str, str]],
+        context: dict[str, Any],
+    ) -> list[str]:
+        """Decrement in-degrees after *nid* completes and return the successors
+        that became ready, pruning the not-taken side of conditional branches."""
+        next_ready: list[str] = []
+        is_branch = isinstance(nodes[nid], ConditionalBranchNode)
+        res_str = "true" if output.get("result") else "false"
+
+        for next_id in adj_list[nid]:
+            if is_branch:
+                edge_con = self._get_edge_condition(definition, nid, next_id)
+                if edge_con and edge_con != res_str:
+                    # This edge is not taken.  Decrement in-degree
+                    # anyway so downstream merge nodes can still
+                    # fire, and propagate the prune transitively.
+                    pruned_edges.add((nid, next_id))
+                    in_degree[next_id] -= 1
+                    if in_degree[next_id] == 0:
+                        # The node became ready but ALL its live
+                        # predecessors were pruned — propagate the
+                        # prune instead of executing it.
+                        if self._all_predecessors_pruned(next_id, reverse_adj, pruned_edges, context):
+                            self._propagate_prune(
+                                next_id,
+                                nodes,
+                                adj_list,
+                                in_degree,
+                                pruned_edges,
+                                next_ready,
+                                reverse_adj,
+                                context,
+                            )
+                        else:
+                            next_ready.append(next_id)
+                    continue
+
+            in_degree[next_id] -= 1
+            if in_degree[next_id] == 0:
+                next_ready.append(next_id)
+
+        return next_ready
+
     @staticmethod
     def _all_predecessors_pruned(
         node_id: str,
@@ -0,0 +1,140 @@
+"""Buffered writer for per-node execution records."""
+
+import asyncio
+import contextlib
+from datetime import UTC, datetime
+from typing import Any
+
+from imports import printer as logger
+from lib.services.scheduler.db_client import SchedulerDB
+
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_BATCH_SIZE = 50
+
+
+class ExecutionLogWriter:
+    """
+    Collects node execution records for one workflow run and writes them in batches.
+
+    ``record()`` never touches the database, so node completion is not held up
+    by an INSERT.  Buffered records are written with a single ``executemany``
+    when the engine calls ``flush_soon()`` (after each wave of completed
+    nodes), when ``batch_size`` records are waiting, every ``flush_interval``
+    seconds, and on ``aclose()``, which the engine awaits on success, failure
+    and cancellation alike.
+
+    Args:
+        execution_id: The ``executions`` row these records belong to.
+        flush_interval: Seconds between timer flushes (0 disables the timer).
+        batch_size: Buffer length that triggers an early flush.
+    """
+
+    def __init__(
+        self,
+        execution_id: int,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.execution_id = execution_id
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.flush_count = 0
+        self.written = 0
+        self._buffer: list[dict[str, Any]] = []
+        self._write_lock = asyncio.Lock()
+        self._pending: set[asyncio.Task] = set()
+        self._timer: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self._closed = False
+
+    async def __aenter__(self) -> "ExecutionLogWriter":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # Shielded so a cancelled workflow still gets its records written.
+        await asyncio.shield(self.aclose())
+
+    def start(self) -> None:
+        if self.flush_interval > 0 and self._timer is None:
+            self._timer = asyncio.create_task(self._flush_periodically(), name=f"exec-log-{self.execution_id}")
+
+    def record(
+        self,
+        node_id: str,
+        node_type: str,
+        status: str,
+        inputs: dict[str, Any],
+        outputs: dict[str, Any] | None = None,
+        error_message: str | None = None,
+        started_at: datetime | None = None,
+        duration_ms: int | None = None,
+    ) -> None:
+        """Buffer one node's outcome; flushes in the background once the batch is full."""
+        self._buffer.append(
+            {
+                "execution_id": self.execution_id,
+                "node_id": node_id,
+                "node_type": node_type,
+                "status": status,
+                "inputs": inputs,
+                "outputs": outputs,
+                "error_message": error_message,
+                "started_at": started_at,
+                "completed_at": datetime.now(UTC),
+                "duration_ms": duration_ms,
+            }
+        )
+        if len(self._buffer) >= self.batch_size:
+            self.flush_soon()
+
+    def flush_soon(self) -> None:
+        """Write whatever is buffered without making the caller wait."""
+        if not self._buffer or self._closed:
+            return
+        task = asyncio.create_task(self.flush())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def flush(self) -> None:
+        """Write all buffered records. A failed batch is kept for the next attempt."""
+        async with self._write_lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            try:
+                await SchedulerDB.log_node_executions(batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} node execution record(s) for {self.execution_id}: {e}")
+                self._buffer[:0] = batch
+                return
+            except BaseException:
+                # Cancelled mid-write: keep the batch so the final flush still sees it.
+                self._buffer[:0] = batch
+                raise
+            self.flush_count += 1
+            self.written += len(batch)
+
+    async def aclose(self) -> None:
+        """Stop the timer, wait for in-flight writes, and flush what remains."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._timer is not None:
+            # Signalled rather than cancelled, so a periodic write in progress completes.
+            self._stop.set()
+            await self._timer
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.flush()
+        if self._buffer:
+            logger.error(f"Dropped {len(self._buffer)} node execution record(s) for execution {self.execution_id}")
+            self._buffer.clear()
+
+    async def _flush_periodically(self) -> None:
+        while not self._stop.is_set():
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), timeout=self.flush_interval)
+            if not self._stop.is_set():
+                await self.flush()
@@ -7,7 +7,8 @@ All functions are async and return dict results.
 Functions that overlap with MCP tools (shell, text, time, encoding) are
 imported from the service layer (lib.services.shell, lib.services.text, etc.)
 to avoid duplication. HTTP and data processing functions remain here as they
-are scheduler-specific.
+are scheduler-specific; HTTP calls go through the shared pooled client in
+lib.services.http_client so scheduled workflows reuse connections.
 """
 
 import asyncio
@@ -16,31 +17,8 @@ import logging
 import time
 from typing import Any
 
-
-try:
-    import httpx
-
-    HTTP_LIB_AVAILABLE = True
-except ImportError:
-    try:
-        import aiohttp
-
-        HTTP_LIB_AVAILABLE = True
-        httpx = None
-    except ImportError:
-        try:
-            import requests
-
-            HTTP_LIB_AVAILABLE = True
-            httpx = None
-            aiohttp = None
-        except ImportError:
-            HTTP_LIB_AVAILABLE = False
-            httpx = None
-            aiohttp = None
-            requests = None
-
 from lib.services.encoding import base64_decode, base64_encode
+from lib.services.http_client import HTTPX_AVAILABLE, get_http_client
 from lib.services.shell import run_shell_command
 from lib.services.text import (
     string_concat,
@@ -58,15 +36,22 @@ from lib.services.time import current_timestamp
 
 logger = logging.getLogger(__name__)
 
+_HTTP_METHODS = ("GET", "POST", "PUT", "DELETE")
+
 
 async def http_get(
     url: str,
     headers: dict[str, str] = None,
     timeout: int = 30,
     method: str = None,  # Ignored parameter for backward compatibility
+    use_cache: bool = True,
 ) -> dict[str, Any]:
     """Make HTTP GET request with configurable timeout.
 
+    Responses carrying ETag/Last-Modified are cached and revalidated on the
+    next call; a 304 is returned as the cached 200 with ``from_cache`` set.
+    Pass ``use_cache=False`` to always fetch a fresh body.
+
     Note: The 'method' parameter is accepted but ignored for backward compatibility.
     Use http_request() if you need to specify a different HTTP method.
     """
@@ -75,24 +60,25 @@ async def http_get(
             f"http_get called with method='{method}' - parameter ignored. Use http_request() for non-GET methods."
         )
 
-    if not HTTP_LIB_AVAILABLE:
-        return {"error": "No HTTP library available (httpx/aiohttp/requests not installed)"}
+    if not HTTPX_AVAILABLE:
+        return {"error": "No HTTP library available (httpx not installed)"}
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            req_start = time.perf_counter()
-            response = await client.get(url, headers=headers or {})
-            duration_ms = int((time.perf_counter() - req_start) * 1000)
-            response.raise_for_status()
-            result = {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "duration_ms": duration_ms,
-                "content": response.text if response.text else None,
-            }
-            if response.headers.get("content-type", "").startswith("application/json"):
-                result["data"] = response.json()
-            return result
+        req_start = time.perf_counter()
+        response = await get_http_client().request("GET", url, headers=headers, timeout=timeout, use_cache=use_cache)
+        duration_ms = int((time.perf_counter() - req_start) * 1000)
+        response.raise_for_status()
+        result = {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "duration_ms": duration_ms,
+            "content": response.text if response.text else None,
+        }
+        if response.extensions.get("from_cache"):
+            result["from_cache"] = True
+        if response.headers.get("content-type", "").startswith("application/json"):
+            result["data"] = response.json()
+        return result
     except Exception as e:
         return {"error": f"HTTP GET failed: {str(e)}"}
 
@@ -104,26 +90,23 @@ async def http_post(
     timeout: int = 30,
 ) -> dict[str, Any]:
     """Make HTTP POST request with JSON body and configurable timeout."""
-    if not HTTP_LIB_AVAILABLE:
+    if not HTTPX_AVAILABLE:
         return {"error": "No HTTP library available"}
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            req_start = time.perf_counter()
-            response = await client.post(url, json=data, headers=headers or {})
-            duration_ms = int((time.perf_counter() - req_start) * 1000)
-            response.raise_for_status()
-            result = {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "duration_ms": duration_ms,
-            }
-            if response.text:
-                result["content"] = response.text
-                result["data"] = (
-                    response.json() if "application/json" in response.headers.get("content-type", "") else None
-                )
-            return result
+        req_start = time.perf_counter()
+        response = await get_http_client().request("POST", url, json=data, headers=headers, timeout=timeout)
+        duration_ms = int((time.perf_counter() - req_start) * 1000)
+        response.raise_for_status()
+        result = {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "duration_ms": duration_ms,
+        }
+        if response.text:
+            result["content"] = response.text
+            result["data"] = response.json() if "application/json" in response.headers.get("content-type", "") else None
+        return result
     except Exception as e:
         return {"error": f"HTTP POST failed: {str(e)}"}
 
@@ -136,37 +119,33 @@ async def http_request(
     timeout: int = 30,
 ) -> dict[str, Any]:
     """Generic HTTP request supporting GET, POST, PUT, DELETE."""
-    if not HTTP_LIB_AVAILABLE:
+    if not HTTPX_AVAILABLE:
         return {"error": "No HTTP library available"}
 
     method = method.upper()
+    if method not in _HTTP_METHODS:
+        return {"error": f"Unsupported HTTP method: {method}"}
+
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            req_start = time.perf_counter()
-            if method == "GET":
-                response = await client.get(url, headers=headers or {})
-            elif method == "POST":
-                response = await client.post(url, json=data, headers=headers or {})
-            elif method == "PUT":
-                response = await client.put(url, json=data, headers=headers or {})
-            elif method == "DELETE":
-                response = await client.delete(url, headers=headers or {})
-            else:
-                return {"error": f"Unsupported HTTP method: {method}"}
-
-            duration_ms = int((time.perf_counter() - req_start) * 1000)
-            response.raise_for_status()
-            result = {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "duration_ms": duration_ms,
-            }
-            if response.text:
-                result["content"] = response.text
-                result["data"] = (
-                    response.json() if "application/json" in response.headers.get("content-type", "") else None
-                )
-            return result
+        req_start = time.perf_counter()
+        response = await get_http_client().request(
+            method,
+            url,
+            json=data if method in ("POST", "PUT") else None,
+            headers=headers,
+            timeout=timeout,
+        )
+        duration_ms = int((time.perf_counter() - req_start) * 1000)
+        response.raise_for_status()
+        result = {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "duration_ms": duration_ms,
+        }
+        if response.text:
+            result["content"] = response.text
+            result["data"] = response.json() if "application/json" in response.headers.get("content-type", "") else None
+        return result
     except Exception as e:
         return {"error": f"HTTP {method} failed: {str(e)}"}
 
@@ -6,9 +6,6 @@ from abc import ABC, abstractmethod
 from typing import Any
 
 from imports import printer as logger
-from lib.mcp.index import register_all_tools
-from lib.services.ai_client.client import AIClient
-from lib.services.ai_client.registry.mcp_registry import MCPServerRegistry
 
 
 class BaseNode(ABC):
@@ -190,6 +187,12 @@ class AIExecutionNode(BaseNode):
             # .invoke() call to a worker thread so nothing blocks the asyncio
             # event loop (matches the web backend _build_ai + to_thread pattern).
             def _build_and_chat() -> tuple[str, dict | None]:
+                # Imported here so loading the workflow engine doesn't pull in
+                # LangChain, and because lib.mcp's tools import lib.cron.
+                from lib.mcp.index import register_all_tools
+                from lib.services.ai_client.client import AIClient
+                from lib.services.ai_client.registry.mcp_registry import MCPServerRegistry
+
                 if self.use_tools:
                     mcp_registry = MCPServerRegistry()
                     register_all_tools(mcp_registry)
@@ -5,7 +5,6 @@ from typing import Any
 from imports import printer as logger
 from lib.cron import workflow_service
 from lib.cron.cron_scheduler import CronScheduler
-from lib.cron.engine import WorkflowEngine
 from lib.cron.models import Schedule
 from lib.services.scheduler.db_client import SchedulerDB
 
@@ -15,8 +14,8 @@ class Scheduler:
 
     def __init__(self):
         """Initialize the scheduler with engine and cron components."""
-        self.workflow_engine = WorkflowEngine()
         self.cron_scheduler = CronScheduler()
+        self.workflow_engine = self.cron_scheduler.engine
         self._running = False
 
     async def register_workflow(self, workflow: "Any") -> bool:
@@ -83,10 +82,10 @@ class Scheduler:
             self.cron_scheduler.start()
             self._running = True
 
-    def stop(self) -> None:
+    async def stop(self) -> None:
         """Stop the cron scheduler background loop."""
         if self._running:
-            self.cron_scheduler.stop()
+            await self.cron_scheduler.stop()
             self._running = False
 
     def is_running(self) -> bool:
@@ -27,7 +27,8 @@ def validate_workflow_definition(definition: dict[str, Any]) -> dict[str, Any]:
     1. Top-level structure: must be a dict with 'nodes' and 'connections' keys.
     2. Node validation: each node must be a dict with a valid 'type' field.
     3. Connection validation: each connection must reference existing nodes.
-    4. Acyclicity: the graph formed by connections must be a valid DAG.
+    4. Optional 'max_parallel' must be a positive integer.
+    5. Acyclicity: the graph formed by connections must be a valid DAG.
 
     Args:
         definition: The workflow definition dictionary containing 'nodes' and
@@ -100,6 +101,16 @@ def validate_workflow_definition(definition: dict[str, Any]) -> dict[str, Any]:
                 "details": {"connection": conn},
             }
 
+    max_parallel = definition.get("max_parallel")
+    if max_parallel is not None and (
+        not isinstance(max_parallel, int) or isinstance(max_parallel, bool) or max_parallel < 1
+    ):
+        return {
+            "valid": False,
+            "message": "'max_parallel' must be a positive integer",
+            "details": {"max_parallel": max_parallel},
+        }
+
     if not is_dag_acyclic(nodes, connections):
         return {
             "valid": False,
@@ -1,4 +1,4 @@
-from .index import get_all_tools, get_tool_info, register_all_tools
+from .index import get_all_tools, get_tool_catalog, get_tool_info, register_all_tools
 
 
-__all__ = ["register_all_tools", "get_all_tools", "get_tool_info"]
+__all__ = ["register_all_tools", "get_all_tools", "get_tool_catalog", "get_tool_info"]
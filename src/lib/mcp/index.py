@@ -1,8 +1,24 @@
 """MCP tool registration and discovery."""
 
+import threading
 from typing import Any
 
 from lib.mcp.tools import ALL_TOOL_CLASSES
+from lib.services.ai_client.registry.tool_catalog import ToolCatalog
+
+
+_catalog: ToolCatalog | None = None
+_catalog_lock = threading.Lock()
+
+
+def get_tool_catalog() -> ToolCatalog:
+    """Return the process-wide catalog, building tools and schemas on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ToolCatalog.from_tool_classes(ALL_TOOL_CLASSES)
+    return _catalog
 
 
 def register_all_tools(registry) -> int:
@@ -10,19 +26,7 @@ def register_all_tools(registry) -> int:
     if registry is None:
         raise ValueError("An MCPServerRegistry instance is required")
 
-    count = 0
-    for tool_cls in ALL_TOOL_CLASSES:
-        tool = tool_cls()
-        registry.add_tool_instance(tool)
-        impls = tool.get_implementations()
-        for tool_def in tool.get_definitions():
-            tool_name = tool_def.get("name")
-            impl = impls.get(tool_name)
-            if impl:
-                registry.register_tool(tool_def, impl)
-                count += 1
-
-    return count
+    return registry.attach_catalog(get_tool_catalog())
 
 
 def get_all_tools() -> list[dict[str, Any]]:
@@ -0,0 +1,417 @@
+"""
+Shared Chromium instance with a bounded pool of per-session browser contexts.
+
+Each ``BrowserTool`` (one per user/conversation) is a session here.  Every
+session gets its own isolated ``BrowserContext`` and page inside a single
+Chromium process, driven through Playwright's async API on one dedicated
+event-loop thread.  Calls for different sessions therefore run concurrently,
+while calls within one session stay strictly ordered.
+
+At most ``max_sessions`` contexts are open.  A new session takes a free slot,
+or else evicts the least recently used session that is not mid-call; when
+every session is busy, callers wait in a FIFO queue.  Sign-ins persist
+across sessions and restarts through a storage-state file in the browser
+profile directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from lib.utils.async_utils import AsyncBridge
+from lib.utils.printer import printer
+
+from ...core.config import Config
+
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright
+
+
+T = TypeVar("T")
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+VIEWPORT = {"width": 1280, "height": 800}
+LAUNCH_ARGS = ["--no-sandbox", "--disable-dev-shm-usage", "--disable-blink-features=AutomationControlled"]
+STORAGE_STATE_FILE = "storage_state.json"
+
+
+@dataclass(eq=False)
+class BrowserSession:
+    session_id: str
+    context: BrowserContext | None = None
+    page: Page | None = None
+    busy: bool = False
+    last_used: float = 0.0
+    # Storage state the context was opened with; closing saves only what changed since.
+    base_state: dict = field(default_factory=dict)
+
+
+def _read_storage_state(path: str) -> dict | None:
+    """The saved storage state at *path*, or ``None`` if there is none (or it is unreadable)."""
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _merge_storage_state(saved: dict, base: dict, current: dict) -> dict | None:
+    """Apply what a session changed since it loaded *base* onto the *saved* state.
+
+    Cookies are keyed by name, domain and path, local storage by origin.
+    Entries the session added or changed replace the saved ones, entries it
+    removed are dropped, and everything else — including sign-ins other
+    sessions saved in the meantime — is kept.  ``None`` if nothing changed.
+    """
+    keys = {
+        "cookies": lambda c: (c.get("name"), c.get("domain"), c.get("path")),
+        "origins": lambda o: o.get("origin"),
+    }
+    merged: dict[str, list] = {}
+    changed = False
+    for name, key in keys.items():
+        before = {key(e): e for e in base.get(name, [])}
+        after = {key(e): e for e in current.get(name, [])}
+        entries = {key(e): e for e in saved.get(name, [])}
+        for k in before.keys() - after.keys():
+            entries.pop(k, None)
+            changed = True
+        for k, entry in after.items():
+            if before.get(k) != entry:
+                entries[k] = entry
+                changed = True
+        merged[name] = list(entries.values())
+    return merged if changed else None
+
+
+class BrowserPool:
+    """
+    Up to ``max_sessions`` isolated browser sessions sharing one Chromium.
+
+    Args:
+        max_sessions: Open contexts allowed at once.
+        headless: Launch Chromium without a window.
+        profile_dir: Where the shared storage state (cookies, local storage)
+            is kept; ``None`` disables persistence.
+        acquire_timeout: Seconds a call may wait for a busy pool before
+            failing with ``TimeoutError``.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 4,
+        headless: bool = False,
+        profile_dir: str | None = None,
+        acquire_timeout: float = 120.0,
+    ):
+        self.max_sessions = max(1, max_sessions)
+        self.headless = headless
+        self.profile_dir = profile_dir
+        self.acquire_timeout = acquire_timeout
+        self._bridge = AsyncBridge(name="knik-browser")
+        self._started = False
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._launch_lock: asyncio.Lock | None = None
+        # LRU order: least recently used first.
+        self._sessions: OrderedDict[str, BrowserSession] = OrderedDict()
+        self._waiters: deque[tuple[str, asyncio.Future]] = deque()
+        self._background: set[asyncio.Task] = set()
+        self._evictions = 0
+        self._waits = 0
+        self._peak_waiting = 0
+
+    # --- thread-side API ---
+
+    def run(self, session_id: str, fn: Callable[[Page], Awaitable[T]], timeout: float | None = None) -> T:
+        """Run ``await fn(page)`` on *session_id*'s page, blocking the calling thread."""
+        self._started = True
+        return self._bridge.run(self._run(session_id, fn), timeout)
+
+    def close_session(self, session_id: str) -> None:
+        """Close one session's context once its in-flight call (if any) finishes."""
+        if self._started:
+            with contextlib.suppress(Exception):
+                self._bridge.run(self._close_session(session_id), timeout=30)
+
+    def evict_idle(self, idle_seconds: float) -> int:
+        """Close sessions unused for *idle_seconds*; stops Chromium when none remain."""
+        if not self._started:
+            return 0
+        return self._bridge.run(self._evict_idle(idle_seconds), timeout=60)
+
+    def close(self) -> None:
+        """Close every session and the browser, then stop the pool's loop thread."""
+        if self._started:
+            with contextlib.suppress(Exception):
+                self._bridge.run(self._shutdown(), timeout=60)
+        self._bridge.close()
+        self._started = False
+
+    def stats(self) -> dict[str, Any]:
+        sessions = list(self._sessions.values())
+        return {
+            "sessions": len(sessions),
+            "busy": sum(1 for s in sessions if s.busy),
+            "waiting": len(self._waiters),
+            "max_sessions": self.max_sessions,
+            "evictions": self._evictions,
+            "waits": self._waits,
+            "peak_waiting": self._peak_waiting,
+            "browser_running": self._browser is not None,
+        }
+
+    # --- pool loop ---
+
+    async def _run(self, session_id: str, fn: Callable[[Page], Awaitable[T]]) -> T:
+        session = await self._acquire(session_id)
+        try:
+            page = await self._ensure_page(session)
+            return await fn(page)
+        finally:
+            self._release(session)
+
+    async def _acquire(self, session_id: str) -> BrowserSession:
+        future: asyncio.Future[BrowserSession] = asyncio.get_running_loop().create_future()
+        entry = (session_id, future)
+        self._waiters.append(entry)
+        self._dispatch()
+        if not future.done():
+            self._waits += 1
+            self._peak_waiting = max(self._peak_waiting, len(self._waiters))
+        try:
+            async with asyncio.timeout(self.acquire_timeout):
+                return await future
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller gave up: hand the slot on.
+                self._release(future.result())
+            else:
+                future.cancel()
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(entry)
+            if isinstance(e, TimeoutError):
+                raise TimeoutError(
+                    f"All {self.max_sessions} browser sessions stayed busy for {self.acquire_timeout:.0f}s"
+                ) from None
+            raise
+
+    def _dispatch(self) -> None:
+        """Grant waiting callers in FIFO order.
+
+        A caller whose own session is busy waits without blocking others; the
+        first caller that needs a new slot and cannot get one blocks every
+        later caller that also needs a slot, so newcomers cannot overtake it.
+        """
+        slots_exhausted = False
+        for entry in list(self._waiters):
+            session_id, future = entry
+            if future.done():
+                self._waiters.remove(entry)
+                continue
+            session = self._sessions.get(session_id)
+            if session is None:
+                if slots_exhausted or not self._make_room():
+                    slots_exhausted = True
+                    continue
+                session = self._sessions[session_id] = BrowserSession(session_id)
+            elif session.busy:
+                continue
+            session.busy = True
+            self._sessions.move_to_end(session_id)
+            self._waiters.remove(entry)
+            future.set_result(session)
+
+    def _make_room(self) -> bool:
+        if len(self._sessions) < self.max_sessions:
+            return True
+        for victim in self._sessions.values():
+            if not victim.busy:
+                del self._sessions[victim.session_id]
+                self._evictions += 1
+                printer.info(f"[BrowserPool] Pool full; evicting least recently used session {victim.session_id}")
+                self._spawn(self._close_context(victim))
+                return True
+        return False
+
+    def _release(self, session: BrowserSession) -> None:
+        session.busy = False
+        session.last_used = time.monotonic()
+        self._dispatch()
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _storage_state_path(self) -> str | None:
+        return os.path.join(self.profile_dir, STORAGE_STATE_FILE) if self.profile_dir else None
+
+    async def _ensure_browser(self) -> Browser:
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            try:
+                from playwright.async_api import async_playwright
+            except ImportError as err:
+                raise RuntimeError(
+                    "Playwright is not installed. Run: pip install playwright && playwright install chromium"
+                ) from err
+
+            # A dead browser (crash, window closed by the user) takes its contexts with it.
+            await self._stop_browser()
+            for session in self._sessions.values():
+                session.context = session.page = None
+
+            if self.profile_dir:
+                os.makedirs(self.profile_dir, exist_ok=True)
+            mode = "headless" if self.headless else "headful"
+            printer.info(f"[BrowserPool] Launching {mode} Chromium (up to {self.max_sessions} sessions)...")
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+            printer.success(f"[BrowserPool] Browser ready ({mode}, profile: {self.profile_dir})")
+            return self._browser
+
+    async def _ensure_page(self, session: BrowserSession) -> Page:
+        browser = await self._ensure_browser()
+        if session.page is not None and session.context is not None and not session.page.is_closed():
+            return session.page
+        if session.context is None:
+            state = self._storage_state_path()
+            saved = _read_storage_state(state) if state else None
+            session.base_state = saved or {}
+            session.context = await browser.new_context(
+                viewport=VIEWPORT,
+                user_agent=USER_AGENT,
+                storage_state=saved,
+            )
+        session.page = await session.context.new_page()
+        return session.page
+
+    async def _close_context(self, session: BrowserSession) -> None:
+        """Merge the session's cookie changes into the shared profile, then close its context."""
+        context, session.context, session.page = session.context, None, None
+        if context is None:
+            return
+        state = self._storage_state_path()
+        if state:
+            with contextlib.suppress(Exception):
+                self._save_storage_state(state, session.base_state, await context.storage_state())
+        with contextlib.suppress(Exception):
+            await context.close()
+
+    @staticmethod
+    def _save_storage_state(path: str, base: dict, current: dict) -> None:
+        """Write the session's changes into *path* through a uniquely named temp file.
+
+        Runs without awaiting, so read-merge-replace cannot interleave with
+        another session closing on the pool's loop.
+        """
+        merged = _merge_storage_state(_read_storage_state(path) or {}, base, current)
+        if merged is None:
+            return
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{STORAGE_STATE_FILE}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(merged, f)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+    async def _close_session(self, session_id: str) -> None:
+        if session_id not in self._sessions:
+            return
+        session = await self._acquire(session_id)
+        self._sessions.pop(session_id, None)
+        try:
+            await self._close_context(session)
+        finally:
+            self._dispatch()
+
+    async def _evict_idle(self, idle_seconds: float) -> int:
+        threshold = time.monotonic() - idle_seconds
+        idle = [s for s in self._sessions.values() if not s.busy and s.last_used < threshold]
+        for session in idle:
+            del self._sessions[session.session_id]
+            printer.info(
+                f"[BrowserPool] Closing idle browser session {session.session_id} "
+                f"(idle {time.monotonic() - session.last_used:.0f}s)"
+            )
+        await asyncio.gather(*(self._close_context(s) for s in idle))
+        if not self._sessions and not self._waiters and self._browser is not None:
+            printer.info("[BrowserPool] No sessions left; closing browser")
+            await self._stop_browser()
+        self._dispatch()
+        return len(idle)
+
+    async def _stop_browser(self) -> None:
+        browser, self._browser = self._browser, None
+        pw, self._playwright = self._playwright, None
+        if browser is not None:
+            with contextlib.suppress(Exception):
+                await browser.close()
+        if pw is not None:
+            with contextlib.suppress(Exception):
+                await pw.stop()
+
+    async def _shutdown(self) -> None:
+        for _, future in self._waiters:
+            future.cancel()
+        self._waiters.clear()
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        await asyncio.gather(*(self._close_context(s) for s in sessions))
+        await self._stop_browser()
+
+
+_shared_pool: BrowserPool | None = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide pool, configured from ``Config`` on first use."""
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                cfg = Config()
+                _shared_pool = BrowserPool(
+                    max_sessions=cfg.browser_max_sessions,
+                    headless=cfg.browser_headless,
+                    profile_dir=cfg.browser_profile_dir,
+                    acquire_timeout=cfg.browser_acquire_timeout,
+                )
+    return _shared_pool
+
+
+def close_browser_session(session_id: str) -> None:
+    """Close one session in the shared pool, if the pool was ever started."""
+    if _shared_pool is not None:
+        _shared_pool.close_session(session_id)
+
+
+def evict_idle_browser_sessions(idle_seconds: float) -> int:
+    """Close idle sessions in the shared pool; returns how many were closed."""
+    if _shared_pool is None:
+        return 0
+    return _shared_pool.evict_idle(idle_seconds)
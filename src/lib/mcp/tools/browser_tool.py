@@ -1,20 +1,20 @@
 from __future__ import annotations
 
-import asyncio
 import base64
 import contextlib
 import math
-import os
 import re
-import threading
-import time
-from concurrent.futures import ThreadPoolExecutor
-from typing import TYPE_CHECKING
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, TypeVar
+from uuid import uuid4
 
 from lib.services.ai_client.base_tool import BaseTool
 from lib.utils.printer import printer
 
-from ...core.config import Config
+from .browser_pool import close_browser_session, evict_idle_browser_sessions, get_browser_pool
+
+
+T = TypeVar("T")
 
 
 BROWSER_DEFINITIONS = [
@@ -192,18 +192,16 @@ BROWSER_DEFINITIONS = [
 
 
 if TYPE_CHECKING:
-    from playwright.sync_api import BrowserContext as BrowserContext
-    from playwright.sync_api import Page as Page
-    from playwright.sync_api import Playwright
+    from playwright.async_api import Page
 
 
 class BrowserTool(BaseTool):
-    """One browser instance per tool instance (= one per user/conversation).
+    """One browser session per tool instance (= one per user/conversation).
 
-    Each instance owns its own ThreadPoolExecutor (single worker), its own
-    Playwright handle, and its own persistent browser context.  All Playwright
-    objects are created and used exclusively on that one thread, so there is
-    never a cross-thread access violation.
+    Sessions are isolated contexts in the shared ``BrowserPool``: one
+    Chromium serves every conversation, each conversation's calls run in
+    order on its own page, and different conversations browse concurrently
+    up to ``KNIK_BROWSER_MAX_SESSIONS``.
     """
 
     consent_required_for = frozenset(
@@ -216,6 +214,7 @@ class BrowserTool(BaseTool):
             "browser_screenshot",
         }
     )
+    session_scoped = True
 
     @property
     def name(self) -> str:
@@ -223,166 +222,20 @@ class BrowserTool(BaseTool):
 
     def __init__(self) -> None:
         super().__init__()
-        self._page: Page | None = None
-        self._playwright: Playwright | None = None
-        self._browser_context: BrowserContext | None = None
-        self._executor: ThreadPoolExecutor | None = None
-        self._lock: threading.Lock = threading.Lock()
-        self._last_used: float = 0.0
-
-    def _get_or_create_executor(self) -> ThreadPoolExecutor:
-        """Uses double-checked locking so the executor is always created before
-        any Playwright work is submitted to it.
-        """
-        if self._executor is None:
-            with self._lock:
-                if self._executor is None:
-                    self._executor = ThreadPoolExecutor(
-                        max_workers=1,
-                        thread_name_prefix=f"browser-{id(self)}",
-                    )
-        return self._executor
-
-    @staticmethod
-    def _clear_stale_singleton_lock(profile_dir: str) -> bool:
-        """Remove a stale Chromium SingletonLock left by an unclean shutdown.
+        self._session_id = f"browser-{uuid4().hex[:12]}"
 
-        Chromium writes SingletonLock as a symlink whose target is
-        ``{hostname}-{pid}``.  If that PID is no longer running the lock is
-        orphaned and blocks the next launch.
-
-        Returns True if a stale lock was removed, False otherwise.
-        """
-        lock_path = os.path.join(profile_dir, "SingletonLock")
-        if not os.path.lexists(lock_path):
-            return False
-
-        try:
-            if os.path.islink(lock_path):
-                target = os.readlink(lock_path)
-                parts = target.rsplit("-", 1)
-                if len(parts) == 2:
-                    try:
-                        pid = int(parts[1])
-                        os.kill(pid, 0)
-                        printer.warning(f"[BrowserTool] SingletonLock held by live PID {pid}; leaving it")
-                        return False
-                    except ProcessLookupError:
-                        pass
-                    except (ValueError, PermissionError):
-                        pass
-
-            os.remove(lock_path)
-            printer.info(f"[BrowserTool] Removed stale SingletonLock ({lock_path})")
-            return True
-        except Exception as exc:
-            printer.warning(f"[BrowserTool] Could not clean up SingletonLock: {exc}")
-            return False
-
-    def _ensure_browser(self) -> None:
-        """Must be called from *inside* the dedicated executor thread (i.e. from
-        within a function passed to run_on_thread).  That guarantees all
-        Playwright objects are owned by the same thread for their entire life.
-        """
-        if self._browser_context is not None:
-            return
-        try:
-            from playwright.sync_api import sync_playwright
-
-            cfg = Config()
-            headless = cfg.browser_headless
-            profile_dir = cfg.browser_profile_dir
-
-            os.makedirs(profile_dir, exist_ok=True)
-            self._clear_stale_singleton_lock(profile_dir)
-
-            mode = "headless" if headless else "headful"
-            printer.info(f"[BrowserTool] Launching {mode} Chromium (profile: {profile_dir})...")
-
-            # Clear any inherited running loop from nest_asyncio so
-            # Playwright's sync API doesn't refuse to start.
-            asyncio._set_running_loop(None)
-            self._playwright = sync_playwright().start()
-            self._browser_context = self._playwright.chromium.launch_persistent_context(
-                user_data_dir=profile_dir,
-                headless=headless,
-                viewport={"width": 1280, "height": 800},
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-                args=[
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-blink-features=AutomationControlled",
-                ],
-            )
-            printer.success(f"[BrowserTool] Browser ready ({mode}, profile: {profile_dir})")
-        except ImportError as err:
-            raise RuntimeError(
-                "Playwright is not installed. Run: pip install playwright && playwright install chromium"
-            ) from err
-
-    def _ensure_page(self) -> None:
-        """Safe to call only from within run_on_thread (i.e. on the dedicated
-        executor thread).
-        """
-        self._ensure_browser()
-        if self._page is None or self._page.is_closed():
-            self._page = self._browser_context.new_page()
-
-    def run_on_thread(self, fn, *args, **kwargs):
-        """The executor is created (via double-checked lock) before the first
-        submission, so sync_playwright is always initialised on the same
-        persistent thread that handles all subsequent calls.
-        """
-        self._last_used = time.monotonic()
-        executor = self._get_or_create_executor()
-        return executor.submit(fn, *args, **kwargs).result()
+    def run_in_page(self, fn: Callable[[Page], Awaitable[T]]) -> T:
+        """Run ``await fn(page)`` on this session's page in the shared pool."""
+        return get_browser_pool().run(self._session_id, fn)
 
     def cleanup(self) -> None:
-        executor = self._executor
-        if executor is not None:
-            # Run teardown on the browser thread so Playwright objects are
-            # closed by the thread that owns them.
-            with contextlib.suppress(Exception):
-                executor.submit(self._teardown_on_thread).result(timeout=10)
-            with contextlib.suppress(Exception):
-                executor.shutdown(wait=False)
-            self._executor = None
-        self._last_used = 0.0
-
-    def _teardown_on_thread(self) -> None:
-        """Close Playwright resources — must run on the browser thread."""
-        with contextlib.suppress(Exception):
-            if self._page is not None and not self._page.is_closed():
-                self._page.close()
-        self._page = None
-        with contextlib.suppress(Exception):
-            if self._browser_context is not None:
-                self._browser_context.close()
-        self._browser_context = None
-        with contextlib.suppress(Exception):
-            if self._playwright is not None:
-                self._playwright.stop()
-        self._playwright = None
+        close_browser_session(self._session_id)
 
     @classmethod
     def cleanup_idle(cls, idle_seconds: int) -> None:
         """Called periodically by the bot's auto-cleaner background task."""
-        from lib.services.ai_client.base_tool import BaseTool as _BaseTool
-
-        threshold = time.monotonic() - idle_seconds
-        for instance in list(_BaseTool._instances):
-            if not isinstance(instance, cls):
-                continue
-            if instance._last_used > 0 and instance._last_used < threshold:
-                printer.info(
-                    f"[BrowserTool] Closing idle browser session (idle {time.monotonic() - instance._last_used:.0f}s)"
-                )
-                with contextlib.suppress(Exception):
-                    instance.cleanup()
+        with contextlib.suppress(Exception):
+            evict_idle_browser_sessions(idle_seconds)
 
     def get_definitions(self):
         return BROWSER_DEFINITIONS
@@ -426,19 +279,17 @@ class BrowserTool(BaseTool):
         return result
 
     def _navigate(self, url: str, wait_until: str = "domcontentloaded") -> str:
-        def _inner():
-            self._ensure_page()
-            page = self._page
+        async def _inner(page):
             valid_states = {"load", "domcontentloaded", "networkidle", "commit"}
             wstate = wait_until if wait_until in valid_states else "domcontentloaded"
-            response = page.goto(url, wait_until=wstate, timeout=30000)
-            title = page.title()
+            response = await page.goto(url, wait_until=wstate, timeout=30000)
+            title = await page.title()
             status = response.status if response else "unknown"
             return title, status
 
         printer.info(f"Navigating to: {url}")
         try:
-            title, status = self.run_on_thread(_inner)
+            title, status = self.run_in_page(_inner)
             printer.success(f"Navigated to '{title}' (HTTP {status})")
             return f"Navigated to: {url}\nPage title: {title}\nHTTP status: {status}"
         except Exception as e:
@@ -446,16 +297,14 @@ class BrowserTool(BaseTool):
             return f"Error navigating to {url}: {str(e)}"
 
     def _get_text(self, selector: str | None = None, max_chars: int = 8000, chunk: int = 1) -> str:
-        def _inner():
-            self._ensure_page()
-            page = self._page
+        async def _inner(page):
             if selector:
-                element = page.query_selector(selector)
+                element = await page.query_selector(selector)
                 if element is None:
                     return None
-                return element.inner_text()
+                return await element.inner_text()
             else:
-                return page.evaluate(
+                return await page.evaluate(
                     """() => {
                         const clone = document.body.cloneNode(true);
                         clone.querySelectorAll('script, style, noscript, svg').forEach(el => el.remove());
@@ -465,7 +314,7 @@ class BrowserTool(BaseTool):
 
         printer.info(f"Extracting text (selector={selector!r}, max_chars={max_chars}, chunk={chunk})")
         try:
-            raw = self.run_on_thread(_inner)
+            raw = self.run_in_page(_inner)
             if raw is None:
                 return f"Error: No element found matching selector '{selector}'"
             text = self._clean_text(raw or "", max_chars, chunk)
@@ -475,11 +324,9 @@ class BrowserTool(BaseTool):
             return f"Error extracting text: {str(e)}"
 
     def _get_links(self, selector: str | None = None, max_links: int = 50) -> str:
-        def _inner():
-            self._ensure_page()
-            page = self._page
+        async def _inner(page):
             scope = selector if selector else "body"
-            return page.evaluate(
+            return await page.evaluate(
                 f"""() => {{
                     const scope = document.querySelector({repr(scope)}) || document.body;
                     const anchors = Array.from(scope.querySelectorAll('a[href]'));
@@ -492,7 +339,7 @@ class BrowserTool(BaseTool):
 
         printer.info(f"Extracting links (selector={selector!r})")
         try:
-            links = self.run_on_thread(_inner)
+            links = self.run_in_page(_inner)
             if not links:
                 return "No links found on the current page."
             lines = [f"{i + 1}. [{item['text'] or '(no text)'}]({item['href']})" for i, item in enumerate(links)]
@@ -503,58 +350,52 @@ class BrowserTool(BaseTool):
             return f"Error extracting links: {str(e)}"
 
     def _click(self, selector: str | None = None, text: str | None = None, timeout: int = 5000) -> str:
-        def _inner():
-            self._ensure_page()
-            page = self._page
+        async def _inner(page):
             if selector:
-                page.wait_for_selector(selector, timeout=timeout)
-                page.click(selector, timeout=timeout)
-                page.wait_for_load_state("domcontentloaded", timeout=10000)
-                return f"Clicked element: {selector}\nNew page title: {page.title()}"
+                await page.wait_for_selector(selector, timeout=timeout)
+                await page.click(selector, timeout=timeout)
+                await page.wait_for_load_state("domcontentloaded", timeout=10000)
+                return f"Clicked element: {selector}\nNew page title: {await page.title()}"
             elif text:
                 sel = f"text={text}"
-                page.wait_for_selector(sel, timeout=timeout)
-                page.click(sel, timeout=timeout)
-                page.wait_for_load_state("domcontentloaded", timeout=10000)
-                return f"Clicked element with text '{text}'\nNew page title: {page.title()}"
+                await page.wait_for_selector(sel, timeout=timeout)
+                await page.click(sel, timeout=timeout)
+                await page.wait_for_load_state("domcontentloaded", timeout=10000)
+                return f"Clicked element with text '{text}'\nNew page title: {await page.title()}"
             else:
                 return "Error: Provide either 'selector' or 'text' to identify what to click."
 
         printer.info(f"Clicking: selector={selector!r} text={text!r}")
         try:
-            return self.run_on_thread(_inner)
+            return self.run_in_page(_inner)
         except Exception as e:
             return f"Error clicking element: {str(e)}"
 
     def _type(self, selector: str, text: str, clear_first: bool = True, press_enter: bool = False) -> str:
-        def _inner():
-            self._ensure_page()
-            page = self._page
-            page.wait_for_selector(selector, timeout=5000)
+        async def _inner(page):
+            await page.wait_for_selector(selector, timeout=5000)
             if clear_first:
-                page.fill(selector, "")
-            page.type(selector, text, delay=30)
+                await page.fill(selector, "")
+            await page.type(selector, text, delay=30)
             if press_enter:
-                page.press(selector, "Enter")
-                page.wait_for_load_state("domcontentloaded", timeout=10000)
-                return f"Typed '{text}' into {selector} and pressed Enter\nNew page title: {page.title()}"
+                await page.press(selector, "Enter")
+                await page.wait_for_load_state("domcontentloaded", timeout=10000)
+                return f"Typed '{text}' into {selector} and pressed Enter\nNew page title: {await page.title()}"
             return f"Typed '{text}' into {selector}"
 
         printer.info(f"Typing into {selector!r}: {text!r}")
         try:
-            return self.run_on_thread(_inner)
+            return self.run_in_page(_inner)
         except Exception as e:
             return f"Error typing into element: {str(e)}"
 
     def _screenshot(self, full_page: bool = False) -> str:
-        def _inner():
-            self._ensure_page()
-            page = self._page
-            return page.screenshot(full_page=full_page)
+        async def _inner(page):
+            return await page.screenshot(full_page=full_page)
 
         printer.info(f"Taking screenshot (full_page={full_page})")
         try:
-            png_bytes = self.run_on_thread(_inner)
+            png_bytes = self.run_in_page(_inner)
             b64 = base64.b64encode(png_bytes).decode("utf-8")
             size_kb = len(png_bytes) // 1024
             printer.success(f"Screenshot captured ({size_kb} KB)")
@@ -6,6 +6,9 @@ from typing import Any
 from lib.services.ai_client.base_tool import BaseTool
 
 
+# Regex constructs that can match at a line's start or end but not in the middle of the file.
+_LINE_EDGE_TOKENS = ("\\A", "\\Z", "(?<", "(?!")
+
 FILE_DEFINITIONS = [
     {
         "name": "read_file",
@@ -58,7 +61,7 @@ FILE_DEFINITIONS = [
     },
     {
         "name": "search_in_files",
-        "description": "Search for a pattern (text or regex) across multiple files in a directory. Perfect for finding TODOs, specific code patterns, or text occurrences.",
+        "description": "Search for a pattern (text or regex) across multiple files in a directory. Perfect for finding TODOs, specific code patterns, or text occurrences. Files excluded by .gitignore/.ignore, binary files and very large files are skipped.",
         "parameters": {
             "type": "object",
             "properties": {
@@ -80,6 +83,11 @@ FILE_DEFINITIONS = [
                     "description": "Maximum number of matches to return",
                     "default": 100,
                 },
+                "include_ignored": {
+                    "type": "boolean",
+                    "description": "Also search files excluded by .gitignore/.ignore rules",
+                    "default": False,
+                },
             },
             "required": ["directory_path", "pattern"],
         },
@@ -179,6 +187,7 @@ FILE_DEFINITIONS = [
         },
     },
 ]
+from lib.utils.file_search import search_tree
 from lib.utils.printer import printer
 
 
@@ -350,6 +359,7 @@ class FileTool(BaseTool):
         is_regex: bool = False,
         case_sensitive: bool = True,
         max_results: int = 100,
+        include_ignored: bool = False,
     ) -> dict[str, Any]:
         printer.info(f"Searching '{pattern}' in {directory_path}")
         try:
@@ -365,36 +375,33 @@ class FileTool(BaseTool):
                 except ValueError as e:
                     return {"error": str(e)}
 
-            matches = []
-            for file_path in path.rglob(file_pattern):
-                if not file_path.is_file():
-                    continue
-                try:
-                    with open(file_path, encoding="utf-8", errors="ignore") as f:
-                        for line_num, line in enumerate(f, 1):
-                            if self._line_matches(line, pattern, regex, case_sensitive):
-                                matches.append(
-                                    {
-                                        "file": str(file_path.relative_to(path)),
-                                        "line": line_num,
-                                        "content": line.strip(),
-                                    }
-                                )
-                            if len(matches) >= max_results:
-                                return {
-                                    "success": True,
-                                    "matches": matches,
-                                    "total_matches": max_results,
-                                    "max_results_reached": True,
-                                }
-                except Exception:
-                    pass
-
+            # Whole-file prefilter: files without a hit are never split into lines.
+            # Patterns using _LINE_EDGE_TOKENS could be rejected there yet match a line, so they skip it.
+            prefilter = None
+            if regex:
+                if not any(token in pattern for token in _LINE_EDGE_TOKENS):
+                    prefilter = re.compile(pattern, regex.flags | re.MULTILINE).search
+            elif case_sensitive:
+                prefilter = lambda text: pattern in text  # noqa: E731
+            else:
+                needle = pattern.lower()
+                prefilter = lambda text: needle in text.lower()  # noqa: E731
+
+            result = search_tree(
+                str(path),
+                lambda line: self._line_matches(line, pattern, regex, case_sensitive),
+                file_matches=prefilter,
+                file_pattern=file_pattern,
+                max_results=max_results,
+                use_ignore_files=not include_ignored,
+            )
             return {
                 "success": True,
-                "matches": matches,
-                "total_matches": len(matches),
-                "max_results_reached": False,
+                "matches": result.matches,
+                "total_matches": len(result.matches),
+                "max_results_reached": result.truncated,
+                "files_searched": result.files_searched,
+                "files_skipped": result.files_skipped,
             }
         except Exception as e:
             return {"error": f"Error searching files: {e}"}
@@ -28,6 +28,10 @@ from lib.utils.async_utils import run_async
 from lib.utils.printer import printer
 
 
+# Extra time the bridge waits beyond the command's own timeout before giving up.
+_BRIDGE_GRACE_SECONDS = 5
+
+
 class ShellTool(BaseTool):
     consent_required_for = frozenset({"run_shell_command"})
 
@@ -50,7 +54,10 @@ class ShellTool(BaseTool):
 
         printer.info(f'Executing shell command: "{command}" with timeout {timeout}s')
 
-        result = run_async(_async_run_shell_command(command, timeout=timeout, blocked_commands=BLOCKED_COMMANDS))
+        result = run_async(
+            _async_run_shell_command(command, timeout=timeout, blocked_commands=BLOCKED_COMMANDS),
+            timeout=timeout + _BRIDGE_GRACE_SECONDS,
+        )
 
         if "error" in result:
             return f"Error: {result['error']}"
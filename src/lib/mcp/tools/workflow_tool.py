@@ -29,6 +29,11 @@ WORKFLOW_DEFINITIONS = [
                             "description": "Map of node_id to node definition objects. node_id must be unique and match pattern ^[a-zA-Z0-9_]+$ (no spaces, special characters). Minimum 1 node required.",
                             "minProperties": 1,
                         },
+                        "max_parallel": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "description": "Optional cap on how many nodes may run concurrently. Omit for no limit.",
+                        },
                         "connections": {
                             "type": "array",
                             "description": "Array of connection objects. Each connection has 'from_id' (source node), 'to_id' (target node) strings that exist in nodes. Optional 'condition' field for ConditionalBranchNode connections (values: 'true' or 'false'). No cycles allowed (must be DAG).",
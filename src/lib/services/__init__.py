@@ -1,15 +1,34 @@
 """
 Services module for Knik library.
 Contains independent, feature-complete service modules.
+
+Importing a submodule (``lib.services.postgres``, ``lib.services.tts.cache``)
+no longer drags in the AI client; the re-exports below load on first access.
 """
 
-from .ai_client import AIClient, BaseTool, MockAIClient
-from .messaging_client import MessagingClient
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+
+if TYPE_CHECKING:
+    from .ai_client import AIClient, BaseTool, MockAIClient
+    from .messaging_client import MessagingClient
 
 
+_LAZY_ATTRS = {
+    "AIClient": ".ai_client",
+    "MockAIClient": ".ai_client",
+    "BaseTool": ".ai_client",
+    "MessagingClient": ".messaging_client",
+}
+
 __all__ = [
     "AIClient",
     "MockAIClient",
     "BaseTool",
     "MessagingClient",
 ]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
@@ -3,21 +3,46 @@ AI Client module for interacting with various AI providers.
 
 Provides unified interface with dynamic provider loading and MCP server support.
 Use AIClient.list_available_providers() to see all registered providers.
+
+Exports load on first access, so helpers such as ``ai_client.pricing`` or
+``ai_client.token_utils`` can be imported without loading every provider SDK.
 """
 
-from .base_tool import BaseTool
-from .client import AIClient, MockAIClient
-from .providers import BaseAIProvider, MockAIProvider, VertexAIProvider
-from .registry import MCPServerRegistry, ProviderRegistry
+from typing import TYPE_CHECKING
+
+from ...utils.lazy import lazy_exports
+
+
+if TYPE_CHECKING:
+    from .base_tool import BaseTool
+    from .client import AIClient, MockAIClient
+    from .providers import BaseAIProvider, CallContext, MockAIProvider, VertexAIProvider
+    from .registry import MCPServerRegistry, ProviderRegistry
 
 
+_LAZY_ATTRS = {
+    "AIClient": ".client",
+    "MockAIClient": ".client",
+    "BaseAIProvider": ".providers",
+    "CallContext": ".providers",
+    "ProviderRegistry": ".registry",
+    "MCPServerRegistry": ".registry",
+    "VertexAIProvider": ".providers",
+    "MockAIProvider": ".providers",
+    "BaseTool": ".base_tool",
+}
+
 __all__ = [
     "AIClient",
     "MockAIClient",
     "BaseAIProvider",
+    "CallContext",
     "ProviderRegistry",
     "MCPServerRegistry",
     "VertexAIProvider",
     "MockAIProvider",
     "BaseTool",
 ]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
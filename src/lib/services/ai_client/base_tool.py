@@ -6,6 +6,9 @@ from typing import Any, ClassVar
 class BaseTool(ABC):
     _instances: ClassVar[list["BaseTool"]] = []
     consent_required_for: ClassVar[frozenset[str]] = frozenset()
+    # Tools holding per-user resources get one instance per registry instead
+    # of the single process-wide instance shared through the ToolCatalog.
+    session_scoped: ClassVar[bool] = False
 
     @property
     @abstractmethod
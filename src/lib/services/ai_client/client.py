@@ -13,16 +13,32 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import json
+import time
 from collections.abc import AsyncGenerator, Generator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, ClassVar
 
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 
 from ...core.config import Config
+from ...utils.metrics import metrics, span
 from ...utils.printer import printer
+from .model_discovery import get_model_discovery
 from .providers import BaseAIProvider
-from .providers.base_provider import ChatResult
+from .providers.base_provider import CallContext, ChatResult
 from .registry import ProviderRegistry
+from .token_utils import REPLY_PRIMING_TOKENS
+
+
+_LLM_REQUESTS = metrics.counter("knik_llm_requests_total", "LLM calls by outcome", ("provider", "mode", "status"))
+_LLM_SECONDS = metrics.histogram(
+    "knik_llm_duration_seconds", "Time from sending an LLM call to its last chunk", ("provider", "mode")
+)
+_LLM_TTFT_SECONDS = metrics.histogram(
+    "knik_llm_time_to_first_token_seconds",
+    "Time from sending a streamed LLM call to its first text chunk",
+    ("provider",),
+)
 
 
 class AIClient:
@@ -36,6 +52,11 @@ class AIClient:
     lifecycle management on top of the sync core.  Pass a
     ``conversation_id`` to opt in; pass ``None`` to fall through to a
     plain async wrapper around the sync method (no DB).
+
+    Every call records its usage and tool calls in its own
+    :class:`CallContext` (pass ``call=`` to receive it), so one client can
+    serve concurrent calls.  The ``last_*`` attributes mirror the most
+    recently finished call for single-caller code.
     """
 
     # Strong references for fire-and-forget tasks (e.g. background
@@ -98,12 +119,6 @@ class AIClient:
                 mock_class = ProviderRegistry.get("mock")
                 self._provider = mock_class(mcp_registry=mcp_registry)
                 self.provider_name = "mock"
-            else:
-                # Eagerly discover models to warm the context-window cache.
-                # This ensures get_context_window() returns API-sourced values
-                # before the first should_compact() call.
-                with contextlib.suppress(Exception):
-                    self._provider.get_models_with_fallback()
 
         except Exception as e:
             if auto_fallback_to_mock:
@@ -150,12 +165,20 @@ class AIClient:
         self.provider_name = provider_name
         printer.info(f"Provider swapped to {provider_name}")
 
+    def _prefetch_models(self) -> None:
+        """Warm the model cache in the background so that get_context_window() has
+        API-sourced values by the time _post_chat() checks for compaction."""
+        with contextlib.suppress(Exception):
+            get_model_discovery().prefetch(self._provider)
+
     def chat(
         self,
         prompt: str,
         max_tokens: int = 1024,
         temperature: float = 0.7,
         history: list = None,
+        *,
+        call: CallContext | None = None,
         **kwargs,
     ) -> str:
         """
@@ -164,47 +187,48 @@ class AIClient:
         Tool usage is automatic - if mcp_registry was provided during initialization,
         the AI can use registered tools. Otherwise, it's just a direct LLM call.
 
-        Token usage from the call is stored in ``self.last_usage``,
-        ``self.last_tool_tokens``, and ``self.last_tool_interactions`` after completion.
+        Token usage and tool calls are recorded in *call* (a fresh
+        :class:`CallContext` if omitted) and mirrored into ``self.last_*``.
 
         Args:
             prompt: The user's message
             max_tokens: Maximum tokens in response
             temperature: Response randomness (0.0-2.0)
             history: Conversation history (list of LangChain messages)
+            call: Per-call context that receives usage and tool calls
             **kwargs: Additional provider-specific parameters
 
         Returns:
             str: The AI's response
         """
+        call = self._new_call(call)
+        self._prefetch_models()
+        start = time.perf_counter()
         try:
-            result = self._provider.chat(
-                prompt=prompt,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                history=history,
-                **kwargs,
-            )
+            with span("llm.chat", provider=self.provider_name):
+                result = self._provider.chat(
+                    prompt=prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    history=history,
+                    call=call,
+                    **kwargs,
+                )
+            _LLM_SECONDS.observe(time.perf_counter() - start, provider=self.provider_name, mode="chat")
+            _LLM_REQUESTS.inc(provider=self.provider_name, mode="chat", status="ok")
 
             if isinstance(result, ChatResult):
-                self.last_usage = result.usage
-                self.last_tool_tokens = getattr(self._provider, "last_tool_tokens", None)
-                self.last_tool_interactions = getattr(self._provider, "last_tool_interactions", None)
-                self.last_context_tokens = getattr(self._provider, "last_context_tokens", 0)
-                return result.content
-            else:
-                self.last_usage = getattr(self._provider, "last_usage", None)
-                self.last_tool_tokens = getattr(self._provider, "last_tool_tokens", None)
-                self.last_tool_interactions = getattr(self._provider, "last_tool_interactions", None)
-                self.last_context_tokens = getattr(self._provider, "last_context_tokens", 0)
-                return result
+                if call.usage is None:
+                    call.usage = result.usage
+                result = result.content
+            self._remember(call)
+            return result
         except Exception as e:
+            _LLM_REQUESTS.inc(provider=self.provider_name, mode="chat", status="error")
             error_msg = f"Chat error: {e}"
             printer.error(error_msg)
-            self.last_usage = None
-            self.last_tool_tokens = None
-            self.last_tool_interactions = None
-            self.last_context_tokens = 0
+            call.reset()
+            self._remember(call)
             return error_msg
 
     def chat_stream(
@@ -213,6 +237,8 @@ class AIClient:
         max_tokens: int = 1024,
         temperature: float = 0.7,
         history: list = None,
+        *,
+        call: CallContext | None = None,
         **kwargs,
     ) -> Generator[str, None, None]:
         """
@@ -221,42 +247,110 @@ class AIClient:
         Tool usage is automatic - if mcp_registry was provided during initialization,
         the AI can use registered tools. Otherwise, it's just a direct LLM streaming.
 
-        Token usage is available in self.last_usage after the stream completes.
+        Token usage is recorded in *call* (and mirrored into
+        ``self.last_usage``) once the stream completes.
 
         Args:
             prompt: The user's message
             max_tokens: Maximum tokens in response
             temperature: Response randomness (0.0-2.0)
             history: Conversation history (list of LangChain messages)
+            call: Per-call context that receives usage and tool calls
             **kwargs: Additional provider-specific parameters
 
         Yields:
             str: Chunks of the AI's response
         """
+        call = self._new_call(call)
+        self._prefetch_models()
         try:
-            self.last_usage = None
-            self.last_tool_tokens = None
-            self.last_tool_interactions = None
-            self.last_context_tokens = 0
-            yield from self._provider.chat_stream(
-                prompt=prompt,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                history=history,
-                **kwargs,
-            )
-            self.last_usage = getattr(self._provider, "last_usage", None)
-            self.last_tool_tokens = getattr(self._provider, "last_tool_tokens", None)
-            self.last_tool_interactions = getattr(self._provider, "last_tool_interactions", None)
-            self.last_context_tokens = getattr(self._provider, "last_context_tokens", 0)
+            start = time.perf_counter()
+            first_token = True
+            with span("llm.stream", provider=self.provider_name) as stream_span:
+                for chunk in self._provider.chat_stream(
+                    prompt=prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    history=history,
+                    call=call,
+                    **kwargs,
+                ):
+                    if first_token and isinstance(chunk, str) and chunk:
+                        first_token = False
+                        self._record_first_token(start, stream_span)
+                    yield chunk
+            self._finish_stream(start, call)
         except Exception as e:
-            error_msg = f"Chat streaming error: {e}"
-            printer.error(error_msg)
-            self.last_usage = None
-            self.last_tool_tokens = None
-            self.last_tool_interactions = None
-            self.last_context_tokens = 0
-            yield error_msg
+            yield self._stream_error(e, call)
+
+    async def _astream(
+        self,
+        prompt: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        history: list | None = None,
+        *,
+        call: CallContext | None = None,
+        **kwargs,
+    ) -> AsyncGenerator[str | dict, None]:
+        """Async :meth:`chat_stream` over the provider's ``achat_stream``.
+
+        LangChain providers stream natively on the event loop; others fall
+        back to BaseAIProvider's thread bridge.
+        """
+        call = self._new_call(call)
+        self._prefetch_models()
+        try:
+            start = time.perf_counter()
+            first_token = True
+            with span("llm.stream", provider=self.provider_name) as stream_span:
+                async for chunk in self._provider.achat_stream(
+                    prompt=prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    history=history,
+                    call=call,
+                    **kwargs,
+                ):
+                    if first_token and isinstance(chunk, str) and chunk:
+                        first_token = False
+                        self._record_first_token(start, stream_span)
+                    yield chunk
+            self._finish_stream(start, call)
+        except Exception as e:
+            yield self._stream_error(e, call)
+
+    def _new_call(self, call: CallContext | None) -> CallContext:
+        if call is None:
+            return CallContext(tool_callback=self.tool_callback)
+        if call.tool_callback is None:
+            call.tool_callback = self.tool_callback
+        return call
+
+    def _remember(self, call: CallContext) -> None:
+        """Mirror a finished call into the ``last_*`` attributes."""
+        self.last_usage = call.usage
+        self.last_tool_tokens = call.tool_tokens
+        self.last_tool_interactions = call.tool_interactions
+        self.last_context_tokens = call.context_tokens
+
+    def _record_first_token(self, start: float, stream_span) -> None:
+        ttft = time.perf_counter() - start
+        _LLM_TTFT_SECONDS.observe(ttft, provider=self.provider_name)
+        stream_span.set_attribute("ttft_ms", round(ttft * 1000, 1))
+
+    def _finish_stream(self, start: float, call: CallContext) -> None:
+        _LLM_SECONDS.observe(time.perf_counter() - start, provider=self.provider_name, mode="stream")
+        _LLM_REQUESTS.inc(provider=self.provider_name, mode="stream", status="ok")
+        self._remember(call)
+
+    def _stream_error(self, error: Exception, call: CallContext) -> str:
+        _LLM_REQUESTS.inc(provider=self.provider_name, mode="stream", status="error")
+        error_msg = f"Chat streaming error: {error}"
+        printer.error(error_msg)
+        call.reset()
+        self._remember(call)
+        return error_msg
 
     async def achat(
         self,
@@ -268,20 +362,22 @@ class AIClient:
         temperature: float = 0.7,
         history: list | None = None,
         provider_meta: dict[str, str] | None = None,
+        call: CallContext | None = None,
         **kwargs,
     ) -> tuple[str, str | None, dict[str, int] | None]:
         """Async chat with optional full conversation lifecycle.
 
         When *conversation_id* is provided (or successfully created),
         the method handles:
-        1. Creating / verifying the conversation in DB
+        1. Creating the conversation in DB if it does not exist yet
         2. Persisting the user message
         3. Loading conversation history from DB (unless *history* is
            passed explicitly) — respects compaction pointers
+           (steps 1-3 are a single DB round-trip)
         4. Running the LLM call on a background thread
         5. Persisting the assistant response
-        6. Tracking tokens and triggering blocking compaction
-           when the threshold is crossed
+        6. Tracking tokens and scheduling background compaction
+           when the watermark is crossed
         7. Auto-generating a title after the first exchange
 
         If the DB is unavailable every step silently degrades and the
@@ -300,6 +396,7 @@ class AIClient:
                 from the DB.
             provider_meta: ``{"provider": ..., "model": ...}`` dict
                 written into message metadata for auditing.
+            call: Per-call context that receives usage and tool calls.
             **kwargs: Forwarded to the underlying provider.
 
         Returns:
@@ -308,43 +405,37 @@ class AIClient:
             *usage* may be ``None`` if the provider didn't report it.
         """
         meta = provider_meta or {}
-        cfg = Config()
 
-        conversation_id = await self._ensure_conversation(conversation_id)
+        turn = await self._start_turn(conversation_id, prompt, meta, load_history=history is None)
+        conversation_id = turn.conversation_id if turn else None
+        call = self._new_call(call)
+        if turn and history is None:
+            history = self._history_from_messages(turn.history, turn.summary_message_id)
+            call.history_tokens = self._persisted_history_tokens(turn.history)
 
-        if conversation_id:
-            await self._conversation_db().append_message(
-                conversation_id=conversation_id,
-                role="user",
-                content=prompt,
-                metadata=meta,
-            )
-
-        if history is None and conversation_id:
-            history = await self._load_history(conversation_id, cfg.history_context_size)
-
-        response_text, usage, tool_interactions = await asyncio.to_thread(
-            self._chat_with_usage,
-            prompt,
-            history,
-            max_tokens,
-            temperature,
+        response_text = await asyncio.to_thread(
+            self.chat,
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            history=history,
+            call=call,
             **kwargs,
         )
 
-        if conversation_id and response_text.strip():
+        if turn and response_text.strip():
             await self._post_chat(
                 conversation_id=conversation_id,
                 prompt=prompt,
                 response_text=response_text,
-                usage=usage,
+                call=call,
                 meta=meta,
                 disable_summarization=disable_summarization,
                 history=history,
-                tool_interactions=tool_interactions,
+                first_exchange=turn.message_count == 1,
             )
 
-        return response_text, conversation_id, usage
+        return response_text, conversation_id, call.usage
 
     async def achat_stream(
         self,
@@ -356,6 +447,7 @@ class AIClient:
         temperature: float = 0.7,
         history: list | None = None,
         provider_meta: dict[str, str] | None = None,
+        call: CallContext | None = None,
         **kwargs,
     ) -> AsyncGenerator[str | dict, None]:
         """Async streaming chat with full conversation lifecycle.
@@ -363,10 +455,12 @@ class AIClient:
         Yields ``str`` chunks during streaming.  After the stream is
         exhausted two *dict* sentinels may be yielded:
 
-        * ``{"__conversation_id__": "<uuid>"}`` — emitted first so the
-          caller can forward it before any text arrives.
+        * ``{"__conversation_id__": "<uuid>", "summary_message_id": ...}``
+          — emitted first so the caller can forward it before any text
+          arrives; carries the compaction pointer the turn started from.
         * ``{"__done__": True, "conversation_id": ..., "usage": ...,
-          "full_response": ...}`` — emitted last with metadata.
+          "full_response": ..., "call": CallContext}`` — emitted last
+          with metadata.
 
         See :meth:`achat` for the lifecycle description.
 
@@ -378,132 +472,83 @@ class AIClient:
             temperature: Response randomness.
             history: Explicit LangChain message list.
             provider_meta: Metadata dict for auditing.
+            call: Per-call context that receives usage and tool calls.
             **kwargs: Forwarded to the underlying provider.
 
         Yields:
             ``str`` text chunks, then a metadata ``dict``.
         """
         meta = provider_meta or {}
-        cfg = Config()
 
-        conversation_id = await self._ensure_conversation(conversation_id)
+        turn = await self._start_turn(conversation_id, prompt, meta, load_history=history is None)
+        conversation_id = turn.conversation_id if turn else None
 
+        call = self._new_call(call)
         # Emit conversation_id early so the caller can forward it
-        if conversation_id:
-            yield {"__conversation_id__": conversation_id}
-
-        if conversation_id:
-            await self._conversation_db().append_message(
-                conversation_id=conversation_id,
-                role="user",
-                content=prompt,
-                metadata=meta,
-            )
-
-        if history is None and conversation_id:
-            history = await self._load_history(conversation_id, cfg.history_context_size)
-
-        queue: asyncio.Queue[str | dict | None] = asyncio.Queue()
-        loop = asyncio.get_running_loop()
-
-        def _produce():
-            try:
-                for chunk in self.chat_stream(
-                    prompt=prompt,
-                    history=history,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    **kwargs,
-                ):
-                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
-            finally:
-                loop.call_soon_threadsafe(queue.put_nowait, None)
-
-        producer = loop.run_in_executor(None, _produce)
-
-        full_response = ""
-        while True:
-            chunk = await queue.get()
-            if chunk is None:
-                break
-            if isinstance(chunk, dict):
-                yield chunk
-            else:
-                yield chunk
-                full_response += chunk
-
-        await producer
-
-        usage = self.last_usage
-        tool_interactions = self.last_tool_interactions
+        if turn:
+            yield {"__conversation_id__": conversation_id, "summary_message_id": turn.summary_message_id}
+            if history is None:
+                history = self._history_from_messages(turn.history, turn.summary_message_id)
+                call.history_tokens = self._persisted_history_tokens(turn.history)
+
+        parts: list[str] = []
+        async for chunk in self._astream(
+            prompt=prompt,
+            history=history,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            call=call,
+            **kwargs,
+        ):
+            yield chunk
+            if isinstance(chunk, str):
+                parts.append(chunk)
+        full_response = "".join(parts)
 
-        if conversation_id and full_response.strip():
+        if turn and full_response.strip():
             await self._post_chat(
                 conversation_id=conversation_id,
                 prompt=prompt,
                 response_text=full_response,
-                usage=usage,
+                call=call,
                 meta=meta,
                 disable_summarization=disable_summarization,
                 history=history,
-                tool_interactions=tool_interactions,
+                first_exchange=turn.message_count == 1,
             )
 
         yield {
             "__done__": True,
             "conversation_id": conversation_id,
-            "usage": usage,
+            "usage": call.usage,
             "full_response": full_response,
+            "call": call,
         }
 
-    def _chat_with_usage(
-        self,
-        prompt: str,
-        history: list | None,
-        max_tokens: int,
-        temperature: float,
-        **kwargs,
-    ) -> tuple[str, dict[str, int] | None, list | None]:
-        """Call :meth:`chat` and atomically capture usage on the same thread.
-
-        Returns ``(response_text, usage_dict_or_none, tool_interactions_or_none)``.
-        """
-        text = self.chat(
-            prompt=prompt,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            history=history,
-            **kwargs,
-        )
-        return text, self.last_usage, self.last_tool_interactions
-
     @classmethod
-    async def _ensure_conversation(cls, conversation_id: str | None) -> str | None:
-        """Create a new conversation or verify an existing one.
-
-        Returns the valid conversation ID, or ``None`` if the DB is
-        unavailable.
+    async def _start_turn(
+        cls, conversation_id: str | None, prompt: str, meta: dict[str, str], *, load_history: bool
+    ) -> Any:
+        """Upsert the conversation, persist the user message and fetch the history window.
+
+        One DB round-trip (``ConversationDB.start_turn``).  Returns the
+        ``TurnStart``, or ``None`` if the DB is unavailable.  Waits for a
+        running compaction first only if the previous turn crossed the hard
+        compaction threshold.
         """
-        db = cls._conversation_db()
-        if not conversation_id:
-            return await db.create_conversation()
-
-        existing = await db.get_conversation(conversation_id)
-        if existing:
-            return conversation_id
-
-        return await db.create_conversation()
-
-    @classmethod
-    async def _load_history(cls, conversation_id: str, context_size: int) -> list:
-        """Load the active message window for a conversation and convert to LangChain types.
+        if conversation_id:
+            await cls._conversation_compactor().wait_if_over_threshold(conversation_id)
+        history_size = Config().history_context_size * 2 if load_history else None
+        return await cls._conversation_db().start_turn(conversation_id, prompt, meta, history_size)
 
-        If the conversation has been compacted, loads only messages from the
-        summary message onwards.  The summary message itself has its role
-        rewritten from ``assistant`` to ``user`` in-memory so the LLM treats
-        it as context (matching the OpenCode approach).
+    @staticmethod
+    def _history_from_messages(messages: list, summary_message_id: str | None) -> list:
+        """Convert a conversation's active message window to LangChain types.
 
-        Falls back to loading the last N turn pairs when no compaction exists.
+        If the conversation has been compacted the window starts at the
+        summary message, whose role is rewritten from ``assistant`` to
+        ``user`` in-memory so the LLM treats it as context (matching the
+        OpenCode approach).  Otherwise it is the last N turn pairs.
 
         For assistant messages that have ``tool_calls`` in their metadata, the
         full LangChain message sequence is reconstructed: an AIMessage declaring
@@ -511,18 +556,6 @@ class AIClient:
         the text response.  This gives the LLM accurate memory of prior tool
         usage across conversation turns.
         """
-        DB = cls._conversation_db()
-
-        summary_message_id, _ = await DB.get_compaction_state(conversation_id)
-
-        if summary_message_id:
-            messages = await DB.get_messages_from(conversation_id, summary_message_id)
-        else:
-            messages = await DB.get_recent_messages(
-                conversation_id,
-                last_n=context_size * 2,
-            )
-
         history: list = []
         for i, msg in enumerate(messages):
             content = msg.content
@@ -564,6 +597,17 @@ class AIClient:
                     history.append(AIMessage(content=content))
         return history
 
+    @staticmethod
+    def _persisted_history_tokens(messages: list) -> int | None:
+        """Context size of a DB history window, summed from the stored per-message counts.
+
+        ``None`` if any message lacks a count, so the provider encodes the history instead.
+        """
+        counts = [msg.token_count for msg in messages]
+        if not counts or None in counts:
+            return None
+        return sum(counts) + REPLY_PRIMING_TOKENS
+
     @staticmethod
     def _estimate_usage(
         prompt: str,
@@ -607,19 +651,20 @@ class AIClient:
         conversation_id: str,
         prompt: str,
         response_text: str,
-        usage: dict[str, int] | None,
+        call: CallContext,
         meta: dict[str, str],
         disable_summarization: bool,
         history: list | None = None,
-        tool_interactions: list | None = None,
+        first_exchange: bool = False,
     ) -> None:
         """Handle post-call persistence: save response, track tokens,
-        trigger blocking compaction, and auto-generate title.
+        schedule compaction, and auto-generate a title after the
+        *first_exchange*.
 
         Uses API-reported ``input_tokens`` as the primary context usage
         metric.  Falls back to tiktoken estimation when the provider did
-        not report usage.  Compaction is **blocking** — the caller waits
-        until it finishes (or fails) before proceeding.
+        not report usage.  Compaction runs in the background; its summary
+        is applied between turns (see ``ConversationCompactor.schedule``).
 
         All operations are DB-resilient (ConversationDB methods no-op
         on failure), so this method never raises.
@@ -628,9 +673,10 @@ class AIClient:
         Compactor = self._conversation_compactor()
 
         model_name = self.get_model_name()
+        usage = call.usage
         if usage is None:
             base_usage = self._estimate_usage(prompt, response_text, model_name, history=history)
-            tool_tokens = self.last_tool_tokens or {}
+            tool_tokens = call.tool_tokens or {}
             tool_input = tool_tokens.get("tool_input_tokens", 0)
             tool_output = tool_tokens.get("tool_output_tokens", 0)
             usage = {
@@ -642,12 +688,12 @@ class AIClient:
         else:
             usage = {**usage, "tool_input_tokens": 0, "tool_output_tokens": 0}
 
-        usage["context_tokens"] = self.last_context_tokens or 0
+        usage["context_tokens"] = call.context_tokens or 0
 
         msg_metadata: dict[str, Any] = dict(meta)
         msg_metadata["usage"] = usage
-        if tool_interactions:
-            msg_metadata["tool_calls"] = tool_interactions
+        if call.tool_interactions:
+            msg_metadata["tool_calls"] = call.tool_interactions
 
         await db.append_message(
             conversation_id=conversation_id,
@@ -660,13 +706,11 @@ class AIClient:
             context_tokens = usage["input_tokens"]
             if Compactor.should_compact(context_tokens, model_name):
                 printer.info(
-                    f"Context threshold crossed ({context_tokens} context tokens). Triggering blocking compaction."
+                    f"Context watermark crossed ({context_tokens} context tokens). Scheduling background compaction."
                 )
-                compactor = Compactor(self, model_name)
-                await compactor.compact(conversation_id)
+                Compactor.schedule(self, model_name, conversation_id, context_tokens)
 
-        msg_count = await db.get_message_count(conversation_id)
-        if msg_count == 2:
+        if first_exchange:
             self._schedule_background(
                 db.generate_and_set_title(
                     conversation_id=conversation_id,
@@ -725,12 +769,13 @@ class AIClient:
             return []
 
     def list_all_models(self) -> dict[str, list[dict[str, Any]]]:
-        all_models = {}
-        for provider_name in ProviderRegistry.list_providers():
-            models = self.list_models_for_provider(provider_name)
-            if models:
-                all_models[provider_name] = models
-        return all_models
+        """Models for every registered provider, queried concurrently."""
+        provider_names = ProviderRegistry.list_providers()
+        if not provider_names:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(provider_names), thread_name_prefix="list-models") as pool:
+            results = pool.map(self.list_models_for_provider, provider_names)
+            return {name: models for name, models in zip(provider_names, results, strict=True) if models}
 
     def is_configured(self) -> bool:
         return self._provider.is_configured()
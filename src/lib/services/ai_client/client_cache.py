@@ -1,9 +1,20 @@
-"""LRU cache for AIClient instances keyed by conversation ID."""
+"""Bounded cache for AIClient instances keyed by conversation ID."""
 
 from __future__ import annotations
 
+import asyncio
+import gc
+import sys
+import threading
+import time
+import types
 from collections import OrderedDict
-from typing import TYPE_CHECKING
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from ...core.config import Config
+from ...utils.printer import printer
 
 
 if TYPE_CHECKING:
@@ -11,33 +22,241 @@ if TYPE_CHECKING:
 
 _DEFAULT_MAX_SIZE = 200
 
+# Objects shared by every client; counting them per client would only inflate the estimate.
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.CodeType)
+_SIZE_WALK_LIMIT = 20_000
+
+
+def approx_size(root: Any, limit: int = _SIZE_WALK_LIMIT) -> int:
+    """Approximate bytes retained by *root*: ``sys.getsizeof`` over the objects it reaches.
+
+    Follows ``gc`` referents depth-first, skipping classes, modules and
+    functions, and stops after *limit* objects, so a client costs a few
+    milliseconds at most to weigh.
+    """
+    seen = {id(root)}
+    stack = [root]
+    total = 0
+    visited = 0
+    while stack and visited < limit:
+        obj = stack.pop()
+        visited += 1
+        total += sys.getsizeof(obj, 0)
+        for ref in gc.get_referents(obj):
+            if id(ref) not in seen and not isinstance(ref, _SHARED_TYPES):
+                seen.add(id(ref))
+                stack.append(ref)
+    return total
+
+
+def _run_hook(hook: Callable[[str, AIClient], None], key: str, client: AIClient) -> None:
+    try:
+        hook(key, client)
+    except Exception as e:
+        printer.warning(f"AIClientCache cleanup failed for {key}: {e}")
+
+
+@dataclass
+class _Entry:
+    client: AIClient
+    nbytes: int
+    last_used: float
+
 
 class AIClientCache:
-    """Thread-unsafe LRU cache mapping conversation_id -> AIClient.
+    """LRU cache mapping conversation_id -> AIClient.
 
-    Not thread-safe by design — callers in async contexts should protect
-    access with an asyncio.Lock if concurrent mutation is possible.
+    Bounded by entry count, by an approximate byte budget (each client is
+    weighed with *sizeof* when it is cached) and by idle time: a client not
+    used for *idle_ttl* seconds is dropped on the next cache access.  Every
+    client the cache drops — evicted, expired, replaced, removed or cleared —
+    is handed to *on_evict* for cleanup, outside the lock.  From a coroutine
+    the hook runs on a worker thread, since cleanup may block (closing MCP
+    tools, browser sessions).
+
+    ``get_or_create`` is single-flight: concurrent misses for one key await
+    the same build.  Safe to share between threads and coroutines; ``0``
+    disables the TTL and byte bounds.
     """
 
-    def __init__(self, max_size: int = _DEFAULT_MAX_SIZE) -> None:
+    def __init__(
+        self,
+        max_size: int = _DEFAULT_MAX_SIZE,
+        idle_ttl: float = 0,
+        max_bytes: int = 0,
+        on_evict: Callable[[str, AIClient], None] | None = None,
+        sizeof: Callable[[Any], int] = approx_size,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self._max_size = max_size
-        self._cache: OrderedDict[str, AIClient] = OrderedDict()
+        self._idle_ttl = idle_ttl
+        self._max_bytes = max_bytes
+        self._on_evict = on_evict
+        self._sizeof = sizeof
+        self._clock = clock
+        self._cache: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._cleanups: set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @classmethod
+    def from_config(cls, on_evict: Callable[[str, AIClient], None] | None = None) -> AIClientCache:
+        """A cache sized from ``Config`` (``KNIK_AI_CLIENT_CACHE_*``)."""
+        cfg = Config()
+        return cls(
+            max_size=cfg.ai_client_cache_max_size,
+            idle_ttl=cfg.ai_client_cache_idle_ttl,
+            max_bytes=cfg.ai_client_cache_max_bytes,
+            on_evict=on_evict,
+        )
 
     def get(self, key: str) -> AIClient | None:
-        if key not in self._cache:
-            return None
-        self._cache.move_to_end(key)
-        return self._cache[key]
+        with self._lock:
+            dropped = self._expire_locked()
+            entry = self._cache.get(key)
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                entry.last_used = self._clock()
+                self._cache.move_to_end(key)
+        self._release(dropped)
+        return entry.client if entry is not None else None
 
     def set(self, key: str, client: AIClient) -> None:
-        if key in self._cache:
-            self._cache.move_to_end(key)
-        self._cache[key] = client
-        if len(self._cache) > self._max_size:
-            self._cache.popitem(last=False)
+        nbytes = self._sizeof(client) if self._max_bytes else 0
+        with self._lock:
+            dropped = self._store_locked(key, client, nbytes)
+        self._release(dropped)
+
+    async def get_or_create(self, key: str, build: Callable[[], Awaitable[AIClient]]) -> AIClient:
+        """Return the cached client for *key*, building it with *build* on a miss.
+
+        Only one build runs per key; concurrent callers await it (a caller
+        being cancelled does not cancel the build).  A failed build is not
+        cached and its exception reaches every waiter.
+        """
+        with self._lock:
+            dropped = self._expire_locked()
+            entry = self._cache.get(key)
+            task = self._inflight.get(key)
+            if entry is not None:
+                self._hits += 1
+                entry.last_used = self._clock()
+                self._cache.move_to_end(key)
+            elif task is not None:
+                self._coalesced += 1
+            else:
+                self._misses += 1
+                task = self._inflight[key] = asyncio.ensure_future(self._build(key, build))
+        self._release(dropped)
+        if entry is not None:
+            return entry.client
+        return await asyncio.shield(task)
+
+    async def _build(self, key: str, build: Callable[[], Awaitable[AIClient]]) -> AIClient:
+        try:
+            client = await build()
+            nbytes = await asyncio.to_thread(self._sizeof, client) if self._max_bytes else 0
+            with self._lock:
+                dropped = self._store_locked(key, client, nbytes)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        self._release(dropped)
+        return client
 
     def remove(self, key: str) -> None:
-        self._cache.pop(key, None)
+        with self._lock:
+            entry = self._cache.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.nbytes
+        self._release([(key, entry)] if entry is not None else [])
+
+    def clear(self) -> None:
+        with self._lock:
+            dropped = list(self._cache.items())
+            self._cache.clear()
+            self._bytes = 0
+        self._release(dropped)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss/eviction counters and occupancy."""
+        with self._lock:
+            lookups = self._hits + self._misses + self._coalesced
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "builds_in_flight": len(self._inflight),
+                "entries": len(self._cache),
+                "max_size": self._max_size,
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "idle_ttl": self._idle_ttl,
+            }
 
     def __len__(self) -> int:
         return len(self._cache)
+
+    def _store_locked(self, key: str, client: AIClient, nbytes: int) -> list[tuple[str, _Entry]]:
+        """Insert *client* and trim to the bounds. Caller holds the lock; returns the dropped entries."""
+        dropped = self._expire_locked()
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+            if previous.client is not client:
+                dropped.append((key, previous))
+        self._cache[key] = _Entry(client, nbytes, self._clock())
+        self._bytes += nbytes
+        # The newest entry always stays, even if it alone exceeds the byte budget.
+        while len(self._cache) > 1 and (
+            len(self._cache) > self._max_size or (self._max_bytes and self._bytes > self._max_bytes)
+        ):
+            evicted = self._cache.popitem(last=False)
+            self._bytes -= evicted[1].nbytes
+            self._evictions += 1
+            dropped.append(evicted)
+        return dropped
+
+    def _expire_locked(self) -> list[tuple[str, _Entry]]:
+        """Drop entries idle for longer than the TTL. Caller holds the lock."""
+        dropped: list[tuple[str, _Entry]] = []
+        if not self._idle_ttl:
+            return dropped
+        deadline = self._clock() - self._idle_ttl
+        while self._cache:
+            key, entry = next(iter(self._cache.items()))
+            if entry.last_used > deadline:
+                break
+            del self._cache[key]
+            self._bytes -= entry.nbytes
+            self._expirations += 1
+            dropped.append((key, entry))
+        return dropped
+
+    def _release(self, dropped: list[tuple[str, _Entry]]) -> None:
+        hook = self._on_evict
+        if hook is None or not dropped:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        for key, entry in dropped:
+            if loop is None:
+                _run_hook(hook, key, entry.client)
+            else:
+                # Keep the event loop free: the hook may wait on in-flight tool calls.
+                task = loop.create_task(asyncio.to_thread(_run_hook, hook, key, entry.client))
+                self._cleanups.add(task)
+                task.add_done_callback(self._cleanups.discard)
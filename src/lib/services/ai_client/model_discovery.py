@@ -0,0 +1,147 @@
+"""
+Process-wide cache of provider model lists.
+
+Building an ``AIClient`` makes no network calls; model lists are fetched on
+demand on a small background pool and cached per ``(provider, endpoint)``.
+A fresh entry is a dict lookup.  A stale entry is returned at once while a
+single background refresh replaces it (stale-while-revalidate).  Only a
+cold miss waits, and then for at most ``KNIK_MODEL_DISCOVERY_TIMEOUT``
+seconds.  A failed discovery caches the provider's static fallback list for
+``FAILURE_TTL`` seconds, so an unreachable endpoint is not retried on every
+call, and it never replaces a list that was discovered earlier.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from ...core.config import Config
+from ...utils.printer import printer
+from .token_utils import register_context_window
+
+
+if TYPE_CHECKING:
+    from .providers.base_provider import BaseAIProvider
+
+
+FAILURE_TTL = 60.0
+
+
+@dataclass
+class _Entry:
+    models: list[dict[str, Any]]
+    expires_at: float
+    discovered: bool
+
+
+class ModelDiscovery:
+    """
+    Cached, single-flight model discovery.
+
+    Args:
+        ttl: Seconds a discovered model list stays fresh.
+        wait_timeout: Longest a cold miss blocks before returning the
+            provider's fallback list (the fetch keeps running and fills the
+            cache).
+        failure_ttl: Seconds a failed discovery is remembered.
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        wait_timeout: float | None = None,
+        failure_ttl: float = FAILURE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.failure_ttl = min(failure_ttl, ttl)
+        self._clock = clock
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self._inflight: dict[tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="model-discovery")
+
+    @staticmethod
+    def key_for(provider: "BaseAIProvider") -> tuple[str, str]:
+        return provider.get_provider_name(), provider.get_models_endpoint()
+
+    def get(self, provider: "BaseAIProvider") -> list[dict[str, Any]]:
+        """Models for *provider*, blocking only when nothing is cached yet."""
+        key = self.key_for(provider)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at <= self._clock():
+                    self._refresh_locked(provider, key)
+                return entry.models
+            future = self._refresh_locked(provider, key)
+        try:
+            return future.result(self.wait_timeout)
+        except FutureTimeoutError:
+            printer.debug(f"Model discovery for {key[0]} still running; using the static model list")
+            return provider.get_fallback_models()
+
+    def prefetch(self, provider: "BaseAIProvider") -> None:
+        """Start a background refresh if *provider*'s list is missing or stale; never blocks."""
+        key = self.key_for(provider)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= self._clock():
+                self._refresh_locked(provider, key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _refresh_locked(self, provider: "BaseAIProvider", key: tuple[str, str]) -> Future:
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = self._executor.submit(self._fetch, provider, key)
+        return future
+
+    def _fetch(self, provider: "BaseAIProvider", key: tuple[str, str]) -> list[dict[str, Any]]:
+        try:
+            models: list[dict[str, Any]] = []
+            try:
+                models = provider.get_models()
+            except Exception as e:
+                printer.warning(f"Model discovery failed for {key[0]}: {e}")
+
+            if models:
+                for m in models:
+                    register_context_window(m["id"], m["context_window"])
+                entry = _Entry(models, self._clock() + self.ttl, discovered=True)
+            else:
+                with self._lock:
+                    previous = self._entries.get(key)
+                discovered = previous is not None and previous.discovered
+                models = previous.models if discovered else provider.get_fallback_models()
+                entry = _Entry(models, self._clock() + self.failure_ttl, discovered=discovered)
+
+            with self._lock:
+                self._entries[key] = entry
+            return models
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+_discovery: ModelDiscovery | None = None
+_discovery_lock = threading.Lock()
+
+
+def get_model_discovery() -> ModelDiscovery:
+    """Return the process-wide model cache, configured from ``Config`` on first use."""
+    global _discovery
+    if _discovery is None:
+        with _discovery_lock:
+            if _discovery is None:
+                config = Config()
+                _discovery = ModelDiscovery(ttl=config.model_cache_ttl, wait_timeout=config.model_discovery_timeout)
+    return _discovery
@@ -1,6 +1,6 @@
 """AI Provider implementations."""
 
-from .base_provider import BaseAIProvider, ChatResult, ModelInfo
+from .base_provider import BaseAIProvider, CallContext, ChatResult, ModelInfo
 from .custom_provider import CustomProvider
 from .gemini_provider import GeminiAIProvider
 from .mock_provider import MockAIProvider
@@ -12,6 +12,7 @@ from .zhipuai_provider import ZhipuAIProvider
 
 __all__ = [
     "BaseAIProvider",
+    "CallContext",
     "ChatResult",
     "ModelInfo",
     "VertexAIProvider",
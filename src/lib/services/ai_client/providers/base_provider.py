@@ -1,14 +1,17 @@
 """Base AI provider interface and LangChain provider mixin."""
 
+import asyncio
+import contextlib
 import json
+import threading
 from abc import ABC, abstractmethod
-from collections.abc import Generator
-from dataclasses import dataclass
+from collections.abc import AsyncGenerator, Callable, Generator, Iterator
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Optional
 
 from ....core.config import Config
 from ....utils import printer
-from ..token_utils import count_message_tokens, count_tokens, get_context_window, register_context_window
+from ..token_utils import count_message_tokens, count_tokens, get_context_window
 
 
 if TYPE_CHECKING:
@@ -23,6 +26,49 @@ class ChatResult:
     usage: dict[str, int] | None = None  # {input_tokens, output_tokens, total_tokens}
 
 
+@dataclass
+class CallContext:
+    """Usage, tool-call tracking and callbacks of one chat or stream invocation.
+
+    The caller creates one per call and the provider fills it in, so
+    concurrent calls on a shared client or provider never see each other's
+    accounting.  *tool_callback* is called with ``(tool_name, tool_args)``
+    when the model requests a tool.
+    """
+
+    tool_callback: Callable[[str, dict], None] | None = None
+    history_tokens: int | None = None  # persisted token count of the history, when the caller has it
+    usage: dict[str, int] | None = None  # {input_tokens, output_tokens, total_tokens}
+    tool_interactions: list[dict] | None = None
+    tool_tokens: dict[str, int] | None = None  # {tool_input_tokens, tool_output_tokens}
+    context_tokens: int = 0
+
+    def set_tool_interactions(self, interactions: list[dict]) -> None:
+        """Record the finished tool calls and their token totals (no-op when empty)."""
+        if not interactions:
+            return
+        self.tool_interactions = interactions
+        self.tool_tokens = {
+            "tool_output_tokens": sum(t["tokens"]["output_tokens"] for t in interactions),
+            "tool_input_tokens": sum(t["tokens"]["input_tokens"] for t in interactions),
+        }
+
+    def notify_tool_call(self, tool_name: str, tool_args: dict) -> None:
+        if self.tool_callback is None:
+            return
+        try:
+            self.tool_callback(tool_name, tool_args)
+        except Exception as e:
+            printer.warning(f"Tool callback failed for {tool_name}: {e}")
+
+    def reset(self) -> None:
+        """Forget everything recorded so far (e.g. after the call failed)."""
+        self.usage = None
+        self.tool_interactions = None
+        self.tool_tokens = None
+        self.context_tokens = 0
+
+
 @dataclass
 class ModelInfo:
     """Information about an available model."""
@@ -41,6 +87,15 @@ class ModelInfo:
         }
 
 
+@dataclass
+class _AgentStreamState:
+    """Usage and tool bookkeeping carried across the events of one agent stream."""
+
+    usage: dict[str, int] | None = None
+    tool_interactions: list[dict] = field(default_factory=list)
+    pending_tool_calls: dict[str, dict] = field(default_factory=dict)
+
+
 class BaseAIProvider(ABC):
     @classmethod
     def get_provider_name(cls) -> str:
@@ -51,12 +106,55 @@ class BaseAIProvider(ABC):
         pass
 
     @abstractmethod
-    def chat(self, prompt: str, history: list = None, **kwargs) -> str | ChatResult:
-        pass
+    def chat(self, prompt: str, history: list = None, *, call: CallContext | None = None, **kwargs) -> str | ChatResult:
+        """Run one chat call, recording usage and tool calls in *call*."""
 
     @abstractmethod
-    def chat_stream(self, prompt: str, history: list = None, **kwargs) -> Generator[str, None, None]:
-        pass
+    def chat_stream(
+        self, prompt: str, history: list = None, *, call: CallContext | None = None, **kwargs
+    ) -> Generator[str, None, None]:
+        """Stream one chat call; *call* is complete once the stream is exhausted."""
+
+    async def achat_stream(
+        self, prompt: str, history: list = None, *, call: CallContext | None = None, **kwargs
+    ) -> AsyncGenerator[str | dict, None]:
+        """Async :meth:`chat_stream`.
+
+        This fallback runs the synchronous stream on a worker thread (holding
+        one executor slot for the whole stream) and hands chunks to the event
+        loop. Providers with an async client override it.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        cancelled = threading.Event()
+
+        def _put(item) -> None:
+            # RuntimeError: the loop closed while the stream was still producing.
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        def _produce() -> None:
+            try:
+                with contextlib.closing(self.chat_stream(prompt, history=history, call=call, **kwargs)) as stream:
+                    for chunk in stream:
+                        if cancelled.is_set():
+                            break
+                        _put(chunk)
+            except Exception as e:
+                _put(e)
+            finally:
+                _put(done)
+
+        producer = loop.run_in_executor(None, _produce)
+        try:
+            while (item := await queue.get()) is not done:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+        await producer
 
     @abstractmethod
     def is_configured(self) -> bool:
@@ -86,24 +184,26 @@ class BaseAIProvider(ABC):
         "zai_coding": ["glm"],
     }
 
-    def get_models_with_fallback(self) -> list[dict[str, Any]]:
-        """Get models from API, falling back to Config.AI_MODELS on failure.
-
-        Tries get_models() first. If it returns an empty list or raises,
-        filters Config.AI_MODELS for models belonging to this provider.
+    def get_models_endpoint(self) -> str:
+        """Endpoint the model list is fetched from; with the provider name it keys the model cache."""
+        return getattr(self, "api_base", None) or ""
 
-        All returned models have their context_window registered in the
-        runtime cache so that ``get_context_window()`` uses live values.
+    def get_models_with_fallback(self) -> list[dict[str, Any]]:
+        """Get models from the process-wide model cache, falling back to Config.AI_MODELS.
+
+        The first call per provider and endpoint runs get_models() on the
+        discovery pool (waiting at most ``model_discovery_timeout`` seconds);
+        later calls are served from the cache and refreshed in the background
+        once ``model_cache_ttl`` expires. Discovered models have their
+        context_window registered so that ``get_context_window()`` uses live
+        values.
         """
-        try:
-            models = self.get_models()
-            if models:
-                for m in models:
-                    register_context_window(m["id"], m["context_window"])
-                return models
-        except Exception as e:
-            printer.warning(f"Model discovery failed for {self.get_provider_name()}: {e}")
+        from ..model_discovery import get_model_discovery
 
+        return get_model_discovery().get(self)
+
+    def get_fallback_models(self) -> list[dict[str, Any]]:
+        """Models from Config.AI_MODELS that belong to this provider."""
         try:
             provider_name = self.get_provider_name()
             prefixes = self._PROVIDER_MODEL_PREFIXES.get(provider_name, [])
@@ -146,10 +246,6 @@ class LangChainProvider(BaseAIProvider):
         self.config = config
         self.system_instruction = system_instruction
         self.tool_callback = tool_callback
-        self.last_usage: dict[str, int] | None = None
-        self.last_tool_tokens: dict | None = None
-        self.last_tool_interactions: list | None = None
-        self.last_context_tokens: int = 0
 
         self.agent = agent
         self.mcp_registry = mcp_registry
@@ -181,7 +277,10 @@ class LangChainProvider(BaseAIProvider):
                 printer.success(f"✓ {provider_name} initialized (no tools)")
 
     @staticmethod
-    def _count_history_tokens(history) -> int:
+    def _count_history_tokens(history, known: int | None = None) -> int:
+        """Context size of *history*: *known* (its persisted count) if given, else encoded here."""
+        if known is not None:
+            return known
         if not history:
             return 0
         dicts = []
@@ -282,21 +381,21 @@ class LangChainProvider(BaseAIProvider):
     def get_provider_name(cls) -> str:
         return "langchain"
 
-    def chat(self, prompt: str, history: list = None, **kwargs) -> ChatResult:
+    def chat(self, prompt: str, history: list = None, *, call: CallContext | None = None, **kwargs) -> ChatResult:
         """
         Chat with AI. Uses agent with tools if available, otherwise direct LLM call.
-        Returns ChatResult with content and usage metadata.
+        Returns ChatResult with content and usage metadata; *call* also gets
+        the tool calls and context size.
         """
-        self.last_context_tokens = self._count_history_tokens(history)
+        call = call if call is not None else CallContext(tool_callback=self.tool_callback)
+        call.context_tokens = self._count_history_tokens(history, call.history_tokens)
         agent_messages = self._build_agent_messages(history, prompt)
 
         if not self.agent:
-            self.last_tool_tokens = None
-            self.last_tool_interactions = None
             result = self.llm.invoke(agent_messages, **kwargs)
-            self.last_usage = self._extract_usage(result)
+            call.usage = self._extract_usage(result)
             content = self._extract_text_from_content(result.content)
-            return ChatResult(content=content, usage=self.last_usage)
+            return ChatResult(content=content, usage=call.usage)
 
         agent_result = self.agent.invoke({"messages": agent_messages}, **kwargs)
 
@@ -333,6 +432,7 @@ class LangChainProvider(BaseAIProvider):
                                     "tool_args": tc.get("args", {}),
                                     "arg_tokens": arg_tokens,
                                 }
+                                call.notify_tool_call(tc.get("name", "unknown"), tc.get("args", {}))
 
                     elif "ToolMessage" in msg_class:
                         tool_call_id = getattr(msg, "tool_call_id", None)
@@ -366,16 +466,8 @@ class LangChainProvider(BaseAIProvider):
                                 }
                             )
 
-                self.last_usage = accumulated_usage
-                self.last_tool_interactions = tool_interactions if tool_interactions else None
-                self.last_tool_tokens = (
-                    {
-                        "tool_output_tokens": sum(t["tokens"]["output_tokens"] for t in tool_interactions),
-                        "tool_input_tokens": sum(t["tokens"]["input_tokens"] for t in tool_interactions),
-                    }
-                    if tool_interactions
-                    else None
-                )
+                call.usage = accumulated_usage
+                call.set_tool_interactions(tool_interactions)
 
                 last_message = messages[-1]
                 if hasattr(last_message, "content"):
@@ -386,17 +478,11 @@ class LangChainProvider(BaseAIProvider):
                     output = str(last_message)
             else:
                 output = agent_result.get("output", agent_result.get("result", ""))
-                self.last_usage = None
-                self.last_tool_tokens = None
-                self.last_tool_interactions = None
         else:
             output = str(agent_result)
-            self.last_usage = None
-            self.last_tool_tokens = None
-            self.last_tool_interactions = None
 
         content = self._extract_text_from_content(output) if output else ""
-        return ChatResult(content=content, usage=self.last_usage)
+        return ChatResult(content=content, usage=call.usage)
 
     def _yield_content(self, content):
         if isinstance(content, str) and content:
@@ -408,12 +494,94 @@ class LangChainProvider(BaseAIProvider):
                     if text:
                         yield text
 
-    def chat_stream(self, prompt: str, history: list = None, **kwargs) -> Generator[str | dict, None, None]:
-        self.last_context_tokens = self._count_history_tokens(history)
-        agent_messages = self._build_agent_messages(history, prompt)
-        self.last_usage = None
-        self.last_tool_tokens = None
-        self.last_tool_interactions = None
+    def _start_stream(self, prompt: str, history: list | None, call: CallContext) -> list[dict]:
+        call.context_tokens = self._count_history_tokens(history, call.history_tokens)
+        return self._build_agent_messages(history, prompt)
+
+    def _agent_stream_items(self, event, state: "_AgentStreamState", call: CallContext) -> Iterator[str | dict]:
+        """Text chunks and tool sentinels for one ``stream_mode="messages"`` agent event."""
+        if not (isinstance(event, tuple) and len(event) >= 1):
+            return
+        message = event[0]
+        message_class = message.__class__.__name__
+
+        if "Tool" in message_class:
+            tool_call_id = getattr(message, "tool_call_id", None)
+            tool_name = getattr(message, "name", "unknown")
+            content = getattr(message, "content", "")
+            result_tokens = count_tokens(str(content) if content else "")
+
+            if tool_call_id and tool_call_id in state.pending_tool_calls:
+                tc_info = state.pending_tool_calls.pop(tool_call_id)
+                state.tool_interactions.append(
+                    {
+                        "tool_name": tc_info["tool_name"],
+                        "tool_args": tc_info["tool_args"],
+                        "tool_result": content,
+                        "tokens": {
+                            "output_tokens": tc_info["arg_tokens"],
+                            "input_tokens": result_tokens,
+                        },
+                    }
+                )
+            else:
+                state.tool_interactions.append(
+                    {
+                        "tool_name": tool_name,
+                        "tool_args": {},
+                        "tool_result": content,
+                        "tokens": {
+                            "output_tokens": 0,
+                            "input_tokens": result_tokens,
+                        },
+                    }
+                )
+
+            yield {
+                "__tool_call_end__": True,
+                "tool_name": tool_name,
+                "tool_call_id": tool_call_id,
+                "tool_result_preview": str(content)[:200],
+            }
+            return
+
+        if "AIMessage" in message_class:
+            u = self._extract_usage(message)
+            if u:
+                usage = state.usage
+                if usage is None:
+                    usage = state.usage = dict.fromkeys(u, 0)
+                usage["input_tokens"] = u.get("input_tokens", 0)
+                usage["output_tokens"] = usage.get("output_tokens", 0) + u.get("output_tokens", 0)
+                usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+
+            if hasattr(message, "tool_calls") and message.tool_calls:
+                yield from self._yield_content(message.content)
+                for tc in message.tool_calls:
+                    tc_id = tc.get("id") or tc.get("name", "unknown")
+                    args_json = json.dumps(tc.get("args", {}))
+                    arg_tokens = count_tokens(args_json)
+                    state.pending_tool_calls[tc_id] = {
+                        "tool_name": tc.get("name", "unknown"),
+                        "tool_args": tc.get("args", {}),
+                        "arg_tokens": arg_tokens,
+                    }
+                    call.notify_tool_call(tc.get("name", "unknown"), tc.get("args", {}))
+                    yield {
+                        "__tool_call_start__": True,
+                        "tool_name": tc.get("name", "unknown"),
+                        "tool_call_id": tc_id,
+                        "tool_args": tc.get("args", {}),
+                    }
+                return
+
+            yield from self._yield_content(message.content)
+
+    def chat_stream(
+        self, prompt: str, history: list = None, *, call: CallContext | None = None, **kwargs
+    ) -> Generator[str | dict, None, None]:
+        call = call if call is not None else CallContext(tool_callback=self.tool_callback)
+        agent_messages = self._start_stream(prompt, history, call)
 
         if not self.agent:
             last_chunk = None
@@ -422,100 +590,43 @@ class LangChainProvider(BaseAIProvider):
                 yield from self._yield_content(chunk.content)
 
             if last_chunk is not None:
-                self.last_usage = self._extract_usage(last_chunk)
+                call.usage = self._extract_usage(last_chunk)
             return
 
-        accumulated_usage: dict[str, int] | None = None
-        tool_interactions: list[dict] = []
-        pending_tool_calls: dict[str, dict] = {}
-
+        state = _AgentStreamState()
         for event in self.agent.stream({"messages": agent_messages}, stream_mode="messages", **kwargs):
-            if not (isinstance(event, tuple) and len(event) >= 1):
-                continue
-            message = event[0]
-            message_class = message.__class__.__name__
-
-            if "Tool" in message_class:
-                tool_call_id = getattr(message, "tool_call_id", None)
-                tool_name = getattr(message, "name", "unknown")
-                content = getattr(message, "content", "")
-                result_tokens = count_tokens(str(content) if content else "")
-
-                if tool_call_id and tool_call_id in pending_tool_calls:
-                    tc_info = pending_tool_calls.pop(tool_call_id)
-                    tool_interactions.append(
-                        {
-                            "tool_name": tc_info["tool_name"],
-                            "tool_args": tc_info["tool_args"],
-                            "tool_result": content,
-                            "tokens": {
-                                "output_tokens": tc_info["arg_tokens"],
-                                "input_tokens": result_tokens,
-                            },
-                        }
-                    )
-                else:
-                    tool_interactions.append(
-                        {
-                            "tool_name": tool_name,
-                            "tool_args": {},
-                            "tool_result": content,
-                            "tokens": {
-                                "output_tokens": 0,
-                                "input_tokens": result_tokens,
-                            },
-                        }
-                    )
-
-                yield {
-                    "__tool_call_end__": True,
-                    "tool_name": tool_name,
-                    "tool_call_id": tool_call_id,
-                    "tool_result_preview": str(content)[:200],
-                }
-                continue
-
-            if "AIMessage" in message_class:
-                u = self._extract_usage(message)
-                if u:
-                    if accumulated_usage is None:
-                        accumulated_usage = dict.fromkeys(u, 0)
-                    accumulated_usage["input_tokens"] = u.get("input_tokens", 0)
-                    accumulated_usage["output_tokens"] = accumulated_usage.get("output_tokens", 0) + u.get(
-                        "output_tokens", 0
-                    )
-                    accumulated_usage["total_tokens"] = (
-                        accumulated_usage["input_tokens"] + accumulated_usage["output_tokens"]
-                    )
-
-                if hasattr(message, "tool_calls") and message.tool_calls:
-                    yield from self._yield_content(message.content)
-                    for tc in message.tool_calls:
-                        tc_id = tc.get("id") or tc.get("name", "unknown")
-                        args_json = json.dumps(tc.get("args", {}))
-                        arg_tokens = count_tokens(args_json)
-                        pending_tool_calls[tc_id] = {
-                            "tool_name": tc.get("name", "unknown"),
-                            "tool_args": tc.get("args", {}),
-                            "arg_tokens": arg_tokens,
-                        }
-                        yield {
-                            "__tool_call_start__": True,
-                            "tool_name": tc.get("name", "unknown"),
-                            "tool_call_id": tc_id,
-                            "tool_args": tc.get("args", {}),
-                        }
-                    continue
+            yield from self._agent_stream_items(event, state, call)
+        call.usage = state.usage
+        call.set_tool_interactions(state.tool_interactions)
 
-                yield from self._yield_content(message.content)
+    async def achat_stream(
+        self, prompt: str, history: list = None, *, call: CallContext | None = None, **kwargs
+    ) -> AsyncGenerator[str | dict, None]:
+        """Native async :meth:`chat_stream` over the LLM's / agent's ``astream``.
 
-        self.last_usage = accumulated_usage
-        if tool_interactions:
-            self.last_tool_interactions = tool_interactions
-            self.last_tool_tokens = {
-                "tool_output_tokens": sum(t["tokens"]["output_tokens"] for t in tool_interactions),
-                "tool_input_tokens": sum(t["tokens"]["input_tokens"] for t in tool_interactions),
-            }
+        Runs on the event loop instead of a worker thread; tools without a
+        coroutine are still executed on the default executor by LangChain.
+        """
+        call = call if call is not None else CallContext(tool_callback=self.tool_callback)
+        agent_messages = self._start_stream(prompt, history, call)
+
+        if not self.agent:
+            last_chunk = None
+            async for chunk in self.llm.astream(agent_messages, **kwargs):
+                last_chunk = chunk
+                for text in self._yield_content(chunk.content):
+                    yield text
+
+            if last_chunk is not None:
+                call.usage = self._extract_usage(last_chunk)
+            return
+
+        state = _AgentStreamState()
+        async for event in self.agent.astream({"messages": agent_messages}, stream_mode="messages", **kwargs):
+            for item in self._agent_stream_items(event, state, call):
+                yield item
+        call.usage = state.usage
+        call.set_tool_interactions(state.tool_interactions)
 
     def get_models(self) -> list[dict[str, Any]]:
         """Default implementation returns empty list.
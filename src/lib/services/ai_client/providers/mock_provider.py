@@ -1,12 +1,14 @@
 """Mock AI Provider implementation for testing."""
 
+import asyncio
 import time
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from typing import TYPE_CHECKING, Any
 
+from ....core.config import Config
 from ....utils import printer
 from ..registry import ProviderRegistry
-from .base_provider import BaseAIProvider, ChatResult
+from .base_provider import BaseAIProvider, CallContext, ChatResult
 
 
 if TYPE_CHECKING:
@@ -18,11 +20,22 @@ class MockAIProvider(BaseAIProvider):
     def get_provider_name(cls) -> str:
         return "mock"
 
-    def __init__(self, mcp_registry: "MCPServerRegistry" = None, system_instruction: str | None = None):
-        """Initialize the mock provider with canned responses."""
+    def __init__(
+        self,
+        mcp_registry: "MCPServerRegistry" = None,
+        system_instruction: str | None = None,
+        word_delay: float | None = None,
+        **kwargs,
+    ):
+        """Initialize the mock provider with canned responses.
+
+        ``word_delay`` is the pause before each streamed word (defaults to
+        ``KNIK_MOCK_WORD_DELAY``).  Other kwargs (``model``, ...) are accepted
+        and ignored so the mock can stand in for any provider.
+        """
         self.mcp_registry = mcp_registry
         self.system_instruction = system_instruction
-        self.last_usage: dict[str, int] | None = None
+        self.word_delay = Config().mock_word_delay if word_delay is None else word_delay
         self._responses = [
             "Mock AI response. Configure Vertex AI for real responses.",
             "I'm a mock assistant. Set GOOGLE_CLOUD_PROJECT to use real AI.",
@@ -30,26 +43,46 @@ class MockAIProvider(BaseAIProvider):
         ]
         self._index = 0
 
-    def chat(self, prompt: str, history: list = None, **kwargs) -> ChatResult:
+    def chat(self, prompt: str, history: list = None, *, call: CallContext | None = None, **kwargs) -> ChatResult:
         response = self._responses[self._index % len(self._responses)]
         self._index += 1
         printer.debug(f"[MOCK] Chat: {prompt[:60]}...")
         printer.debug(f"[MOCK] Response: {response}")
-        self.last_usage = {"input_tokens": 10, "output_tokens": 15, "total_tokens": 25}
-        return ChatResult(content=response, usage=self.last_usage)
+        usage = {"input_tokens": 10, "output_tokens": 15, "total_tokens": 25}
+        if call is not None:
+            call.usage = usage
+        return ChatResult(content=response, usage=usage)
 
-    def chat_stream(self, prompt: str, history: list = None, **kwargs) -> Generator[str, None, None]:
+    def _next_stream_words(self, prompt: str) -> list[str]:
         response = self._responses[self._index % len(self._responses)]
         self._index += 1
         printer.debug(f"[MOCK] Streaming Chat: {prompt[:60]}...")
+        return response.split()
 
-        words = response.split()
+    def _finish_stream(self, words: list[str], call: CallContext | None) -> None:
+        if call is not None:
+            call.usage = {"input_tokens": 10, "output_tokens": len(words), "total_tokens": 10 + len(words)}
+        printer.debug("[MOCK] Streaming complete")
+
+    def chat_stream(
+        self, prompt: str, history: list = None, *, call: CallContext | None = None, **kwargs
+    ) -> Generator[str, None, None]:
+        words = self._next_stream_words(prompt)
         for word in words:
-            time.sleep(0.05)
+            if self.word_delay > 0:
+                time.sleep(self.word_delay)
             yield word + " "
+        self._finish_stream(words, call)
 
-        self.last_usage = {"input_tokens": 10, "output_tokens": len(words), "total_tokens": 10 + len(words)}
-        printer.debug("[MOCK] Streaming complete")
+    async def achat_stream(
+        self, prompt: str, history: list = None, *, call: CallContext | None = None, **kwargs
+    ) -> AsyncGenerator[str, None]:
+        words = self._next_stream_words(prompt)
+        for word in words:
+            if self.word_delay > 0:
+                await asyncio.sleep(self.word_delay)
+            yield word + " "
+        self._finish_stream(words, call)
 
     def get_models(self) -> list[dict[str, Any]]:
         return [
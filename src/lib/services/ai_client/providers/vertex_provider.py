@@ -97,6 +97,9 @@ class VertexAIProvider(LangChainProvider):
             model=model_name,
         )
 
+    def get_models_endpoint(self) -> str:
+        return f"https://{self.location}-aiplatform.googleapis.com"
+
     def get_models(self) -> list[dict[str, Any]]:
         """Query Vertex AI for available Gemini models."""
         try:
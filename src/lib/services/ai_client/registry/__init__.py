@@ -2,6 +2,7 @@
 
 from .mcp_registry import MCPServerRegistry
 from .provider_registry import ProviderRegistry
+from .tool_catalog import ToolCatalog
 
 
-__all__ = ["ProviderRegistry", "MCPServerRegistry"]
+__all__ = ["ProviderRegistry", "MCPServerRegistry", "ToolCatalog"]
@@ -1,17 +1,19 @@
 """MCP tool registry"""
 
 import threading
+import time
 from collections.abc import Callable
 from typing import Any
 
 from lib.services.ai_client.base_tool import BaseTool
 from lib.services.ai_client.consent import ConsentGate, ConsentRequest
+from lib.services.ai_client.registry.tool_catalog import ToolCatalog, build_args_model
+from lib.utils.metrics import metrics, span
 from lib.utils.printer import printer
 
 
 try:
     from langchain_core.tools import StructuredTool
-    from pydantic import Field, create_model
 
     LANGCHAIN_AVAILABLE = True
 except ImportError:
@@ -19,41 +21,68 @@ except ImportError:
     StructuredTool = None
 
 
+_TOOL_CALLS = metrics.counter("knik_tool_calls_total", "Tool executions by outcome", ("tool", "status"))
+_TOOL_SECONDS = metrics.histogram("knik_tool_duration_seconds", "Tool execution time", ("tool",))
+
+
 class MCPServerRegistry:
     """Registry for tool schemas and implementations.
 
-    Each instance owns its own tool state. Create a new instance for an
-    isolated set of tools; reuse an existing instance when you want to
-    share tools across components (e.g. an app-level registry).
+    Each instance owns its own session state (consent gate, approvals,
+    session-scoped tools).  Attach a shared :class:`ToolCatalog` to expose
+    the process-wide tools without rebuilding their schemas; tools passed
+    to :meth:`register_tool` are local to this instance.
     """
 
-    def __init__(self):
+    def __init__(self, catalog: ToolCatalog | None = None):
+        self._catalog: ToolCatalog | None = None
         self._tools: list[dict[str, Any]] = []
         self._implementations: dict[str, Callable] = {}
         self._tool_instances: list[BaseTool] = []
         self._consent_gate: ConsentGate | None = None
         self._allowed_tools: set[str] = set()
         self._consent_lock = threading.Lock()
+        self._langchain_tools: list | None = None
+        if catalog is not None:
+            self.attach_catalog(catalog)
 
     def set_consent_gate(self, gate: ConsentGate) -> None:
         self._consent_gate = gate
         printer.info(f"Consent gate attached: {type(gate).__name__}")
 
+    def attach_catalog(self, catalog: ToolCatalog) -> int:
+        """Expose *catalog*'s tools through this registry. Returns the tool count."""
+        self._catalog = catalog
+        for tool_cls in catalog.session_classes:
+            tool = tool_cls()
+            self._tool_instances.append(tool)
+            self._implementations.update(tool.get_implementations())
+        self._langchain_tools = None
+        return len(catalog)
+
     def register_tool(self, tool_dict: dict[str, Any], implementation: Callable | None = None) -> None:
         self._tools.append(tool_dict)
         if implementation:
             tool_name = tool_dict.get("name")
             if tool_name:
                 self._implementations[tool_name] = implementation
+        self._langchain_tools = None
 
     def get_tools(self) -> list[dict[str, Any]]:
-        return self._tools
+        if self._catalog is None:
+            return self._tools
+        return [*self._catalog.definitions, *self._tools]
 
     def get_implementation(self, tool_name: str) -> Callable | None:
-        return self._implementations.get(tool_name)
+        impl = self._implementations.get(tool_name)
+        if impl is None and self._catalog is not None:
+            impl = self._catalog.get_implementation(tool_name)
+        return impl
 
     def _requires_consent(self, tool_name: str) -> bool:
-        if not self._tool_instances:
+        if not self._tool_instances and self._catalog is None:
+            return True
+        if self._catalog is not None and self._catalog.requires_consent(tool_name):
             return True
         return any(tool_name in type(inst).consent_required_for for inst in self._tool_instances)
 
@@ -73,16 +102,29 @@ class MCPServerRegistry:
                     printer.info(f"Consent granted for {tool_name} (this call only)")
                 else:
                     printer.warning(f"Consent denied for {tool_name}")
+                    _TOOL_CALLS.inc(tool=tool_name, status="denied")
                     return {"error": f"Permission denied for {tool_name}"}
         impl = self.get_implementation(tool_name)
         if impl is None:
             raise ValueError(f"No implementation found for tool: {tool_name}")
-        return impl(**kwargs)
+        with span("tool", tool=tool_name):
+            start = time.perf_counter()
+            try:
+                result = impl(**kwargs)
+            except Exception:
+                _TOOL_CALLS.inc(tool=tool_name, status="error")
+                raise
+            finally:
+                _TOOL_SECONDS.observe(time.perf_counter() - start, tool=tool_name)
+        _TOOL_CALLS.inc(tool=tool_name, status="ok")
+        return result
 
     def clear_tools(self) -> None:
+        self._catalog = None
         self._tools = []
         self._implementations = {}
         self._tool_instances = []
+        self._langchain_tools = None
         with self._consent_lock:
             self._allowed_tools = set()
 
@@ -96,9 +138,12 @@ class MCPServerRegistry:
         printer.info(f"Revoked tool approvals: {cleared}")
 
     def get_tool_instances(self) -> list[BaseTool]:
-        return list(self._tool_instances)
+        if self._catalog is None:
+            return list(self._tool_instances)
+        return [*self._catalog.shared_instances, *self._tool_instances]
 
     def cleanup_tools(self) -> None:
+        # Catalog-shared tools are process-wide and torn down by BaseTool.cleanup_all().
         for tool in self._tool_instances:
             try:
                 tool.cleanup()
@@ -109,80 +154,53 @@ class MCPServerRegistry:
     def create_langchain_tools(self) -> list:
         if not LANGCHAIN_AVAILABLE:
             return []
+        # Providers ask for the tool list several times while wiring up an
+        # agent; the wrappers only change when the registered tools do.
+        if self._langchain_tools is None:
+            self._langchain_tools = self._build_langchain_tools()
+        return list(self._langchain_tools)
+
+    def _build_langchain_tools(self) -> list:
+        prebuilt = self._catalog.definitions if self._catalog is not None else ()
+        schemas = [(schema, True) for schema in prebuilt] + [(schema, False) for schema in self._tools]
 
         tools = []
-        type_mapping = {
-            "string": str,
-            "integer": int,
-            "number": float,
-            "boolean": bool,
-            "object": dict[str, Any],
-            "array": list[Any],
-        }
-
-        for schema in self._tools:
+        for schema, from_catalog in schemas:
             func_def = schema.get("function", schema)
             tool_name = func_def.get("name")
             description = func_def.get("description", "")
-            params = func_def.get("parameters", {})
 
             if not tool_name:
                 continue
 
-            if tool_name not in self._implementations:
+            if self.get_implementation(tool_name) is None:
                 continue
 
-            def make_tool_func(name: str) -> Callable:
-                def tool_func(**kwargs):
-                    printer.info(f"Tool Input: {name}({kwargs})")
-                    try:
-                        result = self.execute_tool(name, **kwargs)
-                        printer.info(f"Tool Output: {name} -> {result}")
-                        return result
-                    except Exception as e:
-                        printer.error(f"Tool Error: {name} -> {e}")
-                        return {"error": str(e)}
-
-                return tool_func
-
-            fields = {}
-            for name, prop in params.get("properties", {}).items():
-                prop_type = prop.get("type", "string")
-                is_required = name in params.get("required", [])
-
-                if prop_type not in type_mapping:
-                    printer.warning(
-                        f"Unknown parameter type '{prop_type}' for tool '{tool_name}', defaulting to 'string'"
-                    )
-                    prop_type = "string"
-
-                if prop_type == "object":
-                    fields[name] = (
-                        dict[str, Any] if is_required else dict[str, Any] | None,
-                        Field(description=prop.get("description", ""), default=None if not is_required else ...),
-                    )
-                elif prop_type == "array":
-                    fields[name] = (
-                        list[Any] if is_required else list[Any] | None,
-                        Field(description=prop.get("description", ""), default=None if not is_required else ...),
-                    )
-                else:
-                    py_type = type_mapping.get(prop_type, str)
-                    is_required = name in params.get("required", [])
-                    fields[name] = (
-                        py_type if is_required else py_type | None,
-                        Field(description=prop.get("description", ""), default=None if not is_required else ...),
-                    )
-
-            ArgsModel = create_model(f"{tool_name}Args", **fields)
+            if from_catalog:
+                args_model = self._catalog.get_args_model(tool_name)
+            else:
+                args_model = build_args_model(tool_name, func_def.get("parameters", {}))
 
             tools.append(
                 StructuredTool(
                     name=tool_name,
                     description=description or f"Execute {tool_name}",
-                    func=make_tool_func(tool_name),
-                    args_schema=ArgsModel,
+                    func=self._make_tool_func(tool_name),
+                    args_schema=args_model,
                 )
             )
 
         return tools
+
+    def _make_tool_func(self, name: str) -> Callable:
+        def tool_func(**kwargs):
+            printer.info(f"Tool Input: {name}({kwargs})")
+            try:
+                result = self.execute_tool(name, **kwargs)
+                printer.info(f"Tool Output: {name} -> {result}")
+                return result
+            except Exception as e:
+                printer.error(f"Tool Error: {name} -> {e}")
+                return {"error": str(e)}
+
+        return tool_func
@@ -0,0 +1,133 @@
+"""Process-wide, immutable tool catalog.
+
+Tool definitions and their LangChain argument schemas never change at runtime,
+yet every client used to re-instantiate all tools and regenerate a pydantic
+``create_model`` class per tool.  A ``ToolCatalog`` does that work once; each
+``MCPServerRegistry`` then acts as a lightweight per-session view over it that
+only carries session state (consent gate, approvals, session-scoped tools).
+"""
+
+from collections.abc import Callable, Iterable
+from types import MappingProxyType
+from typing import Any
+
+from lib.services.ai_client.base_tool import BaseTool
+from lib.utils.printer import printer
+
+
+try:
+    from pydantic import Field, create_model
+
+    PYDANTIC_AVAILABLE = True
+except ImportError:
+    PYDANTIC_AVAILABLE = False
+
+
+_TYPE_MAPPING: dict[str, Any] = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "object": dict[str, Any],
+    "array": list[Any],
+}
+
+
+def build_args_model(tool_name: str, params: dict[str, Any]) -> type | None:
+    """Build the pydantic args schema LangChain needs for a tool definition."""
+    if not PYDANTIC_AVAILABLE:
+        return None
+
+    required = params.get("required", [])
+    fields = {}
+    for name, prop in params.get("properties", {}).items():
+        prop_type = prop.get("type", "string")
+        is_required = name in required
+
+        if prop_type not in _TYPE_MAPPING:
+            printer.warning(f"Unknown parameter type '{prop_type}' for tool '{tool_name}', defaulting to 'string'")
+            prop_type = "string"
+
+        py_type = _TYPE_MAPPING[prop_type]
+        fields[name] = (
+            py_type if is_required else py_type | None,
+            Field(description=prop.get("description", ""), default=None if not is_required else ...),
+        )
+
+    return create_model(f"{tool_name}Args", **fields)
+
+
+class ToolCatalog:
+    """Immutable set of tool definitions, implementations and prebuilt schemas.
+
+    Build it once per process with :meth:`from_tool_classes` and share it
+    between registries.  Tool classes marked ``session_scoped`` keep their
+    definitions and schemas here, but each registry instantiates its own copy
+    so per-session resources (e.g. a browser) stay isolated.
+    """
+
+    def __init__(self, tools: Iterable[BaseTool]):
+        definitions: list[dict[str, Any]] = []
+        implementations: dict[str, Callable] = {}
+        args_models: dict[str, type | None] = {}
+        shared: list[BaseTool] = []
+        session_classes: list[type[BaseTool]] = []
+        consent_required: set[str] = set()
+
+        for tool in tools:
+            tool_cls = type(tool)
+            if tool_cls.session_scoped:
+                session_classes.append(tool_cls)
+            else:
+                shared.append(tool)
+            consent_required.update(tool_cls.consent_required_for)
+
+            impls = tool.get_implementations()
+            for tool_def in tool.get_definitions():
+                tool_name = tool_def.get("name")
+                impl = impls.get(tool_name)
+                if not tool_name or not impl:
+                    continue
+                definitions.append(tool_def)
+                if not tool_cls.session_scoped:
+                    implementations[tool_name] = impl
+                func_def = tool_def.get("function", tool_def)
+                args_models[tool_name] = build_args_model(tool_name, func_def.get("parameters", {}))
+
+        self._definitions = tuple(definitions)
+        self._implementations = MappingProxyType(implementations)
+        self._args_models = MappingProxyType(args_models)
+        self._shared_instances = tuple(shared)
+        self._session_classes = tuple(session_classes)
+        self._consent_required = frozenset(consent_required)
+
+    @classmethod
+    def from_tool_classes(cls, tool_classes: Iterable[type[BaseTool]]) -> "ToolCatalog":
+        return cls(tool_cls() for tool_cls in tool_classes)
+
+    @property
+    def definitions(self) -> tuple[dict[str, Any], ...]:
+        return self._definitions
+
+    @property
+    def shared_instances(self) -> tuple[BaseTool, ...]:
+        return self._shared_instances
+
+    @property
+    def session_classes(self) -> tuple[type[BaseTool], ...]:
+        return self._session_classes
+
+    def get_implementation(self, tool_name: str) -> Callable | None:
+        return self._implementations.get(tool_name)
+
+    def get_args_model(self, tool_name: str) -> type | None:
+        return self._args_models.get(tool_name)
+
+    def has_tool(self, tool_name: str) -> bool:
+        return tool_name in self._args_models
+
+    def requires_consent(self, tool_name: str) -> bool:
+        return tool_name in self._consent_required
+
+    def __len__(self) -> int:
+        return len(self._definitions)
@@ -28,6 +28,9 @@ except ImportError:
 _DEFAULT_ENCODING = "cl100k_base"
 _encoder_cache: dict[str, Any] = {}
 
+# Every reply is primed with 3 tokens: <|start|>assistant<|message|>
+REPLY_PRIMING_TOKENS = 3
+
 
 def _get_encoder(model: str) -> Any:
     """Get a tiktoken encoder for the given model.
@@ -70,7 +73,7 @@ def count_tokens(text: str, model: str = "gpt-4") -> int:
     return len(encoder.encode(text))
 
 
-def count_message_tokens(messages: list[dict[str, Any]], model: str = "gpt-4") -> int:
+def count_message_tokens(messages: list[dict[str, Any]], model: str = "gpt-4", prime: bool = True) -> int:
     """Count tokens for a list of chat messages.
 
     Accounts for the per-message overhead that chat models add
@@ -81,11 +84,13 @@ def count_message_tokens(messages: list[dict[str, Any]], model: str = "gpt-4") -
       - tokens for the content
       - tokens for any tool_calls (serialized as JSON)
 
-    Plus 3 tokens for the overall reply priming.
+    Plus 3 tokens for the overall reply priming (unless *prime* is False,
+    which gives the messages' own cost, e.g. to store per message).
 
     Args:
         messages: List of message dicts with at least "role" and "content" keys.
         model: The model name for tokenizer selection.
+        prime: Include the reply-priming tokens.
 
     Returns:
         Total token count including overhead.
@@ -100,7 +105,7 @@ def count_message_tokens(messages: list[dict[str, Any]], model: str = "gpt-4") -
             tool_calls = msg.get("tool_calls")
             if tool_calls:
                 total += max(1, len(json.dumps(tool_calls)) // 4)
-        return total + len(messages) * 4 + 3
+        return total + len(messages) * 4 + (REPLY_PRIMING_TOKENS if prime else 0)
 
     tokens_per_message = 4
 
@@ -131,8 +136,8 @@ def count_message_tokens(messages: list[dict[str, Any]], model: str = "gpt-4") -
             tool_calls_str = json.dumps(tool_calls)
             total += len(encoder.encode(tool_calls_str))
 
-    # Every reply is primed with 3 tokens: <|start|>assistant<|message|>
-    total += 3
+    if prime:
+        total += REPLY_PRIMING_TOKENS
 
     return total
 
@@ -1,8 +1,8 @@
 """Conversation service exports."""
 
 from .db_client import ConversationDB
-from .models import Conversation, ConversationMessage
+from .models import Conversation, ConversationMessage, TurnStart
 from .summarizer import ConversationCompactor
 
 
-__all__ = ["ConversationDB", "Conversation", "ConversationMessage", "ConversationCompactor"]
+__all__ = ["ConversationDB", "Conversation", "ConversationMessage", "ConversationCompactor", "TurnStart"]
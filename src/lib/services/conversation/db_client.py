@@ -12,14 +12,92 @@ import uuid
 from datetime import datetime
 from typing import Any
 
+from psycopg.rows import dict_row
+
+from lib.services.ai_client.token_utils import count_message_tokens
 from lib.services.postgres.db import PostgresDB
 from lib.utils import printer
 
-from .models import Conversation, ConversationMessage
+from .models import Conversation, ConversationMessage, TurnStart
 
 
 _initialized = False
 
+_CONVERSATION_COLUMNS = """
+    id, title, created_at, updated_at, summary_message_id,
+    compacted_count, total_tokens, message_count, message_tokens
+"""
+
+_MESSAGE_COLUMNS = "role, content, metadata, created_at, token_count"
+
+_USAGE_COLUMNS = """
+    total_tokens, summary_message_id, input_tokens, output_tokens, context_tokens,
+    last_input_tokens, assistant_message_count, usage_message_count, has_estimates
+"""
+
+# Resolves a compaction pointer to its seq; an unknown id falls back to the
+# start of the conversation, matching the pre-normalization behaviour.
+_FROM_MESSAGE_SEQ = """
+    COALESCE(
+        (
+            SELECT seq FROM conversation_messages
+            WHERE conversation_id = %(conversation_id)s
+              AND metadata ? 'message_id'
+              AND metadata->>'message_id' = %(from_message_id)s
+            ORDER BY seq
+            LIMIT 1
+        ),
+        0
+    )
+"""
+
+
+# _FROM_MESSAGE_SEQ for the summary pointer of the ``turn`` CTE in ``start_turn``.
+_TURN_SUMMARY_SEQ = """
+    COALESCE(
+        (
+            SELECT seq FROM conversation_messages
+            WHERE conversation_id = turn.id
+              AND metadata ? 'message_id'
+              AND metadata->>'message_id' = turn.summary_message_id
+            ORDER BY seq
+            LIMIT 1
+        ),
+        0
+    )
+"""
+
+
+def _message_token_count(role: str, content: str, metadata: dict[str, Any]) -> int:
+    """Token cost of a stored message as it is replayed into LLM history.
+
+    Mirrors ``AIClient._history_from_messages``: an assistant message with recorded
+    tool calls expands to the tool-call declaration, one tool result per
+    call, and the final text.  Computed once at append time.
+    """
+    tool_calls = metadata.get("tool_calls") if role == "assistant" else None
+    if not tool_calls:
+        return count_message_tokens([{"role": role, "content": content}], prime=False)
+
+    expanded: list[dict[str, Any]] = [
+        {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [
+                {"name": tc.get("tool_name", "unknown"), "args": tc.get("tool_args", {}), "id": f"hist_tc_0_{j}"}
+                for j, tc in enumerate(tool_calls)
+            ],
+        }
+    ]
+    for tc in tool_calls:
+        result = tc.get("tool_result", "")
+        if not isinstance(result, str):
+            result = json.dumps(result, default=str)
+        expanded.append({"role": "tool", "content": result, "name": tc.get("tool_name", "unknown")})
+    if content.strip():
+        expanded.append({"role": "assistant", "content": content})
+    return count_message_tokens(expanded, prime=False)
+
 
 class ConversationDB:
     """Data access layer for conversations stored in PostgreSQL.
@@ -69,8 +147,8 @@ class ConversationDB:
             await ConversationDB._ensure_initialized()
             conversation_id = str(uuid.uuid4())
             query = """
-                INSERT INTO conversations (id, title, messages)
-                VALUES (%s, %s, '[]'::jsonb)
+                INSERT INTO conversations (id, title)
+                VALUES (%s, %s)
             """
             await PostgresDB.execute(query, (conversation_id, title))
             printer.info(f"Created conversation: {conversation_id}")
@@ -84,9 +162,19 @@ class ConversationDB:
         """Retrieve a conversation by ID with all messages."""
         try:
             await ConversationDB._ensure_initialized()
-            query = "SELECT * FROM conversations WHERE id = %s"
-            row = await PostgresDB.fetch_one(query, (conversation_id,))
-            return Conversation.from_row(row) if row else None
+            async with PostgresDB.get_connection() as conn, conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(
+                    f"SELECT {_CONVERSATION_COLUMNS} FROM conversations WHERE id = %s", (conversation_id,)
+                )
+                row = await cur.fetchone()
+                if not row:
+                    return None
+                await cur.execute(
+                    f"SELECT {_MESSAGE_COLUMNS} FROM conversation_messages WHERE conversation_id = %s ORDER BY seq",
+                    (conversation_id,),
+                )
+                message_rows = await cur.fetchall()
+            return Conversation.from_row(row, [ConversationMessage.from_row(m) for m in message_rows])
         except Exception as e:
             printer.debug(f"DB unavailable for get_conversation: {e}")
             return None
@@ -96,8 +184,8 @@ class ConversationDB:
         """List conversations ordered by most recently updated."""
         try:
             await ConversationDB._ensure_initialized()
-            query = """
-                SELECT id, title, '[]'::jsonb AS messages, created_at, updated_at
+            query = f"""
+                SELECT {_CONVERSATION_COLUMNS}
                 FROM conversations
                 ORDER BY updated_at DESC
                 LIMIT %s OFFSET %s
@@ -149,7 +237,7 @@ class ConversationDB:
         """Get the number of messages in a conversation.  Returns 0 if DB is unavailable."""
         try:
             await ConversationDB._ensure_initialized()
-            query = "SELECT jsonb_array_length(messages) FROM conversations WHERE id = %s"
+            query = "SELECT message_count FROM conversations WHERE id = %s"
             count = await PostgresDB.fetch_val(query, (conversation_id,))
             return count or 0
         except Exception as e:
@@ -162,31 +250,165 @@ class ConversationDB:
         role: str,
         content: str,
         metadata: dict[str, Any] | None = None,
+        token_count: int | None = None,
     ) -> None:
-        """Append a message to a conversation's JSONB messages array.
-
-        No-ops if the database is unavailable.
+        """Append a message to a conversation.
+
+        Bumping ``message_count`` allocates the next ``seq`` and row-locks the
+        conversation, so concurrent appends are serialised without touching
+        earlier messages.  The same statement adds the message's token count
+        (computed here unless given) and any ``metadata["usage"]`` of an
+        assistant message to the conversation's running totals, so usage
+        reads never have to walk the history.  No-ops if the database is
+        unavailable.
         """
         try:
             await ConversationDB._ensure_initialized()
-
-            message = {
-                "role": role,
-                "content": content,
-                "timestamp": datetime.now().isoformat(),
-                "metadata": metadata or {},
-            }
-
+            metadata = metadata or {}
+            if token_count is None:
+                token_count = _message_token_count(role, content, metadata)
+
+            is_assistant = role == "assistant"
+            usage = metadata.get("usage") if is_assistant else None
+            if not isinstance(usage, dict):
+                usage = None
+            u = usage or {}
             query = """
-                UPDATE conversations
-                SET messages = COALESCE(messages, '[]'::jsonb) || %s::jsonb,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
+                WITH next AS (
+                    UPDATE conversations
+                    SET message_count = message_count + 1,
+                        message_tokens = message_tokens + %(token_count)s,
+                        total_tokens = COALESCE(total_tokens, 0) + %(total_tokens)s,
+                        input_tokens = input_tokens + %(input_tokens)s,
+                        output_tokens = output_tokens + %(output_tokens)s,
+                        context_tokens = context_tokens + %(context_tokens)s,
+                        last_input_tokens = CASE WHEN %(has_usage)s THEN %(last_input_tokens)s
+                                                 ELSE last_input_tokens END,
+                        assistant_message_count = assistant_message_count + %(assistant)s,
+                        usage_message_count = usage_message_count + %(usage_count)s,
+                        has_estimates = has_estimates OR %(estimated)s,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %(conversation_id)s
+                    RETURNING message_count - 1 AS seq
+                )
+                INSERT INTO conversation_messages (conversation_id, seq, role, content, metadata, token_count)
+                SELECT %(conversation_id)s, seq, %(role)s, %(content)s, %(metadata)s::jsonb, %(token_count)s FROM next
             """
-            await PostgresDB.execute(query, (json.dumps([message], default=str), conversation_id))
+            await PostgresDB.execute(
+                query,
+                {
+                    "conversation_id": conversation_id,
+                    "role": role,
+                    "content": content,
+                    "metadata": json.dumps(metadata, default=str),
+                    "token_count": token_count,
+                    "total_tokens": u.get("total_tokens", 0),
+                    "input_tokens": u.get("input_tokens", 0) + u.get("tool_input_tokens", 0),
+                    "output_tokens": u.get("output_tokens", 0) + u.get("tool_output_tokens", 0),
+                    "context_tokens": u.get("context_tokens", 0),
+                    "has_usage": usage is not None,
+                    "last_input_tokens": u.get("input_tokens", 0),
+                    "assistant": int(is_assistant),
+                    "usage_count": int(usage is not None),
+                    "estimated": bool(u.get("estimated")),
+                },
+            )
         except Exception as e:
             printer.error(f"append_message failed for {conversation_id}: {e}")
 
+    @staticmethod
+    async def start_turn(
+        conversation_id: str | None,
+        content: str,
+        metadata: dict[str, Any] | None = None,
+        history_size: int | None = None,
+    ) -> TurnStart | None:
+        """Open a chat turn in one round-trip.
+
+        A single statement upserts the conversation (a missing
+        *conversation_id* starts a new one, an unknown one is created under
+        that ID), appends the user message and reads the history window the
+        prompt needs.  The window matches ``get_messages_from`` from the
+        compaction summary, or ``get_recent_messages(last_n=history_size)``
+        without one, as read after ``append_message``: it ends with the new
+        user message.  ``history_size=None`` skips the window.
+
+        Returns ``None`` if the database is unavailable.
+        """
+        try:
+            await ConversationDB._ensure_initialized()
+            conversation_id = conversation_id or str(uuid.uuid4())
+            metadata = metadata or {}
+            token_count = _message_token_count("user", content, metadata)
+            # Data-modifying CTEs are invisible to the outer read, so the
+            # window holds the earlier messages; the new one is added below.
+            query = f"""
+                WITH turn AS (
+                    INSERT INTO conversations (id, message_count, message_tokens)
+                    VALUES (%(conversation_id)s, 1, %(token_count)s)
+                    ON CONFLICT (id) DO UPDATE
+                    SET message_count = conversations.message_count + 1,
+                        message_tokens = conversations.message_tokens + EXCLUDED.message_tokens,
+                        updated_at = CURRENT_TIMESTAMP
+                    RETURNING id, summary_message_id, compacted_count, message_count, (xmax = 0) AS created
+                ),
+                appended AS (
+                    INSERT INTO conversation_messages (conversation_id, seq, role, content, metadata, token_count)
+                    SELECT id, message_count - 1, 'user', %(content)s, %(metadata)s::jsonb, %(token_count)s FROM turn
+                ),
+                window_start AS (
+                    SELECT CASE
+                        WHEN NOT %(load_history)s THEN NULL
+                        WHEN turn.summary_message_id IS NOT NULL THEN {_TURN_SUMMARY_SEQ}
+                        ELSE turn.message_count - 1 - %(earlier_messages)s
+                    END AS seq
+                    FROM turn
+                )
+                SELECT turn.id, turn.summary_message_id, turn.compacted_count, turn.message_count, turn.created,
+                       m.role, m.content, m.metadata, m.created_at, m.token_count
+                FROM turn
+                LEFT JOIN conversation_messages m
+                  ON m.conversation_id = turn.id AND m.seq >= (SELECT seq FROM window_start)
+                ORDER BY m.seq
+            """
+            rows = await PostgresDB.fetch_all(
+                query,
+                {
+                    "conversation_id": conversation_id,
+                    "content": content,
+                    "metadata": json.dumps(metadata, default=str),
+                    "token_count": token_count,
+                    "load_history": history_size is not None,
+                    "earlier_messages": max((history_size or 0) - 1, 0),
+                },
+            )
+        except Exception as e:
+            printer.debug(f"DB unavailable for start_turn: {e}")
+            return None
+
+        head = rows[0]
+        turn = TurnStart(
+            conversation_id=head["id"],
+            created=bool(head["created"]),
+            message_count=head["message_count"],
+            summary_message_id=head.get("summary_message_id"),
+            compacted_count=head.get("compacted_count") or 0,
+        )
+        if turn.created:
+            printer.info(f"Created conversation: {turn.conversation_id}")
+        if history_size is not None and (history_size > 0 or turn.summary_message_id):
+            turn.history = [ConversationMessage.from_row(row) for row in rows if row["role"] is not None]
+            turn.history.append(
+                ConversationMessage(
+                    role="user",
+                    content=content,
+                    timestamp=datetime.now().isoformat(),
+                    metadata=metadata,
+                    token_count=token_count,
+                )
+            )
+        return turn
+
     @staticmethod
     async def get_messages(
         conversation_id: str,
@@ -194,13 +416,9 @@ class ConversationDB:
         """Get all messages for a conversation.  Returns ``[]`` if DB is unavailable."""
         try:
             await ConversationDB._ensure_initialized()
-            query = "SELECT messages FROM conversations WHERE id = %s"
-            row = await PostgresDB.fetch_one(query, (conversation_id,))
-            if not row:
-                return []
-
-            raw_messages = row.get("messages", [])
-            return [ConversationMessage.from_dict(m) for m in raw_messages]
+            query = f"SELECT {_MESSAGE_COLUMNS} FROM conversation_messages WHERE conversation_id = %s ORDER BY seq"
+            rows = await PostgresDB.fetch_all(query, (conversation_id,))
+            return [ConversationMessage.from_row(row) for row in rows]
         except Exception as e:
             printer.debug(f"DB unavailable for get_messages: {e}")
             return []
@@ -213,14 +431,15 @@ class ConversationDB:
         """
         try:
             await ConversationDB._ensure_initialized()
-            query = "SELECT messages FROM conversations WHERE id = %s"
-            row = await PostgresDB.fetch_one(query, (conversation_id,))
-            if not row:
-                return []
-
-            raw_messages = row.get("messages", [])
-            recent = raw_messages[-last_n:] if len(raw_messages) > last_n else raw_messages
-            return [ConversationMessage.from_dict(m) for m in recent]
+            query = f"""
+                SELECT {_MESSAGE_COLUMNS}
+                FROM conversation_messages
+                WHERE conversation_id = %s
+                ORDER BY seq DESC
+                LIMIT %s
+            """
+            rows = await PostgresDB.fetch_all(query, (conversation_id, max(last_n, 0)))
+            return [ConversationMessage.from_row(row) for row in reversed(rows)]
         except Exception as e:
             printer.debug(f"DB unavailable for get_recent_messages: {e}")
             return []
@@ -229,16 +448,16 @@ class ConversationDB:
     async def get_conversation_token_usage(conversation_id: str) -> dict:
         """Get aggregated token usage for a conversation.
 
-        Fetches messages, total_tokens (DB column), and summary_through_index
-        in a single query so callers don't need extra round-trips.
+        Reads the running totals that ``append_message`` maintains on the
+        conversation row, so the cost is one row lookup regardless of
+        conversation length.
 
         Returns:
             total_input      – sum of input_tokens across messages with usage metadata
             total_output     – sum of output_tokens across messages with usage metadata
             total            – sum of total_tokens across messages with usage metadata
-            db_total         – authoritative running total from the conversations.total_tokens
-                               column (incremented every turn, reset after summarization to
-                               compressed_context + summarization_call_cost)
+            db_total         – running total from the conversations.total_tokens column
+                               (incremented by every assistant message's usage)
             has_estimates    – True if any message usage was tiktoken-estimated
             partial_data     – True if some assistant messages are missing usage metadata
                                (typical for sessions started before token tracking was added)
@@ -257,55 +476,25 @@ class ConversationDB:
         }
         try:
             await ConversationDB._ensure_initialized()
-            query = """
-                SELECT messages, total_tokens, summary_message_id
-                FROM conversations
-                WHERE id = %s
-            """
-            row = await PostgresDB.fetch_one(query, (conversation_id,))
+            row = await PostgresDB.fetch_one(
+                f"SELECT {_USAGE_COLUMNS} FROM conversations WHERE id = %s",
+                (conversation_id,),
+            )
             if not row:
                 return _zero
 
-            raw_messages = row.get("messages", [])
-            db_total = row.get("total_tokens") or 0
-            had_summarization = row.get("summary_message_id") is not None
-
-            total_input = 0
-            total_output = 0
-            total = 0
-            has_estimates = False
-            assistant_msgs = 0
-            assistant_msgs_with_usage = 0
-            total_context_tokens = 0
-            last_input_tokens = 0
-
-            for msg in raw_messages:
-                if msg.get("role") == "assistant":
-                    assistant_msgs += 1
-                    metadata = msg.get("metadata", {})
-                    usage = metadata.get("usage")
-                    if usage and isinstance(usage, dict):
-                        assistant_msgs_with_usage += 1
-                        total_input += usage.get("input_tokens", 0) + usage.get("tool_input_tokens", 0)
-                        total_output += usage.get("output_tokens", 0) + usage.get("tool_output_tokens", 0)
-                        total += usage.get("total_tokens", 0)
-                        if usage.get("estimated"):
-                            has_estimates = True
-                        total_context_tokens += usage.get("context_tokens", 0)
-                        last_input_tokens = usage.get("input_tokens", 0)
-
-            partial_data = assistant_msgs > 0 and assistant_msgs_with_usage < assistant_msgs
-
+            total = row.get("total_tokens") or 0
+            assistant_msgs = row.get("assistant_message_count") or 0
             return {
-                "total_input": total_input,
-                "total_output": total_output,
+                "total_input": row.get("input_tokens") or 0,
+                "total_output": row.get("output_tokens") or 0,
                 "total": total,
-                "db_total": db_total,
-                "has_estimates": has_estimates,
-                "partial_data": partial_data,
-                "had_summarization": had_summarization,
-                "total_context_tokens": total_context_tokens,
-                "last_input_tokens": last_input_tokens,
+                "db_total": total,
+                "has_estimates": bool(row.get("has_estimates")),
+                "partial_data": assistant_msgs > (row.get("usage_message_count") or 0),
+                "had_summarization": row.get("summary_message_id") is not None,
+                "total_context_tokens": row.get("context_tokens") or 0,
+                "last_input_tokens": row.get("last_input_tokens") or 0,
             }
         except Exception as e:
             printer.debug(f"DB unavailable for get_conversation_token_usage: {e}")
@@ -387,69 +576,140 @@ class ConversationDB:
             printer.debug(f"DB unavailable for increment_compacted_count: {e}")
             return 0
 
+    @staticmethod
+    async def apply_compaction(
+        conversation_id: str,
+        content: str,
+        summary_message_id: str,
+        *,
+        version: int,
+        expected_summary_message_id: str | None,
+    ) -> bool:
+        """Install a compaction summary of the first *version* messages.
+
+        The summary is applied only if the compaction pointer is still
+        *expected_summary_message_id*, i.e. no other compaction landed since
+        the messages were read; otherwise nothing changes.  If the
+        conversation has not grown past *version* the summary is simply
+        appended.  Messages appended while the summary was being generated
+        are rebased onto it: they move up one ``seq`` and the summary takes
+        ``seq = version``, so the active window (everything from the summary
+        on) keeps them.  Locking the conversation row first serialises this
+        with ``append_message`` and ``start_turn``, and everything runs in
+        one transaction.
+
+        Returns whether the summary was applied (``False`` if the DB is
+        unavailable).
+        """
+        try:
+            await ConversationDB._ensure_initialized()
+            metadata = {"message_id": summary_message_id, "is_compaction_summary": True}
+            params = {
+                "conversation_id": conversation_id,
+                "content": content,
+                "metadata": json.dumps(metadata),
+                "token_count": _message_token_count("assistant", content, metadata),
+                "summary_message_id": summary_message_id,
+                "expected_summary_message_id": expected_summary_message_id,
+                "version": version,
+            }
+            async with PostgresDB.get_connection() as conn, conn.cursor(row_factory=dict_row) as cur:
+                await cur.execute(
+                    """
+                    UPDATE conversations
+                    SET message_count = message_count + 1,
+                        message_tokens = message_tokens + %(token_count)s,
+                        assistant_message_count = assistant_message_count + 1,
+                        summary_message_id = %(summary_message_id)s,
+                        compacted_count = 0,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %(conversation_id)s
+                      AND summary_message_id IS NOT DISTINCT FROM %(expected_summary_message_id)s
+                      AND message_count >= %(version)s
+                    RETURNING message_count - 1 - %(version)s AS newer_messages
+                    """,
+                    params,
+                )
+                row = await cur.fetchone()
+                if row is None:
+                    return False
+                if row["newer_messages"]:
+                    # Shift through negative seqs so (conversation_id, seq) stays unique at every step.
+                    await cur.execute(
+                        """
+                        UPDATE conversation_messages SET seq = -seq - 1
+                        WHERE conversation_id = %(conversation_id)s AND seq >= %(version)s
+                        """,
+                        params,
+                    )
+                    await cur.execute(
+                        "UPDATE conversation_messages SET seq = -seq WHERE conversation_id = %(conversation_id)s AND seq < 0",
+                        params,
+                    )
+                await cur.execute(
+                    """
+                    INSERT INTO conversation_messages (conversation_id, seq, role, content, metadata, token_count)
+                    VALUES (%(conversation_id)s, %(version)s, 'assistant', %(content)s, %(metadata)s::jsonb,
+                            %(token_count)s)
+                    """,
+                    params,
+                )
+            return True
+        except Exception as e:
+            printer.debug(f"DB unavailable for apply_compaction: {e}")
+            return False
+
     @staticmethod
     async def get_messages_from(conversation_id: str, from_message_id: str) -> list[ConversationMessage]:
         """Get messages starting from (and including) a specific message.
 
-        Finds the message with the given ID in the JSONB array and returns
-        it and all subsequent messages.  Returns ``[]`` if DB is unavailable
-        or the message is not found.
+        Resolves the message ID to its ``seq`` through the message-id index and
+        range-scans from there.  Returns every message if the ID is not found,
+        or ``[]`` if DB is unavailable.
         """
         try:
             await ConversationDB._ensure_initialized()
-            query = "SELECT messages FROM conversations WHERE id = %s"
-            row = await PostgresDB.fetch_one(query, (conversation_id,))
-            if not row:
-                return []
-
-            raw_messages = row.get("messages", [])
-            start_idx = None
-            for i, m in enumerate(raw_messages):
-                msg_meta = m.get("metadata", {})
-                if msg_meta.get("message_id") == from_message_id:
-                    start_idx = i
-                    break
-
-            if start_idx is None:
-                return [ConversationMessage.from_dict(m) for m in raw_messages]
-
-            return [ConversationMessage.from_dict(m) for m in raw_messages[start_idx:]]
+            query = f"""
+                SELECT {_MESSAGE_COLUMNS}
+                FROM conversation_messages
+                WHERE conversation_id = %(conversation_id)s
+                  AND seq >= {_FROM_MESSAGE_SEQ}
+                ORDER BY seq
+            """
+            rows = await PostgresDB.fetch_all(
+                query, {"conversation_id": conversation_id, "from_message_id": from_message_id}
+            )
+            return [ConversationMessage.from_row(row) for row in rows]
         except Exception as e:
             printer.debug(f"DB unavailable for get_messages_from: {e}")
             return []
 
     @staticmethod
     async def get_context_usage(conversation_id: str, from_message_id: str | None = None) -> int:
-        """Calculate context token usage from API-reported input_tokens.
+        """Token size of the active context window, from stored per-message counts.
 
-        Sums ``metadata.usage.input_tokens`` across messages in the active
-        window (from ``from_message_id`` onwards, or all if None).
-        Falls back to 0 if no API usage data is available.
+        Without *from_message_id* this is the conversation's running
+        ``message_tokens`` total; with it, the ``token_count`` values from
+        that message onwards are summed (an index range scan, no re-encoding).
         """
         try:
             await ConversationDB._ensure_initialized()
-            query = "SELECT messages FROM conversations WHERE id = %s"
-            row = await PostgresDB.fetch_one(query, (conversation_id,))
-            if not row:
-                return 0
-
-            raw_messages = row.get("messages", [])
-            if from_message_id:
-                start_idx = None
-                for i, m in enumerate(raw_messages):
-                    if m.get("metadata", {}).get("message_id") == from_message_id:
-                        start_idx = i
-                        break
-                if start_idx is not None:
-                    raw_messages = raw_messages[start_idx:]
-
-            total = 0
-            for m in raw_messages:
-                usage = m.get("metadata", {}).get("usage", {})
-                input_tokens = usage.get("input_tokens", 0)
-                if input_tokens:
-                    total += input_tokens
-            return total
+            if not from_message_id:
+                val = await PostgresDB.fetch_val(
+                    "SELECT message_tokens FROM conversations WHERE id = %s", (conversation_id,)
+                )
+                return int(val or 0)
+
+            query = f"""
+                SELECT COALESCE(SUM(token_count), 0)
+                FROM conversation_messages
+                WHERE conversation_id = %(conversation_id)s
+                  AND seq >= {_FROM_MESSAGE_SEQ}
+            """
+            val = await PostgresDB.fetch_val(
+                query, {"conversation_id": conversation_id, "from_message_id": from_message_id}
+            )
+            return int(val or 0)
         except Exception as e:
             printer.debug(f"DB unavailable for get_context_usage: {e}")
             return 0
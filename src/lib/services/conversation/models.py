@@ -13,6 +13,7 @@ class ConversationMessage:
     content: str
     timestamp: str
     metadata: dict[str, Any] = field(default_factory=dict)
+    token_count: int | None = None  # stored cost as replayed into LLM history
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -31,6 +32,18 @@ class ConversationMessage:
             metadata=data.get("metadata", {}),
         )
 
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "ConversationMessage":
+        """Create a ConversationMessage from a ``conversation_messages`` row."""
+        created_at = row.get("created_at")
+        return cls(
+            role=row.get("role") or "user",
+            content=row.get("content") or "",
+            timestamp=created_at.isoformat() if created_at else datetime.now().isoformat(),
+            metadata=row.get("metadata") or {},
+            token_count=row.get("token_count"),
+        )
+
 
 @dataclass
 class Conversation:
@@ -44,12 +57,17 @@ class Conversation:
     summary_message_id: str | None = None
     compacted_count: int = 0
     total_tokens: int = 0
+    message_count: int = 0
+    message_tokens: int = 0
 
     @classmethod
-    def from_row(cls, row: dict[str, Any]) -> "Conversation":
-        """Create a Conversation from a database row."""
-        raw_messages = row.get("messages", [])
-        messages = [ConversationMessage.from_dict(m) for m in raw_messages] if raw_messages else []
+    def from_row(
+        cls,
+        row: dict[str, Any],
+        messages: list[ConversationMessage] | None = None,
+    ) -> "Conversation":
+        """Create a Conversation from a ``conversations`` row and its message rows."""
+        messages = messages or []
 
         return cls(
             id=row["id"],
@@ -60,6 +78,8 @@ class Conversation:
             summary_message_id=row.get("summary_message_id"),
             compacted_count=row.get("compacted_count") or 0,
             total_tokens=row.get("total_tokens") or 0,
+            message_count=row.get("message_count") or len(messages),
+            message_tokens=row.get("message_tokens") or 0,
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -72,4 +92,18 @@ class Conversation:
             "summary_message_id": self.summary_message_id,
             "compacted_count": self.compacted_count,
             "total_tokens": self.total_tokens,
+            "message_count": self.message_count,
+            "message_tokens": self.message_tokens,
         }
+
+
+@dataclass
+class TurnStart:
+    """A conversation as ``ConversationDB.start_turn`` left it, with the user message appended."""
+
+    conversation_id: str
+    created: bool
+    message_count: int
+    summary_message_id: str | None = None
+    compacted_count: int = 0
+    history: list[ConversationMessage] = field(default_factory=list)
@@ -1,13 +1,17 @@
 """Context compaction for conversations approaching model context limits.
 
-When a conversation's context usage reaches the configured threshold percentage
-of the model's context window, compaction is triggered.  All messages are
-summarised into a single summary message that becomes the new starting point
-for the LLM context.  Old messages are kept in the DB for audit but excluded
-from future LLM calls.
-
-The compactor is blocking (not background) to prevent race conditions and
-uses a circuit breaker to stop after N consecutive failures.
+When a conversation's context usage reaches the configured watermark
+percentage of the model's context window, a compaction job starts in the
+background.  All messages are summarised into a single summary message that
+becomes the new starting point for the LLM context.  Old messages are kept
+in the DB for audit but excluded from future LLM calls.
+
+The summary is versioned by the number of messages it covers and applied
+atomically: turns that landed while it was being generated are rebased
+onto it, and a summary that lost a race with another compaction is
+dropped.  Users only wait for a job when the last turn already used more
+than the hard threshold of the window.  A circuit breaker stops after N
+consecutive failures.
 
 Design based on proven approaches from OpenCode and Claude Code.
 """
@@ -15,13 +19,15 @@ Design based on proven approaches from OpenCode and Claude Code.
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import uuid
-from typing import TYPE_CHECKING, Any
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from lib.core.config import Config
 from lib.utils import printer
 
-from ..ai_client.token_utils import count_message_tokens, get_context_window
+from ..ai_client.token_utils import count_message_tokens, count_tokens, get_context_window
 from .db_client import ConversationDB
 
 
@@ -72,39 +78,80 @@ _COMPACT_USER_PROMPT = (
 _TOOL_RESULT_MAX_CHARS = 500
 
 
-def _format_messages_for_compaction(messages: list[dict[str, Any]]) -> str:
-    lines: list[str] = []
-    for msg in messages:
-        role = msg.get("role", "unknown").capitalize()
-        content = msg.get("content") or ""
-        if len(content) > 2000:
-            content = content[:2000] + "... [truncated]"
-        lines.append(f"{role}: {content}")
-
-        tool_calls = msg.get("metadata", {}).get("tool_calls")
-        if tool_calls:
-            for tc in tool_calls:
-                tc_name = tc.get("tool_name", "unknown")
-                tc_result = str(tc.get("tool_result", ""))
-                if len(tc_result) > _TOOL_RESULT_MAX_CHARS:
-                    tc_result = tc_result[:_TOOL_RESULT_MAX_CHARS] + "... [truncated]"
-                tc_args = tc.get("tool_args", {})
-                args_str = ", ".join(f"{k}={v}" for k, v in tc_args.items()) if tc_args else ""
-                lines.append(f"  [Tool: {tc_name}({args_str}) -> {tc_result}]")
+def _format_message_for_compaction(msg: dict[str, Any]) -> str:
+    role = msg.get("role", "unknown").capitalize()
+    content = msg.get("content") or ""
+    if len(content) > 2000:
+        content = content[:2000] + "... [truncated]"
+    lines = [f"{role}: {content}"]
+
+    tool_calls = msg.get("metadata", {}).get("tool_calls")
+    if tool_calls:
+        for tc in tool_calls:
+            tc_name = tc.get("tool_name", "unknown")
+            tc_result = str(tc.get("tool_result", ""))
+            if len(tc_result) > _TOOL_RESULT_MAX_CHARS:
+                tc_result = tc_result[:_TOOL_RESULT_MAX_CHARS] + "... [truncated]"
+            tc_args = tc.get("tool_args", {})
+            args_str = ", ".join(f"{k}={v}" for k, v in tc_args.items()) if tc_args else ""
+            lines.append(f"  [Tool: {tc_name}({args_str}) -> {tc_result}]")
     return "\n".join(lines)
 
 
+def _format_messages_for_compaction(messages: list[dict[str, Any]]) -> str:
+    return "\n".join(_format_message_for_compaction(msg) for msg in messages)
+
+
+def _first_fitting(count: int, fits: Callable[[int], bool], guess: int) -> int:
+    """Smallest index in ``[0, count)`` for which *fits* holds, searching outward from *guess*.
+
+    *fits* must be monotone (once a suffix fits, every shorter one does) and is
+    taken as true for the last index.  Gallops away from *guess* to bracket the
+    boundary, then bisects, so an accurate guess costs only a couple of probes.
+    """
+    last = count - 1
+
+    def ok(i: int) -> bool:
+        return i >= last or (i >= 0 and fits(i))
+
+    hi = min(max(guess, 0), last)
+    step = 1
+    if ok(hi):
+        lo = hi - step
+        while lo >= 0 and ok(lo):
+            hi, step = lo, step * 2
+            lo = hi - step
+        lo = max(lo, -1)
+    else:
+        lo, hi = hi, min(hi + step, last)
+        while not ok(hi):
+            lo, step = hi, step * 2
+            hi = min(lo + step, last)
+
+    # not ok(lo) (or lo == -1) and ok(hi)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if ok(mid):
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
 class ConversationCompactor:
     """Manages context compaction for a conversation.
 
     Usage in route/agent code::
 
+        await ConversationCompactor.wait_if_over_threshold(conversation_id)
+        ...  # run the turn
         if ConversationCompactor.should_compact(context_tokens, model_name):
-            compactor = ConversationCompactor(ai_client, model_name)
-            await compactor.compact(conversation_id)
+            ConversationCompactor.schedule(ai_client, model_name, conversation_id, context_tokens)
     """
 
     _locks: dict[str, asyncio.Lock] = {}
+    _jobs: ClassVar[dict[str, asyncio.Task]] = {}
+    _over_threshold: ClassVar[set[str]] = set()
 
     def __init__(self, ai_client: AIClient, model: str):
         self._ai_client = ai_client
@@ -118,19 +165,61 @@ class ConversationCompactor:
 
     @staticmethod
     def should_compact(context_tokens: int, model: str) -> bool:
+        """True once *context_tokens* reaches the compaction watermark."""
         cfg = Config()
         if not cfg.compaction_enabled:
             return False
         context_window = get_context_window(model)
-        threshold = cfg.compaction_threshold
-        return context_tokens >= int(context_window * threshold)
+        watermark = min(cfg.compaction_watermark, cfg.compaction_threshold)
+        return context_tokens >= int(context_window * watermark)
+
+    @classmethod
+    def schedule(cls, ai_client: AIClient, model: str, conversation_id: str, context_tokens: int) -> asyncio.Task:
+        """Compact *conversation_id* in the background; at most one job runs per conversation.
+
+        If *context_tokens* already reached the hard threshold, the
+        conversation's next turn waits for the job
+        (:meth:`wait_if_over_threshold`).
+        """
+        if context_tokens >= int(get_context_window(model) * Config().compaction_threshold):
+            cls._over_threshold.add(conversation_id)
+        job = cls._jobs.get(conversation_id)
+        if job is None:
+            job = asyncio.create_task(cls(ai_client, model).compact(conversation_id), name=f"compact:{conversation_id}")
+            cls._jobs[conversation_id] = job
+            job.add_done_callback(lambda task: cls._job_done(conversation_id, task))
+        return job
+
+    @classmethod
+    def _job_done(cls, conversation_id: str, job: asyncio.Task) -> None:
+        if cls._jobs.get(conversation_id) is job:
+            del cls._jobs[conversation_id]
+            cls._over_threshold.discard(conversation_id)
+        if not job.cancelled() and job.exception() is not None:
+            printer.error(f"Background compaction failed for {conversation_id}: {job.exception()}")
+
+    @classmethod
+    async def wait_if_over_threshold(cls, conversation_id: str) -> None:
+        """Wait for a running compaction job if the last turn crossed the hard threshold.
+
+        Below the threshold the job stays off the critical path and the turn
+        uses the current window; above it the prompt would risk overflowing
+        the context, so the turn starts from the fresh summary instead.
+        """
+        job = cls._jobs.get(conversation_id)
+        if job is None or conversation_id not in cls._over_threshold:
+            return
+        printer.info(f"Context of {conversation_id} is over the compaction threshold; waiting for compaction")
+        with contextlib.suppress(Exception):
+            await asyncio.shield(job)
 
     @staticmethod
     async def get_active_window(conversation_id: str) -> tuple[list[dict[str, Any]], str | None]:
         """Load the active message window for a conversation.
 
         If the conversation has been compacted, returns only messages from
-        the summary message onwards.  Returns ``(message_dicts, summary_message_id)``.
+        the summary message onwards (turns rebased onto the summary follow
+        it).  Returns ``(message_dicts, summary_message_id)``.
         """
         summary_message_id, _ = await ConversationDB.get_compaction_state(conversation_id)
 
@@ -143,9 +232,9 @@ class ConversationCompactor:
         return message_dicts, summary_message_id
 
     async def compact(self, conversation_id: str) -> bool:
-        """Execute the full compaction pipeline (blocking).
+        """Execute the full compaction pipeline.
 
-        Returns True if compaction succeeded, False otherwise.
+        Returns True if a summary was applied, False otherwise.
         Acquires a per-conversation lock to prevent concurrent compaction.
         """
         lock = self._get_lock(conversation_id)
@@ -160,7 +249,7 @@ class ConversationCompactor:
         prompt_buffer = cfg.compaction_prompt_buffer
         circuit_breaker_limit = cfg.compaction_circuit_breaker
 
-        _, compacted_count = await ConversationDB.get_compaction_state(conversation_id)
+        summary_message_id_before, compacted_count = await ConversationDB.get_compaction_state(conversation_id)
         if compacted_count >= circuit_breaker_limit:
             printer.warning(
                 f"Circuit breaker triggered for {conversation_id}: "
@@ -171,6 +260,8 @@ class ConversationCompactor:
         messages = await ConversationDB.get_messages(conversation_id)
         if not messages:
             return False
+        # seqs are dense, so the summary covers seq < version.
+        version = len(messages)
 
         message_dicts = [{"role": m.role, "content": m.content, "metadata": m.metadata} for m in messages]
 
@@ -181,14 +272,18 @@ class ConversationCompactor:
             return False
 
         summary_message_id = str(uuid.uuid4())
-        await ConversationDB.append_message(
-            conversation_id=conversation_id,
-            role="assistant",
-            content=summary,
-            metadata={"message_id": summary_message_id, "is_compaction_summary": True},
+        applied = await ConversationDB.apply_compaction(
+            conversation_id,
+            summary,
+            summary_message_id,
+            version=version,
+            expected_summary_message_id=summary_message_id_before,
         )
-
-        await ConversationDB.set_compaction_state(conversation_id, summary_message_id, 0)
+        if not applied:
+            printer.warning(
+                f"Discarding compaction summary for {conversation_id} (compacted concurrently or DB unavailable)"
+            )
+            return False
 
         printer.info(
             f"Compaction complete for {conversation_id}: "
@@ -203,7 +298,7 @@ class ConversationCompactor:
         context_window: int,
         prompt_buffer: int,
     ) -> str | None:
-        prompt = self._build_compaction_prompt(message_dicts, context_window, prompt_buffer)
+        prompt = await asyncio.to_thread(self._build_compaction_prompt, message_dicts, context_window, prompt_buffer)
         if not prompt:
             return None
 
@@ -244,16 +339,28 @@ class ConversationCompactor:
             printer.warning("Context window too small for compaction prompt.")
             return None
 
-        messages_to_include = list(message_dicts)
-        formatted = _format_messages_for_compaction(messages_to_include)
-        content_tokens = count_message_tokens([{"role": "user", "content": formatted}], model=self._model)
-
-        while content_tokens > available_for_content and len(messages_to_include) > 1:
-            messages_to_include = messages_to_include[1:]
-            formatted = _format_messages_for_compaction(messages_to_include)
-            content_tokens = count_message_tokens([{"role": "user", "content": formatted}], model=self._model)
-
-        if not messages_to_include:
-            return None
+        # Each message is formatted and counted once.  The oldest messages are
+        # dropped until the rest fits; per-message costs give a prefix-sum guess
+        # for the cut, which is then confirmed against exact counts of the joined
+        # text (BPE is not strictly additive across the newline joins).
+        blocks = [_format_message_for_compaction(msg) for msg in message_dicts]
+        suffix_costs = [0] * (len(blocks) + 1)
+        for i in range(len(blocks) - 1, -1, -1):
+            suffix_costs[i] = suffix_costs[i + 1] + count_tokens(blocks[i], model=self._model) + 1
+        wrapper_tokens = count_message_tokens([{"role": "user", "content": ""}], model=self._model)
+        budget = available_for_content - wrapper_tokens + 1
+        guess = next((i for i, cost in enumerate(suffix_costs) if cost <= budget), len(blocks) - 1)
+
+        exact: dict[int, bool] = {}
+
+        def fits(start: int) -> bool:
+            if start not in exact:
+                text = "\n".join(blocks[start:])
+                tokens = count_message_tokens([{"role": "user", "content": text}], model=self._model)
+                exact[start] = tokens <= available_for_content
+            return exact[start]
+
+        start = _first_fitting(len(blocks), fits, guess)
+        formatted = "\n".join(blocks[start:])
 
         return f"{_COMPACT_SYSTEM_PROMPT}\n\nConversation to summarize:\n{formatted}\n\n{_COMPACT_USER_PROMPT}"
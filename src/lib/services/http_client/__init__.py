@@ -0,0 +1,17 @@
+"""
+Pooled HTTP client service.
+
+Provides a shared, retrying ``httpx`` client with per-host limits and an
+ETag/Last-Modified response cache, used by the scheduler workflow functions.
+"""
+
+from .client import HTTPX_AVAILABLE, HTTPClientPool, ResponseCache, close_http_clients, get_http_client
+
+
+__all__ = [
+    "HTTPClientPool",
+    "ResponseCache",
+    "get_http_client",
+    "close_http_clients",
+    "HTTPX_AVAILABLE",
+]
@@ -0,0 +1,275 @@
+"""
+Shared, pooled HTTP client for workflow functions.
+
+One ``httpx.AsyncClient`` is kept per event loop (httpx connections are bound
+to the loop that opened them), so repeated calls reuse DNS, TCP and TLS
+state instead of handshaking per request.  On top of the pool this adds a
+per-host concurrency cap, retries with exponential backoff, and an optional
+validator cache that revalidates GETs with ``If-None-Match`` /
+``If-Modified-Since`` and serves the stored body on ``304``.
+"""
+
+import asyncio
+import random
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from ...core.config import Config
+from ...utils.printer import printer
+
+
+# Callers check HTTPX_AVAILABLE; httpx is never rebound, so it stays usable in annotations.
+try:
+    import httpx
+
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+# Methods that are safe to resend after the request may have reached the server.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+MAX_BACKOFF = 10.0
+# The cache keeps the decoded body, so headers describing the wire encoding no longer apply to it.
+_ENCODING_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+
+class _CachedResponse(NamedTuple):
+    etag: str | None
+    last_modified: str | None
+    headers: list[tuple[str, str]]
+    content: bytes
+
+
+class ResponseCache:
+    """Bounded LRU of GET responses that carry ``ETag`` or ``Last-Modified``."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(0, max_entries)
+        self._entries: OrderedDict[tuple, _CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url: str, headers: dict[str, str]) -> tuple:
+        return (url, tuple(sorted((k.lower(), v) for k, v in headers.items())))
+
+    def get(self, key: tuple) -> _CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(self, key: tuple, response: "httpx.Response") -> None:
+        if self.max_entries == 0 or response.status_code != 200:
+            return
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        if "no-store" in response.headers.get("cache-control", "").lower():
+            return
+
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _ENCODING_HEADERS]
+        entry = _CachedResponse(etag, last_modified, headers, response.content)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class HTTPClientPool:
+    """
+    Lifecycle-managed pool of ``httpx.AsyncClient`` instances, one per event loop.
+
+    Args:
+        max_connections: Total connection cap per client.
+        max_keepalive: Idle connections kept open for reuse.
+        max_per_host: Concurrent requests allowed to a single host.
+        retries: Extra attempts after a retryable failure.
+        backoff: Base delay in seconds, doubled per attempt (with jitter).
+        cache_entries: Size of the ETag/Last-Modified cache (0 disables it).
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        max_per_host: int = 10,
+        retries: int = 2,
+        backoff: float = 0.5,
+        cache_entries: int = 128,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.max_per_host = max(1, max_per_host)
+        self.retries = max(0, retries)
+        self.backoff = max(0.0, backoff)
+        self.cache = ResponseCache(cache_entries)
+        # Keyed by event loop so a closed loop drops its client and semaphores.
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._host_limits: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._revalidated = 0
+
+    def _client(self) -> "httpx.AsyncClient":
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive,
+                    ),
+                )
+                self._clients[loop] = client
+            return client
+
+    def _host_limit(self, url: "httpx.URL") -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        host = f"{url.scheme}://{url.host}:{url.port or ''}"
+        with self._lock:
+            limits = self._host_limits.setdefault(loop, {})
+            semaphore = limits.get(host)
+            if semaphore is None:
+                semaphore = limits[host] = asyncio.Semaphore(self.max_per_host)
+            return semaphore
+
+    def _retry_delay(self, attempt: int, response: "httpx.Response | None") -> float:
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_BACKOFF)
+        return min(self.backoff * (2**attempt), MAX_BACKOFF) * random.uniform(0.5, 1.0)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        json: Any = None,
+        headers: dict[str, str] | None = None,
+        timeout: float = 30,
+        use_cache: bool = True,
+    ) -> "httpx.Response":
+        """
+        Send a request through the shared client.
+
+        Idempotent methods are retried on transport errors and 502/503/504;
+        any method is retried on connection failures (nothing was sent) and
+        on 429.  Non-retryable responses are returned as-is, so callers keep
+        using ``raise_for_status()``.  Revalidated cache hits come back as a
+        200 with ``response.extensions["from_cache"]`` set.
+        """
+        method = method.upper()
+        headers = dict(headers or {})
+        cache_key = None
+        cached = None
+        if method == "GET" and use_cache and self.cache.max_entries:
+            cache_key = ResponseCache.make_key(url, headers)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if cached.etag:
+                    headers.setdefault("If-None-Match", cached.etag)
+                if cached.last_modified:
+                    headers.setdefault("If-Modified-Since", cached.last_modified)
+
+        client = self._client()
+        semaphore = self._host_limit(httpx.URL(url))
+        idempotent = method in IDEMPOTENT_METHODS
+
+        attempt = 0
+        while True:
+            self._requests += 1
+            response = None
+            try:
+                async with semaphore:
+                    response = await client.request(method, url, json=json, headers=headers, timeout=timeout)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                if attempt >= self.retries:
+                    raise
+            except httpx.TransportError:
+                if not idempotent or attempt >= self.retries:
+                    raise
+            else:
+                retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUSES)
+                if not retryable or attempt >= self.retries:
+                    break
+
+            delay = self._retry_delay(attempt, response)
+            attempt += 1
+            self._retries += 1
+            printer.debug(f"HTTP {method} {url} retry {attempt}/{self.retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        if cache_key is not None:
+            if response.status_code == 304 and cached is not None:
+                self._revalidated += 1
+                return httpx.Response(
+                    200,
+                    headers=cached.headers,
+                    content=cached.content,
+                    request=response.request,
+                    extensions={"from_cache": True},
+                )
+            self.cache.store(cache_key, response)
+        return response
+
+    async def aclose(self) -> None:
+        """Close the client owned by the running loop; others are dropped with their loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+            self._host_limits.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requests": self._requests,
+            "retries": self._retries,
+            "revalidated": self._revalidated,
+            "cache_entries": len(self.cache),
+            "clients": len(self._clients),
+        }
+
+
+_shared_pool: HTTPClientPool | None = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClientPool:
+    """Return the process-wide pool, configured from ``Config`` on first use."""
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                cfg = Config()
+                _shared_pool = HTTPClientPool(
+                    max_connections=cfg.http_max_connections,
+                    max_keepalive=cfg.http_max_keepalive,
+                    max_per_host=cfg.http_max_per_host,
+                    retries=cfg.http_retries,
+                    backoff=cfg.http_retry_backoff,
+                    cache_entries=cfg.http_cache_entries,
+                )
+    return _shared_pool
+
+
+async def close_http_clients() -> None:
+    """Release the shared pool's connections for the running loop (call on shutdown)."""
+    if _shared_pool is not None:
+        await _shared_pool.aclose()
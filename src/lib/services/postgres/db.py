@@ -1,3 +1,4 @@
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Any
@@ -8,6 +9,19 @@ from psycopg_pool import AsyncConnectionPool
 
 from imports import printer as logger
 from lib.core.config import Config
+from lib.utils.async_utils import get_async_bridge
+from lib.utils.metrics import metrics
+
+
+_POOL_WAIT_SECONDS = metrics.histogram(
+    "knik_db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the Postgres pool",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+_POOL_CONNECTIONS = metrics.gauge(
+    "knik_db_pool_connections", "Postgres pool connections (open, idle, or the configured max)", ("state",)
+)
+_POOL_WAITING = metrics.gauge("knik_db_pool_waiting_requests", "Callers queued for a Postgres pool connection")
 
 
 class PostgresDB:
@@ -59,6 +73,8 @@ class PostgresDB:
             open=False,
         )
         await cls._pool.open()
+        # The pool is bound to this loop; sync tool wrappers must run their DB calls here.
+        get_async_bridge().bind()
 
     @classmethod
     async def close(cls) -> None:
@@ -67,6 +83,7 @@ class PostgresDB:
             logger.info("Closing Postgres async connection pool...")
             await cls._pool.close()
             cls._pool = None
+            get_async_bridge().unbind()
 
     @classmethod
     @asynccontextmanager
@@ -78,7 +95,9 @@ class PostgresDB:
         if cls._pool is None:
             raise RuntimeError("PostgresDB is not initialized. Call initialize() first.")
 
+        start = time.perf_counter()
         async with cls._pool.connection() as conn:
+            _POOL_WAIT_SECONDS.observe(time.perf_counter() - start)
             try:
                 yield conn
                 if not conn.autocommit:
@@ -94,6 +113,14 @@ class PostgresDB:
         async with cls.get_connection() as conn, conn.cursor() as cur:
             await cur.execute(query, params)
 
+    @classmethod
+    async def execute_many(cls, query: str, params_seq: list[tuple | dict]) -> None:
+        """Execute a query once per parameter set on a single connection and transaction."""
+        if not params_seq:
+            return
+        async with cls.get_connection() as conn, conn.cursor() as cur:
+            await cur.executemany(query, params_seq)
+
     @classmethod
     async def fetch_one(cls, query: str, params: tuple | dict | None = None) -> dict[str, Any] | None:
         """Execute a query and return a single row as a dictionary."""
@@ -115,3 +142,17 @@ class PostgresDB:
         if row:
             return next(iter(row.values()))
         return None
+
+    @classmethod
+    def collect_pool_stats(cls) -> None:
+        """Copy the pool's current size and queue length into the pool gauges."""
+        if cls._pool is None:
+            return
+        stats = cls._pool.get_stats()
+        _POOL_CONNECTIONS.set(stats.get("pool_size", 0), state="open")
+        _POOL_CONNECTIONS.set(stats.get("pool_available", 0), state="idle")
+        _POOL_CONNECTIONS.set(stats.get("pool_max", 0), state="max")
+        _POOL_WAITING.set(stats.get("requests_waiting", 0))
+
+
+metrics.add_collector(PostgresDB.collect_pool_stats)
@@ -1,5 +1,5 @@
 import json
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 
 from lib.cron.models import ExecutionRecord, NodeExecutionRecord, Schedule, Workflow
 from lib.services.postgres.db import PostgresDB
@@ -8,6 +8,31 @@ from lib.utils import printer
 
 is_initialized = False
 
+# Start of the UTC hour a timestamp falls in: the workflow_execution_rollups bucket.
+_HOUR_BUCKET = "date_trunc('hour', {} AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+
+TIME_RANGES = ("today", "7days", "30days", "90days", "all")
+
+
+def _bucket_floor(value: datetime) -> datetime:
+    """Round a range start down to its rollup bucket (treating naive datetimes as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def _bucket_filter(start_date: datetime | None, end_date: datetime | None, column: str = "bucket") -> tuple[str, tuple]:
+    """WHERE clause selecting the rollup buckets that cover [start_date, end_date]."""
+    clauses: list[str] = []
+    params: list[datetime] = []
+    if start_date:
+        clauses.append(f"{column} >= %s")
+        params.append(_bucket_floor(start_date))
+    if end_date:
+        clauses.append(f"{column} <= %s")
+        params.append(end_date)
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), tuple(params)
+
 
 class SchedulerDB:
     """Data access layer for Workflow, Schedule, and executions."""
@@ -117,6 +142,54 @@ class SchedulerDB:
         rows = await PostgresDB.fetch_all(query)
         return [Schedule.from_row(row) for row in rows]
 
+    @staticmethod
+    async def claim_due_schedules(now: datetime, limit: int) -> list[Schedule]:
+        """Atomically claim up to ``limit`` due schedules and advance their next run.
+
+        ``FOR UPDATE SKIP LOCKED`` lets several scheduler processes poll the
+        same table without firing a schedule twice: rows locked by another
+        poller are skipped, and ``next_run_at`` moves past ``now`` in the same
+        statement so the claim is visible as soon as it commits.  One-shot
+        schedules (no recurrence) get ``next_run_at = NULL`` and never re-fire.
+        """
+        await SchedulerDB.check_initialized()
+        query = """
+            WITH due AS (
+                SELECT id
+                FROM schedules
+                WHERE enabled = true AND next_run_at <= %(now)s
+                ORDER BY next_run_at
+                LIMIT %(limit)s
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE schedules s
+            SET next_run_at = CASE
+                    WHEN s.recurrence_seconds > 0 THEN %(now)s + make_interval(secs => s.recurrence_seconds)
+                END,
+                last_executed_at = CURRENT_TIMESTAMP,
+                updated_at = CURRENT_TIMESTAMP
+            FROM due
+            WHERE s.id = due.id
+            RETURNING s.*
+        """
+        rows = await PostgresDB.fetch_all(query, {"now": now, "limit": limit})
+        return [Schedule.from_row(row) for row in rows]
+
+    @staticmethod
+    async def release_schedule_claims(schedules: list[Schedule], due_at: datetime) -> None:
+        """Make claimed-but-unstarted schedules due again at ``due_at``.
+
+        A row is only reset while ``next_run_at`` still holds the value the
+        claim gave it, so an edit made after the claim is left alone.
+        """
+        await SchedulerDB.check_initialized()
+        query = """
+            UPDATE schedules
+            SET next_run_at = %s, updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND next_run_at IS NOT DISTINCT FROM %s
+        """
+        await PostgresDB.execute_many(query, [(due_at, s.id, s.next_run_at) for s in schedules])
+
     @staticmethod
     async def toggle_schedule(schedule_id: int, enabled: bool) -> Schedule | None:
         """Enable or disable a schedule."""
@@ -147,13 +220,22 @@ class SchedulerDB:
 
     @staticmethod
     async def create_execution(workflow_id: str, inputs: dict) -> int | None:
-        """Start tracking a new execution."""
+        """Start tracking a new execution and count it in its hourly rollup."""
         await SchedulerDB.check_initialized()
         inputs_json = json.dumps(inputs)
-        query = """
-            INSERT INTO executions (workflow_id, status, inputs, started_at)
-            VALUES (%s, 'running', %s, CURRENT_TIMESTAMP)
-            RETURNING id
+        query = f"""
+            WITH execution AS (
+                INSERT INTO executions (workflow_id, status, inputs, started_at)
+                VALUES (%s, 'running', %s, CURRENT_TIMESTAMP)
+                RETURNING id, workflow_id, started_at
+            ), rollup AS (
+                INSERT INTO workflow_execution_rollups AS r (workflow_id, bucket, executions, last_started_at)
+                SELECT workflow_id, {_HOUR_BUCKET.format("started_at")}, 1, started_at FROM execution
+                ON CONFLICT (workflow_id, bucket) DO UPDATE
+                SET executions = r.executions + 1,
+                    last_started_at = GREATEST(r.last_started_at, EXCLUDED.last_started_at)
+            )
+            SELECT id FROM execution
         """
         return await PostgresDB.fetch_val(query, (workflow_id, inputs_json))
 
@@ -165,52 +247,95 @@ class SchedulerDB:
         error_message: str | None = None,
         duration_ms: int | None = None,
     ) -> None:
-        """Mark an execution as completed or failed."""
+        """Mark an execution as completed or failed and fold the outcome into its hourly rollup.
+
+        The rollup is adjusted by the difference between the row's old and new
+        outcome, so completing an execution twice does not count it twice.
+        """
         await SchedulerDB.check_initialized()
         outputs_json = json.dumps(outputs) if outputs else None
-        query = """
-            UPDATE executions
-            SET status = %s,
-                outputs = %s,
-                error_message = %s,
-                completed_at = CURRENT_TIMESTAMP,
-                duration_ms = %s
-            WHERE id = %s
+        query = f"""
+            WITH previous AS (
+                SELECT id, status, duration_ms FROM executions WHERE id = %s FOR UPDATE
+            ), execution AS (
+                UPDATE executions e
+                SET status = %s,
+                    outputs = %s,
+                    error_message = %s,
+                    completed_at = CURRENT_TIMESTAMP,
+                    duration_ms = %s
+                FROM previous p
+                WHERE e.id = p.id
+                RETURNING e.workflow_id, e.started_at, e.status, e.duration_ms,
+                          p.status AS old_status, p.duration_ms AS old_duration_ms
+            ), outcome AS (
+                SELECT
+                    workflow_id,
+                    started_at,
+                    duration_ms,
+                    (status = 'success')::int - (old_status = 'success')::int AS successes,
+                    (status = 'failed')::int - (old_status = 'failed')::int AS failures,
+                    (duration_ms IS NOT NULL)::int
+                        - (old_status <> 'running' AND old_duration_ms IS NOT NULL)::int AS timed_executions,
+                    COALESCE(duration_ms, 0)
+                        - CASE WHEN old_status <> 'running' THEN COALESCE(old_duration_ms, 0) ELSE 0 END
+                        AS total_duration_ms
+                FROM execution
+            )
+            INSERT INTO workflow_execution_rollups AS r (
+                workflow_id, bucket, successes, failures, timed_executions, total_duration_ms, max_duration_ms
+            )
+            SELECT
+                workflow_id,
+                {_HOUR_BUCKET.format("started_at")},
+                successes,
+                failures,
+                timed_executions,
+                total_duration_ms,
+                duration_ms
+            FROM outcome
+            ON CONFLICT (workflow_id, bucket) DO UPDATE
+            SET successes = r.successes + EXCLUDED.successes,
+                failures = r.failures + EXCLUDED.failures,
+                timed_executions = r.timed_executions + EXCLUDED.timed_executions,
+                total_duration_ms = r.total_duration_ms + EXCLUDED.total_duration_ms,
+                max_duration_ms = GREATEST(r.max_duration_ms, EXCLUDED.max_duration_ms)
         """
-        await PostgresDB.execute(query, (status, outputs_json, error_message, duration_ms, execution_id))
+        await PostgresDB.execute(query, (execution_id, status, outputs_json, error_message, duration_ms))
 
     @staticmethod
-    async def log_node_execution(
-        execution_id: int,
-        node_id: str,
-        node_type: str,
-        status: str,
-        inputs: dict,
-        outputs: dict | None = None,
-        error_message: str | None = None,
-        duration_ms: int | None = None,
-    ) -> None:
-        """Log the execution of an individual node."""
+    async def log_node_executions(entries: list[dict]) -> None:
+        """Insert a batch of node execution records in one round trip.
+
+        Each entry carries ``execution_id``, ``node_id``, ``node_type``,
+        ``status``, ``inputs`` and optionally ``outputs``, ``error_message``,
+        ``started_at``, ``completed_at`` and ``duration_ms``.
+        """
+        if not entries:
+            return
         await SchedulerDB.check_initialized()
-        inputs_json = json.dumps(inputs)
-        outputs_json = json.dumps(outputs) if outputs else None
         query = """
             INSERT INTO node_executions
             (execution_id, node_id, node_type, status, inputs, outputs, error_message, started_at, completed_at, duration_ms)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, %s)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, COALESCE(%s, CURRENT_TIMESTAMP), COALESCE(%s, CURRENT_TIMESTAMP), %s)
         """
-        await PostgresDB.execute(
+        await PostgresDB.execute_many(
             query,
-            (
-                execution_id,
-                node_id,
-                node_type,
-                status,
-                inputs_json,
-                outputs_json,
-                error_message,
-                duration_ms,
-            ),
+            [
+                (
+                    entry["execution_id"],
+                    entry["node_id"],
+                    entry["node_type"],
+                    entry["status"],
+                    json.dumps(entry["inputs"]),
+                    json.dumps(entry["outputs"]) if entry.get("outputs") else None,
+                    entry.get("error_message"),
+                    entry.get("started_at"),
+                    entry.get("completed_at"),
+                    entry.get("duration_ms"),
+                )
+                for entry in entries
+            ],
         )
 
     @staticmethod
@@ -252,45 +377,60 @@ class SchedulerDB:
         return result["count"] if result else 0
 
     @staticmethod
-    async def get_executions_count(start_date: datetime | None = None, end_date: datetime | None = None) -> int:
-        """Get count of executions within the specified date range."""
-        await SchedulerDB.check_initialized()
-
-        if start_date:
-            query = "SELECT COUNT(*) as count FROM executions WHERE started_at >= %s AND started_at <= %s"
-            result = await PostgresDB.fetch_one(query, (start_date, end_date))
-        else:
-            query = "SELECT COUNT(*) as count FROM executions"
-            result = await PostgresDB.fetch_one(query)
+    def get_date_range(time_range: str) -> tuple[datetime | None, datetime]:
+        """Resolve an analytics time range (one of ``TIME_RANGES``) to ``(start, end)``.
 
-        return result["count"] if result else 0
+        ``start`` is ``None`` for ``"all"``.
+        """
+        end_date = datetime.now(UTC)
+        if time_range == "today":
+            return end_date.replace(hour=0, minute=0, second=0, microsecond=0), end_date
+        if time_range == "all":
+            return None, end_date
+        if time_range in TIME_RANGES:
+            return end_date - timedelta(days=int(time_range.removesuffix("days"))), end_date
+        raise ValueError(f"Invalid time_range: {time_range}")
 
     @staticmethod
-    async def get_success_rate(start_date: datetime | None = None, end_date: datetime | None = None) -> float:
-        """Calculate success rate as percentage of successful executions."""
+    async def get_execution_stats(start_date: datetime | None = None, end_date: datetime | None = None) -> dict:
+        """Execution count, success rate and average duration from the hourly rollups.
+
+        Ranges are resolved to whole UTC hours: ``start_date`` is rounded down
+        to the start of its hour.
+        """
         await SchedulerDB.check_initialized()
+        where, params = _bucket_filter(start_date, end_date)
+        query = f"""
+            SELECT
+                COALESCE(SUM(executions), 0) AS executions,
+                COALESCE(SUM(successes), 0) AS successes,
+                COALESCE(SUM(failures), 0) AS failures,
+                COALESCE(SUM(timed_executions), 0) AS timed_executions,
+                COALESCE(SUM(total_duration_ms), 0) AS total_duration_ms
+            FROM workflow_execution_rollups
+            {where}
+        """
+        row = await PostgresDB.fetch_one(query, params) or {}
+        executions = int(row.get("executions") or 0)
+        successes = int(row.get("successes") or 0)
+        timed = int(row.get("timed_executions") or 0)
+        return {
+            "executions": executions,
+            "successes": successes,
+            "failures": int(row.get("failures") or 0),
+            "success_rate": round(successes / executions * 100, 2) if executions else 0.0,
+            "avg_duration_ms": round(int(row.get("total_duration_ms") or 0) / timed, 2) if timed else 0.0,
+        }
 
-        if start_date:
-            query = """
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END)::FLOAT as successful
-                FROM executions
-                WHERE started_at >= %s AND started_at <= %s
-            """
-            result = await PostgresDB.fetch_one(query, (start_date, end_date))
-        else:
-            query = """
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END)::FLOAT as successful
-                FROM executions
-            """
-            result = await PostgresDB.fetch_one(query)
+    @staticmethod
+    async def get_executions_count(start_date: datetime | None = None, end_date: datetime | None = None) -> int:
+        """Get count of executions within the specified date range."""
+        return (await SchedulerDB.get_execution_stats(start_date, end_date))["executions"]
 
-        if result and result["total"] > 0:
-            return round((result["successful"] / result["total"]) * 100, 2)
-        return 0.0
+    @staticmethod
+    async def get_success_rate(start_date: datetime | None = None, end_date: datetime | None = None) -> float:
+        """Calculate success rate as percentage of successful executions."""
+        return (await SchedulerDB.get_execution_stats(start_date, end_date))["success_rate"]
 
     @staticmethod
     async def get_recent_workflows_summary(limit: int = 20) -> list[dict]:
@@ -300,15 +440,18 @@ class SchedulerDB:
             SELECT
                 w.id,
                 w.name,
-                MAX(e.started_at) as last_executed_at,
-                COUNT(e.id) as total_executions,
+                r.last_executed_at,
+                COALESCE(r.total_executions, 0) as total_executions,
                 CASE
-                    WHEN MAX(e.started_at) >= NOW() - INTERVAL '7 days' THEN 'active'
+                    WHEN r.last_executed_at >= NOW() - INTERVAL '7 days' THEN 'active'
                     ELSE 'inactive'
                 END as status
             FROM workflows w
-            LEFT JOIN executions e ON w.id = e.workflow_id
-            GROUP BY w.id, w.name
+            LEFT JOIN (
+                SELECT workflow_id, MAX(last_started_at) as last_executed_at, SUM(executions) as total_executions
+                FROM workflow_execution_rollups
+                GROUP BY workflow_id
+            ) r ON w.id = r.workflow_id
             ORDER BY last_executed_at DESC NULLS LAST, w.created_at DESC
             LIMIT %s
         """
@@ -324,6 +467,38 @@ class SchedulerDB:
             for row in rows
         ]
 
+    @staticmethod
+    async def get_top_workflows(
+        limit: int = 10, start_date: datetime | None = None, end_date: datetime | None = None
+    ) -> list[dict]:
+        """Workflows with the most executions in the range, with their success rate."""
+        await SchedulerDB.check_initialized()
+        where, params = _bucket_filter(start_date, end_date, column="r.bucket")
+        query = f"""
+            SELECT
+                w.id,
+                w.name,
+                SUM(r.executions) as executions,
+                SUM(r.successes) as successes
+            FROM workflow_execution_rollups r
+            JOIN workflows w ON w.id = r.workflow_id
+            {where}
+            GROUP BY w.id, w.name
+            HAVING SUM(r.executions) > 0
+            ORDER BY executions DESC, w.name
+            LIMIT %s
+        """
+        rows = await PostgresDB.fetch_all(query, (*params, limit))
+        return [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "executions": int(row["executions"]),
+                "success_rate": round(int(row["successes"]) / int(row["executions"]) * 100, 2),
+            }
+            for row in rows
+        ]
+
     @staticmethod
     async def get_recent_executions_summary(limit: int = 100) -> list[dict]:
         """Get recent executions with minimal fields and workflow name."""
@@ -554,22 +729,4 @@ class SchedulerDB:
     @staticmethod
     async def get_average_duration(start_date: datetime | None = None, end_date: datetime | None = None) -> float:
         """Calculate average execution duration in milliseconds."""
-        await SchedulerDB.check_initialized()
-
-        if start_date:
-            query = """
-                SELECT AVG(duration_ms)::FLOAT as avg_duration
-                FROM executions
-                WHERE duration_ms IS NOT NULL
-                  AND started_at >= %s AND started_at <= %s
-            """
-            result = await PostgresDB.fetch_one(query, (start_date, end_date))
-        else:
-            query = """
-                SELECT AVG(duration_ms)::FLOAT as avg_duration
-                FROM executions
-                WHERE duration_ms IS NOT NULL
-            """
-            result = await PostgresDB.fetch_one(query)
-
-        return round(result["avg_duration"] or 0, 2) if result else 0.0
+        return (await SchedulerDB.get_execution_stats(start_date, end_date))["avg_duration_ms"]
@@ -1,19 +1,44 @@
 """
 TTS (Text-to-Speech) module.
 Consolidates TTS generation and audio playback.
+
+Exports load on first access so that light submodules (``tts.cache``,
+``tts.utils``) can be used without importing Kokoro or the audio device.
 """
 
-from .audio import AudioProcessor
-from .processor import TTSAsyncProcessor
-from .providers.base import VoiceModel
-from .providers.kokoro import KokoroVoiceModel
-from .utils import filter_tts_text
+from typing import TYPE_CHECKING
+
+from ...utils.lazy import lazy_exports
+
+
+if TYPE_CHECKING:
+    from .audio import AudioProcessor
+    from .cache import TTSCache, get_tts_cache
+    from .processor import TTSAsyncProcessor
+    from .providers.base import VoiceModel
+    from .providers.kokoro import KokoroVoiceModel
+    from .utils import filter_tts_text
 
 
+_LAZY_ATTRS = {
+    "AudioProcessor": ".audio",
+    "KokoroVoiceModel": ".providers.kokoro",
+    "TTSAsyncProcessor": ".processor",
+    "TTSCache": ".cache",
+    "VoiceModel": ".providers.base",
+    "filter_tts_text": ".utils",
+    "get_tts_cache": ".cache",
+}
+
 __all__ = [
     "AudioProcessor",
     "KokoroVoiceModel",
     "TTSAsyncProcessor",
+    "TTSCache",
     "VoiceModel",
     "filter_tts_text",
+    "get_tts_cache",
 ]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
@@ -0,0 +1,236 @@
+"""
+Content-addressed cache for synthesized TTS audio.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ...core.config import Config
+from ...utils.printer import printer
+
+
+class TTSCache:
+    """
+    Byte-bounded LRU cache of synthesized audio.
+
+    Entries are keyed on a hash of everything that changes the waveform
+    (normalized text, voice, language, speed, sample rate).  The in-memory
+    tier holds float32 arrays; the optional disk tier stores the same arrays
+    as compressed ``.npz`` files so repeated phrases survive restarts.  Both
+    tiers evict least-recently-used entries once their byte budget is hit.
+    Safe to share between threads.
+    """
+
+    def __init__(self, max_bytes: int, disk_dir: str | None = None, disk_max_bytes: int = 0):
+        self.max_bytes = max(0, max_bytes)
+        self.disk_max_bytes = max(0, disk_max_bytes)
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_dir: Path | None = None
+        self._disk_entries: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        if disk_dir and self.disk_max_bytes > 0:
+            self._open_disk_tier(Path(disk_dir).expanduser())
+
+    @staticmethod
+    def make_key(text: str, voice: str, language: str, speed: float, sample_rate: int) -> str:
+        """Build the cache key; *text* should already be passed through ``filter_tts_text``."""
+        normalized = " ".join(text.split())
+        payload = json.dumps([normalized, voice, language, float(speed), int(sample_rate)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self._disk_dir is not None
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Return cached audio for *key* (read-only array) or None."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return audio
+            on_disk = key in self._disk_entries
+
+        audio = self._read_disk(key) if on_disk else None
+        with self._lock:
+            if audio is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._store_memory(key, audio)
+        return audio
+
+    def put(self, key: str, audio: np.ndarray) -> None:
+        """Cache *audio* under *key* in every enabled tier."""
+        if not self.enabled:
+            return
+
+        audio = np.array(audio, dtype=np.float32, copy=True)
+        audio.setflags(write=False)
+        with self._lock:
+            self._store_memory(key, audio)
+            write_disk = self._disk_dir is not None and key not in self._disk_entries
+        if write_disk:
+            self._write_disk(key, audio)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            keys = list(self._disk_entries)
+            self._disk_entries.clear()
+            self._disk_bytes = 0
+        for key in keys:
+            self._remove_disk_file(key)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and tier occupancy."""
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits + self._disk_hits) / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disk_entries": len(self._disk_entries),
+                "disk_bytes": self._disk_bytes,
+                "disk_max_bytes": self.disk_max_bytes if self._disk_dir is not None else 0,
+            }
+
+    def _store_memory(self, key: str, audio: np.ndarray) -> None:
+        """Insert into the memory tier. Caller holds the lock."""
+        size = audio.nbytes
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._entries[key] = audio
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self._evictions += 1
+
+    def _open_disk_tier(self, disk_dir: Path) -> None:
+        try:
+            disk_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            printer.warning(f"TTS disk cache disabled, cannot create {disk_dir}: {e}")
+            return
+
+        self._disk_dir = disk_dir
+        # Rebuild the LRU order from modification times, which _read_disk bumps.
+        files = sorted(disk_dir.glob("*.npz"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._disk_entries[path.stem] = size
+            self._disk_bytes += size
+        with self._lock:
+            self._evict_disk()
+
+    def _disk_path(self, key: str) -> Path:
+        assert self._disk_dir is not None, "disk tier is not open"
+        return self._disk_dir / f"{key}.npz"
+
+    def _read_disk(self, key: str) -> np.ndarray | None:
+        path = self._disk_path(key)
+        try:
+            with np.load(path) as data:
+                audio = data["audio"]
+            os.utime(path)
+        except Exception as e:
+            printer.warning(f"TTS disk cache read failed for {path.name}: {e}")
+            with self._lock:
+                size = self._disk_entries.pop(key, None)
+                if size is not None:
+                    self._disk_bytes -= size
+            return None
+
+        audio.setflags(write=False)
+        with self._lock:
+            if key in self._disk_entries:
+                self._disk_entries.move_to_end(key)
+        return audio
+
+    def _write_disk(self, key: str, audio: np.ndarray) -> None:
+        buf = io.BytesIO()
+        np.savez_compressed(buf, audio=audio)
+        data = buf.getvalue()
+        if len(data) > self.disk_max_bytes:
+            return
+
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            printer.warning(f"TTS disk cache write failed for {path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            previous = self._disk_entries.pop(key, None)
+            if previous is not None:
+                self._disk_bytes -= previous
+            self._disk_entries[key] = len(data)
+            self._disk_bytes += len(data)
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Trim the disk tier to its budget. Caller holds the lock."""
+        while self._disk_bytes > self.disk_max_bytes and self._disk_entries:
+            key, size = self._disk_entries.popitem(last=False)
+            self._disk_bytes -= size
+            self._evictions += 1
+            self._remove_disk_file(key)
+
+    def _remove_disk_file(self, key: str) -> None:
+        try:
+            self._disk_path(key).unlink(missing_ok=True)
+        except OSError as e:
+            printer.warning(f"TTS disk cache could not remove {key}.npz: {e}")
+
+
+_shared_cache: TTSCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> TTSCache:
+    """Return the process-wide cache, sized from ``Config`` on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                cfg = Config()
+                _shared_cache = TTSCache(
+                    max_bytes=cfg.tts_cache_max_bytes,
+                    disk_dir=cfg.tts_cache_dir,
+                    disk_max_bytes=cfg.tts_cache_disk_max_bytes,
+                )
+    return _shared_cache
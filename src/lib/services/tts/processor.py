@@ -118,9 +118,11 @@ class TTSAsyncProcessor:
                 text = self.text_processing_queue.popleft()
                 try:
                     self.is_generating = True
-                    audio, sample_rate = self.tts_processor.generate(text)
-                    self.audio_processing_queue.append((audio, sample_rate))
-                    printer.debug("Audio generated")
+                    # Queue each pipeline chunk as soon as it exists so playback
+                    # of a long sentence starts before synthesis has finished.
+                    for audio in self.tts_processor.generate_stream(text):
+                        self.audio_processing_queue.append((audio, self.tts_processor.sample_rate))
+                        printer.debug("Audio chunk generated")
                 except Exception as e:
                     printer.error(f"Error processing text: {e}")
                 finally:
@@ -4,7 +4,7 @@ Provides abstract base class for TTS models.
 """
 
 from abc import ABC, abstractmethod
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 
 import numpy as np
 
@@ -54,6 +54,15 @@ class VoiceModel(ABC):
         """
         pass
 
+    def generate_stream(self, text: str, voice: str | None = None) -> Iterator[np.ndarray]:
+        """
+        Yield audio chunks at ``self.sample_rate`` as they are synthesized.
+
+        Models that cannot stream fall back to a single chunk from ``generate``.
+        """
+        audio, _ = self.generate(text, voice)
+        yield audio
+
     @abstractmethod
     def set_voice(self, voice: str) -> None:
         """Set the voice for speech generation."""
@@ -2,13 +2,17 @@
 Kokoro TTS model implementation.
 """
 
+import time
 import warnings
+from collections.abc import Iterator
 
 import numpy as np
 from kokoro import KPipeline
 
 from ....core.config import Config
 from ....utils import printer
+from ....utils.metrics import metrics, span
+from ..cache import TTSCache, get_tts_cache
 from ..utils import filter_tts_text, is_speakable
 from .base import VoiceModel
 
@@ -16,6 +20,11 @@ from .base import VoiceModel
 warnings.filterwarnings("ignore", category=UserWarning, module="torch")
 warnings.filterwarnings("ignore", category=FutureWarning, module="torch")
 
+_SYNTHESIS_SECONDS = metrics.histogram(
+    "knik_tts_synthesis_seconds", "Kokoro time spent synthesizing one text (cache misses only)"
+)
+_AUDIO_SECONDS = metrics.counter("knik_tts_audio_seconds_total", "Seconds of audio synthesized by Kokoro")
+
 
 class KokoroVoiceModel(VoiceModel):
     """
@@ -30,9 +39,13 @@ class KokoroVoiceModel(VoiceModel):
         language: str = Config.DEFAULT_LANGUAGE,
         voice: str = Config.DEFAULT_VOICE,
         model_name: str = Config.DEFAULT_MODEL,
+        speed: float = 1.0,
+        cache: TTSCache | None = None,
     ):
         super().__init__(language, voice, model_name)
+        self.speed = speed
         self._pipeline: KPipeline | None = None
+        self._cache = cache if cache is not None else get_tts_cache()
 
         if not Config.is_valid_voice(voice):
             printer.warning(f"Voice '{voice}' may not be recognized. Using anyway.")
@@ -53,12 +66,6 @@ class KokoroVoiceModel(VoiceModel):
 
     def generate(self, text: str, voice: str | None = None) -> tuple[np.ndarray, int]:
         """Generate speech audio from the given text."""
-        if not self.is_loaded():
-            self.load()
-
-        filtered_text = filter_tts_text(text)
-        voice_to_use = voice or self.voice
-
         # Guard: if the text has nothing speakable after filtering (e.g. pure
         # markdown like "**"), return a tiny silent buffer instead of crashing.
         if not is_speakable(text):
@@ -66,22 +73,67 @@ class KokoroVoiceModel(VoiceModel):
             silence = np.zeros(2400, dtype=np.float32)  # 0.1s silence at 24 kHz
             return silence, 24000
 
-        try:
-            printer.info(f"Generating speech with voice '{voice_to_use}'...")
+        audio_chunks = list(self.generate_stream(text, voice))
+        if len(audio_chunks) == 0:
+            raise RuntimeError("No audio generated by Kokoro pipeline")
 
-            generator = self._pipeline(filtered_text, voice=voice_to_use)
+        return np.concatenate(audio_chunks), 24000
 
-            audio_chunks = []
-            for _, _, audio in generator:
-                audio_chunks.append(audio)
+    def generate_stream(self, text: str, voice: str | None = None) -> Iterator[np.ndarray]:
+        """Yield 24 kHz float32 audio for each Kokoro pipeline chunk as soon as it is synthesized.
 
-            if len(audio_chunks) == 0:
-                raise RuntimeError("No audio generated by Kokoro pipeline")
+        Long inputs are split by the pipeline into several chunks, so callers
+        can start playback after the first one instead of waiting for the
+        whole text.  Non-speakable text yields nothing.  Previously synthesized
+        text is served from the TTS cache as a single chunk.
+        """
+        if not self.is_loaded():
+            self.load()
+
+        if not is_speakable(text):
+            printer.warning(f"Skipping TTS for non-speakable text: '{text[:60]}'")
+            return
+
+        filtered_text = filter_tts_text(text)
+        voice_to_use = voice or self.voice
+
+        cache_key = self._cache.make_key(filtered_text, voice_to_use, self.language, self.speed, self.sample_rate)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            printer.debug(f"TTS cache hit for '{filtered_text[:40]}'")
+            yield cached
+            return
+
+        try:
+            printer.info(f"Generating speech with voice '{voice_to_use}'...")
 
-            full_audio = np.concatenate(audio_chunks)
+            chunks = []
+            # Synthesis time excludes the consumer's time between chunks (playback, encoding).
+            synthesis_seconds = 0.0
+            with span("tts.synthesize", voice=voice_to_use, chars=len(filtered_text)) as tts_span:
+                results = iter(self._pipeline(filtered_text, voice=voice_to_use, speed=self.speed))
+                while True:
+                    step_start = time.perf_counter()
+                    result = next(results, None)
+                    synthesis_seconds += time.perf_counter() - step_start
+                    if result is None:
+                        break
+                    audio = result[2]
+                    if audio is None:
+                        continue
+                    chunk = np.asarray(audio, dtype=np.float32)
+                    chunks.append(chunk)
+                    yield chunk
+                tts_span.set_attribute("synthesis_ms", round(synthesis_seconds * 1000, 1))
+
+            _SYNTHESIS_SECONDS.observe(synthesis_seconds)
+            # Only a fully consumed stream is cached; a closed generator never gets here.
+            if chunks:
+                audio = np.concatenate(chunks)
+                _AUDIO_SECONDS.inc(len(audio) / self.sample_rate)
+                self._cache.put(cache_key, audio)
 
             printer.info(f"Generation completed cleanly for kokoro voice '{voice_to_use}'")
-            return full_audio, 24000
 
         except Exception as e:
             printer.error(f"Kokoro generation error: {e}")
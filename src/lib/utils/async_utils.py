@@ -1,34 +1,138 @@
 """
 Async utility functions for bridging sync and async code.
+
+Synchronous MCP tool implementations (shell, cron, workflow, ...) run in
+worker threads but need to call async scheduler/database code.  Rather than
+creating and tearing down an event loop per call, they submit coroutines to a
+long-lived loop through :class:`AsyncBridge`:
+
+- If the application registered its main loop (``PostgresDB.initialize`` does
+  this, since the connection pool is bound to that loop), coroutines run there
+  and share the real pool.
+- Otherwise they run on one background loop thread owned by the bridge.
 """
 
 import asyncio
+import concurrent.futures
+import threading
+from collections.abc import Coroutine
 from typing import Any
 
 
-def run_async(coro: Any) -> Any:
-    """Run an async coroutine synchronously.
+class AsyncBridge:
+    """Runs coroutines on a persistent event loop from synchronous code."""
+
+    def __init__(self, name: str = "knik-async-bridge"):
+        self._name = name
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._home: asyncio.AbstractEventLoop | None = None
+        self._home_thread_id: int | None = None
+
+    def bind(self) -> None:
+        """Route submissions to the running loop for as long as it keeps running.
+
+        Must be called from a coroutine on that loop.
+        """
+        self._home = asyncio.get_running_loop()
+        self._home_thread_id = threading.get_ident()
+
+    def unbind(self) -> None:
+        """Forget the bound loop if it is the running one."""
+        if self._home is asyncio.get_running_loop():
+            self._home = None
+            self._home_thread_id = None
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def _serve() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=_serve, name=self._name, daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _target_loop(self) -> asyncio.AbstractEventLoop:
+        home = self._home
+        # A sync call made on the home loop's own thread would block the loop it
+        # is waiting on, so that case falls through to the background loop.
+        if home is not None and home.is_running() and threading.get_ident() != self._home_thread_id:
+            return home
+        loop = self._background_loop()
+        if self._thread is not None and threading.get_ident() == self._thread.ident:
+            raise RuntimeError("run_async() called from inside the bridge loop; await the coroutine instead")
+        return loop
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Schedule *coro* on the target loop and return a thread-safe future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._target_loop())
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any:
+        """Block until *coro* finishes on the target loop and return its result.
+
+        Raises:
+            TimeoutError: The coroutine did not finish within *timeout* seconds;
+                it is cancelled on its loop.
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            if future.done():
+                # The coroutine itself raised TimeoutError (the same class since 3.11).
+                raise
+            future.cancel()
+            raise TimeoutError(f"Coroutine did not finish within {timeout}s") from None
+        except BaseException:
+            # Interrupted while waiting (e.g. KeyboardInterrupt): don't leave it running.
+            future.cancel()
+            raise
+
+    def close(self) -> None:
+        """Stop the background loop thread, if one was started."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        if not loop.is_running():
+            loop.close()
+
+
+_bridge: AsyncBridge | None = None
+_bridge_lock = threading.Lock()
+
+
+def get_async_bridge() -> AsyncBridge:
+    """Return the process-wide bridge, created on first use."""
+    global _bridge
+    if _bridge is None:
+        with _bridge_lock:
+            if _bridge is None:
+                _bridge = AsyncBridge()
+    return _bridge
+
 
-    Handles the case where an event loop is already running by applying
-    nest_asyncio to allow nested event loops. This is necessary because
-    MCP tool implementations are synchronous but need to call async
-    scheduler/database code.
+def run_async(coro: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any:
+    """Run an async coroutine synchronously on the shared bridge loop.
 
     Args:
         coro: An awaitable coroutine to execute synchronously.
+        timeout: Seconds to wait before cancelling it and raising ``TimeoutError``.
 
     Returns:
         The result of the coroutine execution.
     """
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-
-    if loop and loop.is_running():
-        import nest_asyncio
-
-        nest_asyncio.apply()
-        return asyncio.run(coro)
-    else:
-        return asyncio.run(coro)
+    return get_async_bridge().run(coro, timeout)
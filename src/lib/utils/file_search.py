@@ -0,0 +1,333 @@
+"""
+Ignore-aware, parallel text search over a directory tree.
+
+Used by ``FileTool.search_in_files``.  The walk honors ``.gitignore`` and
+``.ignore`` files (including those between the search root and its git
+repository root), never enters VCS metadata directories, and skips binary
+and oversized files.  File reads and matching fan out across a thread pool
+while results are consumed in walk order, so the first ``max_results``
+matches are the same as a sequential search would return and the walk stops
+as soon as the limit is hit.
+"""
+
+import os
+import re
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import NamedTuple
+
+
+IGNORE_FILES = (".gitignore", ".ignore")
+ALWAYS_SKIPPED_DIRS = frozenset({".git", ".hg", ".svn"})
+DEFAULT_MAX_FILE_SIZE = 2 * 1024 * 1024
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 1) + 4)
+# A NUL byte in the first chunk marks a file as binary (the heuristic git and grep use).
+BINARY_SNIFF_BYTES = 8192
+
+
+class IgnoreRule(NamedTuple):
+    regex: re.Pattern
+    negated: bool
+    dir_only: bool
+
+
+def _glob_to_regex(glob: str) -> str:
+    """Translate one gitignore glob (without leading/trailing slashes) to a regex body."""
+    out: list[str] = []
+    i, n = 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if c == "*":
+            if glob.startswith("**", i) and (i == 0 or glob[i - 1] == "/") and (i + 2 == n or glob[i + 2] == "/"):
+                if i + 2 == n:
+                    out.append(".*")
+                    i += 2
+                else:
+                    out.append("(?:.*/)?")
+                    i += 3
+                continue
+            while i < n and glob[i] == "*":
+                i += 1
+            out.append("[^/]*")
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and glob[j] in "!^":
+                j += 1
+            if j < n and glob[j] == "]":
+                j += 1
+            while j < n and glob[j] != "]":
+                j += 1
+            if j >= n:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1 : j]
+                negate = body[0] in "!^"
+                body = body[1:] if negate else body
+                out.append(f"[{'^' if negate else ''}{body.replace(chr(92), chr(92) * 2)}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(glob[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_ignore_line(line: str) -> IgnoreRule | None:
+    """Parse one line of a gitignore file; ``None`` for blanks and comments."""
+    line = line.rstrip("\r\n")
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+
+    negated = line.startswith("!")
+    # "!" negates; a backslash escapes a literal leading "!" or "#".
+    if negated or line.startswith(("\\!", "\\#")):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # A slash anywhere but the end anchors the pattern to the ignore file's directory.
+    anchored = "/" in line
+    body = _glob_to_regex(line.lstrip("/"))
+    return IgnoreRule(re.compile(body if anchored else f"(?:.*/)?{body}", re.DOTALL), negated, dir_only)
+
+
+@dataclass
+class IgnoreFile:
+    """Rules from one ignore file, matched against paths relative to its directory."""
+
+    base: str
+    rules: list[IgnoreRule]
+
+    def match(self, path: str, is_dir: bool) -> bool | None:
+        """``True``/``False`` if a rule decides *path* (last rule wins), else ``None``."""
+        if not path.startswith(self.base + os.sep):
+            return None
+        rel = path[len(self.base) + 1 :].replace(os.sep, "/")
+        for rule in reversed(self.rules):
+            if (is_dir or not rule.dir_only) and rule.regex.fullmatch(rel):
+                return not rule.negated
+        return None
+
+
+def load_ignore_files(directory: str) -> list[IgnoreFile]:
+    """Read the ignore files present in *directory*."""
+    loaded = []
+    for name in IGNORE_FILES:
+        try:
+            with open(os.path.join(directory, name), encoding="utf-8", errors="ignore") as f:
+                rules = [rule for rule in map(parse_ignore_line, f) if rule is not None]
+        except OSError:
+            continue
+        if rules:
+            loaded.append(IgnoreFile(directory, rules))
+    return loaded
+
+
+def _parent_ignore_files(root: str) -> list[IgnoreFile]:
+    """Ignore files between *root*'s git repository root and *root* (exclusive), shallowest first."""
+    parents = []
+    current = root
+    while True:
+        parent = os.path.dirname(current)
+        if os.path.exists(os.path.join(current, ".git")) or parent == current:
+            break
+        current = parent
+        parents.append(current)
+    if not os.path.exists(os.path.join(current, ".git")):
+        return []
+    return [ignore for directory in reversed(parents) for ignore in load_ignore_files(directory)]
+
+
+def _is_ignored(chain: tuple[IgnoreFile, ...], path: str, is_dir: bool) -> bool:
+    # Deeper ignore files take precedence, as in git.
+    for ignore in reversed(chain):
+        decision = ignore.match(path, is_dir)
+        if decision is not None:
+            return decision
+    return False
+
+
+def _pattern_matcher(file_pattern: str) -> Callable[[str], bool]:
+    """Match relative posix paths the way ``Path.rglob(file_pattern)`` selects them."""
+    pattern = file_pattern
+    while pattern.startswith("**/"):
+        pattern = pattern[3:]
+    if pattern in ("", "*", "**"):
+        return lambda rel: True
+    return lambda rel: PurePosixPath(rel).match(pattern)
+
+
+class _Candidate(NamedTuple):
+    path: str
+    rel: str
+    size: int
+
+
+def _walk(root: str, file_pattern: str, use_ignore_files: bool) -> Iterator[_Candidate]:
+    selects = _pattern_matcher(file_pattern)
+    base_chain = tuple(_parent_ignore_files(root)) if use_ignore_files else ()
+    stack: list[tuple[str, tuple[IgnoreFile, ...]]] = [(root, base_chain)]
+    while stack:
+        directory, chain = stack.pop()
+        if use_ignore_files:
+            chain = chain + tuple(load_ignore_files(directory))
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_dir:
+                    if entry.name not in ALWAYS_SKIPPED_DIRS and not _is_ignored(chain, entry.path, True):
+                        subdirs.append(entry.path)
+                    continue
+                if not entry.is_file() or _is_ignored(chain, entry.path, False):
+                    continue
+                rel = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                if selects(rel):
+                    yield _Candidate(entry.path, rel, entry.stat().st_size)
+            except OSError:
+                continue
+        stack.extend((subdir, chain) for subdir in reversed(subdirs))
+
+
+def walk_files(root: str, file_pattern: str = "*", use_ignore_files: bool = True) -> Iterator[str]:
+    """Yield the files under *root* a search would visit, in walk order."""
+    for candidate in _walk(os.path.abspath(root), file_pattern, use_ignore_files):
+        yield candidate.path
+
+
+@dataclass
+class SearchResult:
+    matches: list[dict] = field(default_factory=list)
+    truncated: bool = False
+    files_searched: int = 0
+    files_skipped: int = 0
+
+
+def _scan_file(
+    candidate: _Candidate,
+    line_matches: Callable[[str], bool],
+    file_matches: Callable[[str], bool] | None,
+    max_matches: int,
+    max_file_size: int,
+    stop: threading.Event,
+) -> list[tuple[int, str]] | None:
+    """Matching ``(line_number, stripped_line)`` pairs, or ``None`` if the file was skipped."""
+    if stop.is_set() or candidate.size > max_file_size:
+        return None
+    try:
+        with open(candidate.path, "rb") as f:
+            data = f.read(max_file_size + 1)
+    except OSError:
+        return None
+    if len(data) > max_file_size or b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return None
+
+    # Normalised before the prefilter so it sees the same line ends as the line scan.
+    text = data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+    if file_matches is not None and not file_matches(text):
+        return []
+
+    found = []
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    for line_num, line in enumerate(lines, 1):
+        if line_matches(line):
+            found.append((line_num, line.strip()))
+            if len(found) >= max_matches or stop.is_set():
+                break
+    return found
+
+
+def search_tree(
+    root: str,
+    line_matches: Callable[[str], bool],
+    *,
+    file_matches: Callable[[str], bool] | None = None,
+    file_pattern: str = "*",
+    max_results: int = 100,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+    use_ignore_files: bool = True,
+    workers: int = DEFAULT_WORKERS,
+) -> SearchResult:
+    """
+    Search every text file under *root* for lines accepted by *line_matches*.
+
+    Args:
+        root: Directory to search.
+        line_matches: Predicate applied to each line (without its newline).
+        file_matches: Optional cheap whole-file check; a file it rejects is
+            not split into lines.  It must accept every file that contains a
+            matching line.
+        file_pattern: Glob selecting files, as for ``Path.rglob``.
+        max_results: Stop after this many matches.
+        max_file_size: Files larger than this many bytes are skipped.
+        use_ignore_files: Honor ``.gitignore``/``.ignore`` rules.
+        workers: Threads reading and scanning files.
+
+    Returns:
+        Matches in walk order (``file`` relative to *root*, ``line``,
+        ``content``), whether the limit cut the search short, and how many
+        files were searched or skipped as binary/oversized/unreadable.
+    """
+    root = os.path.abspath(root)
+    max_results = max(1, max_results)
+    workers = max(1, workers)
+    result = SearchResult()
+    stop = threading.Event()
+    candidates = _walk(root, file_pattern, use_ignore_files)
+    window: deque[tuple[_Candidate, Future]] = deque()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file-search") as pool:
+
+        def _fill() -> None:
+            while len(window) < workers * 4 and not stop.is_set():
+                candidate = next(candidates, None)
+                if candidate is None:
+                    return
+                future = pool.submit(
+                    _scan_file, candidate, line_matches, file_matches, max_results, max_file_size, stop
+                )
+                window.append((candidate, future))
+
+        try:
+            _fill()
+            while window:
+                candidate, future = window.popleft()
+                found = future.result()
+                if found is None:
+                    result.files_skipped += 1
+                else:
+                    result.files_searched += 1
+                    for line_num, content in found:
+                        result.matches.append({"file": candidate.rel, "line": line_num, "content": content})
+                        if len(result.matches) >= max_results:
+                            result.truncated = True
+                            return result
+                _fill()
+        finally:
+            stop.set()
+            for _, future in window:
+                future.cancel()
+    return result
@@ -0,0 +1,33 @@
+"""Lazy (PEP 562) re-exports for package facades."""
+
+import importlib
+import sys
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(module_name: str, mapping: dict[str, str]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Module-level ``__getattr__`` and ``__dir__`` that import *mapping*'s names on first access.
+
+    *mapping* maps each public name to the module that defines it; relative
+    module names resolve against *module_name*.  A resolved value is stored
+    on the module, so later lookups never reach ``__getattr__`` again.
+
+    Usage, in a package ``__init__``::
+
+        __getattr__, __dir__ = lazy_exports(__name__, _LAZY_ATTRS)
+    """
+
+    def module_getattr(name: str) -> Any:
+        target = mapping.get(name)
+        if target is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(target, module_name), name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def module_dir() -> list[str]:
+        module = sys.modules[module_name]
+        return sorted(set(vars(module)) | set(getattr(module, "__all__", ())))
+
+    return module_getattr, module_dir
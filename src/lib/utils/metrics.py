@@ -0,0 +1,362 @@
+"""
+In-process metrics and lightweight tracing.
+
+Counters, gauges and histograms live in one process-wide registry and are
+rendered in the Prometheus text exposition format (the web backend serves
+them at ``/metrics``).  Instrumented modules declare their metrics at import
+time and update them on the hot path; with ``KNIK_METRICS_ENABLED=false``
+every update returns after a single attribute check.
+
+``span()`` marks a unit of work.  With ``KNIK_TRACING_ENABLED=true`` finished
+spans, linked to their parent through a context variable (so they nest
+across ``await`` and tasks), are kept in a bounded in-memory buffer; when
+tracing is off it returns one shared no-op object.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import math
+import secrets
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, ClassVar
+
+from ..core.config import Config
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: list[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind: ClassVar[str]
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _samples(self) -> Iterator[tuple[str, list[tuple[str, str]], float]]:
+        """``(name suffix, label pairs, value)`` for every series."""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", list(zip(self.labelnames, key, strict=True)), value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, pairs, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(pairs)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """A monotonically increasing total."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative ``le`` buckets, plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(b for b in buckets if b != math.inf))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Per-bucket (non-cumulative) counts with a trailing +Inf slot, then sum and count.
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the wall time of the ``with`` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels: Any) -> tuple[int, float]:
+        """``(count, sum)`` of the observations for one label set."""
+        series = self._values.get(self._key(labels))
+        return (0, 0.0) if series is None else (series[2], series[1])
+
+    def _samples(self) -> Iterator[tuple[str, list[tuple[str, str]], float]]:
+        with self._lock:
+            items = [(key, (list(s[0]), s[1], s[2])) for key, s in self._values.items()]
+        for key, (counts, total, count) in items:
+            pairs = list(zip(self.labelnames, key, strict=True))
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += n
+                yield "_bucket", [*pairs, ("le", _format_value(bound))], cumulative
+            yield "_sum", pairs, total
+            yield "_count", pairs, count
+
+
+class MetricsRegistry:
+    """
+    Named metrics plus collectors that refresh gauges just before a scrape.
+
+    Declaring a metric that already exists returns the existing one, so
+    module reloads (and tests) do not fail on duplicate registration.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _declare(self, cls: type[_Metric], name: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, cls):
+                    raise ValueError(f"Metric {name} is already registered as a {existing.kind}")
+                return existing
+            metric = self._metrics[name] = cls(self, name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._declare(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._declare(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._declare(Histogram, name, documentation, labelnames, buckets)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run *collector* before every render, e.g. to copy pool stats into gauges."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        if not self.enabled:
+            return ""
+        for collector in list(self._collectors):
+            # A broken collector must not break the scrape.
+            with contextlib.suppress(Exception):
+                collector()
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def reset(self) -> None:
+        """Clear every recorded value; declarations and collectors stay."""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("knik_span", default=None)
+
+
+class Span:
+    """One timed unit of work; use as a context manager via ``span()``."""
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: dict[str, Any]):
+        parent = _current_span.get()
+        self._tracer = tracer
+        self._token: contextvars.Token | None = None
+        self._start = 0.0
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(8)
+        self.span_id = secrets.token_hex(4)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.started_at = 0.0
+        self.duration: float | None = None
+        self.status = "ok"
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration = time.perf_counter() - self._start
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            self.status = "error"
+            self.error = f"{exc_type.__name__}: {exc}"
+        # ValueError: closed from another context (e.g. a generator finalized elsewhere).
+        with contextlib.suppress(ValueError):
+            _current_span.reset(self._token)
+        self._tracer._finish(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "started_at": self.started_at,
+            "duration_ms": None if self.duration is None else round(self.duration * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned by ``span()`` while tracing is off."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Keeps the most recent ``buffer_size`` finished spans."""
+
+    def __init__(self, enabled: bool = False, buffer_size: int = 1000):
+        self.enabled = enabled
+        self._finished: deque[Span] = deque(maxlen=max(1, buffer_size))
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes: Any) -> Span | _NoopSpan:
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._finished.append(span)
+
+    def recent(self, limit: int = 100, trace_id: str | None = None) -> list[dict[str, Any]]:
+        """Finished spans, newest first, optionally for one trace."""
+        with self._lock:
+            spans = list(self._finished)
+        selected = [s for s in reversed(spans) if trace_id is None or s.trace_id == trace_id]
+        return [s.to_dict() for s in selected[: max(0, limit)]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._finished.clear()
+
+
+_config = Config()
+metrics = MetricsRegistry(enabled=_config.metrics_enabled)
+tracer = Tracer(enabled=_config.tracing_enabled, buffer_size=_config.tracing_buffer_size)
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """``with span("tool", tool=name):`` — records the block when tracing is enabled."""
+    return tracer.span(name, **attributes)
@@ -41,6 +41,11 @@ def mock_config():
     config = MagicMock()
     config.error_message = "Sorry, I encountered an error."
     config.busy_message = "I'm still thinking about your previous message."
+    config.queue_full_message = "Too many messages waiting."
+    config.queue_expired_message = "This message waited too long."
+    config.bot_queue_max_depth = 5
+    config.bot_queue_ttl = 300.0
+    config.bot_coalesce_window = 10.0
     return config
 
 
@@ -343,3 +348,102 @@ class TestBotMessageHandler:
 
         await handler.handle(incoming)
         assert handler.get_active_count() == 1
+
+
+@pytest.mark.asyncio
+class TestMessageQueue:
+    @pytest.fixture
+    def gated_handler(self, handler):
+        """Handler whose deliveries block until the test releases them."""
+        handler._user_identity.resolve = MagicMock(return_value=MagicMock(user_id="user_1", conversation_id=None))
+        handler.release = asyncio.Event()
+        handler.prompts = []
+
+        async def deliver(**kw):
+            handler.prompts.append(kw["prompt"])
+            await handler.release.wait()
+            return DeliveryResult(response_text="ok", conversation_id=None)
+
+        handler._streaming.deliver = deliver
+        return handler
+
+    async def _drain(self, handler):
+        handler.release.set()
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if handler.get_active_count() == 0:
+                return
+
+    async def test_burst_is_coalesced_into_one_prompt(self, gated_handler):
+        await gated_handler.handle(_make_msg("chat_1", "first", message_id="m1"))
+        await asyncio.sleep(0)
+        await gated_handler.handle(_make_msg("chat_1", "also this", message_id="m2"))
+        await gated_handler.handle(_make_msg("chat_1", "and this", message_id="m3"))
+
+        assert gated_handler.get_metrics()["queue_depth"] == 2
+        await self._drain(gated_handler)
+
+        assert gated_handler.prompts == ["first", "also this\n\nand this"]
+        metrics = gated_handler.get_metrics()
+        assert metrics["total_queued"] == 2
+        assert metrics["total_coalesced"] == 1
+        assert metrics["total_processed"] == 2
+        assert metrics["queue_depth"] == 0
+        assert metrics["peak_queue_depth"] == 2
+
+    async def test_only_one_busy_hint_per_burst(self, gated_handler):
+        await gated_handler.handle(_make_msg("chat_1", "first"))
+        for text in ("a", "b", "c"):
+            await gated_handler.handle(_make_msg("chat_1", text))
+        await asyncio.sleep(0.05)
+
+        texts = [c.kwargs["text"] for c in gated_handler._messaging_client.send_message.call_args_list]
+        assert texts.count(gated_handler._config.busy_message) == 1
+        await self._drain(gated_handler)
+
+    async def test_different_senders_are_not_merged(self, gated_handler):
+        await gated_handler.handle(_make_msg("group", "q1", sender_id="alice"))
+        await asyncio.sleep(0)
+        await gated_handler.handle(_make_msg("group", "q2", sender_id="bob"))
+        await gated_handler.handle(_make_msg("group", "q3", sender_id="alice"))
+        await self._drain(gated_handler)
+
+        assert gated_handler.prompts == ["q1", "q2", "q3"]
+
+    async def test_full_queue_rejects_with_notice(self, gated_handler):
+        gated_handler._config.bot_queue_max_depth = 1
+        await gated_handler.handle(_make_msg("chat_1", "first"))
+        await gated_handler.handle(_make_msg("chat_1", "queued"))
+        await gated_handler.handle(_make_msg("chat_1", "rejected", message_id="m_rej"))
+        await asyncio.sleep(0.05)
+
+        notice = gated_handler._messaging_client.send_message.call_args_list[-1].kwargs
+        assert notice["text"] == gated_handler._config.queue_full_message
+        assert notice["reply_to_message_id"] == "m_rej"
+        assert gated_handler.get_metrics()["total_rejected"] == 1
+
+        await self._drain(gated_handler)
+        assert gated_handler.prompts == ["first", "queued"]
+
+    async def test_expired_messages_get_a_notice(self, gated_handler):
+        gated_handler._config.bot_queue_ttl = 0.0
+        await gated_handler.handle(_make_msg("chat_1", "first"))
+        await gated_handler.handle(_make_msg("chat_1", "stale", message_id="m_old"))
+        await asyncio.sleep(0.01)
+        await self._drain(gated_handler)
+
+        assert gated_handler.prompts == ["first"]
+        texts = [c.kwargs["text"] for c in gated_handler._messaging_client.send_message.call_args_list]
+        assert gated_handler._config.queue_expired_message in texts
+        assert gated_handler.get_metrics()["total_expired"] == 1
+
+    async def test_slot_is_released_after_drain(self, gated_handler):
+        await gated_handler.handle(_make_msg("chat_1", "first"))
+        await gated_handler.handle(_make_msg("chat_1", "second"))
+        await self._drain(gated_handler)
+        assert gated_handler.get_active_count() == 0
+
+        await gated_handler.handle(_make_msg("chat_1", "later"))
+        await asyncio.sleep(0.01)
+        assert gated_handler.prompts == ["first", "second", "later"]
+        assert gated_handler.get_metrics()["total_queued"] == 1
@@ -0,0 +1,82 @@
+"""Tests for the binary audio frame transport."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.apps.web.backend.audio_frames import (
+    CODEC_PCM16,
+    FLAG_END,
+    FRAME_HEADER,
+    AudioFrameStream,
+    AudioStreamRegistry,
+    encode_pcm16,
+    pack_frame,
+    unpack_header,
+)
+
+
+class TestFraming:
+    def test_header_is_twenty_bytes(self):
+        assert FRAME_HEADER.size == 20
+
+    def test_encode_pcm16_scales_and_clips(self):
+        pcm = np.frombuffer(encode_pcm16(np.array([0.0, 0.5, -1.0, 2.0], dtype=np.float32)), dtype="<i2")
+        assert pcm.tolist() == [0, 16383, -32767, 32767]
+
+    def test_pack_roundtrip(self):
+        frame = pack_frame(3, 1, 24000, b"\x01\x02\x03\x04")
+        assert unpack_header(frame) == (CODEC_PCM16, 0, 3, 1, 24000, 4)
+        assert frame[FRAME_HEADER.size :] == b"\x01\x02\x03\x04"
+
+    def test_bad_magic_rejected(self):
+        with pytest.raises(ValueError):
+            unpack_header(b"XX" + pack_frame(0, 0, 24000)[2:])
+
+    def test_binary_smaller_than_base64_wav(self):
+        """The point of the transport: a chunk costs its PCM plus 20 bytes."""
+        import base64
+        import io
+
+        import soundfile as sf
+
+        audio = np.random.default_rng(0).uniform(-0.5, 0.5, 24000).astype(np.float32)
+        buf = io.BytesIO()
+        sf.write(buf, audio, 24000, format="WAV")
+        sse_size = len(base64.b64encode(buf.getvalue()))
+        assert len(pack_frame(0, 0, 24000, encode_pcm16(audio))) < sse_size * 0.8
+
+
+class TestAudioFrameStream:
+    @pytest.mark.asyncio
+    async def test_frames_then_end_marker(self):
+        stream = AudioFrameStream("abc")
+        ref = stream.push(0, np.zeros(100, dtype=np.float32), 24000)
+        stream.push(1, np.zeros(50, dtype=np.float32), 24000)
+        stream.close()
+        stream.close()
+
+        assert ref == {"stream_id": "abc", "seq": 0, "sentence": 0, "sample_rate": 24000, "samples": 100}
+        frames = [frame async for frame in stream.frames()]
+        headers = [unpack_header(f) for f in frames]
+        assert [(h[2], h[3], h[5]) for h in headers] == [(0, 0, 200), (1, 1, 100), (2, 0, 0)]
+        assert headers[-1][1] & FLAG_END
+        assert stream.bytes_sent == 2 * FRAME_HEADER.size + 300
+
+
+class TestAudioStreamRegistry:
+    @pytest.mark.asyncio
+    async def test_claim_once(self):
+        registry = AudioStreamRegistry()
+        stream = registry.open()
+        assert registry.claim(stream.stream_id) is stream
+        assert registry.claim(stream.stream_id) is None
+
+    @pytest.mark.asyncio
+    async def test_unclaimed_stream_expires(self):
+        registry = AudioStreamRegistry(ttl=0.01)
+        stream = registry.open()
+        await asyncio.sleep(0.05)
+        assert len(registry) == 0
+        assert registry.claim(stream.stream_id) is None
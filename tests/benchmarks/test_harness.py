@@ -0,0 +1,170 @@
+"""Tests for the benchmark harness: statistics, DB call attribution, comparison and the scripted provider."""
+
+import asyncio
+import contextlib
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from benchmarks.compare import compare
+from benchmarks.measure import RunResult, TurnSample, attribute_db_calls, count_db_calls, distribution, percentile
+from benchmarks.scripted_provider import Script, ScriptedChatModel, ScriptedProvider, ToolCall
+from lib.services.ai_client.providers import base_provider
+from lib.services.ai_client.providers.mock_provider import MockAIProvider
+from lib.services.ai_client.registry import MCPServerRegistry
+from lib.services.postgres.db import PostgresDB
+
+
+class TestStatistics:
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+        assert percentile([7], 99) == 7
+        assert percentile([], 50) is None
+
+    def test_distribution_skips_missing_values_and_scales(self):
+        dist = distribution([0.010, None, 0.020, 0.030], scale=1000)
+        assert dist == {"count": 3, "mean": 20.0, "p50": 20.0, "p90": 30.0, "p99": 30.0, "max": 30.0}
+        assert distribution([None]) == {"count": 0}
+
+    def test_summary_excludes_failed_turns_from_latencies(self):
+        ok = TurnSample(0, 0, started=0.0, first_token=0.1, finished=0.5, output_tokens=40)
+        failed = TurnSample(1, 0, started=0.0, error="boom")
+        summary = RunResult([ok, failed], wall_time=1.0).summary()
+        assert summary["turns"] == 2
+        assert summary["errors"] == 1
+        assert summary["first_errors"] == ["boom"]
+        assert summary["ttft_ms"]["p50"] == 100.0
+        assert summary["tokens_per_s"]["p50"] == 100.0
+        assert summary["turns_per_s"] == 1.0
+
+
+async def _fake_get_connection(cls):
+    await asyncio.sleep(0)
+    yield object()
+
+
+class TestDbCallCounting:
+    def test_checkouts_are_charged_to_the_turn_that_made_them(self, monkeypatch):
+        monkeypatch.setattr(
+            PostgresDB, "get_connection", classmethod(contextlib.asynccontextmanager(_fake_get_connection))
+        )
+        patched = PostgresDB.__dict__["get_connection"]
+        first, second = TurnSample(0, 0, 0.0), TurnSample(1, 0, 0.0)
+
+        async def turn(sample, queries):
+            with attribute_db_calls(sample):
+                for _ in range(queries):
+                    # Checkouts from spawned tasks inherit the turn's context.
+                    await asyncio.create_task(_checkout())
+
+        async def _checkout():
+            async with PostgresDB.get_connection():
+                pass
+
+        async def main():
+            with count_db_calls() as total:
+                await asyncio.gather(turn(first, 3), turn(second, 2), _checkout())
+            return total[0]
+
+        assert asyncio.run(main()) == 6
+        assert (first.db_calls, second.db_calls) == (3, 2)
+        assert PostgresDB.__dict__["get_connection"] is patched
+
+
+def _result(**scenario):
+    return {"scenarios": {"chat": {"status": "ok", **scenario}}}
+
+
+class TestCompare:
+    def test_direction_of_each_metric(self):
+        baseline = _result(latency_ms={"p50": 100.0, "p99": 200.0}, tokens_per_s={"p50": 50.0})
+        current = _result(latency_ms={"p50": 105.0, "p99": 300.0}, tokens_per_s={"p50": 40.0})
+        deltas = {d.metric: d for d in compare(baseline, current)}
+        assert set(deltas) == {"latency_ms.p50", "latency_ms.p99", "tokens_per_s.p50"}
+        assert not deltas["latency_ms.p50"].is_regression(0.10)
+        assert deltas["latency_ms.p99"].is_regression(0.10)
+        assert deltas["tokens_per_s.p50"].is_regression(0.10)
+        assert not deltas["tokens_per_s.p50"].is_regression(0.25)
+
+    def test_skipped_or_new_scenarios_are_not_compared(self):
+        baseline = {"scenarios": {"chat": {"status": "skipped", "reason": "x"}}}
+        current = {"scenarios": {**_result(ttft_ms={"p50": 1.0})["scenarios"], "new": {"status": "ok"}}}
+        assert compare(baseline, current) == []
+
+
+class TestProviders:
+    def test_mock_word_delay(self):
+        provider = MockAIProvider(word_delay=0)
+        start = time.perf_counter()
+        words = list(provider.chat_stream("hello"))
+        assert len(words) > 5
+        assert time.perf_counter() - start < 0.05
+
+        slow = MockAIProvider(word_delay=0.01)
+        start = time.perf_counter()
+        list(slow.chat_stream("hello"))
+        assert time.perf_counter() - start >= 0.01 * len(words)
+
+    def test_scripted_provider_runs_tool_calls_through_the_registry(self, monkeypatch):
+        # Tool-call accounting would otherwise fetch a tiktoken encoding.
+        monkeypatch.setattr(base_provider, "count_tokens", lambda text, model="gpt-4": len(text.split()))
+        calls = []
+        registry = MCPServerRegistry()
+        registry.register_tool(
+            {
+                "name": "double",
+                "description": "Double a number",
+                "parameters": {
+                    "type": "object",
+                    "properties": {"n": {"type": "integer", "description": "Number"}},
+                    "required": ["n"],
+                },
+            },
+            lambda n: calls.append(n) or str(n * 2),
+        )
+        script = Script(tool_calls=(ToolCall("double", {"n": 4}), ToolCall("double", {"n": 5})), reply_words=3)
+        provider = ScriptedProvider(mcp_registry=registry, script=script, word_delay=0)
+
+        chunks = list(provider.chat_stream("go"))
+
+        assert calls == [4, 5]
+        ends = [c for c in chunks if isinstance(c, dict) and c.get("__tool_call_end__")]
+        assert [c["tool_result_preview"] for c in ends] == ["8", "10"]
+        assert "".join(c for c in chunks if isinstance(c, str)) == "word0 word1 word2"
+
+    def test_scripted_provider_async_stream_matches_sync(self, monkeypatch):
+        monkeypatch.setattr(base_provider, "count_tokens", lambda text, model="gpt-4": len(text.split()))
+        registry = MCPServerRegistry()
+        registry.register_tool(
+            {"name": "noop", "description": "No-op", "parameters": {"type": "object", "properties": {}}},
+            lambda: "done",
+        )
+        script = Script(tool_calls=(ToolCall("noop"),), reply_words=3)
+
+        async def collect(provider, call):
+            return [c async for c in provider.achat_stream("go", call=call)]
+
+        sync_call, async_call = base_provider.CallContext(), base_provider.CallContext()
+        sync_provider = ScriptedProvider(mcp_registry=registry, script=script, word_delay=0)
+        async_provider = ScriptedProvider(mcp_registry=registry, script=script, word_delay=0)
+        sync_chunks = list(sync_provider.chat_stream("go", call=sync_call))
+        async_chunks = asyncio.run(collect(async_provider, async_call))
+
+        assert async_chunks == sync_chunks
+        assert async_call.usage == sync_call.usage
+        assert async_call.tool_tokens == sync_call.tool_tokens
+
+    def test_script_restarts_after_each_user_message(self):
+        model = ScriptedChatModel(script=Script((ToolCall("noop"),), reply_words=2))
+        first_turn = [HumanMessage("a")]
+        assert model.invoke(first_turn).tool_calls[0]["name"] == "noop"
+        first_turn += [
+            AIMessage("", tool_calls=[{"name": "noop", "args": {}, "id": "1"}]),
+            ToolMessage("ok", tool_call_id="1"),
+        ]
+        assert model.invoke(first_turn).content == "word0 word1"
+        second_turn = [*first_turn, AIMessage("word0 word1"), HumanMessage("b")]
+        assert model.invoke(second_turn).tool_calls
@@ -0,0 +1,195 @@
+"""Tests for CronScheduler: DB row claiming and bounded dispatch of due schedules."""
+
+import asyncio
+import importlib.util
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Direct module loading — dependencies are stubbed only while the module loads
+# so the real engine/models stay importable for the other cron tests.
+# ---------------------------------------------------------------------------
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src"))
+
+
+def _stub(name: str, **attrs):
+    mod = type(sys)(name)
+    for key, value in attrs.items():
+        setattr(mod, key, value)
+    return mod
+
+
+_stubs = {
+    "imports": _stub("imports", printer=MagicMock()),
+    "lib": sys.modules.get("lib") or _stub("lib"),
+    "lib.core": _stub("lib.core"),
+    "lib.core.config": _stub("lib.core.config", Config=MagicMock()),
+    "lib.cron": sys.modules.get("lib.cron") or _stub("lib.cron"),
+    "lib.cron.engine": _stub("lib.cron.engine", WorkflowEngine=MagicMock()),
+    "lib.cron.models": _stub("lib.cron.models", Schedule=object),
+    "lib.services": _stub("lib.services"),
+    "lib.services.scheduler": _stub("lib.services.scheduler"),
+    "lib.services.scheduler.db_client": _stub("lib.services.scheduler.db_client", SchedulerDB=MagicMock()),
+}
+
+with patch.dict(sys.modules, _stubs):
+    _spec = importlib.util.spec_from_file_location(
+        "lib.cron.cron_scheduler", os.path.join(_SRC, "lib", "cron", "cron_scheduler.py")
+    )
+    _cron_mod = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(_cron_mod)
+
+CronScheduler = _cron_mod.CronScheduler
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _schedule(schedule_id: int) -> SimpleNamespace:
+    return SimpleNamespace(id=schedule_id, target_workflow_id=f"wf-{schedule_id}", next_run_at=None)
+
+
+@pytest.fixture
+def scheduler_db(monkeypatch):
+    db = MagicMock()
+    db.claim_due_schedules = AsyncMock(return_value=[])
+    monkeypatch.setattr(_cron_mod, "SchedulerDB", db)
+    return db
+
+
+def _make_scheduler(workers: int = 2, max_concurrent: int = 3) -> CronScheduler:
+    scheduler = CronScheduler()
+    scheduler.config = SimpleNamespace(
+        scheduler_workers=workers,
+        scheduler_max_concurrent=max_concurrent,
+        scheduler_check_interval=1,
+    )
+    return scheduler
+
+
+# ===========================================================================
+# Claiming
+# ===========================================================================
+
+
+class TestClaiming:
+    @pytest.mark.asyncio
+    async def test_claims_only_free_slots(self, scheduler_db):
+        scheduler = _make_scheduler(max_concurrent=3)
+        scheduler_db.claim_due_schedules.return_value = [_schedule(1), _schedule(2)]
+
+        claimed = await scheduler._check_schedules()
+
+        assert claimed == 2
+        assert scheduler_db.claim_due_schedules.await_args.args[1] == 3
+        assert scheduler._in_flight == 2
+
+        scheduler_db.claim_due_schedules.return_value = [_schedule(3)]
+        await scheduler._check_schedules()
+        assert scheduler_db.claim_due_schedules.await_args.args[1] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_instance_leaves_due_rows_in_the_table(self, scheduler_db):
+        scheduler = _make_scheduler(max_concurrent=1)
+        scheduler_db.claim_due_schedules.return_value = [_schedule(1)]
+        await scheduler._check_schedules()
+        scheduler_db.claim_due_schedules.reset_mock()
+
+        assert await scheduler._check_schedules() == 0
+        scheduler_db.claim_due_schedules.assert_not_awaited()
+
+
+# ===========================================================================
+# Dispatch
+# ===========================================================================
+
+
+class TestDispatch:
+    @pytest.mark.asyncio
+    async def test_workers_bound_parallel_runs_and_release_slots(self, scheduler_db):
+        scheduler = _make_scheduler(workers=2, max_concurrent=5)
+        scheduler_db.claim_due_schedules.return_value = [_schedule(i) for i in range(5)]
+        state = {"running": 0, "peak": 0, "done": []}
+
+        async def _fake_trigger(workflow_id: str):
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.01)
+            state["running"] -= 1
+            state["done"].append(workflow_id)
+
+        scheduler._trigger_workflow = _fake_trigger
+        scheduler._running = True
+        scheduler._workers = [asyncio.create_task(scheduler._worker_loop(i)) for i in range(2)]
+        try:
+            await scheduler._check_schedules()
+            await asyncio.wait_for(scheduler._queue.join(), timeout=2)
+        finally:
+            await scheduler.stop()
+
+        assert sorted(state["done"]) == [f"wf-{i}" for i in range(5)]
+        assert state["peak"] == 2
+        assert scheduler._in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_worker_survives_trigger_errors(self, scheduler_db):
+        scheduler = _make_scheduler(workers=1, max_concurrent=2)
+        scheduler_db.claim_due_schedules.return_value = [_schedule(1), _schedule(2)]
+        calls = []
+
+        async def _fake_trigger(workflow_id: str):
+            calls.append(workflow_id)
+            if workflow_id == "wf-1":
+                raise RuntimeError("boom")
+
+        scheduler._trigger_workflow = _fake_trigger
+        scheduler._running = True
+        scheduler._workers = [asyncio.create_task(scheduler._worker_loop(0))]
+        try:
+            await scheduler._check_schedules()
+            await asyncio.wait_for(scheduler._queue.join(), timeout=2)
+        finally:
+            await scheduler.stop()
+
+        assert calls == ["wf-1", "wf-2"]
+        assert scheduler._in_flight == 0
+
+
+# ===========================================================================
+# Shutdown
+# ===========================================================================
+
+
+class TestStop:
+    @pytest.mark.asyncio
+    async def test_stop_releases_queued_claims_and_resets_slots(self, scheduler_db):
+        scheduler = _make_scheduler(workers=1, max_concurrent=3)
+        scheduler_db.claim_due_schedules.return_value = [_schedule(1), _schedule(2), _schedule(3)]
+        scheduler_db.release_schedule_claims = AsyncMock()
+        started = asyncio.Event()
+
+        async def _hang(workflow_id: str):
+            started.set()
+            await asyncio.Event().wait()
+
+        scheduler._trigger_workflow = _hang
+        scheduler._running = True
+        scheduler._workers = [asyncio.create_task(scheduler._worker_loop(0))]
+        await scheduler._check_schedules()
+        await asyncio.wait_for(started.wait(), timeout=2)
+
+        await scheduler.stop()
+
+        released = scheduler_db.release_schedule_claims.await_args.args[0]
+        assert [s.id for s in released] == [2, 3]
+        assert scheduler._queue.empty()
+        assert scheduler._in_flight == 0
+        assert scheduler._workers == []
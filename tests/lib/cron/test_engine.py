@@ -0,0 +1,341 @@
+"""Tests for WorkflowEngine: event-driven DAG scheduling, pruning, and parallelism limits."""
+
+import asyncio
+import importlib.util
+import os
+import sys
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Direct module loading — bypass __init__.py chains to avoid heavy imports.
+# ---------------------------------------------------------------------------
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src"))
+
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+
+def _load_module(name: str, filepath: str):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, filepath)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _stub_module(name: str, **attrs):
+    if name not in sys.modules:
+        mod = type(sys)(name)
+        sys.modules[name] = mod
+    for key, value in attrs.items():
+        if not hasattr(sys.modules[name], key):
+            setattr(sys.modules[name], key, value)
+    return sys.modules[name]
+
+
+_stub_module("imports", printer=MagicMock())
+_stub_module("lib.utils.printer", printer=MagicMock())
+_stub_module("lib.utils.metrics", metrics=MagicMock(), span=MagicMock())
+for pkg in (
+    "lib",
+    "lib.cron",
+    "lib.mcp",
+    "lib.services",
+    "lib.services.ai_client",
+    "lib.services.ai_client.registry",
+    "lib.utils",
+):
+    _stub_module(pkg)
+_stub_module("lib.mcp.index", register_all_tools=MagicMock())
+_stub_module("lib.services.ai_client.client", AIClient=MagicMock())
+_stub_module("lib.services.scheduler")
+_stub_module("lib.services.scheduler.db_client", SchedulerDB=MagicMock())
+
+_AI_CLIENT = os.path.join(_SRC, "lib", "services", "ai_client")
+_load_module("lib.services.ai_client.base_tool", os.path.join(_AI_CLIENT, "base_tool.py"))
+_load_module("lib.services.ai_client.consent", os.path.join(_AI_CLIENT, "consent.py"))
+_load_module("lib.services.ai_client.registry.tool_catalog", os.path.join(_AI_CLIENT, "registry", "tool_catalog.py"))
+_load_module("lib.services.ai_client.registry.mcp_registry", os.path.join(_AI_CLIENT, "registry", "mcp_registry.py"))
+_load_module("lib.utils.graph_utils", os.path.join(_SRC, "lib", "utils", "graph_utils.py"))
+_load_module("lib.cron.models", os.path.join(_SRC, "lib", "cron", "models.py"))
+_nodes_mod = _load_module("lib.cron.nodes", os.path.join(_SRC, "lib", "cron", "nodes.py"))
+_validation_mod = _load_module("lib.cron.validation", os.path.join(_SRC, "lib", "cron", "validation.py"))
+_exec_log_mod = _load_module("lib.cron.execution_log", os.path.join(_SRC, "lib", "cron", "execution_log.py"))
+_engine_mod = _load_module("lib.cron.engine", os.path.join(_SRC, "lib", "cron", "engine.py"))
+
+WorkflowEngine = _engine_mod.WorkflowEngine
+Workflow = sys.modules["lib.cron.models"].Workflow
+BaseNode = _nodes_mod.BaseNode
+validate_workflow_definition = _validation_mod.validate_workflow_definition
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class _Tracker:
+    def __init__(self):
+        self.events: list[tuple[str, str]] = []
+        self.running = 0
+        self.max_running = 0
+
+
+class _SleepNode(BaseNode):
+    """Node that sleeps for ``delay`` seconds and records start/finish order."""
+
+    def __init__(self, node_id: str, delay: float, tracker: _Tracker, fail: bool = False):
+        super().__init__(node_id)
+        self.delay = delay
+        self.tracker = tracker
+        self.fail = fail
+
+    async def execute(self, inputs: dict[str, Any]) -> dict[str, Any]:
+        self.tracker.events.append(("start", self.node_id))
+        self.tracker.running += 1
+        self.tracker.max_running = max(self.tracker.max_running, self.tracker.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise ValueError(f"{self.node_id} exploded")
+            return {"value": self.node_id, "seen": sorted(k for k in inputs if k != "input")}
+        finally:
+            self.tracker.running -= 1
+            self.tracker.events.append(("finish", self.node_id))
+
+
+def _sleep_node(delay: float = 0.0, fail: bool = False) -> dict[str, Any]:
+    return {"type": "FunctionExecutionNode", "function": "sleep", "params": {"delay": delay, "fail": fail}}
+
+
+def _make_engine(tracker: _Tracker):
+    engine = WorkflowEngine()
+    original = engine._instantiate_node
+
+    def _instantiate(node_id: str, data: dict[str, Any]):
+        if data.get("function") == "sleep":
+            return _SleepNode(node_id, data["params"]["delay"], tracker, data["params"]["fail"])
+        return original(node_id, data)
+
+    engine._instantiate_node = _instantiate
+    return engine
+
+
+def _workflow(nodes: dict[str, Any], connections: list[dict[str, Any]], **extra) -> Any:
+    return Workflow(id="wf-test", name="test", definition={"nodes": nodes, "connections": connections, **extra})
+
+
+@pytest.fixture
+def scheduler_db(monkeypatch):
+    db = MagicMock()
+    db.create_execution = AsyncMock(return_value=1)
+    db.log_node_executions = AsyncMock()
+    db.complete_execution = AsyncMock()
+    monkeypatch.setattr(_engine_mod, "SchedulerDB", db)
+    monkeypatch.setattr(_exec_log_mod, "SchedulerDB", db)
+    return db
+
+
+def _logged(db) -> list[dict[str, Any]]:
+    return [entry for call in db.log_node_executions.await_args_list for entry in call.args[0]]
+
+
+@pytest.fixture
+def tracker():
+    return _Tracker()
+
+
+# ===========================================================================
+# Scheduling
+# ===========================================================================
+
+
+class TestEventDrivenScheduling:
+    @pytest.mark.asyncio
+    async def test_fast_branch_successor_does_not_wait_for_slow_sibling(self, scheduler_db, tracker):
+        wf = _workflow(
+            {"slow": _sleep_node(0.3), "fast": _sleep_node(0.01), "after_fast": _sleep_node(0.01)},
+            [{"from_id": "fast", "to_id": "after_fast"}],
+        )
+
+        outputs = await _make_engine(tracker).execute_workflow(wf)
+
+        assert set(outputs) == {"slow", "fast", "after_fast"}
+        assert tracker.events.index(("finish", "after_fast")) < tracker.events.index(("finish", "slow"))
+
+    @pytest.mark.asyncio
+    async def test_node_receives_outputs_of_all_predecessors(self, scheduler_db, tracker):
+        wf = _workflow(
+            {"a": _sleep_node(0.02), "b": _sleep_node(0.01), "join": _sleep_node()},
+            [{"from_id": "a", "to_id": "join"}, {"from_id": "b", "to_id": "join"}],
+        )
+
+        outputs = await _make_engine(tracker).execute_workflow(wf)
+
+        assert outputs["join"]["seen"] == ["a", "b"]
+        assert tracker.events.index(("start", "join")) > tracker.events.index(("finish", "a"))
+
+    @pytest.mark.asyncio
+    async def test_success_is_recorded(self, scheduler_db, tracker):
+        wf = _workflow({"only": _sleep_node()}, [])
+
+        await _make_engine(tracker).execute_workflow(wf)
+
+        assert [entry["status"] for entry in _logged(scheduler_db)] == ["success"]
+        assert scheduler_db.complete_execution.await_args.kwargs["status"] == "success"
+
+
+class TestParallelismLimit:
+    @pytest.mark.asyncio
+    async def test_definition_limit_caps_running_nodes(self, scheduler_db, tracker):
+        wf = _workflow({f"n{i}": _sleep_node(0.01) for i in range(6)}, [], max_parallel=2)
+
+        outputs = await _make_engine(tracker).execute_workflow(wf)
+
+        assert len(outputs) == 6
+        assert tracker.max_running == 2
+
+    @pytest.mark.asyncio
+    async def test_argument_overrides_definition_limit(self, scheduler_db, tracker):
+        wf = _workflow({f"n{i}": _sleep_node(0.01) for i in range(4)}, [], max_parallel=4)
+
+        await _make_engine(tracker).execute_workflow(wf, max_parallel=1)
+
+        assert tracker.max_running == 1
+
+    @pytest.mark.asyncio
+    async def test_unbounded_by_default(self, scheduler_db, tracker):
+        wf = _workflow({f"n{i}": _sleep_node(0.02) for i in range(5)}, [])
+
+        await _make_engine(tracker).execute_workflow(wf)
+
+        assert tracker.max_running == 5
+
+    def test_validation_rejects_non_positive_limit(self):
+        result = validate_workflow_definition({"nodes": {"a": _sleep_node()}, "connections": [], "max_parallel": 0})
+
+        assert result["valid"] is False
+        assert "max_parallel" in result["message"]
+
+
+class TestConditionalPruning:
+    @pytest.mark.asyncio
+    async def test_not_taken_branch_is_pruned_and_merge_still_runs(self, scheduler_db, tracker):
+        wf = _workflow(
+            {
+                "check": {"type": "ConditionalBranchNode", "condition": "1 == 1"},
+                "yes": _sleep_node(0.01),
+                "no": _sleep_node(0.01),
+                "no_child": _sleep_node(0.01),
+                "merge": {"type": "FlowMergeNode", "merge_strategy": "concat"},
+            },
+            [
+                {"from_id": "check", "to_id": "yes", "condition": "true"},
+                {"from_id": "check", "to_id": "no", "condition": "false"},
+                {"from_id": "no", "to_id": "no_child"},
+                {"from_id": "yes", "to_id": "merge"},
+                {"from_id": "no_child", "to_id": "merge"},
+            ],
+        )
+
+        outputs = await _make_engine(tracker).execute_workflow(wf)
+
+        assert "yes" in outputs
+        assert "merge" in outputs
+        assert "no" not in outputs
+        assert "no_child" not in outputs
+
+    @pytest.mark.asyncio
+    async def test_subgraph_behind_not_taken_branch_never_runs(self, scheduler_db, tracker):
+        wf = _workflow(
+            {
+                "check": {"type": "ConditionalBranchNode", "condition": "1 == 2"},
+                "yes": _sleep_node(),
+                "yes_child": _sleep_node(),
+            },
+            [
+                {"from_id": "check", "to_id": "yes", "condition": "true"},
+                {"from_id": "yes", "to_id": "yes_child"},
+            ],
+        )
+
+        outputs = await _make_engine(tracker).execute_workflow(wf)
+
+        assert set(outputs) == {"check"}
+
+
+class TestFailures:
+    @pytest.mark.asyncio
+    async def test_failure_stops_new_nodes_but_lets_running_ones_finish(self, scheduler_db, tracker):
+        wf = _workflow(
+            {"bad": _sleep_node(0.01, fail=True), "slow": _sleep_node(0.1), "after_bad": _sleep_node()},
+            [{"from_id": "bad", "to_id": "after_bad"}],
+        )
+
+        with pytest.raises(RuntimeError, match="bad"):
+            await _make_engine(tracker).execute_workflow(wf)
+
+        assert ("finish", "slow") in tracker.events
+        assert ("start", "after_bad") not in tracker.events
+        assert sorted((entry["node_id"], entry["status"]) for entry in _logged(scheduler_db)) == [
+            ("bad", "failed"),
+            ("slow", "success"),
+        ]
+        assert scheduler_db.complete_execution.await_args.kwargs["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_cancellation_cancels_running_nodes(self, scheduler_db, tracker):
+        wf = _workflow({"a": _sleep_node(5), "b": _sleep_node(5)}, [])
+
+        task = asyncio.create_task(_make_engine(tracker).execute_workflow(wf))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert tracker.running == 0
+
+    @pytest.mark.asyncio
+    async def test_cancellation_still_writes_finished_nodes(self, scheduler_db, tracker):
+        wf = _workflow({"quick": _sleep_node(0.01), "stuck": _sleep_node(5)}, [])
+
+        task = asyncio.create_task(_make_engine(tracker).execute_workflow(wf))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert [entry["node_id"] for entry in _logged(scheduler_db)] == ["quick"]
+
+
+class TestExecutionLogging:
+    @pytest.mark.asyncio
+    async def test_nodes_finishing_together_share_one_write(self, scheduler_db, tracker):
+        wf = _workflow({f"n{i}": _sleep_node() for i in range(5)}, [])
+
+        await _make_engine(tracker).execute_workflow(wf)
+
+        assert len(_logged(scheduler_db)) == 5
+        assert scheduler_db.log_node_executions.await_count < 5
+
+    @pytest.mark.asyncio
+    async def test_records_written_before_execution_completes(self, scheduler_db, tracker):
+        order: list[str] = []
+        scheduler_db.log_node_executions.side_effect = lambda batch: order.append("log")
+        scheduler_db.complete_execution.side_effect = lambda *a, **kw: order.append("complete")
+        wf = _workflow({"a": _sleep_node(0.01), "b": _sleep_node(0.02)}, [{"from_id": "a", "to_id": "b"}])
+
+        await _make_engine(tracker).execute_workflow(wf)
+
+        assert order[-1] == "complete"
+        assert "log" in order
+        entry = _logged(scheduler_db)[0]
+        assert entry["execution_id"] == 1
+        assert entry["started_at"] <= entry["completed_at"]
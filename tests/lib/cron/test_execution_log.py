@@ -0,0 +1,184 @@
+"""Tests for ExecutionLogWriter: batching, timer flushes, retries and final flush."""
+
+import asyncio
+import importlib.util
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src"))
+
+
+def _package(name: str):
+    mod = type(sys)(name)
+    mod.__path__ = []
+    return mod
+
+
+_imports_stub = type(sys)("imports")
+_imports_stub.printer = MagicMock()
+_db_client_stub = type(sys)("lib.services.scheduler.db_client")
+_db_client_stub.SchedulerDB = MagicMock()
+
+with patch.dict(
+    sys.modules,
+    {
+        "imports": _imports_stub,
+        "lib": _package("lib"),
+        "lib.cron": _package("lib.cron"),
+        "lib.services": _package("lib.services"),
+        "lib.services.scheduler": _package("lib.services.scheduler"),
+        "lib.services.scheduler.db_client": _db_client_stub,
+    },
+):
+    _spec = importlib.util.spec_from_file_location(
+        "lib.cron.execution_log", os.path.join(_SRC, "lib", "cron", "execution_log.py")
+    )
+    _exec_log_mod = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(_exec_log_mod)
+
+ExecutionLogWriter = _exec_log_mod.ExecutionLogWriter
+
+
+@pytest.fixture
+def scheduler_db(monkeypatch):
+    db = MagicMock()
+    db.log_node_executions = AsyncMock()
+    monkeypatch.setattr(_exec_log_mod, "SchedulerDB", db)
+    return db
+
+
+def _record(writer, node_id: str, status: str = "success"):
+    writer.record(node_id=node_id, node_type="FunctionExecutionNode", status=status, inputs={"input": {}})
+
+
+def _batches(db) -> list[list[str]]:
+    return [[entry["node_id"] for entry in call.args[0]] for call in db.log_node_executions.await_args_list]
+
+
+class TestBatching:
+    @pytest.mark.asyncio
+    async def test_record_does_not_write_until_flushed(self, scheduler_db):
+        writer = ExecutionLogWriter(7, flush_interval=0, batch_size=10)
+        _record(writer, "a")
+        _record(writer, "b")
+        await asyncio.sleep(0)
+        assert scheduler_db.log_node_executions.await_count == 0
+
+        await writer.aclose()
+
+        assert _batches(scheduler_db) == [["a", "b"]]
+        assert writer.written == 2
+        assert writer.flush_count == 1
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_in_background(self, scheduler_db):
+        writer = ExecutionLogWriter(7, flush_interval=0, batch_size=2)
+        _record(writer, "a")
+        _record(writer, "b")
+        await asyncio.sleep(0.01)
+        assert _batches(scheduler_db) == [["a", "b"]]
+
+        _record(writer, "c")
+        await writer.aclose()
+        assert _batches(scheduler_db) == [["a", "b"], ["c"]]
+
+    @pytest.mark.asyncio
+    async def test_timer_flushes_idle_buffer(self, scheduler_db):
+        async with ExecutionLogWriter(7, flush_interval=0.02, batch_size=100) as writer:
+            _record(writer, "a")
+            await asyncio.sleep(0.06)
+            assert _batches(scheduler_db) == [["a"]]
+
+    @pytest.mark.asyncio
+    async def test_records_carry_execution_id_and_timestamps(self, scheduler_db):
+        writer = ExecutionLogWriter(42, flush_interval=0)
+        _record(writer, "a", status="failed")
+        await writer.aclose()
+
+        entry = scheduler_db.log_node_executions.await_args.args[0][0]
+        assert entry["execution_id"] == 42
+        assert entry["status"] == "failed"
+        assert entry["completed_at"].tzinfo is not None
+
+
+class TestFailureHandling:
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_on_next_flush(self, scheduler_db):
+        scheduler_db.log_node_executions.side_effect = [RuntimeError("db down"), None]
+        writer = ExecutionLogWriter(7, flush_interval=0)
+        _record(writer, "a")
+        await writer.flush()
+        _record(writer, "b")
+
+        await writer.aclose()
+
+        assert _batches(scheduler_db) == [["a"], ["a", "b"]]
+        assert writer.written == 2
+
+    @pytest.mark.asyncio
+    async def test_close_drops_records_it_cannot_write(self, scheduler_db):
+        scheduler_db.log_node_executions.side_effect = RuntimeError("db down")
+        writer = ExecutionLogWriter(7, flush_interval=0)
+        _record(writer, "a")
+
+        await writer.aclose()
+
+        assert writer.written == 0
+        assert writer._buffer == []
+
+    @pytest.mark.asyncio
+    async def test_context_exit_flushes_when_cancelled(self, scheduler_db):
+        async def _run():
+            async with ExecutionLogWriter(7, flush_interval=10) as writer:
+                _record(writer, "a")
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(_run())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert _batches(scheduler_db) == [["a"]]
+
+    @pytest.mark.asyncio
+    async def test_close_during_slow_periodic_flush_keeps_its_batch(self, scheduler_db):
+        writing = asyncio.Event()
+
+        async def slow_write(batch):
+            writing.set()
+            await asyncio.sleep(0.1)
+
+        scheduler_db.log_node_executions.side_effect = slow_write
+        writer = ExecutionLogWriter(7, flush_interval=0.05)
+        writer.start()
+        _record(writer, "a")
+        await writing.wait()
+        _record(writer, "b")
+
+        await writer.aclose()
+
+        assert _batches(scheduler_db) == [["a"], ["b"]]
+        assert writer.written == 2
+        assert writer._buffer == []
+
+    @pytest.mark.asyncio
+    async def test_cancelled_write_returns_its_batch_to_the_buffer(self, scheduler_db):
+        async def hang(batch):
+            await asyncio.sleep(10)
+
+        scheduler_db.log_node_executions.side_effect = hang
+        writer = ExecutionLogWriter(7, flush_interval=0)
+        _record(writer, "a")
+
+        task = asyncio.create_task(writer.flush())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert [entry["node_id"] for entry in writer._buffer] == ["a"]
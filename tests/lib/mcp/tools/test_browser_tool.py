@@ -1,15 +1,17 @@
-"""Tests for BrowserTool: asyncio fix, single session, multiple sessions, lifecycle, and edge cases."""
+"""Tests for BrowserTool and the shared BrowserPool: tool ops, sessions, pooling, and lifecycle."""
 
 import asyncio
+import functools
+import http.server
 import importlib
 import importlib.util
+import json
 import math
 import os
 import sys
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -44,7 +46,6 @@ _base_tool_mod = _load_module(
 BaseTool = _base_tool_mod.BaseTool
 
 # Stub out printer so browser_tool import doesn't need the full lib tree
-_printer_mod_path = os.path.join(_SRC, "lib", "utils", "printer.py")
 if "lib.utils.printer" not in sys.modules:
     # Provide a lightweight stub — the real printer pulls in heavy deps
     _printer_stub = type(sys)("lib.utils.printer")
@@ -59,12 +60,14 @@ if "lib.core.config" not in sys.modules:
     class _StubConfig:
         browser_headless = True
         browser_profile_dir = "/tmp/test-browser-profile"
+        browser_max_sessions = 4
+        browser_acquire_timeout = 120.0
 
     _config_stub_mod.Config = _StubConfig
     sys.modules["lib.core.config"] = _config_stub_mod
 
-# Ensure the relative import `from ...core.config import Config` resolves.
-# browser_tool.py uses relative imports so we also need the package chain stubs.
+# Ensure the relative imports (`from ...core.config import Config`, `from .browser_pool import ...`)
+# resolve; browser_tool.py and browser_pool.py need the package chain stubs.
 for pkg in ("lib", "lib.mcp", "lib.mcp.tools", "lib.core", "lib.services", "lib.services.ai_client", "lib.utils"):
     if pkg not in sys.modules:
         sys.modules[pkg] = type(sys)(pkg)
@@ -73,6 +76,13 @@ for pkg in ("lib", "lib.mcp", "lib.mcp.tools", "lib.core", "lib.services", "lib.
 sys.modules["lib.services.ai_client"].base_tool = sys.modules["lib.services.ai_client.base_tool"]
 sys.modules["lib.services.ai_client.base_tool"] = _base_tool_mod
 
+_load_module("lib.utils.async_utils", os.path.join(_SRC, "lib", "utils", "async_utils.py"))
+_browser_pool_mod = _load_module(
+    "lib.mcp.tools.browser_pool",
+    os.path.join(_SRC, "lib", "mcp", "tools", "browser_pool.py"),
+)
+BrowserPool = _browser_pool_mod.BrowserPool
+
 # Now load browser_tool
 _browser_tool_mod = _load_module(
     "lib.mcp.tools.browser_tool",
@@ -88,63 +98,78 @@ BROWSER_DEFINITIONS = _browser_tool_mod.BROWSER_DEFINITIONS
 
 
 def _make_mock_page():
-    """Return a MagicMock that behaves like a Playwright Page."""
-    page = MagicMock()
-    page.is_closed.return_value = False
+    """Return an AsyncMock that behaves like a Playwright async Page."""
+    page = AsyncMock()
+    page.is_closed = MagicMock(return_value=False)
     page.title.return_value = "Test Page"
     page.goto.return_value = MagicMock(status=200)
     page.evaluate.return_value = "body text content"
-    page.query_selector.return_value = MagicMock(inner_text=MagicMock(return_value="selector text"))
+    page.query_selector.return_value = MagicMock(inner_text=AsyncMock(return_value="selector text"))
     page.screenshot.return_value = b"\x89PNG\r\n\x1a\nfake_png_bytes"
     return page
 
 
-def _make_mock_context(page=None):
-    """Return a MagicMock that behaves like a Playwright BrowserContext."""
-    ctx = MagicMock()
-    ctx.new_page.return_value = page or _make_mock_page()
-    return ctx
-
-
-def _make_mock_playwright(context=None, page=None):
-    """Return a MagicMock that behaves like a started Playwright instance."""
-    pw = MagicMock()
-    ctx = context or _make_mock_context(page)
-    pw.chromium.launch_persistent_context.return_value = ctx
-    return pw
-
-
-def _make_sync_playwright_factory(pw_instance=None, page=None):
-    """Return a callable that mimics sync_playwright().start()."""
-    pw = pw_instance or _make_mock_playwright(page=page)
-    mock_sync_pw = MagicMock()
-    mock_sync_pw.return_value.start.return_value = pw
-    return mock_sync_pw, pw
-
-
-def _patch_sync_playwright(mock_sync_pw):
-    """Patch the `playwright.sync_api` module in sys.modules so local imports
-    inside _ensure_browser pick up our mock sync_playwright."""
-    fake_module = type(sys)("playwright.sync_api")
-    fake_module.sync_playwright = mock_sync_pw
-    return patch.dict(
-        "sys.modules",
-        {
-            "playwright": type(sys)("playwright"),
-            "playwright.sync_api": fake_module,
-        },
-    )
+def _cookie(name, value, domain="a.com"):
+    return {"name": name, "value": value, "domain": domain, "path": "/"}
 
 
-def _patch_config():
-    """Patch Config to return headless=True and a temp profile dir."""
-    return patch(
-        "lib.mcp.tools.browser_tool.Config",
-        return_value=MagicMock(
-            browser_headless=True,
-            browser_profile_dir="/tmp/test-browser-profile",
-        ),
-    )
+class _FakeChromium:
+    """Stands in for ``playwright.async_api``: one browser, a new context and page per session.
+
+    ``page_factory`` builds each new page (defaults to ``_make_mock_page``);
+    every context and page handed out is recorded for assertions.
+    """
+
+    def __init__(self, page_factory=None):
+        self.page_factory = page_factory or _make_mock_page
+        self.launches = 0
+        self.contexts: list[MagicMock] = []
+        self.context_kwargs: list[dict] = []
+        self.pages: list[AsyncMock] = []
+        self.browser = MagicMock()
+        self.browser.is_connected.return_value = True
+        self.browser.new_context = AsyncMock(side_effect=self._new_context)
+        self.browser.close = AsyncMock()
+        self.playwright = MagicMock()
+        self.playwright.chromium.launch = AsyncMock(side_effect=self._launch)
+        self.playwright.stop = AsyncMock()
+
+    async def _launch(self, **kwargs):
+        self.launches += 1
+        return self.browser
+
+    async def _new_context(self, **kwargs):
+        context = MagicMock()
+        context.new_page = AsyncMock(side_effect=lambda: self._new_page())
+        context.close = AsyncMock()
+        # What the context reports on close: by default the state it opened with plus its own "sid" cookie.
+        opened = kwargs.get("storage_state") or {}
+        cookies = [c for c in opened.get("cookies", []) if c["name"] != "sid"]
+        cookies.append(_cookie("sid", str(len(self.contexts))))
+        context.state = {"cookies": cookies, "origins": list(opened.get("origins", []))}
+
+        async def storage_state(path=None):
+            return context.state
+
+        context.storage_state = AsyncMock(side_effect=storage_state)
+        self.contexts.append(context)
+        self.context_kwargs.append(kwargs)
+        return context
+
+    def _new_page(self):
+        page = self.page_factory()
+        self.pages.append(page)
+        return page
+
+    def async_playwright(self):
+        manager = MagicMock()
+        manager.start = AsyncMock(return_value=self.playwright)
+        return manager
+
+    def patch_modules(self):
+        fake_module = type(sys)("playwright.async_api")
+        fake_module.async_playwright = self.async_playwright
+        return patch.dict("sys.modules", {"playwright": type(sys)("playwright"), "playwright.async_api": fake_module})
 
 
 @pytest.fixture(autouse=True)
@@ -158,105 +183,80 @@ def _clear_base_tool_instances():
 @pytest.fixture
 def browser_tool():
     """Fresh BrowserTool instance."""
-    tool = BrowserTool()
-    yield tool
-    # Tear down any executor created during the test
-    if tool._executor:
-        tool._executor.shutdown(wait=False)
-        tool._executor = None
+    return BrowserTool()
 
 
 @pytest.fixture
-def wired_tool():
-    """BrowserTool with mocked Playwright already wired up, ready for tool calls.
+def make_pool(tmp_path):
+    """Factory for a BrowserPool over a fake Chromium, installed as the shared pool.
 
-    Returns (tool, mock_page, mock_playwright).
+    Returns (pool, chromium); every pool is closed after the test.
     """
-    tool = BrowserTool()
-    page = _make_mock_page()
-    pw = _make_mock_playwright(page=page)
-    ctx = pw.chromium.launch_persistent_context.return_value
+    pools = []
 
-    # Pre-wire the tool so _ensure_browser has already run
-    tool._playwright = pw
-    tool._browser_context = ctx
-    tool._page = page
-    tool._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="test-browser")
+    with patch.object(_browser_pool_mod, "_shared_pool", None):
 
-    yield tool, page, pw
+        def _make(max_sessions=4, acquire_timeout=5.0, page_factory=None):
+            chromium = _FakeChromium(page_factory)
+            pool = BrowserPool(
+                max_sessions=max_sessions,
+                headless=True,
+                profile_dir=str(tmp_path / "profile"),
+                acquire_timeout=acquire_timeout,
+            )
+            pools.append(pool)
+            _browser_pool_mod._shared_pool = pool
+            return pool, chromium
 
-    if tool._executor:
-        tool._executor.shutdown(wait=False)
-        tool._executor = None
+        yield _make
+        for pool in pools:
+            pool.close()
 
 
-# ===========================================================================
-# A. Asyncio fix tests
-# ===========================================================================
+@pytest.fixture
+def wired_tool(make_pool):
+    """BrowserTool on a fake-Chromium pool with its page already open, ready for tool calls.
+
+    Returns (tool, mock_page, chromium).
+    """
+    pool, chromium = make_pool()
+    page = _make_mock_page()
+    chromium.page_factory = lambda: page
+    with chromium.patch_modules():
+        tool = BrowserTool()
+        tool.run_in_page(AsyncMock())
+        page.reset_mock()
+        yield tool, page, chromium
 
 
-class TestAsyncioFix:
-    """Verify that _ensure_browser clears any inherited running loop."""
-
-    def test_ensure_browser_clears_running_loop(self, browser_tool):
-        """When a running loop is inherited (e.g. from nest_asyncio), _ensure_browser
-        clears it before sync_playwright().start(), so Playwright doesn't raise."""
-        page = _make_mock_page()
-        mock_sync_pw, pw = _make_sync_playwright_factory(page=page)
-
-        loop_was_none_at_start = threading.Event()
-        original_start = mock_sync_pw.return_value.start
-
-        def intercepted_start():
-            # At the moment sync_playwright().start() is called,
-            # the running loop should have been cleared.
-            if asyncio._get_running_loop() is None:
-                loop_was_none_at_start.set()
-            return original_start()
-
-        mock_sync_pw.return_value.start = intercepted_start
-
-        def run_on_executor():
-            # Simulate nest_asyncio having set a running loop on this thread
-            fake_loop = asyncio.new_event_loop()
-            asyncio._set_running_loop(fake_loop)
-            try:
-                browser_tool._ensure_browser()
-            finally:
-                asyncio._set_running_loop(None)
-                fake_loop.close()
-
-        with (
-            _patch_sync_playwright(mock_sync_pw),
-            _patch_config(),
-            patch("os.makedirs"),
-        ):
-            executor = ThreadPoolExecutor(max_workers=1)
-            try:
-                executor.submit(run_on_executor).result(timeout=5)
-            finally:
-                executor.shutdown(wait=False)
-
-        assert loop_was_none_at_start.is_set(), "Running loop was NOT cleared before sync_playwright().start()"
-
-    def test_ensure_browser_works_without_running_loop(self, browser_tool):
-        """When no running loop exists, _ensure_browser still works fine."""
-        page = _make_mock_page()
-        mock_sync_pw, pw = _make_sync_playwright_factory(page=page)
-
-        with (
-            _patch_sync_playwright(mock_sync_pw),
-            _patch_config(),
-            patch("os.makedirs"),
-        ):
-            browser_tool._ensure_browser()
-
-        mock_sync_pw.return_value.start.assert_called_once()
-        assert browser_tool._playwright is pw
+def _read_state(pool):
+    with open(os.path.join(pool.profile_dir, _browser_pool_mod.STORAGE_STATE_FILE)) as f:
+        return json.load(f)
+
+
+def _run_parallel(*calls):
+    """Run each zero-argument callable on its own thread; return (results, elapsed seconds)."""
+    results = [None] * len(calls)
+    errors = []
+
+    def _worker(idx, call):
+        try:
+            results[idx] = call()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_worker, args=(i, call)) for i, call in enumerate(calls)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    assert not errors, f"Errors in threads: {errors}"
+    return results, time.perf_counter() - start
 
 
 # ===========================================================================
-# B. Single session tests
+# A. Single session tests
 # ===========================================================================
 
 
@@ -319,8 +319,7 @@ class TestGetText:
     def test_get_text_with_selector(self, wired_tool):
         """_get_text(selector='h1') uses query_selector().inner_text()."""
         tool, page, _ = wired_tool
-        element = MagicMock()
-        element.inner_text.return_value = "Main Heading"
+        element = MagicMock(inner_text=AsyncMock(return_value="Main Heading"))
         page.query_selector.return_value = element
 
         result = tool._get_text(selector="h1")
@@ -535,215 +534,6 @@ class TestScreenshot:
         assert "Error taking screenshot" in result
 
 
-# ===========================================================================
-# C. Multiple session / lifecycle tests
-# ===========================================================================
-
-
-class TestBrowserLifecycle:
-    def test_ensure_browser_only_launches_once(self, browser_tool):
-        """Calling _ensure_browser twice reuses the existing context."""
-        page = _make_mock_page()
-        mock_sync_pw, pw = _make_sync_playwright_factory(page=page)
-
-        with (
-            _patch_sync_playwright(mock_sync_pw),
-            _patch_config(),
-            patch("os.makedirs"),
-        ):
-            browser_tool._ensure_browser()
-            browser_tool._ensure_browser()
-
-        # sync_playwright().start() should only be called once
-        mock_sync_pw.return_value.start.assert_called_once()
-
-    def test_cleanup_tears_down_browser(self):
-        """cleanup() closes page, context, stops playwright, and shuts down executor."""
-        tool = BrowserTool()
-        page = _make_mock_page()
-        pw = _make_mock_playwright(page=page)
-        ctx = pw.chromium.launch_persistent_context.return_value
-
-        tool._playwright = pw
-        tool._browser_context = ctx
-        tool._page = page
-        tool._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="test")
-        tool._last_used = time.monotonic()
-
-        tool.cleanup()
-
-        page.close.assert_called_once()
-        ctx.close.assert_called_once()
-        pw.stop.assert_called_once()
-        assert tool._executor is None
-        assert tool._last_used == 0.0
-
-    def test_cleanup_allows_relaunch(self, browser_tool):
-        """After cleanup(), the next tool call re-initializes the browser."""
-        page = _make_mock_page()
-        mock_sync_pw, pw = _make_sync_playwright_factory(page=page)
-
-        with (
-            _patch_sync_playwright(mock_sync_pw),
-            _patch_config(),
-            patch("os.makedirs"),
-        ):
-            # First session
-            browser_tool._executor = ThreadPoolExecutor(max_workers=1)
-            browser_tool._ensure_browser()
-            assert mock_sync_pw.return_value.start.call_count == 1
-
-            # Simulate cleanup — clear browser state but keep executor
-            browser_tool._browser_context = None
-            browser_tool._playwright = None
-            browser_tool._page = None
-
-            # Second session — should re-launch
-            browser_tool._ensure_browser()
-            assert mock_sync_pw.return_value.start.call_count == 2
-
-    def test_cleanup_idle_skips_active(self):
-        """cleanup_idle doesn't clean up a recently-used instance."""
-        tool = BrowserTool()
-        tool._last_used = time.monotonic()  # just used
-        tool._playwright = MagicMock()
-        tool._browser_context = MagicMock()
-
-        BrowserTool.cleanup_idle(idle_seconds=30)
-
-        # Should NOT have been cleaned up
-        assert tool._browser_context is not None
-
-    def test_cleanup_idle_cleans_stale(self):
-        """cleanup_idle cleans up an instance idle for longer than threshold."""
-        tool = BrowserTool()
-        page = _make_mock_page()
-        pw = _make_mock_playwright(page=page)
-        ctx = pw.chromium.launch_persistent_context.return_value
-
-        tool._playwright = pw
-        tool._browser_context = ctx
-        tool._page = page
-        tool._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="test")
-        tool._last_used = time.monotonic() - 60  # idle for 60s
-
-        BrowserTool.cleanup_idle(idle_seconds=30)
-
-        assert tool._executor is None
-        assert tool._last_used == 0.0
-
-    def test_executor_created_once(self, browser_tool):
-        """Multiple _get_or_create_executor calls return the same executor."""
-        ex1 = browser_tool._get_or_create_executor()
-        ex2 = browser_tool._get_or_create_executor()
-
-        assert ex1 is ex2
-
-    def test_run_on_thread_serializes_calls(self, browser_tool):
-        """Two run_on_thread calls execute sequentially on the single-worker executor."""
-        order = []
-
-        def task_a():
-            order.append("a_start")
-            time.sleep(0.05)
-            order.append("a_end")
-            return "a"
-
-        def task_b():
-            order.append("b_start")
-            order.append("b_end")
-            return "b"
-
-        # Submit from two threads concurrently
-        t1 = threading.Thread(target=lambda: browser_tool.run_on_thread(task_a))
-        t2 = threading.Thread(target=lambda: browser_tool.run_on_thread(task_b))
-        t1.start()
-        time.sleep(0.01)  # ensure task_a starts first
-        t2.start()
-        t1.join(timeout=5)
-        t2.join(timeout=5)
-
-        # Since max_workers=1, task_a must finish before task_b starts
-        assert order.index("a_end") < order.index("b_start")
-
-    def test_run_on_thread_updates_last_used(self, browser_tool):
-        """run_on_thread updates _last_used timestamp."""
-        browser_tool._last_used = 0.0
-
-        browser_tool.run_on_thread(lambda: None)
-
-        assert browser_tool._last_used > 0.0
-
-    def test_cleanup_on_fresh_tool_is_noop(self, browser_tool):
-        """Calling cleanup on a tool that was never initialized doesn't raise."""
-        browser_tool.cleanup()  # should not raise
-
-
-# ===========================================================================
-# D. Edge case tests
-# ===========================================================================
-
-
-class TestEdgeCases:
-    def test_ensure_browser_raises_without_playwright(self, browser_tool):
-        """When playwright is not importable, raises RuntimeError with install instructions."""
-        # Temporarily remove playwright from sys.modules and make import fail
-        saved_modules = {}
-        for key in list(sys.modules):
-            if "playwright" in key:
-                saved_modules[key] = sys.modules.pop(key)
-
-        import builtins
-
-        real_import = builtins.__import__
-
-        def fail_playwright(name, *args, **kwargs):
-            if "playwright" in name:
-                raise ImportError("No module named 'playwright'")
-            return real_import(name, *args, **kwargs)
-
-        try:
-            with (
-                patch("builtins.__import__", side_effect=fail_playwright),
-                pytest.raises(RuntimeError, match="Playwright is not installed"),
-            ):
-                browser_tool._ensure_browser()
-        finally:
-            sys.modules.update(saved_modules)
-
-    def test_ensure_page_creates_new_if_closed(self):
-        """If page.is_closed() returns True, _ensure_page creates a new page."""
-        tool = BrowserTool()
-        ctx = _make_mock_context()
-        tool._browser_context = ctx
-        tool._playwright = MagicMock()
-
-        closed_page = MagicMock()
-        closed_page.is_closed.return_value = True
-        tool._page = closed_page
-
-        tool._ensure_page()
-
-        ctx.new_page.assert_called_once()
-        assert tool._page is ctx.new_page.return_value
-
-    def test_ensure_page_reuses_open_page(self):
-        """If page is still open, _ensure_page does NOT create a new one."""
-        tool = BrowserTool()
-        ctx = _make_mock_context()
-        tool._browser_context = ctx
-        tool._playwright = MagicMock()
-
-        open_page = MagicMock()
-        open_page.is_closed.return_value = False
-        tool._page = open_page
-
-        tool._ensure_page()
-
-        ctx.new_page.assert_not_called()
-        assert tool._page is open_page
-
-
 class TestCleanText:
     """Tests for the static _clean_text method."""
 
@@ -799,46 +589,6 @@ class TestCleanText:
         assert "Chunk 1/" in result
 
 
-class TestClearStaleSingletonLock:
-    """Tests for the static _clear_stale_singleton_lock method."""
-
-    def test_no_lock_file(self, tmp_path):
-        """Returns False when no SingletonLock exists."""
-        assert BrowserTool._clear_stale_singleton_lock(str(tmp_path)) is False
-
-    def test_removes_lock_for_dead_pid(self, tmp_path):
-        """Removes lock file when referenced PID is dead."""
-        lock_path = tmp_path / "SingletonLock"
-        # PID 999999999 is very likely dead
-        os.symlink("hostname-999999999", str(lock_path))
-
-        result = BrowserTool._clear_stale_singleton_lock(str(tmp_path))
-
-        assert result is True
-        assert not lock_path.exists()
-
-    def test_keeps_lock_for_live_pid(self, tmp_path):
-        """Leaves lock file when referenced PID is alive (current process)."""
-        lock_path = tmp_path / "SingletonLock"
-        os.symlink(f"hostname-{os.getpid()}", str(lock_path))
-
-        result = BrowserTool._clear_stale_singleton_lock(str(tmp_path))
-
-        assert result is False
-        # Use lexists because the symlink target doesn't exist as a real path
-        assert os.path.lexists(str(lock_path))
-
-    def test_regular_file_lock_removed(self, tmp_path):
-        """A regular file (not symlink) named SingletonLock is removed."""
-        lock_path = tmp_path / "SingletonLock"
-        lock_path.write_text("stale")
-
-        result = BrowserTool._clear_stale_singleton_lock(str(tmp_path))
-
-        assert result is True
-        assert not lock_path.exists()
-
-
 class TestDefinitionsAndImplementations:
     """Verify tool registration."""
 
@@ -874,236 +624,377 @@ class TestDefinitionsAndImplementations:
         assert browser_tool.name == "browser"
 
 
-class TestExecutorThreadSafety:
-    """Verify double-checked locking for executor creation."""
+# ===========================================================================
+# B. Sessions and lifecycle
+# ===========================================================================
 
-    def test_concurrent_get_or_create_returns_same_executor(self, browser_tool):
-        """Multiple threads calling _get_or_create_executor get the same instance."""
-        results = []
-        barrier = threading.Barrier(5)
 
-        def worker():
-            barrier.wait()
-            results.append(browser_tool._get_or_create_executor())
+def _slow_page(delay, log=None):
+    """A page whose goto takes *delay* seconds, optionally logging start/end per URL."""
+    page = _make_mock_page()
 
-        threads = [threading.Thread(target=worker) for _ in range(5)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join(timeout=5)
+    async def goto(url, **kwargs):
+        if log is not None:
+            log.append(f"start:{url}")
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(f"end:{url}")
+        return MagicMock(status=200)
 
-        assert len(results) == 5
-        assert all(r is results[0] for r in results)
+    page.goto.side_effect = goto
+    return page
 
 
-class TestParallelToolCalls:
-    """Verify behaviour when tool calls overlap from multiple threads."""
+class TestBrowserSessions:
+    def test_browser_launches_once_and_context_is_reused(self, make_pool):
+        """Repeated calls in one session reuse a single browser, context and page."""
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            tool = BrowserTool()
+            tool._navigate("https://a.com")
+            tool._get_text()
+
+        assert chromium.launches == 1
+        assert len(chromium.contexts) == 1
+        assert len(chromium.pages) == 1
+
+    def test_sessions_get_isolated_contexts(self, make_pool):
+        """Each tool instance browses in its own context and page."""
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            BrowserTool()._navigate("https://a.com")
+            BrowserTool()._navigate("https://b.com")
+
+        assert chromium.launches == 1
+        assert len(chromium.contexts) == 2
+        chromium.pages[0].goto.assert_awaited_once()
+        chromium.pages[1].goto.assert_awaited_once()
+        assert pool.stats()["sessions"] == 2
+
+    def test_calls_within_a_session_serialize(self, make_pool):
+        """Overlapping calls on one tool never interleave on its page."""
+        log = []
+        pool, chromium = make_pool(page_factory=lambda: _slow_page(0.05, log))
+        with chromium.patch_modules():
+            tool = BrowserTool()
+            results, _ = _run_parallel(
+                lambda: tool._navigate("https://first.com"), lambda: tool._navigate("https://second.com")
+            )
+
+        assert all("Navigated to" in r for r in results)
+        assert len(chromium.pages) == 1
+        assert log[0].startswith("start:") and log[1].startswith("end:")
+        assert log[1][4:] == log[0][6:]
+
+    def test_throughput_scales_with_pool_size(self, make_pool):
+        """Four sessions browse concurrently with four slots, one at a time with one."""
+        delay = 0.2
+        timings = {}
+        for size in (4, 1):
+            pool, chromium = make_pool(max_sessions=size, page_factory=lambda: _slow_page(delay))
+            with chromium.patch_modules():
+                tools = [BrowserTool() for _ in range(4)]
+                results, timings[size] = _run_parallel(
+                    *(functools.partial(t._navigate, "https://x.com") for t in tools)
+                )
+            assert all("Navigated to" in r for r in results)
+
+        assert timings[4] < 2 * delay
+        assert timings[1] >= 4 * delay
+
+    def test_reopens_closed_page_in_same_context(self, make_pool):
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            tool = BrowserTool()
+            tool._navigate("https://a.com")
+            chromium.pages[0].is_closed.return_value = True
+            tool._navigate("https://b.com")
+
+        assert len(chromium.contexts) == 1
+        assert len(chromium.pages) == 2
+
+    def test_relaunches_after_browser_disconnects(self, make_pool):
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            tool = BrowserTool()
+            tool._navigate("https://a.com")
+            chromium.browser.is_connected.return_value = False
+            tool._navigate("https://b.com")
+
+        assert chromium.launches == 2
+        assert len(chromium.contexts) == 2
+
+    def test_missing_playwright_reports_error(self, make_pool):
+        make_pool()
+        with patch.dict("sys.modules", {"playwright": None, "playwright.async_api": None}):
+            result = BrowserTool()._navigate("https://a.com")
+
+        assert "Playwright is not installed" in result
+
+    def test_cleanup_closes_context_and_saves_storage_state(self, make_pool):
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            tool = BrowserTool()
+            tool._navigate("https://a.com")
+            tool.cleanup()
+
+        chromium.contexts[0].close.assert_awaited_once()
+        state_file = os.path.join(pool.profile_dir, _browser_pool_mod.STORAGE_STATE_FILE)
+        with open(state_file) as f:
+            assert json.load(f)["cookies"][0]["name"] == "sid"
+        assert pool.stats()["sessions"] == 0
+
+    def test_new_sessions_start_from_saved_storage_state(self, make_pool):
+        """Sign-ins saved by one session carry over to sessions opened later."""
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            first = BrowserTool()
+            first._navigate("https://a.com")
+            first.cleanup()
+            BrowserTool()._navigate("https://a.com")
+
+        assert chromium.context_kwargs[0]["storage_state"] is None
+        assert chromium.context_kwargs[1]["storage_state"]["cookies"] == [_cookie("sid", "0")]
+
+    def test_stale_session_does_not_erase_a_later_sign_in(self, make_pool):
+        """A session opened before another signed in keeps that sign-in when it closes last."""
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            early, signer = BrowserTool(), BrowserTool()
+            early._navigate("https://a.com")
+            signer._navigate("https://a.com")
+            chromium.contexts[0].state = {"cookies": [_cookie("theme", "dark")], "origins": []}
+            chromium.contexts[1].state = {
+                "cookies": [_cookie("auth", "token")],
+                "origins": [{"origin": "https://a.com", "localStorage": [{"name": "user", "value": "b"}]}],
+            }
+            signer.cleanup()
+            early.cleanup()
+
+        saved = _read_state(pool)
+        assert sorted(c["name"] for c in saved["cookies"]) == ["auth", "theme"]
+        assert saved["origins"][0]["origin"] == "https://a.com"
+
+    def test_sign_out_removes_the_saved_cookie(self, make_pool):
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            first = BrowserTool()
+            first._navigate("https://a.com")
+            chromium.contexts[0].state = {"cookies": [_cookie("auth", "token")], "origins": []}
+            first.cleanup()
+
+            second = BrowserTool()
+            second._navigate("https://a.com")
+            chromium.contexts[1].state = {"cookies": [], "origins": []}
+            second.cleanup()
+
+        assert _read_state(pool)["cookies"] == []
+
+    def test_concurrent_closes_keep_every_session_change(self, make_pool):
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            tools = [BrowserTool() for _ in range(3)]
+            for tool in tools:
+                tool._navigate("https://a.com")
+            for i, context in enumerate(chromium.contexts):
+                context.state = {"cookies": [_cookie(f"c{i}", "1", domain=f"{i}.com")], "origins": []}
+            assert pool.evict_idle(0) == 3
+
+        assert sorted(c["name"] for c in _read_state(pool)["cookies"]) == ["c0", "c1", "c2"]
+        assert os.listdir(pool.profile_dir) == [_browser_pool_mod.STORAGE_STATE_FILE]
+
+    def test_unchanged_session_does_not_rewrite_the_profile(self, make_pool):
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            tool = BrowserTool()
+            tool._navigate("https://a.com")
+            chromium.contexts[0].state = {"cookies": [], "origins": []}
+            tool.cleanup()
+
+        assert not os.path.exists(os.path.join(pool.profile_dir, _browser_pool_mod.STORAGE_STATE_FILE))
+
+    def test_cleanup_waits_for_in_flight_call(self, make_pool):
+        """cleanup() during a call lets the call finish, then closes the context."""
+        pool, chromium = make_pool(page_factory=lambda: _slow_page(0.2))
+        with chromium.patch_modules():
+            tool = BrowserTool()
+
+            def _cleanup_later():
+                time.sleep(0.05)
+                tool.cleanup()
 
-    def test_parallel_navigate_same_instance_serializes(self, wired_tool):
-        """Two _navigate calls on the same tool serialize — no page corruption."""
-        tool, page, _ = wired_tool
-        order = []
+            results, _ = _run_parallel(lambda: tool._navigate("https://a.com"), _cleanup_later)
 
-        original_goto = page.goto
+        assert "Navigated to" in results[0]
+        chromium.contexts[0].close.assert_awaited_once()
 
-        def slow_goto(url, **kwargs):
-            order.append(f"goto_start:{url}")
+    def test_cleanup_on_fresh_tool_is_noop(self, browser_tool):
+        with patch.object(_browser_pool_mod, "_shared_pool", None):
+            browser_tool.cleanup()
+
+    def test_cleanup_idle_keeps_active_sessions(self, make_pool):
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            BrowserTool()._navigate("https://a.com")
+            BrowserTool.cleanup_idle(3600)
+
+        chromium.contexts[0].close.assert_not_called()
+        assert pool.stats()["browser_running"] is True
+
+    def test_cleanup_idle_closes_stale_sessions_then_browser(self, make_pool):
+        pool, chromium = make_pool()
+        with chromium.patch_modules():
+            tool_a, tool_b = BrowserTool(), BrowserTool()
+            tool_a._navigate("https://a.com")
             time.sleep(0.05)
-            order.append(f"goto_end:{url}")
-            return original_goto(url, **kwargs)
-
-        page.goto = slow_goto
-        page.title.return_value = "Page"
-
-        results: list[str | None] = [None, None]
-        errors: list[Exception] = []
-
-        def nav(idx, url):
-            try:
-                results[idx] = tool._navigate(url)
-            except Exception as e:
-                errors.append(e)
-
-        t1 = threading.Thread(target=nav, args=(0, "https://first.com"))
-        t2 = threading.Thread(target=nav, args=(1, "https://second.com"))
-        t1.start()
-        time.sleep(0.01)  # give t1 a head start
-        t2.start()
-        t1.join(timeout=10)
-        t2.join(timeout=10)
-
-        assert not errors, f"Errors in threads: {errors}"
-        assert results[0] is not None and results[1] is not None
-        # Both should succeed
-        assert "Navigated to: https://first.com" in results[0]
-        assert "Navigated to: https://second.com" in results[1]
-        # First navigate must finish before second starts (single-worker executor)
-        assert order.index("goto_end:https://first.com") < order.index("goto_start:https://second.com")
-
-    def test_parallel_tool_calls_different_instances(self):
-        """Two separate BrowserTool instances run tool calls truly in parallel."""
-        tool_a = BrowserTool()
-        tool_b = BrowserTool()
-
-        page_a = _make_mock_page()
-        page_b = _make_mock_page()
-        pw_a = _make_mock_playwright(page=page_a)
-        pw_b = _make_mock_playwright(page=page_b)
-
-        for tool, page, pw in [(tool_a, page_a, pw_a), (tool_b, page_b, pw_b)]:
-            tool._playwright = pw
-            tool._browser_context = pw.chromium.launch_persistent_context.return_value
-            tool._page = page
-            tool._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="test")
-
-        overlap = threading.Event()
-        order = []
-
-        original_goto_a = page_a.goto
-
-        def slow_goto_a(url, **kwargs):
-            order.append("a_start")
-            overlap.wait(timeout=5)  # wait until b has also started
-            order.append("a_end")
-            return original_goto_a(url, **kwargs)
-
-        original_goto_b = page_b.goto
-
-        def slow_goto_b(url, **kwargs):
-            order.append("b_start")
-            overlap.set()  # signal that b has started
-            order.append("b_end")
-            return original_goto_b(url, **kwargs)
-
-        page_a.goto = slow_goto_a
-        page_b.goto = slow_goto_b
-        page_a.title.return_value = "A"
-        page_b.title.return_value = "B"
-
-        results: list[str | None] = [None, None]
-
-        def nav(idx, tool, url):
-            results[idx] = tool._navigate(url)
-
-        t1 = threading.Thread(target=nav, args=(0, tool_a, "https://a.com"))
-        t2 = threading.Thread(target=nav, args=(1, tool_b, "https://b.com"))
-        t1.start()
-        time.sleep(0.01)
-        t2.start()
-        t1.join(timeout=10)
-        t2.join(timeout=10)
-
-        # Both succeed
-        assert results[0] is not None and results[1] is not None
-        assert "Navigated to: https://a.com" in results[0]
-        assert "Navigated to: https://b.com" in results[1]
-        # b_start should appear before a_end — proving true parallelism
-        assert order.index("b_start") < order.index("a_end")
-
-        for tool in (tool_a, tool_b):
-            tool._executor.shutdown(wait=False)
-            tool._executor = None
-
-    def test_cleanup_during_active_tool_call(self, wired_tool):
-        """cleanup() called while _navigate is mid-flight doesn't crash either thread."""
-        tool, page, _ = wired_tool
+            tool_b._navigate("https://b.com")
 
-        navigate_started = threading.Event()
-        navigate_can_finish = threading.Event()
+            assert pool.evict_idle(0.03) == 1
+            chromium.contexts[0].close.assert_awaited_once()
+            chromium.browser.close.assert_not_called()
 
-        original_goto = page.goto
+            BrowserTool.cleanup_idle(0)
+            chromium.contexts[1].close.assert_awaited_once()
+            chromium.browser.close.assert_awaited_once()
+            assert pool.stats()["browser_running"] is False
 
-        def blocking_goto(url, **kwargs):
-            navigate_started.set()
-            navigate_can_finish.wait(timeout=5)
-            return original_goto(url, **kwargs)
+            # The next call brings the browser back.
+            tool_a._navigate("https://a.com")
+        assert chromium.launches == 2
 
-        page.goto = blocking_goto
-        page.title.return_value = "Page"
 
-        nav_result: list[str | None] = [None]
-        nav_error: list[Exception | None] = [None]
-        cleanup_error: list[Exception | None] = [None]
+# ===========================================================================
+# C. Pool limits
+# ===========================================================================
 
-        def do_navigate():
-            try:
-                nav_result[0] = tool._navigate("https://example.com")
-            except Exception as e:
-                nav_error[0] = e
 
-        def do_cleanup():
-            try:
-                navigate_started.wait(timeout=5)
-                # Navigate is now in progress on the executor thread —
-                # cleanup submits _teardown to the same single-worker executor,
-                # so it queues behind the navigate.
-                tool.cleanup()
-            except Exception as e:
-                cleanup_error[0] = e
-            finally:
-                # Unblock navigate so the test doesn't hang
-                navigate_can_finish.set()
-
-        t_nav = threading.Thread(target=do_navigate)
-        t_clean = threading.Thread(target=do_cleanup)
-        t_nav.start()
-        t_clean.start()
-        t_nav.join(timeout=10)
-        t_clean.join(timeout=10)
-
-        # Neither thread should have crashed
-        assert nav_error[0] is None, f"Navigate raised: {nav_error[0]}"
-        assert cleanup_error[0] is None, f"Cleanup raised: {cleanup_error[0]}"
-
-    def test_concurrent_navigate_and_get_text(self, wired_tool):
-        """Navigate and get_text submitted concurrently — get_text waits for navigate."""
-        tool, page, _ = wired_tool
-        order = []
+class TestPoolLimits:
+    def test_full_pool_evicts_least_recently_used_idle_session(self, make_pool):
+        pool, chromium = make_pool(max_sessions=2)
+        with chromium.patch_modules():
+            tool_a, tool_b, tool_c = BrowserTool(), BrowserTool(), BrowserTool()
+            tool_a._navigate("https://a.com")
+            tool_b._navigate("https://b.com")
+            tool_a._get_text()  # b is now least recently used
+            tool_c._navigate("https://c.com")
+            time.sleep(0.05)  # eviction closes the context in the background
+
+        chromium.contexts[1].close.assert_awaited_once()
+        chromium.contexts[0].close.assert_not_called()
+        stats = pool.stats()
+        assert stats["sessions"] == 2
+        assert stats["evictions"] == 1
+
+    def test_waits_in_fifo_order_when_all_sessions_busy(self, make_pool):
+        log = []
+        pool, chromium = make_pool(max_sessions=1, page_factory=lambda: _slow_page(0.15, log))
+        with chromium.patch_modules():
+            tools = [BrowserTool() for _ in range(3)]
+
+            def _nav(i):
+                time.sleep(0.05 * i)
+                return tools[i]._navigate(f"https://{i}.com")
+
+            results, _ = _run_parallel(*(functools.partial(_nav, i) for i in range(3)))
+
+        assert all("Navigated to" in r for r in results)
+        assert [entry for entry in log if entry.startswith("start:")] == [
+            "start:https://0.com",
+            "start:https://1.com",
+            "start:https://2.com",
+        ]
+        stats = pool.stats()
+        assert stats["waits"] == 2
+        assert stats["peak_waiting"] == 2
+        assert stats["evictions"] == 2
 
-        original_goto = page.goto
+    def test_busy_session_does_not_hold_up_other_sessions(self, make_pool):
+        """A second call queued behind its own session must not block a different session."""
+        log = []
+        pool, chromium = make_pool(max_sessions=2, page_factory=lambda: _slow_page(0.2, log))
+        with chromium.patch_modules():
+            tool_a, tool_b = BrowserTool(), BrowserTool()
 
-        def slow_goto(url, **kwargs):
-            order.append("goto_start")
-            time.sleep(0.05)
-            order.append("goto_end")
-            return original_goto(url, **kwargs)
+            def _b_later():
+                time.sleep(0.05)
+                return tool_b._navigate("https://b.com")
 
-        page.goto = slow_goto
-        page.title.return_value = "Page"
-        page.evaluate.return_value = "page body text"
+            _run_parallel(
+                lambda: tool_a._navigate("https://a1.com"), lambda: tool_a._navigate("https://a2.com"), _b_later
+            )
 
-        results: list[str | None] = [None, None]
+        first_end = next(i for i, entry in enumerate(log) if entry.startswith("end:"))
+        assert log.index("start:https://b.com") < first_end
 
-        def do_navigate():
-            results[0] = tool._navigate("https://example.com")
+    def test_acquire_times_out_when_all_sessions_stay_busy(self, make_pool):
+        pool, chromium = make_pool(max_sessions=1, acquire_timeout=0.1, page_factory=lambda: _slow_page(0.5))
+        with chromium.patch_modules():
+            tool_a, tool_b = BrowserTool(), BrowserTool()
 
-        def do_get_text():
-            results[1] = tool._get_text()
+            def _b_later():
+                time.sleep(0.05)
+                return tool_b._navigate("https://b.com")
 
-        t1 = threading.Thread(target=do_navigate)
-        t2 = threading.Thread(target=do_get_text)
-        t1.start()
-        time.sleep(0.01)  # ensure navigate starts first
-        t2.start()
-        t1.join(timeout=10)
-        t2.join(timeout=10)
+            results, _ = _run_parallel(lambda: tool_a._navigate("https://a.com"), _b_later)
 
-        assert results[0] is not None and results[1] is not None
         assert "Navigated to" in results[0]
-        assert "page body text" in results[1]
-        # Navigate must finish before get_text runs (single-worker)
-        assert order.index("goto_end") < len(order)
+        assert "stayed busy" in results[1]
+        assert pool.stats()["waiting"] == 0
+        assert len(chromium.contexts) == 1
 
-    def test_sequential_navigate_then_get_text(self, wired_tool):
-        """Navigate followed by get_text on the same page returns correct data."""
-        tool, page, _ = wired_tool
-        page.goto.return_value = MagicMock(status=200)
-        page.title.return_value = "Example"
-        page.evaluate.return_value = "Hello from example.com"
 
-        nav_result = tool._navigate("https://example.com")
-        text_result = tool._get_text()
+# ===========================================================================
+# D. Real Chromium against a local page
+# ===========================================================================
+
+
+@pytest.fixture
+def html_server(tmp_path):
+    """Serve a small HTML fixture site from a background thread; yields its base URL."""
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "index.html").write_text(
+        "<html><head><title>Fixture Home</title></head>"
+        "<body><main><h1>Jobs</h1><a href='/job.html'>Python Developer</a></main></body></html>"
+    )
+    (site / "job.html").write_text(
+        "<html><head><title>Python Developer</title></head><body><p id='desc'>Remote role</p></body></html>"
+    )
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(site))
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
 
-        assert "Navigated to: https://example.com" in nav_result
-        assert "Example" in nav_result
-        assert "Hello from example.com" in text_result
+
+class TestRealChromium:
+    def test_sessions_browse_fixture_site_concurrently(self, html_server, tmp_path):
+        pytest.importorskip("playwright.async_api")
+        pool = BrowserPool(max_sessions=2, headless=True, profile_dir=str(tmp_path / "profile"), acquire_timeout=30)
+
+        async def _title(page):
+            return await page.title()
+
+        try:
+            pool.run("probe", _title, timeout=60)
+        except Exception as e:
+            pool.close()
+            pytest.skip(f"Chromium cannot be launched here: {e}")
+
+        try:
+            with patch.object(_browser_pool_mod, "_shared_pool", pool):
+                tool_a, tool_b = BrowserTool(), BrowserTool()
+                results, _ = _run_parallel(
+                    lambda: tool_a._navigate(f"{html_server}/index.html"),
+                    lambda: tool_b._navigate(f"{html_server}/job.html"),
+                )
+                assert "Fixture Home" in results[0]
+                assert "Page title: Python Developer" in results[1]
+                assert "[Python Developer](" in tool_a._get_links()
+                assert "Remote role" in tool_b._get_text(selector="#desc")
+                assert pool.stats()["sessions"] == 2
+        finally:
+            pool.close()
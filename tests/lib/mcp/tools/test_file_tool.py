@@ -66,6 +66,8 @@ for pkg in ("lib", "lib.mcp", "lib.mcp.tools", "lib.core", "lib.services", "lib.
 sys.modules["lib.services.ai_client"].base_tool = sys.modules["lib.services.ai_client.base_tool"]
 sys.modules["lib.services.ai_client.base_tool"] = _base_tool_mod
 
+_load_module("lib.utils.file_search", os.path.join(_SRC, "lib", "utils", "file_search.py"))
+
 # Now load file_tool
 _file_tool_mod = _load_module(
     "lib.mcp.tools.file_tool",
@@ -456,6 +458,47 @@ class TestSearchInFiles:
         assert all("code.py" in f for f in file_names)
         assert not any("notes.txt" in f for f in file_names)
 
+    def test_gitignored_and_binary_files_skipped(self, file_tool, tmp_path):
+        """Ignored directories and binary files are not searched unless asked."""
+        (tmp_path / ".gitignore").write_text("node_modules/\n")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "dep.js").write_text("target\n")
+        (tmp_path / "image.bin").write_bytes(b"\x00\x01target")
+        (tmp_path / "app.js").write_text("target\n")
+
+        result = file_tool._search_in_files(str(tmp_path), "target")
+
+        assert [m["file"] for m in result["matches"]] == ["app.js"]
+        assert result["files_skipped"] == 1
+
+        result = file_tool._search_in_files(str(tmp_path), "target", include_ignored=True)
+        assert sorted(m["file"] for m in result["matches"]) == ["app.js", "node_modules/dep.js"]
+
+    def test_anchored_regex_matches_each_line(self, file_tool, tmp_path):
+        """Line anchors apply per line, as in a line-by-line scan."""
+        (tmp_path / "a.txt").write_text("x\ndef one\n  def two\ndef three\n")
+
+        result = file_tool._search_in_files(str(tmp_path), r"^def", is_regex=True)
+
+        assert [m["line"] for m in result["matches"]] == [2, 4]
+
+    @pytest.mark.parametrize("pattern", [r"\Afoo", r"foo\Z", r"(?<!x)foo", r"foo(?!\n)"])
+    def test_string_anchors_and_lookarounds_match_per_line(self, file_tool, tmp_path, pattern):
+        """Constructs that only match at a line edge are not rejected by the whole-file prefilter."""
+        (tmp_path / "a.txt").write_text("bar\nfoo\nbaz\n")
+
+        result = file_tool._search_in_files(str(tmp_path), pattern, is_regex=True)
+
+        assert [m["line"] for m in result["matches"]] == [2]
+
+    def test_end_anchor_matches_on_crlf_files(self, file_tool, tmp_path):
+        """The prefilter sees CRLF files with the same line ends as the line scan."""
+        (tmp_path / "a.txt").write_bytes(b"bar\r\nfoo\r\n")
+
+        result = file_tool._search_in_files(str(tmp_path), "foo$", is_regex=True)
+
+        assert [m["line"] for m in result["matches"]] == [2]
+
 
 # ===========================================================================
 # E. _file_info tests
@@ -0,0 +1,212 @@
+"""Tests for AIClientCache: LRU/TTL/byte bounds, eviction hooks, stats and single-flight builds."""
+
+import asyncio
+import threading
+
+import pytest
+
+from lib.services.ai_client.client_cache import AIClientCache, approx_size
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Client:
+    def __init__(self, name, nbytes=10):
+        self.name = name
+        self.nbytes = nbytes
+
+
+def _cache(**kwargs):
+    evicted = []
+    kwargs.setdefault("sizeof", lambda client: client.nbytes)
+    cache = AIClientCache(on_evict=lambda key, client: evicted.append((key, client.name)), **kwargs)
+    return cache, evicted
+
+
+class TestBounds:
+    def test_least_recently_used_is_evicted(self):
+        cache, evicted = _cache(max_size=2)
+        cache.set("a", _Client("a"))
+        cache.set("b", _Client("b"))
+        cache.get("a")
+        cache.set("c", _Client("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a").name == "a"
+        assert evicted == [("b", "b")]
+
+    def test_idle_entries_expire(self):
+        clock = _Clock()
+        cache, evicted = _cache(idle_ttl=60, clock=clock)
+        cache.set("a", _Client("a"))
+        cache.set("b", _Client("b"))
+        clock.now += 50
+        cache.get("b")
+        clock.now += 20
+
+        assert cache.get("a") is None
+        assert cache.get("b").name == "b"
+        assert evicted == [("a", "a")]
+        assert cache.stats()["expirations"] == 1
+
+    def test_byte_budget(self):
+        cache, evicted = _cache(max_bytes=100)
+        cache.set("a", _Client("a", 60))
+        cache.set("b", _Client("b", 30))
+        cache.set("c", _Client("c", 30))
+
+        assert evicted == [("a", "a")]
+        assert cache.stats()["bytes"] == 60
+
+    def test_oversized_newest_entry_is_kept(self):
+        cache, evicted = _cache(max_bytes=100)
+        cache.set("a", _Client("a", 10))
+        cache.set("big", _Client("big", 500))
+
+        assert cache.get("big").name == "big"
+        assert evicted == [("a", "a")]
+
+    def test_replacing_and_removing_release_the_old_client(self):
+        cache, evicted = _cache()
+        first = _Client("first")
+        cache.set("a", first)
+        cache.set("a", first)
+        cache.set("a", _Client("second"))
+        cache.remove("a")
+
+        assert evicted == [("a", "first"), ("a", "second")]
+        assert len(cache) == 0
+
+    def test_failing_hook_does_not_break_the_cache(self):
+        def boom(key, client):
+            raise RuntimeError("cleanup failed")
+
+        cache = AIClientCache(max_size=1, on_evict=boom)
+        cache.set("a", _Client("a"))
+        cache.set("b", _Client("b"))
+        assert cache.get("b").name == "b"
+
+    def test_clear_releases_everything(self):
+        cache, evicted = _cache()
+        cache.set("a", _Client("a"))
+        cache.set("b", _Client("b"))
+        cache.clear()
+        assert sorted(evicted) == [("a", "a"), ("b", "b")]
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_build(self):
+        cache, _ = _cache()
+        gate = asyncio.Event()
+        builds = []
+
+        async def build():
+            builds.append(1)
+            await gate.wait()
+            return _Client("built")
+
+        waiters = [asyncio.create_task(cache.get_or_create("c1", build)) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*waiters)
+
+        assert len(builds) == 1
+        assert len({id(r) for r in results}) == 1
+        assert (await cache.get_or_create("c1", build)) is results[0]
+        stats = cache.stats()
+        assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 4, 1)
+        assert stats["builds_in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_build_reaches_every_waiter_and_is_not_cached(self):
+        cache, _ = _cache()
+        attempts = []
+
+        async def build():
+            attempts.append(1)
+            await asyncio.sleep(0)
+            if len(attempts) == 1:
+                raise RuntimeError("provider down")
+            return _Client("ok")
+
+        results = await asyncio.gather(
+            cache.get_or_create("c1", build), cache.get_or_create("c1", build), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert (await cache.get_or_create("c1", build)).name == "ok"
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_build(self):
+        cache, _ = _cache()
+        gate = asyncio.Event()
+
+        async def build():
+            await gate.wait()
+            return _Client("built")
+
+        first = asyncio.create_task(cache.get_or_create("c1", build))
+        await asyncio.sleep(0)
+        first.cancel()
+        second = asyncio.create_task(cache.get_or_create("c1", build))
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert (await second).name == "built"
+        assert cache.get("c1").name == "built"
+
+
+class TestReleaseOffLoop:
+    @pytest.mark.asyncio
+    async def test_blocking_hook_does_not_stall_the_event_loop(self):
+        released = threading.Event()
+        finished = threading.Event()
+        hook_threads = []
+
+        def slow_hook(key, client):
+            hook_threads.append(threading.current_thread())
+            released.wait(timeout=5)
+            finished.set()
+
+        cache = AIClientCache(max_size=1, on_evict=slow_hook, sizeof=lambda client: 0)
+
+        async def build():
+            return _Client("new")
+
+        cache.set("old", _Client("old"))
+        await cache.get_or_create("new", build)  # evicts "old" while the hook blocks
+        ticks = 0
+        for _ in range(5):
+            await asyncio.sleep(0)
+            ticks += 1
+
+        assert ticks == 5 and not finished.is_set()
+        released.set()
+        await asyncio.to_thread(finished.wait, 5)
+        assert hook_threads and hook_threads[0] is not threading.main_thread()
+
+    def test_hook_runs_inline_without_a_loop(self):
+        threads = []
+        cache = AIClientCache(max_size=1, on_evict=lambda key, client: threads.append(threading.current_thread()))
+        cache.set("a", _Client("a"))
+        cache.set("b", _Client("b"))
+        assert threads == [threading.current_thread()]
+
+
+class TestApproxSize:
+    def test_grows_with_retained_data(self):
+        small = _Client("s")
+        large = _Client("l")
+        large.history = [str(i) * 1000 for i in range(100)]
+        assert approx_size(large) > approx_size(small) + 100_000
+
+    def test_walk_is_bounded(self):
+        nested = [[i] for i in range(10_000)]
+        assert approx_size(nested, limit=10) < approx_size(nested)
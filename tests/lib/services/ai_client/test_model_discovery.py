@@ -0,0 +1,207 @@
+"""Tests for model_discovery: TTL cache, stale-while-revalidate, single-flight fetches and fallbacks."""
+
+import importlib.util
+import os
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "src"))
+
+
+def _package(name: str):
+    mod = type(sys)(name)
+    mod.__path__ = []
+    return mod
+
+
+def _stub(name: str, **attrs):
+    mod = type(sys)(name)
+    mod.__dict__.update(attrs)
+    return mod
+
+
+_register_context_window = MagicMock()
+
+with patch.dict(
+    sys.modules,
+    {
+        "lib": _package("lib"),
+        "lib.core": _package("lib.core"),
+        "lib.core.config": _stub("lib.core.config", Config=MagicMock()),
+        "lib.utils": _package("lib.utils"),
+        "lib.utils.printer": _stub("lib.utils.printer", printer=MagicMock()),
+        "lib.services": _package("lib.services"),
+        "lib.services.ai_client": _package("lib.services.ai_client"),
+        "lib.services.ai_client.token_utils": _stub(
+            "lib.services.ai_client.token_utils", register_context_window=_register_context_window
+        ),
+    },
+):
+    _spec = importlib.util.spec_from_file_location(
+        "lib.services.ai_client.model_discovery",
+        os.path.join(_SRC, "lib", "services", "ai_client", "model_discovery.py"),
+    )
+    model_discovery = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(model_discovery)
+
+ModelDiscovery = model_discovery.ModelDiscovery
+
+FALLBACK = [{"id": "static-model", "name": "Static", "context_window": 8192, "provider": "fake"}]
+
+
+def _models(*ids):
+    return [{"id": i, "name": i, "context_window": 32000, "provider": "fake"} for i in ids]
+
+
+class _FakeProvider:
+    """Duck-typed provider whose get_models() returns (or raises) the queued results in order."""
+
+    def __init__(self, *results, endpoint="https://fake.example", gate: threading.Event | None = None):
+        self._results = list(results)
+        self._endpoint = endpoint
+        self._gate = gate
+        self.calls = 0
+
+    def get_provider_name(self):
+        return "fake"
+
+    def get_models_endpoint(self):
+        return self._endpoint
+
+    def get_models(self):
+        self.calls += 1
+        if self._gate is not None:
+            self._gate.wait(5)
+        result = self._results.pop(0) if len(self._results) > 1 else self._results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def get_fallback_models(self):
+        return FALLBACK
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def discovery(clock):
+    return ModelDiscovery(ttl=100, wait_timeout=5, failure_ttl=10, clock=clock)
+
+
+def _drain(discovery):
+    """Wait for every in-flight refresh to finish."""
+    for future in list(discovery._inflight.values()):
+        future.result(5)
+
+
+class TestCache:
+    def test_fresh_entry_is_served_without_refetching(self, discovery):
+        provider = _FakeProvider(_models("a", "b"))
+        assert [m["id"] for m in discovery.get(provider)] == ["a", "b"]
+        assert [m["id"] for m in discovery.get(provider)] == ["a", "b"]
+        assert provider.calls == 1
+
+    def test_entries_are_keyed_by_endpoint(self, discovery):
+        first = _FakeProvider(_models("a"), endpoint="http://one")
+        second = _FakeProvider(_models("b"), endpoint="http://two")
+        assert discovery.get(first)[0]["id"] == "a"
+        assert discovery.get(second)[0]["id"] == "b"
+
+    def test_discovered_context_windows_are_registered(self, discovery):
+        _register_context_window.reset_mock()
+        discovery.get(_FakeProvider(_models("a")))
+        _register_context_window.assert_called_once_with("a", 32000)
+
+    def test_stale_entry_is_returned_while_one_refresh_runs(self, discovery, clock):
+        gate = threading.Event()
+        provider = _FakeProvider(_models("old"), _models("new"))
+        assert discovery.get(provider)[0]["id"] == "old"
+
+        provider._gate = gate
+        clock.now += 101
+        assert discovery.get(provider)[0]["id"] == "old"
+        assert discovery.get(provider)[0]["id"] == "old"
+        gate.set()
+        _drain(discovery)
+
+        assert discovery.get(provider)[0]["id"] == "new"
+        assert provider.calls == 2
+
+
+class TestSingleFlight:
+    def test_concurrent_cold_misses_share_one_fetch(self, discovery):
+        gate = threading.Event()
+        provider = _FakeProvider(_models("a"), gate=gate)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(discovery.get(provider))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        gate.set()
+        for t in threads:
+            t.join(5)
+
+        assert provider.calls == 1
+        assert len(results) == 8
+        assert all(r[0]["id"] == "a" for r in results)
+
+    def test_cold_miss_past_the_wait_timeout_returns_the_fallback(self, clock):
+        discovery = ModelDiscovery(ttl=100, wait_timeout=0.01, clock=clock)
+        gate = threading.Event()
+        provider = _FakeProvider(_models("a"), gate=gate)
+
+        assert discovery.get(provider) == FALLBACK
+        gate.set()
+        _drain(discovery)
+        assert discovery.get(provider)[0]["id"] == "a"
+        assert provider.calls == 1
+
+    def test_prefetch_does_not_block(self, discovery):
+        gate = threading.Event()
+        provider = _FakeProvider(_models("a"), gate=gate)
+        discovery.prefetch(provider)
+        discovery.prefetch(provider)
+        gate.set()
+        _drain(discovery)
+        assert provider.calls == 1
+        assert discovery.get(provider)[0]["id"] == "a"
+
+
+class TestFailures:
+    def test_failure_caches_the_fallback_briefly(self, discovery, clock):
+        provider = _FakeProvider(RuntimeError("unreachable"), _models("a"))
+        assert discovery.get(provider) == FALLBACK
+        assert discovery.get(provider) == FALLBACK
+        assert provider.calls == 1
+
+        clock.now += 11
+        discovery.get(provider)
+        _drain(discovery)
+        assert discovery.get(provider)[0]["id"] == "a"
+
+    def test_failed_refresh_keeps_the_discovered_models(self, discovery, clock):
+        provider = _FakeProvider(_models("a"), RuntimeError("unreachable"))
+        discovery.get(provider)
+
+        clock.now += 101
+        discovery.get(provider)
+        _drain(discovery)
+
+        assert discovery.get(provider)[0]["id"] == "a"
+
+    def test_empty_result_counts_as_a_failure(self, discovery):
+        assert discovery.get(_FakeProvider([])) == FALLBACK
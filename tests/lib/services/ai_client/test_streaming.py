@@ -0,0 +1,224 @@
+"""Tests for async streaming: native LangChain astream, the thread-bridge fallback, and AIClient._astream."""
+
+import asyncio
+import threading
+from collections.abc import Generator
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from lib.services.ai_client.client import AIClient
+from lib.services.ai_client.providers import base_provider
+from lib.services.ai_client.providers.base_provider import BaseAIProvider, CallContext, LangChainProvider
+from lib.services.ai_client.providers.mock_provider import MockAIProvider
+from lib.services.conversation.models import ConversationMessage
+
+
+class _SyncOnlyProvider(BaseAIProvider):
+    """Provider with only a synchronous stream; records the thread it ran on."""
+
+    def __init__(self, chunks=("a", "b", "c"), error: Exception | None = None):
+        self.chunks = chunks
+        self.error = error
+        self.thread: threading.Thread | None = None
+        self.closed = False
+
+    def chat(self, prompt: str, history: list = None, *, call: CallContext | None = None, **kwargs) -> str:
+        return "".join(self.chunks)
+
+    def chat_stream(
+        self, prompt: str, history: list = None, *, call: CallContext | None = None, **kwargs
+    ) -> Generator[str, None, None]:
+        self.thread = threading.current_thread()
+        try:
+            yield from self.chunks
+            if self.error is not None:
+                raise self.error
+            if call is not None:
+                call.usage = {"input_tokens": 1, "output_tokens": len(self.chunks), "total_tokens": 4}
+        finally:
+            self.closed = True
+
+    def is_configured(self) -> bool:
+        return True
+
+    def get_info(self):
+        return {}
+
+    def get_models(self):
+        return []
+
+
+async def _collect(stream) -> list:
+    return [chunk async for chunk in stream]
+
+
+def _client(provider: BaseAIProvider) -> AIClient:
+    client = AIClient(provider="mock")
+    client._provider = provider
+    return client
+
+
+class TestThreadBridgeFallback:
+    def test_sync_stream_runs_on_a_worker_thread(self):
+        provider = _SyncOnlyProvider()
+        assert asyncio.run(_collect(provider.achat_stream("hi"))) == ["a", "b", "c"]
+        assert provider.thread is not threading.main_thread()
+        assert provider.closed
+
+    def test_errors_reach_the_consumer(self):
+        provider = _SyncOnlyProvider(error=RuntimeError("upstream failed"))
+        with pytest.raises(RuntimeError, match="upstream failed"):
+            asyncio.run(_collect(provider.achat_stream("hi")))
+
+    def test_abandoned_stream_stops_the_producer(self):
+        provider = _SyncOnlyProvider(chunks=tuple("x" * 1000))
+
+        async def main():
+            stream = provider.achat_stream("hi")
+            assert await anext(stream) == "x"
+            await stream.aclose()
+            for _ in range(200):
+                if provider.closed:
+                    return
+                await asyncio.sleep(0.01)
+
+        asyncio.run(main())
+        assert provider.closed
+
+
+class TestNativeLangChainStream:
+    def test_direct_llm_astream_matches_the_sync_stream(self):
+        def make():
+            llm = GenericFakeChatModel(messages=iter([AIMessage("hello there world")]))
+            return LangChainProvider(llm=llm, agent=None, provider_name="fake")
+
+        sync_chunks = list(make().chat_stream("hi"))
+        provider = make()
+        async_chunks = asyncio.run(_collect(provider.achat_stream("hi")))
+
+        assert "".join(async_chunks) == "".join(sync_chunks) == "hello there world"
+        assert len(async_chunks) > 1
+
+    def test_native_stream_stays_on_the_event_loop_thread(self):
+        seen = []
+
+        class _Recording(GenericFakeChatModel):
+            async def _astream(self, *args, **kwargs):
+                seen.append(threading.current_thread())
+                async for chunk in super()._astream(*args, **kwargs):
+                    yield chunk
+
+        llm = _Recording(messages=iter([AIMessage("one two")]))
+        provider = LangChainProvider(llm=llm, agent=None, provider_name="fake")
+        asyncio.run(_collect(provider.achat_stream("hi")))
+        assert seen == [threading.main_thread()]
+
+
+class TestClientAsyncStream:
+    def test_native_provider_usage_is_captured(self):
+        client = _client(MockAIProvider(word_delay=0))
+        chunks = asyncio.run(_collect(client._astream("hi")))
+        assert "".join(chunks).strip()
+        assert client.last_usage["output_tokens"] == len(chunks)
+
+    def test_fallback_provider_is_bridged(self):
+        client = _client(_SyncOnlyProvider())
+        call = CallContext()
+        assert asyncio.run(_collect(client._astream("hi", call=call))) == ["a", "b", "c"]
+        assert call.usage["output_tokens"] == 3
+        assert client.last_usage is call.usage
+
+    def test_provider_error_becomes_an_error_chunk(self):
+        client = _client(_SyncOnlyProvider(error=RuntimeError("boom")))
+        chunks = asyncio.run(_collect(client._astream("hi")))
+        assert chunks[-1] == "Chat streaming error: boom"
+        assert client.last_usage is None
+
+    def test_concurrent_native_streams_do_not_need_threads(self):
+        clients = [_client(MockAIProvider(word_delay=0.01)) for _ in range(50)]
+
+        async def main():
+            results = await asyncio.gather(*(_collect(c._astream("hi")) for c in clients))
+            # The loop's default executor names its workers asyncio_N; none should have been started.
+            executor_threads = [t for t in threading.enumerate() if t.name.startswith("asyncio_")]
+            return results, executor_threads
+
+        results, executor_threads = asyncio.run(main())
+        assert all(results)
+        assert executor_threads == []
+
+
+class TestPerCallContext:
+    def test_concurrent_streams_on_one_client_keep_their_own_usage(self):
+        # The mock rotates through replies of different lengths, so each stream's usage is distinct.
+        client = _client(MockAIProvider(word_delay=0.001))
+        calls = [CallContext() for _ in range(2)]
+
+        async def main():
+            return await asyncio.gather(*(_collect(client._astream("hi", call=c)) for c in calls))
+
+        results = asyncio.run(main())
+        for chunks, call in zip(results, calls, strict=True):
+            assert call.usage["output_tokens"] == len(chunks)
+        assert len({c.usage["output_tokens"] for c in calls}) == len(calls)
+
+    def test_concurrent_sync_chats_on_one_client(self):
+        barrier = threading.Barrier(4)
+
+        class _Overlapping(_SyncOnlyProvider):
+            def chat(self, prompt, history=None, *, call=None, **kwargs):
+                barrier.wait(timeout=5)  # every call is in flight before any records usage
+                call.usage = {"input_tokens": len(prompt), "output_tokens": 1, "total_tokens": len(prompt) + 1}
+                return prompt
+
+        client = _client(_Overlapping())
+        calls = [CallContext() for _ in range(4)]
+
+        async def main():
+            return await asyncio.gather(
+                *(asyncio.to_thread(client.chat, "x" * (i + 1), call=c) for i, c in enumerate(calls))
+            )
+
+        replies = asyncio.run(main())
+        assert [c.usage["input_tokens"] for c in calls] == [len(r) for r in replies] == [1, 2, 3, 4]
+
+    def test_client_tool_callback_is_the_default(self):
+        seen = []
+        client = _client(MockAIProvider(word_delay=0))
+        client.tool_callback = lambda name, args: seen.append(name)
+        call = client._new_call(None)
+        call.notify_tool_call("search", {})
+        assert seen == ["search"]
+
+    def test_failing_tool_callback_is_contained(self):
+        def boom(name, args):
+            raise RuntimeError("ui gone")
+
+        CallContext(tool_callback=boom).notify_tool_call("search", {})
+
+    def test_error_resets_the_call(self):
+        client = _client(_SyncOnlyProvider(error=RuntimeError("boom")))
+        call = CallContext(usage={"input_tokens": 9}, context_tokens=5)
+        asyncio.run(_collect(client._astream("hi", call=call)))
+        assert (call.usage, call.context_tokens) == (None, 0)
+
+    def test_persisted_history_count_is_used_without_encoding(self, monkeypatch):
+        def no_encoding(*args, **kwargs):
+            raise AssertionError("history was re-encoded")
+
+        monkeypatch.setattr(base_provider, "count_message_tokens", no_encoding)
+        llm = GenericFakeChatModel(messages=iter([AIMessage("ok")]))
+        provider = LangChainProvider(llm=llm, agent=None, provider_name="fake")
+        call = CallContext(history_tokens=123)
+        list(provider.chat_stream("hi", history=[AIMessage("earlier")], call=call))
+        assert call.context_tokens == 123
+
+    def test_persisted_history_tokens_need_every_count(self):
+        def message(token_count):
+            return ConversationMessage(role="user", content="x", timestamp="", token_count=token_count)
+
+        assert AIClient._persisted_history_tokens([message(5), message(7)]) == 12 + 3
+        assert AIClient._persisted_history_tokens([message(5), message(None)]) is None
+        assert AIClient._persisted_history_tokens([]) is None
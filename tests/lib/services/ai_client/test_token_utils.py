@@ -0,0 +1,82 @@
+"""Tests for token_utils: message counts and unprimed per-message costs."""
+
+import importlib.util
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "src"))
+
+
+def _package(name: str):
+    mod = type(sys)(name)
+    mod.__path__ = []
+    return mod
+
+
+_config_stub = type(sys)("lib.core.config")
+_config_stub.Config = MagicMock()
+
+with patch.dict(
+    sys.modules,
+    {
+        "lib": _package("lib"),
+        "lib.core": _package("lib.core"),
+        "lib.core.config": _config_stub,
+        "lib.services": _package("lib.services"),
+        "lib.services.ai_client": _package("lib.services.ai_client"),
+    },
+):
+    _spec = importlib.util.spec_from_file_location(
+        "lib.services.ai_client.token_utils", os.path.join(_SRC, "lib", "services", "ai_client", "token_utils.py")
+    )
+    token_utils = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(token_utils)
+
+
+class _WordEncoder:
+    """One token per whitespace-separated word."""
+
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+
+@pytest.fixture
+def encoder():
+    enc = _WordEncoder()
+    with patch.object(token_utils, "_get_encoder", return_value=enc):
+        yield enc
+
+
+class TestCounting:
+    def test_counts_match_encoder(self, encoder):
+        messages = [
+            {"role": "user", "content": "one two three"},
+            {"role": "assistant", "content": "four five"},
+        ]
+        # 2 * (4 overhead + 1 role) + 3 + 2 content + 3 priming
+        assert token_utils.count_message_tokens(messages) == 18
+
+    def test_count_tokens(self, encoder):
+        assert token_utils.count_tokens("a b c") == 3
+
+
+class TestPriming:
+    def test_unprimed_sum_plus_priming_equals_primed(self, encoder):
+        messages = [
+            {"role": "user", "content": "hello world"},
+            {"role": "assistant", "content": "", "tool_calls": [{"name": "calc", "args": {}, "id": "x"}]},
+            {"role": "tool", "content": "42", "name": "calc"},
+        ]
+        per_message = sum(token_utils.count_message_tokens([m], prime=False) for m in messages)
+        assert per_message + token_utils.REPLY_PRIMING_TOKENS == token_utils.count_message_tokens(messages)
+
+    def test_fallback_without_tiktoken(self):
+        with patch.object(token_utils, "_get_encoder", return_value=None):
+            primed = token_utils.count_message_tokens([{"role": "user", "content": "x" * 40}])
+            unprimed = token_utils.count_message_tokens([{"role": "user", "content": "x" * 40}], prime=False)
+        assert primed == 10 + 4 + 3
+        assert unprimed == 10 + 4
@@ -0,0 +1,222 @@
+"""Tests for ToolCatalog and MCPServerRegistry views over a shared catalog."""
+
+import importlib.util
+import os
+import sys
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Direct module loading — bypass __init__.py chains to avoid heavy imports.
+# ---------------------------------------------------------------------------
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "src"))
+
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+
+def _load_module(name: str, filepath: str):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, filepath)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+if "lib.utils.printer" not in sys.modules:
+    _printer_stub = type(sys)("lib.utils.printer")
+    _printer_stub.printer = MagicMock()
+    sys.modules["lib.utils.printer"] = _printer_stub
+
+if "lib.utils.metrics" not in sys.modules:
+    _metrics_stub = type(sys)("lib.utils.metrics")
+    _metrics_stub.metrics = MagicMock()
+    _metrics_stub.span = MagicMock()
+    sys.modules["lib.utils.metrics"] = _metrics_stub
+
+for pkg in ("lib", "lib.services", "lib.services.ai_client", "lib.services.ai_client.registry", "lib.utils"):
+    if pkg not in sys.modules:
+        sys.modules[pkg] = type(sys)(pkg)
+
+_AI_CLIENT = os.path.join(_SRC, "lib", "services", "ai_client")
+_base_tool_mod = _load_module("lib.services.ai_client.base_tool", os.path.join(_AI_CLIENT, "base_tool.py"))
+_load_module("lib.services.ai_client.consent", os.path.join(_AI_CLIENT, "consent.py"))
+_catalog_mod = _load_module(
+    "lib.services.ai_client.registry.tool_catalog", os.path.join(_AI_CLIENT, "registry", "tool_catalog.py")
+)
+_registry_mod = _load_module(
+    "lib.services.ai_client.registry.mcp_registry", os.path.join(_AI_CLIENT, "registry", "mcp_registry.py")
+)
+
+BaseTool = _base_tool_mod.BaseTool
+ToolCatalog = _catalog_mod.ToolCatalog
+MCPServerRegistry = _registry_mod.MCPServerRegistry
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class _EchoTool(BaseTool):
+    @property
+    def name(self) -> str:
+        return "echo"
+
+    def get_definitions(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": "echo",
+                "description": "Echo text back",
+                "parameters": {
+                    "type": "object",
+                    "properties": {"text": {"type": "string"}, "times": {"type": "integer"}},
+                    "required": ["text"],
+                },
+            }
+        ]
+
+    def get_implementations(self):
+        return {"echo": lambda text, times=None: text * (times or 1)}
+
+
+class _SessionTool(BaseTool):
+    consent_required_for = frozenset({"session_touch"})
+    session_scoped = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.touched = 0
+        self.cleaned = False
+
+    @property
+    def name(self) -> str:
+        return "session"
+
+    def get_definitions(self) -> list[dict[str, Any]]:
+        return [{"name": "session_touch", "description": "Touch the session", "parameters": {"properties": {}}}]
+
+    def get_implementations(self):
+        return {"session_touch": self._touch}
+
+    def _touch(self):
+        self.touched += 1
+        return {"touched": self.touched, "owner": id(self)}
+
+    def cleanup(self) -> None:
+        self.cleaned = True
+
+
+class _StubConsentGate:
+    def __init__(self, response: str) -> None:
+        self.response = response
+        self.calls = 0
+
+    def request_sync(self, req, timeout: float = 30.0) -> str:
+        self.calls += 1
+        return self.response
+
+
+@pytest.fixture
+def catalog():
+    return ToolCatalog.from_tool_classes([_EchoTool, _SessionTool])
+
+
+# ===========================================================================
+# ToolCatalog
+# ===========================================================================
+
+
+class TestToolCatalog:
+    def test_definitions_and_schemas_are_built_once(self, catalog):
+        assert [d["name"] for d in catalog.definitions] == ["echo", "session_touch"]
+        schema = catalog.get_args_model("echo").model_json_schema()
+        assert schema["required"] == ["text"]
+        assert set(schema["properties"]) == {"text", "times"}
+
+    def test_session_scoped_tools_are_not_shared(self, catalog):
+        assert [type(t) for t in catalog.shared_instances] == [_EchoTool]
+        assert catalog.session_classes == (_SessionTool,)
+        assert catalog.get_implementation("session_touch") is None
+
+    def test_consent_set(self, catalog):
+        assert catalog.requires_consent("session_touch")
+        assert not catalog.requires_consent("echo")
+
+
+# ===========================================================================
+# MCPServerRegistry views
+# ===========================================================================
+
+
+class TestRegistryView:
+    def test_views_share_schemas_but_not_session_tools(self, catalog):
+        a = MCPServerRegistry(catalog)
+        b = MCPServerRegistry(catalog)
+
+        assert a.execute_tool("echo", text="hi", times=2) == "hihi"
+        assert a.execute_tool("session_touch")["owner"] != b.execute_tool("session_touch")["owner"]
+
+        tools_a = {t.name: t for t in a.create_langchain_tools()}
+        tools_b = {t.name: t for t in b.create_langchain_tools()}
+        assert tools_a["echo"].args_schema is tools_b["echo"].args_schema
+
+    def test_langchain_tools_are_memoized_until_tools_change(self, catalog):
+        reg = MCPServerRegistry(catalog)
+        first = reg.create_langchain_tools()
+
+        assert [t.name for t in reg.create_langchain_tools()] == [t.name for t in first]
+        assert reg.create_langchain_tools()[0] is first[0]
+
+        reg.register_tool({"name": "local", "parameters": {"properties": {}}}, lambda: "ok")
+        assert [t.name for t in reg.create_langchain_tools()] == ["echo", "session_touch", "local"]
+
+    def test_langchain_tool_routes_through_view_consent(self, catalog):
+        reg = MCPServerRegistry(catalog)
+        gate = _StubConsentGate("no")
+        reg.set_consent_gate(gate)
+        tools = {t.name: t for t in reg.create_langchain_tools()}
+
+        assert tools["session_touch"].invoke({}) == {"error": "Permission denied for session_touch"}
+        assert tools["echo"].invoke({"text": "x"}) == "x"
+        assert gate.calls == 1
+
+    def test_consent_approvals_are_per_view(self, catalog):
+        a = MCPServerRegistry(catalog)
+        b = MCPServerRegistry(catalog)
+        gate_a, gate_b = _StubConsentGate("yes_all"), _StubConsentGate("yes_all")
+        a.set_consent_gate(gate_a)
+        b.set_consent_gate(gate_b)
+
+        a.execute_tool("session_touch")
+        a.execute_tool("session_touch")
+        b.execute_tool("session_touch")
+
+        assert gate_a.calls == 1
+        assert gate_b.calls == 1
+
+    def test_cleanup_only_touches_session_tools(self, catalog):
+        reg = MCPServerRegistry(catalog)
+        other = MCPServerRegistry(catalog)
+
+        reg.cleanup_tools()
+
+        session_tools = [t for t in reg.get_tool_instances() if isinstance(t, _SessionTool)]
+        other_tools = [t for t in other.get_tool_instances() if isinstance(t, _SessionTool)]
+        assert session_tools[0].cleaned
+        assert not other_tools[0].cleaned
+        assert catalog.shared_instances[0] in reg.get_tool_instances()
+
+    def test_clear_tools_detaches_catalog(self, catalog):
+        reg = MCPServerRegistry(catalog)
+
+        reg.clear_tools()
+
+        assert reg.get_tools() == []
+        assert reg.create_langchain_tools() == []
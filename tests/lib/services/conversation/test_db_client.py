@@ -0,0 +1,308 @@
+"""Tests for ConversationDB incremental token accounting (no live database)."""
+
+import importlib.util
+import json
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "src"))
+_CONV_DIR = os.path.join(_SRC, "lib", "services", "conversation")
+
+
+def _package(name: str):
+    mod = type(sys)(name)
+    mod.__path__ = []
+    return mod
+
+
+def _load(name: str, path: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _fake_count_message_tokens(messages, model="gpt-4", prime=True):
+    """One token per word plus 4 per message, enough to check what gets counted."""
+    total = 0
+    for msg in messages:
+        total += 4 + len(str(msg.get("content", "")).split())
+        if msg.get("tool_calls"):
+            total += len(json.dumps(msg["tool_calls"]).split())
+    return total + (3 if prime else 0)
+
+
+_postgres_stub = type(sys)("lib.services.postgres.db")
+_postgres_stub.PostgresDB = MagicMock()
+_utils_stub = type(sys)("lib.utils")
+_utils_stub.printer = MagicMock()
+_token_utils_stub = type(sys)("lib.services.ai_client.token_utils")
+_token_utils_stub.count_message_tokens = _fake_count_message_tokens
+
+with patch.dict(
+    sys.modules,
+    {
+        "lib": _package("lib"),
+        "lib.utils": _utils_stub,
+        "lib.services": _package("lib.services"),
+        "lib.services.postgres": _package("lib.services.postgres"),
+        "lib.services.postgres.db": _postgres_stub,
+        "lib.services.ai_client": _package("lib.services.ai_client"),
+        "lib.services.ai_client.token_utils": _token_utils_stub,
+        "lib.services.conversation": _package("lib.services.conversation"),
+    },
+):
+    _load("lib.services.conversation.models", os.path.join(_CONV_DIR, "models.py"))
+    db_client = _load("lib.services.conversation.db_client", os.path.join(_CONV_DIR, "db_client.py"))
+
+ConversationDB = db_client.ConversationDB
+
+
+@pytest.fixture
+def pg():
+    mock = MagicMock()
+    mock.execute = AsyncMock()
+    mock.fetch_one = AsyncMock()
+    mock.fetch_val = AsyncMock()
+    mock.fetch_all = AsyncMock()
+    with patch.object(db_client, "PostgresDB", mock), patch.object(db_client, "_initialized", True):
+        yield mock
+
+
+class TestMessageTokenCount:
+    def test_plain_message(self):
+        assert db_client._message_token_count("user", "three word message", {}) == 7
+
+    def test_tool_calls_expand_like_history(self):
+        metadata = {"tool_calls": [{"tool_name": "calc", "tool_args": {"x": 1}, "tool_result": {"y": 2}}]}
+        with_tools = db_client._message_token_count("assistant", "done", metadata)
+        plain = db_client._message_token_count("assistant", "done", {})
+        # declaration + tool result message + final text
+        assert with_tools > plain + 8
+
+    def test_tool_calls_ignored_on_user_messages(self):
+        metadata = {"tool_calls": [{"tool_name": "calc"}]}
+        assert db_client._message_token_count("user", "hi", metadata) == 5
+
+
+class TestAppendMessage:
+    @pytest.mark.asyncio
+    async def test_user_message_counts_tokens_without_usage(self, pg):
+        await ConversationDB.append_message("c1", "user", "hello there")
+
+        params = pg.execute.call_args.args[1]
+        assert params["token_count"] == 6
+        assert params["assistant"] == 0
+        assert params["usage_count"] == 0
+        assert params["has_usage"] is False
+        assert params["total_tokens"] == 0
+
+    @pytest.mark.asyncio
+    async def test_assistant_usage_feeds_running_totals(self, pg):
+        usage = {
+            "input_tokens": 40,
+            "output_tokens": 7,
+            "total_tokens": 60,
+            "tool_input_tokens": 10,
+            "tool_output_tokens": 3,
+            "context_tokens": 30,
+            "estimated": True,
+        }
+        await ConversationDB.append_message("c1", "assistant", "ok", {"usage": usage})
+
+        params = pg.execute.call_args.args[1]
+        assert params["input_tokens"] == 50
+        assert params["output_tokens"] == 10
+        assert params["total_tokens"] == 60
+        assert params["context_tokens"] == 30
+        assert params["last_input_tokens"] == 40
+        assert params["assistant"] == 1
+        assert params["usage_count"] == 1
+        assert params["estimated"] is True
+
+    @pytest.mark.asyncio
+    async def test_explicit_token_count_is_kept(self, pg):
+        await ConversationDB.append_message("c1", "user", "hello there", token_count=99)
+        assert pg.execute.call_args.args[1]["token_count"] == 99
+
+
+def _turn_row(message=None, **turn):
+    row = {"id": "c1", "summary_message_id": None, "compacted_count": 0, "message_count": 5, "created": False}
+    row.update(turn)
+    row.update(message or {"role": None, "content": None, "metadata": None, "created_at": None})
+    return row
+
+
+class TestStartTurn:
+    @pytest.mark.asyncio
+    async def test_one_statement_returns_the_window_ending_with_the_new_message(self, pg):
+        pg.fetch_all.return_value = [
+            _turn_row({"role": "user", "content": "earlier", "metadata": {}, "created_at": None, "token_count": 5}),
+            _turn_row({"role": "assistant", "content": "reply", "metadata": {}, "created_at": None, "token_count": 7}),
+        ]
+
+        turn = await ConversationDB.start_turn("c1", "hello there", {"provider": "p"}, history_size=4)
+
+        assert pg.fetch_all.await_count == 1
+        params = pg.fetch_all.call_args.args[1]
+        assert params["conversation_id"] == "c1"
+        assert params["token_count"] == 6
+        assert params["earlier_messages"] == 3
+        assert params["load_history"] is True
+        assert (turn.conversation_id, turn.message_count, turn.created) == ("c1", 5, False)
+        assert [(m.role, m.content) for m in turn.history] == [
+            ("user", "earlier"),
+            ("assistant", "reply"),
+            ("user", "hello there"),
+        ]
+        assert turn.history[-1].metadata == {"provider": "p"}
+        # Stored counts come back with the window; the new message carries the one just computed.
+        assert [m.token_count for m in turn.history] == [5, 7, 6]
+
+    @pytest.mark.asyncio
+    async def test_new_conversation_without_history(self, pg):
+        pg.fetch_all.return_value = [_turn_row(message_count=1, created=True)]
+
+        turn = await ConversationDB.start_turn(None, "hi")
+
+        params = pg.fetch_all.call_args.args[1]
+        assert params["conversation_id"] and params["load_history"] is False
+        assert turn.conversation_id == "c1" and turn.created
+        assert turn.history == []
+
+    @pytest.mark.asyncio
+    async def test_compacted_conversation_reports_its_pointer(self, pg):
+        summary = {"role": "assistant", "content": "summary", "metadata": {"message_id": "s1"}, "created_at": None}
+        pg.fetch_all.return_value = [_turn_row(summary, summary_message_id="s1", compacted_count=1)]
+
+        turn = await ConversationDB.start_turn("c1", "next", history_size=0)
+
+        assert turn.summary_message_id == "s1"
+        assert [m.content for m in turn.history] == ["summary", "next"]
+
+    @pytest.mark.asyncio
+    async def test_unavailable_database_returns_none(self, pg):
+        pg.fetch_all.side_effect = RuntimeError("no pool")
+        assert await ConversationDB.start_turn("c1", "hi", history_size=4) is None
+
+
+class _Cursor:
+    """Records executed statements; ``fetchone`` returns the queued row."""
+
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+
+    async def execute(self, query, params=None):
+        self.statements.append((" ".join(query.split()), params))
+
+    async def fetchone(self):
+        return self.row
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _connection(cursor):
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    conn.__aenter__ = AsyncMock(return_value=conn)
+    conn.__aexit__ = AsyncMock(return_value=False)
+    return conn
+
+
+class TestApplyCompaction:
+    async def _apply(self, pg, row, **kwargs):
+        cursor = _Cursor(row)
+        pg.get_connection.return_value = _connection(cursor)
+        applied = await ConversationDB.apply_compaction(
+            "c1", "the summary", "s2", version=6, expected_summary_message_id="s1", **kwargs
+        )
+        return applied, cursor.statements
+
+    @pytest.mark.asyncio
+    async def test_fast_forward_appends_the_summary(self, pg):
+        applied, statements = await self._apply(pg, {"newer_messages": 0})
+
+        assert applied
+        assert len(statements) == 2
+        guard, params = statements[0]
+        assert "summary_message_id IS NOT DISTINCT FROM %(expected_summary_message_id)s" in guard
+        assert params["expected_summary_message_id"] == "s1"
+        insert, params = statements[1]
+        assert insert.startswith("INSERT INTO conversation_messages")
+        assert params["version"] == 6
+        assert json.loads(params["metadata"]) == {"message_id": "s2", "is_compaction_summary": True}
+        assert params["token_count"] == 4 + 2
+
+    @pytest.mark.asyncio
+    async def test_newer_messages_are_rebased_onto_the_summary(self, pg):
+        applied, statements = await self._apply(pg, {"newer_messages": 2})
+
+        assert applied
+        shifted = [query for query, _ in statements[1:3]]
+        assert "SET seq = -seq - 1" in shifted[0] and "seq >= %(version)s" in shifted[0]
+        assert "SET seq = -seq " in shifted[1] and "seq < 0" in shifted[1]
+        assert statements[3][0].startswith("INSERT INTO conversation_messages")
+
+    @pytest.mark.asyncio
+    async def test_diverged_pointer_applies_nothing(self, pg):
+        applied, statements = await self._apply(pg, None)
+
+        assert not applied
+        assert len(statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_unavailable_database(self, pg):
+        pg.get_connection.side_effect = RuntimeError("no pool")
+        assert not await ConversationDB.apply_compaction("c1", "s", "s2", version=1, expected_summary_message_id=None)
+
+
+class TestTokenUsageReads:
+    @pytest.mark.asyncio
+    async def test_usage_read_from_running_totals(self, pg):
+        pg.fetch_one.return_value = {
+            "total_tokens": 85,
+            "summary_message_id": None,
+            "input_tokens": 70,
+            "output_tokens": 15,
+            "context_tokens": 30,
+            "last_input_tokens": 40,
+            "assistant_message_count": 3,
+            "usage_message_count": 2,
+            "has_estimates": True,
+        }
+        usage = await ConversationDB.get_conversation_token_usage("c1")
+
+        assert usage == {
+            "total_input": 70,
+            "total_output": 15,
+            "total": 85,
+            "db_total": 85,
+            "has_estimates": True,
+            "partial_data": True,
+            "had_summarization": False,
+            "total_context_tokens": 30,
+            "last_input_tokens": 40,
+        }
+        assert pg.fetch_one.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_conversation_returns_zeroes(self, pg):
+        pg.fetch_one.return_value = None
+        usage = await ConversationDB.get_conversation_token_usage("nope")
+        assert usage["db_total"] == 0 and usage["partial_data"] is False
+
+    @pytest.mark.asyncio
+    async def test_context_usage_without_pointer_reads_running_total(self, pg):
+        pg.fetch_val.return_value = 58
+        assert await ConversationDB.get_context_usage("c1") == 58
+        assert "message_tokens" in pg.fetch_val.call_args.args[0]
@@ -0,0 +1,306 @@
+"""Tests for compaction: prompt suffix selection matches the drop-oldest loop, background jobs, versioned apply."""
+
+import asyncio
+import importlib.util
+import os
+import random
+import re
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "src"))
+_CONV_DIR = os.path.join(_SRC, "lib", "services", "conversation")
+
+# Whitespace runs are single tokens, so "\n" merges with a tool line's indent and
+# the count of joined text is not the sum of its parts — like real BPE.
+_TOKEN_RE = re.compile(r"\s+|\w+|[^\w\s]")
+_encode_calls = []
+
+
+def _fake_count_tokens(text, model="gpt-4"):
+    _encode_calls.append(len(text))
+    return len(_TOKEN_RE.findall(text))
+
+
+def _fake_count_message_tokens(messages, model="gpt-4", prime=True):
+    total = sum(4 + _fake_count_tokens(msg["role"]) + _fake_count_tokens(msg["content"]) for msg in messages)
+    return total + (3 if prime else 0)
+
+
+def _package(name: str):
+    mod = type(sys)(name)
+    mod.__path__ = []
+    return mod
+
+
+_config_stub = type(sys)("lib.core.config")
+_config_stub.Config = MagicMock()
+_utils_stub = type(sys)("lib.utils")
+_utils_stub.printer = MagicMock()
+_token_utils_stub = type(sys)("lib.services.ai_client.token_utils")
+_token_utils_stub.count_tokens = _fake_count_tokens
+_token_utils_stub.count_message_tokens = _fake_count_message_tokens
+_token_utils_stub.get_context_window = MagicMock(return_value=128_000)
+_db_client_stub = type(sys)("lib.services.conversation.db_client")
+_db_client_stub.ConversationDB = MagicMock()
+
+with patch.dict(
+    sys.modules,
+    {
+        "lib": _package("lib"),
+        "lib.core": _package("lib.core"),
+        "lib.core.config": _config_stub,
+        "lib.utils": _utils_stub,
+        "lib.services": _package("lib.services"),
+        "lib.services.ai_client": _package("lib.services.ai_client"),
+        "lib.services.ai_client.token_utils": _token_utils_stub,
+        "lib.services.conversation": _package("lib.services.conversation"),
+        "lib.services.conversation.db_client": _db_client_stub,
+    },
+):
+    _spec = importlib.util.spec_from_file_location(
+        "lib.services.conversation.summarizer", os.path.join(_CONV_DIR, "summarizer.py")
+    )
+    summarizer = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(summarizer)
+
+
+_OVERHEAD = _fake_count_message_tokens(
+    [
+        {"role": "system", "content": summarizer._COMPACT_SYSTEM_PROMPT},
+        {"role": "user", "content": summarizer._COMPACT_USER_PROMPT},
+    ]
+)
+
+
+def _reference_prompt(message_dicts, context_window, prompt_buffer):
+    """The original drop-one-and-recount loop, kept as the behavioural oracle."""
+    available = context_window - prompt_buffer - _OVERHEAD
+    if available <= 0:
+        return None
+
+    messages = list(message_dicts)
+    formatted = summarizer._format_messages_for_compaction(messages)
+    tokens = _fake_count_message_tokens([{"role": "user", "content": formatted}])
+    while tokens > available and len(messages) > 1:
+        messages = messages[1:]
+        formatted = summarizer._format_messages_for_compaction(messages)
+        tokens = _fake_count_message_tokens([{"role": "user", "content": formatted}])
+    return (
+        f"{summarizer._COMPACT_SYSTEM_PROMPT}\n\nConversation to summarize:\n{formatted}\n\n"
+        f"{summarizer._COMPACT_USER_PROMPT}"
+    )
+
+
+def _conversation(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    words = ["alpha", "beta", "gamma", "delta", "x", "(", ")", "file.py", "  ", "\n"]
+    messages = []
+    for i in range(count):
+        content = " ".join(rng.choice(words) for _ in range(rng.randint(0, 60)))
+        metadata = {}
+        if i % 3 == 1:
+            metadata["tool_calls"] = [
+                {
+                    "tool_name": "read_file",
+                    "tool_args": {"path": f"src/{i}.py"},
+                    "tool_result": "ok " * rng.randint(0, 9),
+                }
+            ]
+        messages.append({"role": "user" if i % 2 == 0 else "assistant", "content": content, "metadata": metadata})
+    return messages
+
+
+@pytest.fixture
+def compactor():
+    return summarizer.ConversationCompactor(MagicMock(), "gpt-4")
+
+
+class TestBuildCompactionPrompt:
+    def test_matches_reference_for_every_budget(self, compactor):
+        messages = _conversation(40)
+        everything = _fake_count_message_tokens(
+            [{"role": "user", "content": summarizer._format_messages_for_compaction(messages)}]
+        )
+        for window in range(_OVERHEAD - 5, _OVERHEAD + everything + 10, 11):
+            assert compactor._build_compaction_prompt(messages, window, 0) == _reference_prompt(messages, window, 0)
+
+    def test_keeps_last_message_when_nothing_fits(self, compactor):
+        messages = _conversation(5)
+        window = _OVERHEAD + 5
+        prompt = compactor._build_compaction_prompt(messages, window, 0)
+        assert prompt == _reference_prompt(messages, window, 0)
+        assert summarizer._format_message_for_compaction(messages[-1]) in prompt
+        assert summarizer._format_message_for_compaction(messages[-2]) not in prompt
+
+    def test_window_smaller_than_overhead(self, compactor):
+        assert compactor._build_compaction_prompt(_conversation(3), 10, 0) is None
+        assert compactor._build_compaction_prompt([], 100_000, 0) is None
+
+    def test_encodes_far_less_text_than_the_loop(self, compactor):
+        messages = _conversation(200)
+        window = _fake_count_message_tokens(
+            [{"role": "user", "content": summarizer._format_messages_for_compaction(messages[-50:])}]
+        )
+
+        _encode_calls.clear()
+        _reference_prompt(messages, window + _OVERHEAD, 0)
+        reference_chars = sum(_encode_calls)
+
+        _encode_calls.clear()
+        compactor._build_compaction_prompt(messages, window + _OVERHEAD, 0)
+        builder_chars = sum(_encode_calls)
+
+        assert builder_chars * 10 < reference_chars
+
+
+class TestFirstFitting:
+    @pytest.mark.parametrize("boundary", [0, 1, 5, 17, 31])
+    @pytest.mark.parametrize("guess", [0, 3, 16, 31])
+    def test_finds_boundary_from_any_guess(self, boundary, guess):
+        probes = []
+
+        def fits(i):
+            probes.append(i)
+            return i >= boundary
+
+        assert summarizer._first_fitting(32, fits, guess) == min(boundary, 31)
+        assert len(set(probes)) <= 12
+
+    def test_last_index_is_the_fallback(self):
+        assert summarizer._first_fitting(4, lambda i: False, 0) == 3
+        assert summarizer._first_fitting(1, lambda i: False, 0) == 0
+
+
+def _cfg(**overrides):
+    values = {
+        "compaction_enabled": True,
+        "compaction_watermark": 0.80,
+        "compaction_threshold": 0.95,
+        "compaction_circuit_breaker": 3,
+        "compaction_prompt_buffer": 1024,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture
+def cfg():
+    config = _cfg()
+    with patch.object(summarizer, "Config", return_value=config):
+        yield config
+
+
+@pytest.fixture
+def db():
+    mock = MagicMock()
+    mock.get_compaction_state = AsyncMock(return_value=("s0", 0))
+    mock.get_messages = AsyncMock(
+        return_value=[SimpleNamespace(role="user", content=f"m{i}", metadata={}) for i in range(6)]
+    )
+    mock.apply_compaction = AsyncMock(return_value=True)
+    mock.increment_compacted_count = AsyncMock(return_value=1)
+    with patch.object(summarizer, "ConversationDB", mock):
+        yield mock
+
+
+class TestWatermark:
+    def test_compaction_starts_at_the_watermark(self, cfg):
+        assert not summarizer.ConversationCompactor.should_compact(int(128_000 * 0.8) - 1, "gpt-4")
+        assert summarizer.ConversationCompactor.should_compact(int(128_000 * 0.8), "gpt-4")
+
+    def test_watermark_never_exceeds_the_threshold(self, cfg):
+        cfg.compaction_watermark = 0.99
+        assert summarizer.ConversationCompactor.should_compact(int(128_000 * 0.95), "gpt-4")
+
+    def test_disabled(self, cfg):
+        cfg.compaction_enabled = False
+        assert not summarizer.ConversationCompactor.should_compact(10**9, "gpt-4")
+
+
+class TestVersionedApply:
+    @pytest.mark.asyncio
+    async def test_summary_is_versioned_by_the_messages_it_covers(self, cfg, db):
+        ai_client = MagicMock()
+        ai_client.chat.return_value = "## Goal\n- summary"
+
+        assert await summarizer.ConversationCompactor(ai_client, "gpt-4").compact("c1")
+
+        args, kwargs = db.apply_compaction.call_args
+        assert args[:2] == ("c1", "## Goal\n- summary")
+        assert kwargs == {"version": 6, "expected_summary_message_id": "s0"}
+
+    @pytest.mark.asyncio
+    async def test_lost_race_is_not_a_failure(self, cfg, db):
+        db.apply_compaction.return_value = False
+        ai_client = MagicMock()
+        ai_client.chat.return_value = "summary"
+
+        assert not await summarizer.ConversationCompactor(ai_client, "gpt-4").compact("c1")
+        db.increment_compacted_count.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_empty_summary_counts_towards_the_circuit_breaker(self, cfg, db):
+        ai_client = MagicMock()
+        ai_client.chat.return_value = ""
+
+        assert not await summarizer.ConversationCompactor(ai_client, "gpt-4").compact("c1")
+        db.apply_compaction.assert_not_awaited()
+        db.increment_compacted_count.assert_awaited_once_with("c1")
+
+
+class TestBackgroundJobs:
+    @pytest.fixture(autouse=True)
+    def _gated_compact(self, cfg):
+        self.gate = asyncio.Event()
+        self.runs = 0
+
+        async def compact(compactor, conversation_id):
+            self.runs += 1
+            await self.gate.wait()
+            return True
+
+        with patch.object(summarizer.ConversationCompactor, "compact", compact):
+            yield
+        summarizer.ConversationCompactor._jobs.clear()
+        summarizer.ConversationCompactor._over_threshold.clear()
+
+    @pytest.mark.asyncio
+    async def test_one_job_per_conversation(self):
+        Compactor = summarizer.ConversationCompactor
+        first = Compactor.schedule(MagicMock(), "gpt-4", "c1", 110_000)
+        assert Compactor.schedule(MagicMock(), "gpt-4", "c1", 115_000) is first
+        other = Compactor.schedule(MagicMock(), "gpt-4", "c2", 110_000)
+        assert other is not first
+
+        self.gate.set()
+        await asyncio.gather(first, other)
+        await asyncio.sleep(0)
+        assert self.runs == 2
+        assert Compactor._jobs == {}
+
+    @pytest.mark.asyncio
+    async def test_below_the_threshold_the_next_turn_does_not_wait(self):
+        Compactor = summarizer.ConversationCompactor
+        job = Compactor.schedule(MagicMock(), "gpt-4", "c1", int(128_000 * 0.8))
+
+        await asyncio.wait_for(Compactor.wait_if_over_threshold("c1"), timeout=1)
+        assert not job.done()
+        self.gate.set()
+        await job
+
+    @pytest.mark.asyncio
+    async def test_over_the_threshold_the_next_turn_waits(self):
+        Compactor = summarizer.ConversationCompactor
+        job = Compactor.schedule(MagicMock(), "gpt-4", "c1", int(128_000 * 0.95))
+
+        waiter = asyncio.create_task(Compactor.wait_if_over_threshold("c1"))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        self.gate.set()
+        await asyncio.wait_for(waiter, timeout=1)
+        assert job.done()
@@ -0,0 +1,281 @@
+"""Tests for HTTPClientPool against a local stand-in server: reuse, retries, limits, ETag cache."""
+
+import asyncio
+import gzip
+import importlib.util
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Direct module loading — stubs live only for the duration of the load.
+# ---------------------------------------------------------------------------
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "src"))
+
+
+def _package(name: str):
+    mod = type(sys)(name)
+    mod.__path__ = []
+    return mod
+
+
+_printer_stub = type(sys)("lib.utils.printer")
+_printer_stub.printer = MagicMock()
+_config_stub = type(sys)("lib.core.config")
+_config_stub.Config = MagicMock()
+
+with patch.dict(
+    sys.modules,
+    {
+        "lib": _package("lib"),
+        "lib.core": _package("lib.core"),
+        "lib.core.config": _config_stub,
+        "lib.utils": _package("lib.utils"),
+        "lib.utils.printer": _printer_stub,
+        "lib.services": _package("lib.services"),
+        "lib.services.http_client": _package("lib.services.http_client"),
+    },
+):
+    _spec = importlib.util.spec_from_file_location(
+        "lib.services.http_client.client", os.path.join(_SRC, "lib", "services", "http_client", "client.py")
+    )
+    _client_mod = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(_client_mod)
+
+HTTPClientPool = _client_mod.HTTPClientPool
+
+
+# ---------------------------------------------------------------------------
+# Stand-in server
+# ---------------------------------------------------------------------------
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        server = self.server
+        with server.lock:
+            server.paths.append((self.command, self.path))
+            server.peers.add(self.client_address)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+
+            if self.path == "/etag":
+                if self.headers.get("If-None-Match") == '"v1"':
+                    self._send(304, headers={"ETag": '"v1"'})
+                else:
+                    self._send(200, b'{"value": 1}', {"ETag": '"v1"', "Content-Type": "application/json"})
+            elif self.path == "/gzip-etag":
+                if self.headers.get("If-None-Match") == '"g1"':
+                    self._send(304, headers={"ETag": '"g1"'})
+                else:
+                    body = gzip.compress(b'{"value": "zipped"}')
+                    headers = {"ETag": '"g1"', "Content-Type": "application/json", "Content-Encoding": "gzip"}
+                    self._send(200, body, headers)
+            elif self.path == "/flaky":
+                with server.lock:
+                    server.flaky_calls += 1
+                    fail = server.flaky_calls <= 2
+                self._send(503 if fail else 200, b"ok")
+            elif self.path == "/slow":
+                time.sleep(0.05)
+                self._send(200, b"slow")
+            else:
+                self._send(200, b"hello")
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def do_GET(self):  # noqa: N802
+        self._handle()
+
+    def do_POST(self):  # noqa: N802
+        self._handle()
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.lock = threading.Lock()
+    srv.paths = []
+    srv.peers = set()
+    srv.active = 0
+    srv.max_active = 0
+    srv.flaky_calls = 0
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _url(srv, path: str) -> str:
+    return f"http://127.0.0.1:{srv.server_address[1]}{path}"
+
+
+# ===========================================================================
+# Connection reuse and lifecycle
+# ===========================================================================
+
+
+class TestPooling:
+    @pytest.mark.asyncio
+    async def test_sequential_requests_share_one_connection(self, server):
+        pool = HTTPClientPool(retries=0)
+        for _ in range(5):
+            response = await pool.request("GET", _url(server, "/"))
+            assert response.text == "hello"
+        await pool.aclose()
+
+        assert len(server.paths) == 5
+        assert len(server.peers) == 1
+
+    @pytest.mark.asyncio
+    async def test_aclose_then_reuse_opens_new_client(self, server):
+        pool = HTTPClientPool(retries=0)
+        await pool.request("GET", _url(server, "/"))
+        first = pool._client()
+        await pool.aclose()
+        assert first.is_closed
+
+        await pool.request("GET", _url(server, "/"))
+        assert pool._client() is not first
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit_caps_concurrency(self, server):
+        pool = HTTPClientPool(max_per_host=2, retries=0)
+        await asyncio.gather(*(pool.request("GET", _url(server, "/slow")) for _ in range(6)))
+        await pool.aclose()
+
+        assert server.max_active <= 2
+        assert len(server.paths) == 6
+
+
+# ===========================================================================
+# Retries
+# ===========================================================================
+
+
+class TestRetries:
+    @pytest.mark.asyncio
+    async def test_get_retried_on_503(self, server):
+        pool = HTTPClientPool(retries=2, backoff=0)
+        response = await pool.request("GET", _url(server, "/flaky"))
+        await pool.aclose()
+
+        assert response.status_code == 200
+        assert server.flaky_calls == 3
+        assert pool.stats()["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted_returns_last_response(self, server):
+        pool = HTTPClientPool(retries=1, backoff=0)
+        response = await pool.request("GET", _url(server, "/flaky"))
+        await pool.aclose()
+
+        assert response.status_code == 503
+        assert server.flaky_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_post_not_retried_on_503(self, server):
+        pool = HTTPClientPool(retries=2, backoff=0)
+        response = await pool.request("POST", _url(server, "/flaky"), json={"a": 1})
+        await pool.aclose()
+
+        assert response.status_code == 503
+        assert server.flaky_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_connection_refused_retried_then_raised(self):
+        pool = HTTPClientPool(retries=1, backoff=0)
+        with pytest.raises(httpx.ConnectError):
+            await pool.request("POST", "http://127.0.0.1:9/unreachable")
+        await pool.aclose()
+        assert pool.stats()["requests"] == 2
+
+
+# ===========================================================================
+# ETag cache
+# ===========================================================================
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    async def test_304_served_from_cache(self, server):
+        pool = HTTPClientPool(retries=0)
+        first = await pool.request("GET", _url(server, "/etag"))
+        second = await pool.request("GET", _url(server, "/etag"))
+        await pool.aclose()
+
+        assert first.status_code == 200
+        assert not first.extensions.get("from_cache")
+        assert second.status_code == 200
+        assert second.extensions.get("from_cache")
+        assert second.json() == {"value": 1}
+        assert pool.stats()["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_304_for_gzip_body_is_not_decoded_twice(self, server):
+        pool = HTTPClientPool(retries=0)
+        first = await pool.request("GET", _url(server, "/gzip-etag"))
+        second = await pool.request("GET", _url(server, "/gzip-etag"))
+        await pool.aclose()
+
+        assert first.json() == {"value": "zipped"}
+        assert second.extensions.get("from_cache")
+        assert second.json() == {"value": "zipped"}
+        assert "content-encoding" not in second.headers
+
+    @pytest.mark.asyncio
+    async def test_cache_bypass_and_disabled(self, server):
+        pool = HTTPClientPool(retries=0)
+        await pool.request("GET", _url(server, "/etag"))
+        fresh = await pool.request("GET", _url(server, "/etag"), use_cache=False)
+        await pool.aclose()
+        assert not fresh.extensions.get("from_cache")
+
+        disabled = HTTPClientPool(retries=0, cache_entries=0)
+        await disabled.request("GET", _url(server, "/etag"))
+        again = await disabled.request("GET", _url(server, "/etag"))
+        await disabled.aclose()
+        assert not again.extensions.get("from_cache")
+        assert len(disabled.cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_responses_without_validators_not_cached(self, server):
+        pool = HTTPClientPool(retries=0)
+        await pool.request("GET", _url(server, "/"))
+        await pool.aclose()
+        assert len(pool.cache) == 0
+
+    def test_lru_bound(self):
+        pool = HTTPClientPool(cache_entries=2)
+        for i in range(3):
+            pool.cache.store(("u", i), httpx.Response(200, headers={"ETag": f'"{i}"'}, content=b"x"))
+        assert len(pool.cache) == 2
+        assert pool.cache.get(("u", 0)) is None
@@ -0,0 +1,169 @@
+"""Tests for SchedulerDB analytics reads over the hourly execution rollups (no live database)."""
+
+import importlib.util
+import os
+import sys
+from datetime import UTC, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "src"))
+
+
+def _package(name: str):
+    mod = type(sys)(name)
+    mod.__path__ = []
+    return mod
+
+
+_models_stub = type(sys)("lib.cron.models")
+for _name in ("ExecutionRecord", "NodeExecutionRecord", "Schedule", "Workflow"):
+    setattr(_models_stub, _name, MagicMock())
+_postgres_stub = type(sys)("lib.services.postgres.db")
+_postgres_stub.PostgresDB = MagicMock()
+_utils_stub = type(sys)("lib.utils")
+_utils_stub.printer = MagicMock()
+
+with patch.dict(
+    sys.modules,
+    {
+        "lib": _package("lib"),
+        "lib.cron": _package("lib.cron"),
+        "lib.cron.models": _models_stub,
+        "lib.utils": _utils_stub,
+        "lib.services": _package("lib.services"),
+        "lib.services.postgres": _package("lib.services.postgres"),
+        "lib.services.postgres.db": _postgres_stub,
+        "lib.services.scheduler": _package("lib.services.scheduler"),
+    },
+):
+    _spec = importlib.util.spec_from_file_location(
+        "lib.services.scheduler.db_client", os.path.join(_SRC, "lib", "services", "scheduler", "db_client.py")
+    )
+    db_client = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(db_client)
+
+SchedulerDB = db_client.SchedulerDB
+
+
+@pytest.fixture
+def pg():
+    mock = MagicMock()
+    mock.execute = AsyncMock()
+    mock.fetch_one = AsyncMock()
+    mock.fetch_all = AsyncMock(return_value=[])
+    mock.fetch_val = AsyncMock()
+    with patch.object(db_client, "PostgresDB", mock), patch.object(db_client, "is_initialized", True):
+        yield mock
+
+
+class TestDateRange:
+    def test_today_starts_at_utc_midnight(self):
+        start, end = SchedulerDB.get_date_range("today")
+        assert start == end.replace(hour=0, minute=0, second=0, microsecond=0)
+        assert end.tzinfo is UTC
+
+    def test_day_ranges(self):
+        start, end = SchedulerDB.get_date_range("30days")
+        assert end - start == timedelta(days=30)
+
+    def test_all_has_no_start(self):
+        start, _ = SchedulerDB.get_date_range("all")
+        assert start is None
+
+    def test_unknown_range_rejected(self):
+        with pytest.raises(ValueError):
+            SchedulerDB.get_date_range("yesterday")
+
+
+class TestBucketFilter:
+    def test_start_rounded_down_to_utc_hour(self):
+        start = datetime(2025, 3, 1, 16, 35, 12, tzinfo=timezone(timedelta(hours=2)))
+        end = datetime(2025, 3, 1, 18, 0, tzinfo=UTC)
+
+        where, params = db_client._bucket_filter(start, end)
+
+        assert where == "WHERE bucket >= %s AND bucket <= %s"
+        assert params == (datetime(2025, 3, 1, 14, 0, tzinfo=UTC), end)
+
+    def test_no_bounds_reads_everything(self):
+        assert db_client._bucket_filter(None, None) == ("", ())
+
+
+class TestExecutionStats:
+    @pytest.mark.asyncio
+    async def test_stats_derived_from_rollup_sums(self, pg):
+        pg.fetch_one.return_value = {
+            "executions": 8,
+            "successes": 6,
+            "failures": 1,
+            "timed_executions": 7,
+            "total_duration_ms": 1000,
+        }
+
+        stats = await SchedulerDB.get_execution_stats(*SchedulerDB.get_date_range("7days"))
+
+        assert stats == {
+            "executions": 8,
+            "successes": 6,
+            "failures": 1,
+            "success_rate": 75.0,
+            "avg_duration_ms": 142.86,
+        }
+        query = pg.fetch_one.await_args.args[0]
+        assert "FROM workflow_execution_rollups" in query
+        assert "FROM executions" not in query
+
+    @pytest.mark.asyncio
+    async def test_empty_range_is_zero(self, pg):
+        pg.fetch_one.return_value = {
+            "executions": 0,
+            "successes": 0,
+            "failures": 0,
+            "timed_executions": 0,
+            "total_duration_ms": 0,
+        }
+
+        assert await SchedulerDB.get_success_rate() == 0.0
+        assert await SchedulerDB.get_average_duration() == 0.0
+        assert await SchedulerDB.get_executions_count() == 0
+
+
+class TestRollupMaintenance:
+    @pytest.mark.asyncio
+    async def test_create_execution_bumps_rollup_in_same_statement(self, pg):
+        pg.fetch_val.return_value = 12
+
+        assert await SchedulerDB.create_execution("wf", {"a": 1}) == 12
+        query = pg.fetch_val.await_args.args[0]
+        assert "INSERT INTO executions" in query
+        assert "INSERT INTO workflow_execution_rollups" in query
+
+    @pytest.mark.asyncio
+    async def test_complete_execution_updates_rollup_in_same_statement(self, pg):
+        await SchedulerDB.complete_execution(12, status="success", duration_ms=40)
+
+        query, params = pg.execute.await_args.args
+        assert "UPDATE executions" in query
+        assert "INSERT INTO workflow_execution_rollups" in query
+        assert params == (12, "success", None, None, 40)
+
+
+class TestTopWorkflows:
+    @pytest.mark.asyncio
+    async def test_rows_mapped_with_success_rate(self, pg):
+        pg.fetch_all.return_value = [
+            {"id": "a", "name": "A", "executions": 4, "successes": 3},
+            {"id": "b", "name": "B", "executions": 1, "successes": 0},
+        ]
+        start, end = SchedulerDB.get_date_range("today")
+
+        workflows = await SchedulerDB.get_top_workflows(5, start, end)
+
+        assert workflows == [
+            {"id": "a", "name": "A", "executions": 4, "success_rate": 75.0},
+            {"id": "b", "name": "B", "executions": 1, "success_rate": 0.0},
+        ]
+        assert pg.fetch_all.await_args.args[1] == (start, end, 5)
@@ -0,0 +1,180 @@
+"""Tests for TTSCache: key normalization, LRU byte bounds, disk tier, and stats."""
+
+import importlib.util
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Direct module loading — stubs live only for the duration of the load.
+# ---------------------------------------------------------------------------
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "src"))
+
+
+def _package(name: str):
+    mod = type(sys)(name)
+    mod.__path__ = []
+    return mod
+
+
+_printer_stub = type(sys)("lib.utils.printer")
+_printer_stub.printer = MagicMock()
+_config_stub = type(sys)("lib.core.config")
+_config_stub.Config = MagicMock()
+
+with patch.dict(
+    sys.modules,
+    {
+        "lib": _package("lib"),
+        "lib.core": _package("lib.core"),
+        "lib.core.config": _config_stub,
+        "lib.utils": _package("lib.utils"),
+        "lib.utils.printer": _printer_stub,
+        "lib.services": _package("lib.services"),
+        "lib.services.tts": _package("lib.services.tts"),
+    },
+):
+    _spec = importlib.util.spec_from_file_location(
+        "lib.services.tts.cache", os.path.join(_SRC, "lib", "services", "tts", "cache.py")
+    )
+    _cache_mod = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(_cache_mod)
+
+TTSCache = _cache_mod.TTSCache
+
+
+def _audio(n: int, value: float = 0.5) -> np.ndarray:
+    return np.full(n, value, dtype=np.float32)
+
+
+def _key(text: str, voice: str = "af_heart") -> str:
+    return TTSCache.make_key(text, voice, "a", 1.0, 24000)
+
+
+# ===========================================================================
+# Keys
+# ===========================================================================
+
+
+class TestMakeKey:
+    def test_whitespace_is_normalized(self):
+        assert _key("Hello   there ") == _key("Hello there")
+
+    @pytest.mark.parametrize(
+        "other",
+        [
+            ("Hello", "bm_george", "a", 1.0, 24000),
+            ("Hello", "af_heart", "b", 1.0, 24000),
+            ("Hello", "af_heart", "a", 1.2, 24000),
+            ("Hello", "af_heart", "a", 1.0, 16000),
+        ],
+    )
+    def test_every_synthesis_parameter_is_part_of_the_key(self, other):
+        assert TTSCache.make_key(*other) != _key("Hello")
+
+
+# ===========================================================================
+# Memory tier
+# ===========================================================================
+
+
+class TestMemoryTier:
+    def test_hit_and_miss_are_counted(self):
+        cache = TTSCache(max_bytes=10_000)
+        cache.put(_key("a"), _audio(10))
+
+        assert cache.get(_key("a")) is not None
+        assert cache.get(_key("b")) is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    def test_evicts_least_recently_used_when_over_budget(self):
+        cache = TTSCache(max_bytes=3 * 400)
+        for name in ("a", "b", "c"):
+            cache.put(_key(name), _audio(100))
+        cache.get(_key("a"))
+
+        cache.put(_key("d"), _audio(100))
+
+        assert cache.get(_key("b")) is None
+        assert cache.get(_key("a")) is not None
+        assert cache.stats()["bytes"] <= 3 * 400
+        assert cache.stats()["evictions"] == 1
+
+    def test_entry_larger_than_budget_is_skipped(self):
+        cache = TTSCache(max_bytes=100)
+        cache.put(_key("big"), _audio(1000))
+
+        assert cache.stats()["entries"] == 0
+
+    def test_cached_audio_is_an_immutable_copy(self):
+        cache = TTSCache(max_bytes=10_000)
+        original = _audio(10)
+        cache.put(_key("a"), original)
+        original[:] = 0
+
+        cached = cache.get(_key("a"))
+
+        assert cached[0] == pytest.approx(0.5)
+        with pytest.raises(ValueError):
+            cached[0] = 1.0
+
+    def test_zero_budget_without_disk_disables_cache(self):
+        cache = TTSCache(max_bytes=0)
+        cache.put(_key("a"), _audio(10))
+
+        assert not cache.enabled
+        assert cache.get(_key("a")) is None
+        assert cache.stats()["misses"] == 0
+
+
+# ===========================================================================
+# Disk tier
+# ===========================================================================
+
+
+class TestDiskTier:
+    def test_survives_a_new_instance(self, tmp_path):
+        TTSCache(max_bytes=10_000, disk_dir=str(tmp_path), disk_max_bytes=1_000_000).put(_key("a"), _audio(50))
+
+        cache = TTSCache(max_bytes=10_000, disk_dir=str(tmp_path), disk_max_bytes=1_000_000)
+        audio = cache.get(_key("a"))
+
+        np.testing.assert_array_equal(audio, _audio(50))
+        assert cache.stats()["disk_hits"] == 1
+        assert cache.get(_key("a")) is not None
+        assert cache.stats()["hits"] == 1
+
+    def test_disk_budget_evicts_oldest_files(self, tmp_path):
+        rng = np.random.default_rng(0)
+        cache = TTSCache(max_bytes=0, disk_dir=str(tmp_path), disk_max_bytes=12_000)
+        for name in ("a", "b", "c", "d"):
+            cache.put(_key(name), rng.random(1000).astype(np.float32))
+
+        stats = cache.stats()
+        assert stats["disk_bytes"] <= 12_000
+        assert len(list(tmp_path.glob("*.npz"))) == stats["disk_entries"] < 4
+        assert cache.get(_key("d")) is not None
+        assert cache.get(_key("a")) is None
+
+    def test_corrupt_file_is_a_miss(self, tmp_path):
+        cache = TTSCache(max_bytes=0, disk_dir=str(tmp_path), disk_max_bytes=1_000_000)
+        cache.put(_key("a"), _audio(10))
+        next(tmp_path.glob("*.npz")).write_bytes(b"not an npz")
+
+        assert cache.get(_key("a")) is None
+        assert cache.stats()["disk_entries"] == 0
+
+    def test_clear_removes_files(self, tmp_path):
+        cache = TTSCache(max_bytes=10_000, disk_dir=str(tmp_path), disk_max_bytes=1_000_000)
+        cache.put(_key("a"), _audio(10))
+
+        cache.clear()
+
+        assert list(tmp_path.iterdir()) == []
+        assert cache.get(_key("a")) is None
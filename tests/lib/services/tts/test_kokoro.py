@@ -0,0 +1,175 @@
+"""Tests for KokoroVoiceModel: per-chunk streaming and the concatenating generate() wrapper."""
+
+import importlib.util
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Direct module loading — the kokoro package is replaced by a fake pipeline and
+# all stubs live only for the duration of the load.
+# ---------------------------------------------------------------------------
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "src"))
+_TTS = os.path.join(_SRC, "lib", "services", "tts")
+
+
+class _FakePipeline:
+    """Yields one chunk per '|'-separated part, like KPipeline does per text chunk."""
+
+    def __init__(self, *args, **kwargs):
+        self.calls: list[tuple[str, str]] = []
+
+    def __call__(self, text: str, voice: str | None = None, speed: float = 1.0):
+        self.calls.append((text, voice))
+        for i, part in enumerate(p for p in text.split("|") if p.strip()):
+            yield part, part, np.full(100, i, dtype=np.float32)
+
+
+class _StubConfig:
+    DEFAULT_LANGUAGE = "a"
+    DEFAULT_VOICE = "af_heart"
+    DEFAULT_MODEL = "hexgrad/Kokoro-82M"
+    SAMPLE_RATE = 24000
+
+    @staticmethod
+    def is_valid_voice(voice: str) -> bool:
+        return True
+
+
+def _package(name: str):
+    mod = type(sys)(name)
+    mod.__path__ = []
+    return mod
+
+
+def _load(name: str, filepath: str):
+    spec = importlib.util.spec_from_file_location(name, filepath)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+_utils_stub = _package("lib.utils")
+_utils_stub.printer = MagicMock()
+_printer_stub = type(sys)("lib.utils.printer")
+_printer_stub.printer = _utils_stub.printer
+_metrics_stub = type(sys)("lib.utils.metrics")
+_metrics_stub.metrics = MagicMock()
+_metrics_stub.span = MagicMock()
+_config_stub = type(sys)("lib.core.config")
+_config_stub.Config = _StubConfig
+_kokoro_stub = type(sys)("kokoro")
+_kokoro_stub.KPipeline = _FakePipeline
+
+with patch.dict(
+    sys.modules,
+    {
+        "kokoro": _kokoro_stub,
+        "lib": _package("lib"),
+        "lib.core": _package("lib.core"),
+        "lib.core.config": _config_stub,
+        "lib.utils": _utils_stub,
+        "lib.utils.printer": _printer_stub,
+        "lib.utils.metrics": _metrics_stub,
+        "lib.services": _package("lib.services"),
+        "lib.services.tts": _package("lib.services.tts"),
+        "lib.services.tts.providers": _package("lib.services.tts.providers"),
+    },
+):
+    _load("lib.services.tts.utils", os.path.join(_TTS, "utils.py"))
+    _cache_mod = _load("lib.services.tts.cache", os.path.join(_TTS, "cache.py"))
+    _load("lib.services.tts.providers.base", os.path.join(_TTS, "providers", "base.py"))
+    _kokoro_mod = _load("lib.services.tts.providers.kokoro", os.path.join(_TTS, "providers", "kokoro.py"))
+
+KokoroVoiceModel = _kokoro_mod.KokoroVoiceModel
+TTSCache = _cache_mod.TTSCache
+
+
+@pytest.fixture
+def model():
+    return KokoroVoiceModel(cache=TTSCache(max_bytes=0))
+
+
+class TestGenerateStream:
+    def test_yields_each_pipeline_chunk(self, model):
+        chunks = list(model.generate_stream("Hello there | general Kenobi | you are a bold one"))
+
+        assert len(chunks) == 3
+        assert [int(c[0]) for c in chunks] == [0, 1, 2]
+        assert all(c.dtype == np.float32 for c in chunks)
+
+    def test_is_lazy(self, model):
+        stream = model.generate_stream("first | second")
+        model.load()
+
+        first = next(stream)
+
+        assert int(first[0]) == 0
+        assert len(model._pipeline.calls) == 1
+
+    def test_non_speakable_text_yields_nothing(self, model):
+        assert list(model.generate_stream("**")) == []
+
+    def test_uses_voice_override(self, model):
+        list(model.generate_stream("Hi", voice="bm_george"))
+
+        assert model._pipeline.calls[-1][1] == "bm_george"
+
+
+class TestGenerate:
+    def test_concatenates_stream(self, model):
+        audio, sr = model.generate("one | two")
+
+        assert sr == 24000
+        assert audio.shape == (200,)
+
+    def test_non_speakable_returns_silence(self, model):
+        audio, sr = model.generate("**")
+
+        assert sr == 24000
+        assert not audio.any()
+
+    def test_empty_pipeline_raises(self, model):
+        model._pipeline = lambda text, voice=None, speed=1.0: iter(())
+
+        with pytest.raises(RuntimeError):
+            model.generate("Hello")
+
+
+class TestCaching:
+    def test_repeat_is_served_from_cache(self):
+        model = KokoroVoiceModel(cache=TTSCache(max_bytes=1024 * 1024))
+        first, _ = model.generate("Hello there | friend")
+        model.load()
+        model._pipeline.calls.clear()
+
+        chunks = list(model.generate_stream("Hello   there | friend"))
+
+        assert model._pipeline.calls == []
+        assert len(chunks) == 1
+        np.testing.assert_array_equal(chunks[0], first)
+
+    def test_key_includes_voice(self):
+        model = KokoroVoiceModel(cache=TTSCache(max_bytes=1024 * 1024))
+        model.generate("Hello")
+        model._pipeline.calls.clear()
+
+        model.generate("Hello", voice="bm_george")
+
+        assert len(model._pipeline.calls) == 1
+
+    def test_partially_consumed_stream_is_not_cached(self):
+        cache = TTSCache(max_bytes=1024 * 1024)
+        model = KokoroVoiceModel(cache=cache)
+
+        stream = model.generate_stream("one | two")
+        next(stream)
+        stream.close()
+
+        assert cache.stats()["entries"] == 0
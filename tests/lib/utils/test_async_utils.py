@@ -0,0 +1,144 @@
+"""Tests for AsyncBridge: one persistent loop, home-loop routing, timeouts and cancellation."""
+
+import asyncio
+import importlib.util
+import os
+import threading
+
+import pytest
+
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src"))
+
+_spec = importlib.util.spec_from_file_location(
+    "lib.utils.async_utils", os.path.join(_SRC, "lib", "utils", "async_utils.py")
+)
+async_utils = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(async_utils)
+
+AsyncBridge = async_utils.AsyncBridge
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+@pytest.fixture
+def bridge():
+    b = AsyncBridge(name="test-bridge")
+    yield b
+    b.close()
+
+
+@pytest.fixture
+def home_loop(bridge):
+    """An application loop on its own thread, bound to the bridge."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def _bind():
+        bridge.bind()
+
+    asyncio.run_coroutine_threadsafe(_bind(), loop).result(5)
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+class TestBackgroundLoop:
+    def test_calls_share_one_persistent_loop(self, bridge):
+        first = bridge.run(_current_loop())
+        second = bridge.run(_current_loop())
+        assert first is second
+        assert first.is_running()
+
+    def test_result_and_exception_propagate(self, bridge):
+        async def ok():
+            return 42
+
+        async def boom():
+            raise ValueError("bad")
+
+        assert bridge.run(ok()) == 42
+        with pytest.raises(ValueError, match="bad"):
+            bridge.run(boom())
+
+    def test_timeout_cancels_the_coroutine(self, bridge):
+        cancelled = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            bridge.run(slow(), timeout=0.05)
+        assert cancelled.wait(2)
+
+    def test_timeout_raised_by_the_coroutine_propagates(self, bridge):
+        async def gives_up():
+            raise TimeoutError("pool exhausted")
+
+        with pytest.raises(TimeoutError, match="pool exhausted"):
+            bridge.run(gives_up(), timeout=5)
+
+    def test_nested_call_from_bridge_loop_raises(self, bridge):
+        async def nested():
+            inner = _current_loop()
+            try:
+                return bridge.run(inner)
+            finally:
+                inner.close()
+
+        with pytest.raises(RuntimeError, match="inside the bridge loop"):
+            bridge.run(nested())
+
+    def test_close_then_reuse_starts_a_new_loop(self, bridge):
+        first = bridge.run(_current_loop())
+        bridge.close()
+        assert first.is_closed()
+        assert bridge.run(_current_loop()) is not first
+
+
+class TestHomeLoop:
+    def test_worker_thread_calls_run_on_home_loop(self, bridge, home_loop):
+        assert bridge.run(_current_loop()) is home_loop
+
+        results = []
+        worker = threading.Thread(target=lambda: results.append(bridge.run(_current_loop())))
+        worker.start()
+        worker.join(5)
+        assert results == [home_loop]
+
+    def test_sync_call_on_home_thread_falls_back_instead_of_deadlocking(self, bridge, home_loop):
+        async def blocking_sync_call_on_home_loop():
+            return bridge.run(_current_loop(), timeout=2)
+
+        used = asyncio.run_coroutine_threadsafe(blocking_sync_call_on_home_loop(), home_loop).result(5)
+        assert used is not home_loop
+
+    def test_stopped_home_loop_is_ignored(self, bridge):
+        loop = asyncio.new_event_loop()
+
+        async def _bind():
+            bridge.bind()
+
+        loop.run_until_complete(_bind())
+        loop.close()
+        assert bridge.run(_current_loop()) is not loop
+
+    def test_unbind(self, bridge, home_loop):
+        async def _unbind():
+            bridge.unbind()
+
+        asyncio.run_coroutine_threadsafe(_unbind(), home_loop).result(5)
+        assert bridge.run(_current_loop()) is not home_loop
+
+
+def test_run_async_uses_process_wide_bridge():
+    assert async_utils.get_async_bridge() is async_utils.get_async_bridge()
+    assert async_utils.run_async(_current_loop()) is async_utils.run_async(_current_loop())
@@ -0,0 +1,180 @@
+"""Tests for file_search: gitignore semantics, binary/size skipping, ordering and early termination."""
+
+import importlib.util
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src"))
+
+_spec = importlib.util.spec_from_file_location(
+    "lib.utils.file_search", os.path.join(_SRC, "lib", "utils", "file_search.py")
+)
+file_search = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(file_search)
+
+
+def _tree(root: Path, files: dict[str, str | bytes]) -> Path:
+    for rel, content in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text(content)
+    return root
+
+
+def _walked(root: Path, **kwargs) -> list[str]:
+    return [os.path.relpath(p, root).replace(os.sep, "/") for p in file_search.walk_files(str(root), **kwargs)]
+
+
+def _contains(needle: str):
+    return lambda line: needle in line
+
+
+# ===========================================================================
+# Ignore rules
+# ===========================================================================
+
+
+class TestIgnoreRules:
+    @pytest.mark.parametrize(
+        ("pattern", "path", "is_dir", "expected"),
+        [
+            ("*.log", "a/b/x.log", False, True),
+            ("/top.txt", "top.txt", False, True),
+            ("/top.txt", "src/top.txt", False, False),
+            ("build/", "build", True, True),
+            ("build/", "build", False, False),
+            ("docs/**/*.tmp", "docs/a/b/q.tmp", False, True),
+            ("docs/**/*.tmp", "docs/q.tmp", False, True),
+            ("docs/**/*.tmp", "src/docs/q.tmp", False, False),
+            ("**/cache", "a/cache", True, True),
+            ("a/**", "a/b/c", False, True),
+            ("foo[0-9].txt", "foo7.txt", False, True),
+            ("foo[!0-9].txt", "foo7.txt", False, False),
+            ("\\#hash", "#hash", False, True),
+        ],
+    )
+    def test_pattern(self, pattern, path, is_dir, expected):
+        ignore = file_search.IgnoreFile("/r", [file_search.parse_ignore_line(pattern)])
+        assert bool(ignore.match(os.path.join("/r", path), is_dir)) is expected
+
+    @pytest.mark.parametrize("line", ["", "# comment", "   ", "/"])
+    def test_blank_and_comment_lines(self, line):
+        assert file_search.parse_ignore_line(line) is None
+
+    def test_last_rule_wins_and_negation(self):
+        rules = [file_search.parse_ignore_line(line) for line in ("*.log", "!keep.log")]
+        ignore = file_search.IgnoreFile("/r", rules)
+        assert ignore.match("/r/x.log", False) is True
+        assert ignore.match("/r/keep.log", False) is False
+        assert ignore.match("/r/x.py", False) is None
+
+    def test_walk_matches_git(self, tmp_path):
+        if subprocess.run(["git", "--version"], capture_output=True).returncode != 0:
+            pytest.skip("git not available")
+        _tree(
+            tmp_path,
+            {
+                ".gitignore": "*.log\n!keep.log\nbuild/\n/top.txt\n**/cache\nsub/nested.txt\n",
+                "x.log": "",
+                "keep.log": "",
+                "build/a.txt": "",
+                "src/build/b.txt": "",
+                "top.txt": "",
+                "src/top.txt": "",
+                "cache/k": "",
+                "src/cache/k": "",
+                "sub/nested.txt": "",
+                "other/sub/nested.txt": "",
+                "src/.gitignore": "!*.log\n*.py\n",
+                "src/ok.log": "",
+                "src/a.py": "",
+                "main.py": "",
+            },
+        )
+        subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+        listed = subprocess.run(
+            ["git", "ls-files", "-co", "--exclude-standard"], cwd=tmp_path, capture_output=True, text=True, check=True
+        ).stdout.split()
+
+        assert sorted(_walked(tmp_path)) == sorted(listed)
+
+    def test_parent_gitignore_applies_inside_repo(self, tmp_path):
+        _tree(tmp_path, {".gitignore": "*.gen\n", "pkg/a.gen": "", "pkg/a.py": ""})
+        (tmp_path / ".git").mkdir()
+
+        assert _walked(tmp_path / "pkg") == ["a.py"]
+
+    def test_vcs_dirs_and_ignored_dirs_not_entered(self, tmp_path):
+        _tree(tmp_path, {".gitignore": "node_modules/\n", "node_modules/x.js": "", ".git/config": "", "a.js": ""})
+
+        assert _walked(tmp_path) == [".gitignore", "a.js"]
+        assert "node_modules/x.js" in _walked(tmp_path, use_ignore_files=False)
+
+    def test_file_pattern(self, tmp_path):
+        _tree(tmp_path, {"a.py": "", "src/b.py": "", "src/c.txt": ""})
+
+        assert _walked(tmp_path, file_pattern="*.py") == ["a.py", "src/b.py"]
+        assert _walked(tmp_path, file_pattern="src/*.py") == ["src/b.py"]
+        assert _walked(tmp_path, file_pattern="**/*.txt") == ["src/c.txt"]
+
+
+# ===========================================================================
+# Searching
+# ===========================================================================
+
+
+class TestSearchTree:
+    def test_binary_and_oversized_files_skipped(self, tmp_path):
+        _tree(tmp_path, {"bin.dat": b"\0\0TODO\n", "big.txt": "TODO\n" * 100, "ok.txt": "TODO\n"})
+
+        result = file_search.search_tree(str(tmp_path), _contains("TODO"), max_file_size=64)
+
+        assert [m["file"] for m in result.matches] == ["ok.txt"]
+        assert result.files_searched == 1
+        assert result.files_skipped == 2
+
+    def test_line_numbers_and_newline_styles(self, tmp_path):
+        _tree(tmp_path, {"crlf.txt": b"a\r\nTODO one\r\nb\rTODO two\n"})
+
+        result = file_search.search_tree(str(tmp_path), _contains("TODO"))
+
+        assert [(m["line"], m["content"]) for m in result.matches] == [(2, "TODO one"), (4, "TODO two")]
+
+    def test_parallel_results_in_walk_order(self, tmp_path):
+        _tree(tmp_path, {f"d{i % 3}/f{i:02}.txt": "x\nTODO\n" * (i % 4) for i in range(40)})
+
+        sequential = file_search.search_tree(str(tmp_path), _contains("TODO"), max_results=1000, workers=1)
+        parallel = file_search.search_tree(str(tmp_path), _contains("TODO"), max_results=1000, workers=8)
+
+        assert parallel.matches == sequential.matches
+        assert len(parallel.matches) == sum(i % 4 for i in range(40))
+
+    def test_stops_at_max_results(self, tmp_path):
+        _tree(tmp_path, {f"f{i:03}.txt": "TODO\n" * 10 for i in range(200)})
+
+        result = file_search.search_tree(str(tmp_path), _contains("TODO"), max_results=15, workers=4)
+
+        assert result.truncated is True
+        assert [(m["file"], m["line"]) for m in result.matches][-1] == ("f001.txt", 5)
+        assert len(result.matches) == 15
+        assert result.files_searched < 200
+
+    def test_file_prefilter_short_circuits_line_scan(self, tmp_path):
+        _tree(tmp_path, {"a.txt": "nothing\n", "b.txt": "TODO\n"})
+        scanned = []
+
+        def _line(line):
+            scanned.append(line)
+            return "TODO" in line
+
+        result = file_search.search_tree(str(tmp_path), _line, file_matches=lambda text: "TODO" in text)
+
+        assert [m["file"] for m in result.matches] == ["b.txt"]
+        assert scanned == ["TODO"]
@@ -0,0 +1,161 @@
+"""Tests for the metrics registry (Prometheus rendering, disabled mode) and the span tracer."""
+
+import asyncio
+import importlib.util
+import os
+import sys
+
+import pytest
+
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src"))
+
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+_spec = importlib.util.spec_from_file_location("lib.utils.metrics", os.path.join(_SRC, "lib", "utils", "metrics.py"))
+metrics_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(metrics_mod)
+
+MetricsRegistry = metrics_mod.MetricsRegistry
+Tracer = metrics_mod.Tracer
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(enabled=True)
+
+
+class TestRegistry:
+    def test_counter_and_gauge_render(self, registry):
+        calls = registry.counter("knik_calls_total", "Calls", ("tool", "status"))
+        calls.inc(tool="search", status="ok")
+        calls.inc(2, tool="search", status="ok")
+        calls.inc(tool="search", status="error")
+        inflight = registry.gauge("knik_inflight", "In flight")
+        inflight.inc()
+        inflight.inc()
+        inflight.dec()
+
+        text = registry.render()
+
+        assert "# TYPE knik_calls_total counter" in text
+        assert 'knik_calls_total{tool="search",status="ok"} 3' in text
+        assert 'knik_calls_total{tool="search",status="error"} 1' in text
+        assert "# TYPE knik_inflight gauge\nknik_inflight 1\n" in text
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        latency = registry.histogram("knik_latency_seconds", "Latency", ("op",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value, op="read")
+
+        text = registry.render()
+
+        assert 'knik_latency_seconds_bucket{op="read",le="0.1"} 2' in text
+        assert 'knik_latency_seconds_bucket{op="read",le="1"} 3' in text
+        assert 'knik_latency_seconds_bucket{op="read",le="+Inf"} 4' in text
+        assert 'knik_latency_seconds_sum{op="read"} 3.65' in text
+        assert 'knik_latency_seconds_count{op="read"} 4' in text
+        assert latency.snapshot(op="read") == (4, pytest.approx(3.65))
+
+    def test_histogram_time_observes_the_block(self, registry):
+        latency = registry.histogram("knik_block_seconds", "Block")
+        with pytest.raises(RuntimeError), latency.time():
+            raise RuntimeError("still observed")
+        assert latency.snapshot()[0] == 1
+
+    def test_labels_must_match_the_declaration(self, registry):
+        calls = registry.counter("knik_calls_total", "Calls", ("tool",))
+        with pytest.raises(ValueError, match="expects labels"):
+            calls.inc()
+        with pytest.raises(KeyError):
+            calls.inc(other="x")
+
+    def test_label_values_are_escaped(self, registry):
+        registry.counter("knik_paths_total", "Paths", ("path",)).inc(path='a"b\\c\nd')
+        assert 'knik_paths_total{path="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+    def test_redeclaring_returns_the_same_metric(self, registry):
+        first = registry.counter("knik_x_total", "X")
+        assert registry.counter("knik_x_total", "X") is first
+        with pytest.raises(ValueError, match="already registered"):
+            registry.gauge("knik_x_total", "X")
+
+    def test_collectors_run_before_render_and_failures_are_contained(self, registry):
+        pool = registry.gauge("knik_pool_size", "Pool size")
+        registry.add_collector(lambda: pool.set(7))
+        registry.add_collector(lambda: 1 / 0)
+        assert "knik_pool_size 7" in registry.render()
+
+    def test_disabled_registry_records_nothing(self):
+        registry = MetricsRegistry(enabled=False)
+        calls = registry.counter("knik_calls_total", "Calls", ("tool",))
+        latency = registry.histogram("knik_latency_seconds", "Latency")
+        calls.inc(tool="search")
+        latency.observe(0.2)
+        assert calls.value(tool="search") == 0
+        assert latency.snapshot() == (0, 0.0)
+        assert registry.render() == ""
+
+    def test_reset_clears_values(self, registry):
+        calls = registry.counter("knik_calls_total", "Calls")
+        calls.inc()
+        registry.reset()
+        assert calls.value() == 0
+
+
+class TestTracer:
+    def test_disabled_tracer_returns_a_shared_noop(self):
+        tracer = Tracer(enabled=False)
+        with tracer.span("work", a=1) as span:
+            span.set_attribute("b", 2)
+        assert tracer.span("other") is span
+        assert tracer.recent() == []
+
+    def test_nested_spans_share_a_trace(self):
+        tracer = Tracer(enabled=True)
+        with tracer.span("outer") as outer, tracer.span("inner", tool="search") as inner:
+            inner.set_attribute("rows", 3)
+
+        recent = tracer.recent()
+        assert [s["name"] for s in recent] == ["outer", "inner"]
+        assert inner.trace_id == outer.trace_id
+        assert inner.parent_id == outer.span_id
+        assert outer.parent_id is None
+        assert recent[1]["attributes"] == {"tool": "search", "rows": 3}
+        assert recent[1]["duration_ms"] >= 0
+
+    def test_spans_in_tasks_inherit_the_parent(self):
+        tracer = Tracer(enabled=True)
+
+        async def child(name):
+            with tracer.span(name):
+                await asyncio.sleep(0)
+
+        async def main():
+            with tracer.span("workflow") as root:
+                await asyncio.gather(child("a"), child("b"))
+            return root
+
+        root = asyncio.run(main())
+        children = [s for s in tracer.recent() if s["name"] in ("a", "b")]
+        assert len(children) == 2
+        assert all(s["parent_id"] == root.span_id and s["trace_id"] == root.trace_id for s in children)
+
+    def test_exception_marks_the_span_failed(self):
+        tracer = Tracer(enabled=True)
+        with pytest.raises(ValueError), tracer.span("work"):
+            raise ValueError("bad input")
+        (span,) = tracer.recent()
+        assert span["status"] == "error"
+        assert span["error"] == "ValueError: bad input"
+
+    def test_buffer_is_bounded_and_filterable(self):
+        tracer = Tracer(enabled=True, buffer_size=3)
+        for i in range(5):
+            with tracer.span(f"s{i}"):
+                pass
+        recent = tracer.recent()
+        assert [s["name"] for s in recent] == ["s4", "s3", "s2"]
+        assert tracer.recent(limit=1)[0]["name"] == "s4"
+        assert [s["name"] for s in tracer.recent(trace_id=recent[1]["trace_id"])] == ["s3"]
@@ -0,0 +1,87 @@
+"""Import-time regression tests: entry points must not load stacks they don't use.
+
+Each case imports an entry point in a fresh interpreter and inspects
+``sys.modules``, so one test's imports can't leak into another's.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# The TTS stack: model weights, torch and the audio device.
+_TTS_MODULES = [
+    "kokoro",
+    "torch",
+    "sounddevice",
+    "soundfile",
+    "lib.services.tts.audio",
+    "lib.services.tts.processor",
+    "lib.services.tts.providers.kokoro",
+]
+# LangChain and the provider SDKs behind AIClient.
+_AI_MODULES = [
+    "langchain_core",
+    "langchain_openai",
+    "langchain_google_vertexai",
+    "openai",
+    "lib.services.ai_client.client",
+    "lib.services.ai_client.providers",
+]
+
+
+def _loaded_after_import(statement: str, watched: list[str]) -> list[str]:
+    script = f"import json, sys\n{statement}\nprint(json.dumps(sorted(m for m in {watched!r} if m in sys.modules)))\n"
+    env = {**os.environ, "PYTHONPATH": _SRC}
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, timeout=120)
+    if result.returncode != 0:
+        if "ModuleNotFoundError" in result.stderr:
+            pytest.skip(f"dependency missing for {statement!r}: {result.stderr.strip().splitlines()[-1]}")
+        pytest.fail(f"{statement!r} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import imports",
+        "import lib",
+        "from imports import printer",
+        "from lib import Config, printer",
+        "import lib.services",
+        "from lib.services.tts.cache import get_tts_cache",
+        "from lib.services.ai_client.token_utils import count_tokens",
+    ],
+)
+def test_facades_load_nothing_heavy(statement):
+    assert _loaded_after_import(statement, _TTS_MODULES + _AI_MODULES) == []
+
+
+def test_cron_mode_skips_tts_and_ai_providers():
+    assert _loaded_after_import("import apps.cron_job.app", _TTS_MODULES + _AI_MODULES) == []
+
+
+def test_bot_mode_skips_tts():
+    assert _loaded_after_import("import apps.bot", _TTS_MODULES) == []
+
+
+def test_lazy_attributes_resolve_once_and_unknown_names_raise():
+    statement = (
+        "import imports, lib\n"
+        "assert 'Config' not in vars(imports)\n"
+        "from imports import Config\n"
+        "import lib.core\n"
+        "assert Config is lib.core.Config and vars(imports)['Config'] is Config\n"
+        "try:\n"
+        "    lib.NotAThing\n"
+        "except AttributeError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise AssertionError('expected AttributeError')"
+    )
+    assert _loaded_after_import(statement, ["lib.core"]) == ["lib.core"]